@@ -0,0 +1,189 @@
+# ----------------------------------------
+import os
+import re
+import sys
+import pickle
+import shutil
+import hashlib
+import tempfile
+import functools
+from pulseutils.system import execute_command
+# ----------------------------------------
+def file_digest(filename):
+    if not os.path.isfile(filename):
+        return 'missing'
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as istr:
+        for block in iter(lambda: istr.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()
+# ----------------------------------------
+def inputs_digest(stage, files, params):
+    # params must have a deterministic repr (sort sets before passing them)
+    digest = hashlib.sha256(stage.encode())
+    for filename in files:
+        digest.update(file_digest(filename).encode())
+    digest.update(repr(params).encode())
+    return digest.hexdigest()
+# ----------------------------------------
+_dependencies = {}
+# ----------------------------------------
+def _file_stat(filename):
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+# ----------------------------------------
+def _load_dependencies(depfile, key):
+    try:
+        with open(depfile, 'rb') as istr:
+            dkey, entry = pickle.load(istr)
+    except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+        return None
+    return entry if dkey == key else None
+# ----------------------------------------
+def _save_dependencies(depfile, key, entry):
+    tmp = '{}.tmp'.format(depfile)
+    with open(tmp, 'wb') as ostr:
+        pickle.dump((key, entry), ostr, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, depfile)
+# ----------------------------------------
+def source_dependencies(filename, cpp_path='cpp', depfile=None):
+    # files a C source depends on as listed by cpp -M, the source first; only the
+    # source itself if cpp cannot list them (preprocessing will fail on its own).
+    # Lists are memoized (in memory, and in depfile across runs) and reused while
+    # the listed files keep their modification times and sizes.
+    key = (os.path.abspath(filename), cpp_path)
+    entry = _dependencies.get(key)
+    if entry is None and depfile is not None:
+        entry = _load_dependencies(depfile, key)
+    if entry is not None and all(_file_stat(dep) == stat for dep, stat in entry):
+        _dependencies[key] = entry
+        return [ dep for dep, _ in entry ]
+    try:
+        ret, to, out, err = execute_command([cpp_path, '-M', filename], merge_output=False)
+    except OSError:
+        return [ filename ]
+    if ret != 0:
+        return [ filename ]
+    rule = out.replace('\\\n', ' ').split(':', 1)[-1]
+    deps = [ dep.replace('\\ ', ' ') for dep in re.split(r'(?<!\\)\s+', rule.strip()) if dep ]
+    if not deps:
+        return [ filename ]
+    entry = [ (dep, _file_stat(dep)) for dep in deps ]
+    _dependencies[key] = entry
+    if depfile is not None:
+        _save_dependencies(depfile, key, entry)
+    return deps
+# ----------------------------------------
+@functools.lru_cache(maxsize=None)
+def tool_version(tool, flag='--version'):
+    try:
+        ret, to, out, err = execute_command([tool, flag], timeout=10)
+    except OSError:
+        return 'missing'
+    return '{}:{}'.format(ret, out.strip())
+# ----------------------------------------
+@functools.lru_cache(maxsize=None)
+def sources_version(*modules):
+    # digest of the python sources of the given modules; packages contribute all their modules
+    digest = hashlib.sha256()
+    for name in modules:
+        filename = sys.modules[name].__file__
+        if os.path.basename(filename) == '__init__.py':
+            dirname = os.path.dirname(filename)
+            files = [ os.path.join(dirname, f) for f in sorted(os.listdir(dirname)) if f.endswith('.py') ]
+        else:
+            files = [ filename ]
+        for source in files:
+            digest.update(file_digest(source).encode())
+    return digest.hexdigest()
+# ----------------------------------------
+class BuildStamps:
+
+    # Per-task record of the input digest of each completed compilation stage, along
+    # with the in-memory state it produced for the following stages and the digests
+    # of its outputs. A stage is up to date when its recorded digest matches and its
+    # outputs are unchanged (a deleted or rewritten output is rebuilt). Stamps are
+    # still recorded when reuse is disabled, so that forced rebuilds stay consistent.
+
+    def __init__(self, filename, reuse=True):
+        self.filename = filename
+        self.reuse = reuse
+        self.stamps = self._load()
+
+    def _load(self):
+        try:
+            with open(self.filename, 'rb') as istr:
+                return pickle.load(istr)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return {}
+
+    def _save(self):
+        tmp = '{}.tmp'.format(self.filename)
+        with open(tmp, 'wb') as ostr:
+            pickle.dump(self.stamps, ostr, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.filename)
+
+    def lookup(self, stage, digest, outputs):
+        if not self.reuse or stage not in self.stamps:
+            return None
+        stamp = self.stamps[stage]
+        if len(stamp) != 3:
+            return None
+        sdigest, state, odigests = stamp
+        if sdigest != digest or odigests != [ file_digest(f) for f in outputs ]:
+            return None
+        return state
+
+    def invalidate(self, stage):
+        # called before a stage runs, so that a failure never leaves a stale stamp
+        # over partially rewritten outputs
+        if self.stamps.pop(stage, None) is not None:
+            self._save()
+
+    def record(self, stage, digest, state, outputs=()):
+        self.stamps[stage] = (digest, state, [ file_digest(f) for f in outputs ])
+        self._save()
+# ----------------------------------------
+class ObjectCache:
+
+    # ccache-style store of compiled binaries, shared between tasks and runs.
+    # Entries are keyed by the compiler version, the compilation flags and the
+    # names and content of the compiled sources.
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def key(self, command, sources, target):
+        flags = [ c for c in command if c != target and c not in sources ]
+        names = [ os.path.basename(s) for s in sources ]
+        return inputs_digest('object', sources, [ tool_version(command[0]), flags, names ])
+
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    def fetch(self, key, target):
+        entry = self.path(key)
+        if not os.path.isfile(entry):
+            return False
+        shutil.copyfile(entry, target)
+        shutil.copymode(entry, target)
+        return True
+
+    def store(self, key, target):
+        entry = self.path(key)
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(entry))
+        os.close(fd)
+        try:
+            shutil.copyfile(target, tmp)
+            shutil.copymode(target, tmp)
+            os.replace(tmp, entry)
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+# ----------------------------------------
+# ----------------------------------------
@@ -3,7 +3,10 @@ import sys
 import os
 from .core import TaskStatus, TaskException
 from pulseutils.system import execute_command
-from .cupdate import generate_update
+from .cupdate import generate_update, ParseCache
+from .buildcache import BuildStamps, ObjectCache, inputs_digest, tool_version, sources_version, source_dependencies
+from .ruleset.asmindex import AsmIndex
+from .ruleset.dbaslice import DbaSlice, write_unrestricted_slice
 from pulseutils.assembly import x86AsmData
 # ----------------------------------------
 # ----------------------------------------
@@ -21,7 +24,9 @@ class CompilationFiles:
         self.binary       = os.path.join(self.outdir, '{}.bin'.format(corename))
         self.dump         = os.path.join(self.outdir, '{}.bin.s'.format(corename))
         self.dumptbl      = os.path.join(self.outdir, '{}.bin.s2'.format(corename))
+        self.dumpidx      = os.path.join(self.outdir, '{}.bin.s.idx'.format(corename))
         self.dba          = os.path.join(self.outdir, '{}.dba'.format(corename))
+        self.sdba         = os.path.join(self.outdir, '{}.slice.dba'.format(corename))
         self.stub         = os.path.join(self.outdir, '{}.stub.raw.c'.format(corename))
         self.bconfig      = os.path.join(self.outdir, '{}.binsec.config'.format(corename))
         self.bmemory      = os.path.join(self.outdir, '{}.binsec.memory'.format(corename))
@@ -33,7 +38,11 @@ class CompilationFiles:
         self.rrunner      = os.path.join(self.outdir, '{}.robust-run.bash'.format(corename))
         self.adirectives  = os.path.join(self.outdir, '{}.abd.directives.txt'.format(corename))
         self.aliterals    = os.path.join(self.outdir, '{}.abd.literals.txt'.format(corename))
+        self.aslice       = os.path.join(self.outdir, '{}.abd.slice.txt'.format(corename))
         self.arunner      = os.path.join(self.outdir, '{}.abduce-run.bash'.format(corename))
+        self.aproblem     = os.path.join(self.outdir, '{}.abduce-problem.json'.format(corename))
+        self.stamps       = os.path.join(self.outdir, '{}.c2bc.stamps'.format(corename))
+        self.deps         = os.path.join(self.outdir, '{}.c2bc.deps'.format(corename))
 # ----------------------------------------
 class CompilationTask:
 
@@ -42,22 +51,19 @@ class CompilationTask:
         self.args = args
         self.ruleset = ruleset
         self.debug_stack = []
-        self.forward = None
         self.context = {}
+        self.stamps = BuildStamps(self.files.stamps, reuse=getattr(args, 'incremental', True))
+        object_cache = getattr(args, 'object_cache', None)
+        self.objects = ObjectCache(object_cache) if object_cache else None
+        parse_cache = getattr(args, 'parse_cache', None)
+        self.parses = ParseCache(parse_cache) if parse_cache else None
         self.status = TaskStatus.Pending
 
     def __call__(self):
         try:
             self.status = TaskStatus.Running
             self.debug_stack.append('compiling {} -> {}'.format(self.files.input, self.files.runner))
-            if not (self.args.skip_existing and os.path.isfile(self.files.runner)):
-                self._build_intermediate()
-                self._generate_code()
-                self._compile_code()
-                self._disasm_code()
-                self._build_dba()
-                self._build_config()
-                self._build_runner()
+            self._build_stages()
             self.status = TaskStatus.Complete
         except TaskException as e:
             self.status = TaskStatus.Failure
@@ -67,31 +73,103 @@ class CompilationTask:
             self.status = TaskStatus.HardFailure
             self.debug_stack.append(e)
 
+    def _build_stages(self):
+        # Each stage is keyed by the content of its input files and by its parameters
+        # (ruleset sources, tool versions, options); unchanged stages are skipped and
+        # restore the context they produced. Runners are cheap and always rewritten.
+        # Sources are preprocessed when generating code, which thus also depends on
+        # the headers they include.
+        version = self._ruleset_version()
+        self._stage('intermediate', self._build_intermediate, (self.files.input,), [ version ],
+                    (self.files.intermediate,), ('forward',))
+        self._stage('generate', self._generate_code, tuple(source_dependencies(self.files.intermediate, depfile=self.files.deps)),
+                    [ version, sorted(self.context['forward']), tool_version('cpp') ],
+                    (self.files.output, self.files.stub), ('symbols',))
+        compilation = self._compilation_command()
+        self._stage('compile', self._compile_code, (self.files.stub, self.files.output),
+                    [ compilation, tool_version(compilation[0]) ], (self.files.binary,))
+        disasm = self.ruleset.make_disasm_command(self.files.binary)
+        self._stage('disasm', self._disasm_code, (self.files.binary,),
+                    [ disasm, self.ruleset.make_disasm_table_command(self.files.binary), tool_version(disasm[0]) ],
+                    (self.files.dump, self.files.dumptbl))
+        self._stage('dba', self._build_dba, (self.files.binary,), [ self._dba_version() ], (self.files.dba,))
+        self._stage('config', self._build_config, (self.files.dump, self.files.dumptbl, self.files.dba),
+                    [ version, sorted(self.context['symbols']), self._is_ct_mode(), self._ct_script_lines(),
+                      self.args.auto_control_variables ],
+                    (self.files.bconfig, self.files.bmemory, self.files.rconfig, self.files.rmemory,
+                     self.files.adirectives, self.files.aliterals), ('controlled', 'assume-addr', 'slice-functions'))
+        if self._has_input_slice():
+            functions = self.context['slice-functions']
+            self._stage('slice', self._build_slice, (self.files.binary,),
+                        [ version, self._dba_version(), sorted(functions.items()) if functions is not None else None ],
+                        (self.files.aslice,))
+        self._build_runner()
+
+    def _stage(self, stage, build, inputs, params, outputs, state=()):
+        digest = inputs_digest(stage, inputs, params)
+        recorded = self.stamps.lookup(stage, digest, outputs)
+        if recorded is not None:
+            self.debug_stack.append('skip unchanged stage {}'.format(stage))
+            self.context.update(recorded)
+            return
+        self.stamps.invalidate(stage)
+        build()
+        self.stamps.record(stage, digest, { key : self.context[key] for key in state }, outputs)
+
+    def _ruleset_version(self):
+        return sources_version(__name__, 'c2binsec.cupdate', 'c2binsec.ruleset', 'pulseutils.assembly',
+                               type(self.ruleset).__module__)
+
+    def _has_dba_command(self):
+        # DBA extraction is a ruleset capability, not every ruleset provides it
+        return callable(getattr(self.ruleset, 'make_dba_command', None))
+
+    def _dba_version(self):
+        if not self._has_dba_command():
+            return None
+        command = self.ruleset.make_dba_command(self.files.binary, self.files.dba, function='c2bc_main')
+        if not command:
+            return None
+        return tool_version(command[0], flag='-version')
+
     def _build_intermediate(self):
         with open(self.files.input) as istr:
             data = istr.read()
         with open(self.files.intermediate, 'w') as ostr:
-            self.forward = self.ruleset.write_cpp_compliant(ostr, data, stack=self.debug_stack)
+            self.context['forward'] = self.ruleset.write_cpp_compliant(ostr, data, stack=self.debug_stack)
 
     def _generate_code(self):
-        ast, data = generate_update(self.files.intermediate, self.ruleset.crules, stack=self.debug_stack)
+        ast, data = generate_update(self.files.intermediate, self.ruleset.crules, stack=self.debug_stack,
+                                    cache=self.parses)
         self.context['symbols'] = data.symbols
-        prepatch = self.ruleset.build_c_prepatch(self.forward)
+        prepatch = self.ruleset.build_c_prepatch(self.context['forward'])
         with open(self.files.output, 'w') as ostr:
             self.ruleset.write_c_update(ostr, ast, data, prepatch=prepatch, stack=self.debug_stack)
         with open(self.files.stub, 'w') as ostr:
             self.ruleset.write_c_stubs(ostr, data, stack=self.debug_stack)
 
-    def _compile_code(self):
+    def _compilation_command(self):
         command = self.ruleset.make_compilation_command((self.files.stub, self.files.output), self.files.binary)
         if self._is_ct_mode():
             # Preserve branch structure for CHECKCT analyses.
             filtered = [c for c in command if not (c.startswith('-O') and len(c) >= 2)]
             command = [filtered[0], '-O0'] + filtered[1:]
+        return command
+
+    def _compile_code(self):
+        command = self._compilation_command()
+        key = None
+        if self.objects is not None:
+            key = self.objects.key(command, (self.files.stub, self.files.output), self.files.binary)
+            if self.objects.fetch(key, self.files.binary):
+                self.debug_stack.append('reuse cached binary {}'.format(key))
+                return
         self.debug_stack.append('run {}'.format(' '.join(command)))
         ret, to, out, err = execute_command(command)
         if ret != 0:
             raise TaskException('compilation failed', out)
+        if key is not None:
+            self.objects.store(key, self.files.binary)
 
     def _disasm_code(self):
         command = self.ruleset.make_disasm_command(self.files.binary)
@@ -136,6 +214,7 @@ class CompilationTask:
         if os.path.isfile(self.files.dumptbl):
             with open(self.files.dumptbl) as istr:
                 asm.read_symbol_table(istr)
+        asm = AsmIndex(asm, cachefile=self.files.dumpidx, sources=(self.files.dump, self.files.dumptbl))
         extra_lines = self._ct_script_lines(asm=asm)
         ct_mode = self._is_ct_mode()
         with open(self.files.bconfig, 'w') as ostr:
@@ -175,6 +254,51 @@ class CompilationTask:
                     os.path.getsize(self.files.aliterals) == 0):
                 self.debug_stack.append('warning: no controlled variables detected for abduction; use --auto-control-variables for robust abduction')
         self.context['assume-addr'] = self.ruleset.make_assumption_addr_param(asm, dba_file=self.files.dba)
+        entry = asm.entry_function()
+        self.context['slice-functions'] = asm.callees(entry) if entry is not None else None
+        asm.save()
+
+    def _has_input_slice(self):
+        # The slice follows branch and guard conditions only, while constant-time
+        # leaks also come from load and store addresses: no slice in CT mode.
+        return getattr(self.args, 'input_slice', True) and not self._is_ct_mode()
+
+    def _build_slice(self):
+        # Static input relevance slice of the entry function and of its callees, from
+        # their DBA; the slice is left unrestricted if it cannot be computed.
+        functions = self.context['slice-functions']
+        if functions is None or not self._build_slice_dba(functions):
+            with open(self.files.aslice, 'w') as ostr:
+                write_unrestricted_slice(ostr)
+            return
+        dslice = DbaSlice((self.files.sdba,), entries=functions.values())
+        if not dslice.complete:
+            self.debug_stack.append('warning: no branch condition or calls to non disassembled functions; input slice left unrestricted')
+        with open(self.files.aslice, 'w') as ostr:
+            dslice.write(ostr)
+
+    def _build_slice_dba(self, functions):
+        if not self._has_dba_command():
+            return False
+        part = '{}.part'.format(self.files.sdba)
+        with open(self.files.sdba, 'w') as ostr:
+            for fname in sorted(functions):
+                command = self.ruleset.make_dba_command(self.files.binary, part, function=fname)
+                if not command:
+                    return False
+                self.debug_stack.append('run {}'.format(' '.join(command)))
+                try:
+                    ret, to, out, err = execute_command(command, merge_output=False)
+                except FileNotFoundError:
+                    self.debug_stack.append('warning: binsec not found; input slice left unrestricted')
+                    return False
+                if ret != 0 or not os.path.isfile(part):
+                    self.debug_stack.append('warning: dba generation of {} failed; input slice left unrestricted'.format(fname))
+                    return False
+                with open(part) as istr:
+                    ostr.write(istr.read())
+                os.remove(part)
+        return True
 
     def _build_runner(self):
         with open(self.files.runner, 'w') as ostr:
@@ -186,11 +310,20 @@ class CompilationTask:
             self.ruleset.write_abduction_runner(ostr, self.files.bconfig, self.files.rconfig, abduce_memory, self.files.binary,
                                                 self.files.aliterals, self.files.adirectives, self.context['assume-addr'],
                                                 self.args.binsec_timeout, autocontrol=self.args.auto_control_variables,
-                                                ct_mode=self._is_ct_mode(), stack=self.debug_stack)
+                                                ct_mode=self._is_ct_mode(), input_slice=self._input_slice_file(), stack=self.debug_stack)
+        with open(self.files.aproblem, 'w') as ostr:
+            abduce_memory = self.files.rmemory if self.args.auto_control_variables else self.files.bmemory
+            self.ruleset.write_abduction_problem(ostr, self.files.input, self.files.bconfig, self.files.rconfig, abduce_memory, self.files.binary,
+                                                 self.files.aliterals, self.files.adirectives, self.context['assume-addr'],
+                                                 self.args.binsec_timeout, autocontrol=self.args.auto_control_variables,
+                                                 ct_mode=self._is_ct_mode(), input_slice=self._input_slice_file(), stack=self.debug_stack)
         os.chmod(self.files.runner, 0o750)
         os.chmod(self.files.rrunner, 0o750)
         os.chmod(self.files.arunner, 0o750)
 
+    def _input_slice_file(self):
+        return self.files.aslice if self._has_input_slice() else None
+
     def _ct_script_lines(self, asm=None):
         lines = []
         # Optional constant-time / policy directives for new BINSEC scripts.
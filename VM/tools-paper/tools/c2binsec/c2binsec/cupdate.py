@@ -1,5 +1,104 @@
 # ----------------------------------------
-from pycparser import parse_file, c_parser, c_ast
+import os
+import re
+import pickle
+import hashlib
+import tempfile
+import threading
+import pycparser
+from pycparser import parse_file, preprocess_file, c_parser, c_ast
+from .buildcache import tool_version, file_digest, source_dependencies
+# ----------------------------------------
+_parsers = threading.local()
+LINE_MARKER_RE = re.compile(r'^(#\s*(?:line\s+)?\d+\s+")([^"]*)(")', re.MULTILINE)
+# ----------------------------------------
+def get_parser():
+    # Parsers are reused across files: PLY based pycparser versions build their lexer
+    # on construction (their parser tables ship with pycparser, later versions have
+    # no tables at all). CParser is not reentrant, hence one per thread.
+    parser = getattr(_parsers, 'parser', None)
+    if parser is None:
+        parser = c_parser.CParser()
+        _parsers.parser = parser
+    return parser
+# ----------------------------------------
+class ParseCache:
+
+    # Content-addressed cache of preprocessed sources and of their pickled ASTs.
+    # Preprocessed text is keyed by the content of the source and of the headers it
+    # includes (cpp -M) and the cpp version, ASTs by the preprocessed text and the
+    # pycparser version. ASTs are unpickled on each lookup since the detection pass
+    # updates them in place. The source path and its directory are replaced by
+    # placeholders in the keys and in the stored line markers, so that identical
+    # sources and headers of different tasks share their entries.
+
+    Source = '<c2bc-source>'
+    SourceDir = '<c2bc-source-dir>'
+
+    def __init__(self, directory, cpp_path='cpp'):
+        self.directory = directory
+        self.cpp_path = cpp_path
+
+    def _path(self, kind, key):
+        return os.path.join(self.directory, kind, key[:2], key)
+
+    def _read(self, kind, key):
+        try:
+            with open(self._path(kind, key), 'rb') as istr:
+                return istr.read()
+        except OSError:
+            return None
+
+    def _write(self, kind, key, data):
+        target = self._path(kind, key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(target))
+        with os.fdopen(fd, 'wb') as ostr:
+            ostr.write(data)
+        os.replace(tmp, target)
+
+    def _normalize(self, path, filename):
+        if path == filename:
+            return self.Source
+        srcdir = os.path.dirname(os.path.abspath(filename))
+        apath = os.path.abspath(path)
+        if apath.startswith(srcdir + os.sep):
+            return '{}/{}'.format(self.SourceDir, os.path.relpath(apath, srcdir))
+        return path
+
+    def _denormalize(self, path, filename):
+        if path == self.Source:
+            return filename
+        if path.startswith(self.SourceDir + '/'):
+            return os.path.join(os.path.dirname(filename), path[len(self.SourceDir)+1:])
+        return path
+
+    def _markers(self, text, convert, filename):
+        return LINE_MARKER_RE.sub(lambda m: m.group(1) + convert(m.group(2), filename) + m.group(3), text)
+
+    def preprocess(self, filename):
+        digest = hashlib.sha256(tool_version(self.cpp_path).encode())
+        for dep in source_dependencies(filename, self.cpp_path):
+            digest.update('{}\0{}\0'.format(self._normalize(dep, filename), file_digest(dep)).encode())
+        key = digest.hexdigest()
+        data = self._read('cpp', key)
+        if data is not None:
+            return self._markers(data.decode(), self._denormalize, filename)
+        text = preprocess_file(filename, self.cpp_path)
+        self._write('cpp', key, self._markers(text, self._normalize, filename).encode())
+        return text
+
+    def parse(self, text, filename, parser):
+        key = hashlib.sha256('{}\n{}'.format(pycparser.__version__, text).encode()).hexdigest()
+        data = self._read('ast', key)
+        if data is not None:
+            try:
+                return pickle.loads(data)
+            except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+                pass
+        ast = parser.parse(text, filename)
+        self._write('ast', key, pickle.dumps(ast, protocol=pickle.HIGHEST_PROTOCOL))
+        return ast
 # ----------------------------------------
 class UFDDetectGeneric(c_ast.NodeVisitor):
 
@@ -118,8 +217,12 @@ class UFDDetectGeneric(c_ast.NodeVisitor):
         self.generic_visit(node)
         self.in_def = False
 # ----------------------------------------
-def generate_update(filename, rules, stack=[]):
-    ast = parse_file(filename, use_cpp=True)
+def generate_update(filename, rules, stack=[], cache=None):
+    parser = get_parser()
+    if cache is None:
+        ast = parse_file(filename, use_cpp=True, parser=parser)
+    else:
+        ast = cache.parse(cache.preprocess(filename), filename, parser)
     detector = UFDDetectGeneric(rules, stack)
     detector.visit(ast)
     return ast, detector
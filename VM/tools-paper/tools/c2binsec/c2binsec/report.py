@@ -1,5 +1,7 @@
 # ----------------------------------------
 import os.path
+import hashlib
+import sqlite3
 from .core import TaskStatus, TaskException
 # ----------------------------------------
 class ReportTemplates:
@@ -53,6 +55,39 @@ class ReportTemplates:
 \\end{document}
 """
 # ----------------------------------------
+def parse_summary(stream):
+    # Reads the summary lines of a runner log. They are written at the top of the
+    # log (and by the runner script first), so reading stops as soon as they are all
+    # found. Also returns a digest of the summary lines.
+    data = dict()
+    digest = hashlib.sha256()
+    for line in stream:
+        if line.startswith('[binsec:run]') or line.startswith('[robust-binsec:run]'):
+            digest.update(line.encode())
+            ldata = line.replace('[binsec:run]', '').replace('[robust-binsec:run]', '').replace('seconds', '').strip()
+            lpart = [ ld.strip() for ld in ldata.split(' in ') ]
+            data['results'] = lpart[0].split('+')
+            data['time'] = float(lpart[1])
+        if line.startswith('[source]'):
+            digest.update(line.encode())
+            ldata = line.replace('[source]', '').strip()
+            data['directory'] = os.path.dirname(ldata)
+            data['problem'] = os.path.basename(ldata)
+        if line.startswith('[c2bc]'):
+            digest.update(line.encode())
+            ldata = line.replace('[c2bc]', '').replace('expect', '').strip()
+            data['targets'] = ldata.split('+')
+        if len(data) == 5:
+            break
+    return data, digest.hexdigest()
+# ----------------------------------------
+def log_kind(filename):
+    if filename.endswith('.robust-binsec.log'):
+        return 'robust'
+    if filename.endswith('.binsec.log'):
+        return 'binsec'
+    return None
+# ----------------------------------------
 class ReportData:
 
     def __init__(self, filename, stack=[]):
@@ -64,22 +99,91 @@ class ReportData:
         return self.data[k]
 
     def _parse_file(self, filename):
-        data = dict()
         with open(filename) as stream:
-            for line in stream:
-                if line.startswith('[binsec:run]') or line.startswith('[robust-binsec:run]'):
-                    ldata = line.replace('[binsec:run]', '').replace('[robust-binsec:run]', '').replace('seconds', '').strip()
-                    lpart = [ ld.strip() for ld in ldata.split(' in ') ]
-                    data['results'] = lpart[0].split('+')
-                    data['time'] = float(lpart[1])
-                if line.startswith('[source]'):
-                    ldata = line.replace('[source]', '').strip()
-                    data['directory'] = os.path.dirname(ldata)
-                    data['problem'] = os.path.basename(ldata)
-                if line.startswith('[c2bc]'):
-                    ldata = line.replace('[c2bc]', '').replace('expect', '').strip()
-                    data['targets'] = ldata.split('+')
-        return data
+            return parse_summary(stream)[0]
+# ----------------------------------------
+class ReportDatabase:
+
+    # Persistent store of the summary lines of runner logs. A log is only parsed
+    # again when its size or mtime changed, and its entry only rewritten when its
+    # summary changed. Reports are computed with SQL aggregates over the logs
+    # given as inputs (in the temporary inputs table, with their position in the
+    # input list to keep the input order in listings and ties). A log given twice
+    # as input is counted twice, and logs without run summary (interrupted runs)
+    # have NULL results: they are counted in an empty category and left out of the
+    # time series.
+
+    SCHEMA = (
+        'CREATE TABLE IF NOT EXISTS logs (path TEXT PRIMARY KEY, kind TEXT, size INTEGER, mtime REAL, digest TEXT, '
+        'directory TEXT, problem TEXT, targets TEXT, results TEXT, time REAL)',
+        'CREATE INDEX IF NOT EXISTS logs_problem ON logs (kind, directory, problem)',
+    )
+
+    def __init__(self, filename, stack=[]):
+        self.filename = filename
+        self.stack = stack
+        self.conn = sqlite3.connect(filename)
+        with self.conn:
+            for statement in self.SCHEMA:
+                self.conn.execute(statement)
+        self.conn.execute('CREATE TEMP TABLE inputs (position INTEGER PRIMARY KEY, path TEXT)')
+
+    def close(self):
+        self.conn.close()
+
+    def ingest(self, filenames):
+        known = { path : (size, mtime, digest) for path, size, mtime, digest in self.conn.execute('SELECT path, size, mtime, digest FROM logs') }
+        parsed = 0
+        seen = set()
+        with self.conn:
+            self.conn.execute('DELETE FROM inputs')
+            for position, filename in enumerate(filenames):
+                kind = log_kind(filename)
+                if kind is None:
+                    continue
+                path = os.path.abspath(filename)
+                self.conn.execute('INSERT INTO inputs (position, path) VALUES (?, ?)', (position, path))
+                if path in seen:
+                    continue
+                seen.add(path)
+                stat = os.stat(filename)
+                entry = known.get(path)
+                if entry is not None and entry[0] == stat.st_size and entry[1] == stat.st_mtime:
+                    continue
+                with open(filename) as stream:
+                    data, digest = parse_summary(stream)
+                parsed += 1
+                if entry is not None and entry[2] == digest:
+                    self.conn.execute('UPDATE logs SET size = ?, mtime = ? WHERE path = ?', (stat.st_size, stat.st_mtime, path))
+                    continue
+                self.stack.append('load logged result data from {}'.format(filename))
+                self.conn.execute('INSERT OR REPLACE INTO logs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                  (path, kind, stat.st_size, stat.st_mtime, digest, data.get('directory'), data.get('problem'),
+                                   '+'.join(data['targets']) if 'targets' in data else None,
+                                   '+'.join(data['results']) if 'results' in data else None, data.get('time')))
+        self.stack.append('parsed {} of {} logs into {}'.format(parsed, len(filenames), self.filename))
+
+    def _query(self, sql, kind, repo=None, params=()):
+        where = 'l.kind = ?' if repo is None else 'l.kind = ? AND l.directory = ?'
+        args = (kind,) if repo is None else (kind, repo)
+        return self.conn.execute(sql.format(source='logs l JOIN inputs i USING (path)', where=where), args + tuple(params)).fetchall()
+
+    def categories(self, kind, column, repo=None):
+        # counts by value of column, most frequent first (ties in input order)
+        return self._query('SELECT COALESCE(l.{0}, \'\'), COUNT(*) FROM {{source}} WHERE {{where}} '
+                           'GROUP BY COALESCE(l.{0}, \'\') ORDER BY COUNT(*) DESC, MIN(i.position)'.format(column), kind, repo)
+
+    def times(self, kind, repo=None):
+        return self._query('SELECT l.results, l.time FROM {source} WHERE {where} AND l.results IS NOT NULL ORDER BY i.position', kind, repo)
+
+    def repos(self):
+        return [ row[0] for row in self._query('SELECT DISTINCT l.directory FROM {source} WHERE {where} ORDER BY l.directory', 'binsec') ]
+
+    def results(self, repo=None):
+        # binsec results with the robust result of the same problem (last one given as input)
+        return self._query('SELECT l.directory, l.problem, COALESCE(l.results, \'\'), COALESCE((SELECT r.results FROM logs r JOIN inputs ri USING (path) '
+                           'WHERE r.kind = \'robust\' AND r.directory = l.directory AND r.problem = l.problem '
+                           'ORDER BY ri.position DESC LIMIT 1), \'\') FROM {source} WHERE {where} ORDER BY i.position', 'binsec', repo)
 # ----------------------------------------
 class ReportTask:
 
@@ -87,9 +191,12 @@ class ReportTask:
         self.args = args
         self._atpr = False
         self.debug_stack = []
-        self.rdata = [ ReportData(filename, self.debug_stack) for filename in args.input_files if filename.endswith('.binsec.log') ]
-        self.sdata = [ ReportData(filename, self.debug_stack) for filename in args.input_files if filename.endswith('.robust-binsec.log') ]
         self.outfile = args.output_file
+        database = getattr(args, 'database', None)
+        if database is None:
+            database = '{}.db'.format(os.path.splitext(self.outfile)[0])
+        self.db = ReportDatabase(database, self.debug_stack)
+        self.db.ingest(args.input_files)
 
     def __call__(self):
         with open(self.args.output_file, 'w') as stream:
@@ -102,31 +209,22 @@ class ReportTask:
         with open(self.outfile + '.interest.pyl', 'w') as stream:
             stream.write(str(list(self._list_interesting_examples(maxi=True))))
         with open(self.outfile + '.rse.data', 'w') as stream:
-            for sdat in self.sdata:
-                print(sdat)
-                robust = '+'.join(sdat['results'])
+            for robust, rtime in self.db.times('robust'):
                 if 'model' in robust:
-                    stream.write('{}\n'.format(sdat['time']))
+                    stream.write('{}\n'.format(rtime))
+        self.db.close()
 
     def _list_interesting_examples(self, maxi=False, repo=None):
-        interest = set()
-        for dat in self.rdata:
-            if repo is not None and dat['directory'] != repo:
-                continue
-            problem = os.path.join(dat['directory'], dat['problem'])
-            target = '+'.join(dat['targets'])
-            result = '+'.join(dat['results'])
-            robust = ''
-            for sdat in self.sdata:
-                if sdat['directory'] == dat['directory'] and sdat['problem'] == dat['problem']:
-                    robust = '+'.join(sdat['results'])
+        interest = dict()
+        for directory, problem, result, robust in self.db.results(repo):
+            problem = os.path.join(directory, problem)
             if 'model' in result and ((not maxi) or 'unreachable' in robust or 'model' in robust):
-                interest.add(problem)
+                interest[problem] = None
             if not self._atpr and 'model' in robust:
                 print('{}'.format(problem))
         if not self._atpr:
             self._atpr = True
-        return interest
+        return interest.keys()
 
     def _write_interest_frame(self, stream):
         stream.write('\\begin{frame}\n')
@@ -152,12 +250,8 @@ class ReportTask:
         stream.write('\\end{block}\n')
         stream.write('\\end{frame}\n')
 
-    def _write_computation_time_graph(self, stream, data, repo=None):
-        tserie = []
-        for dat in data:
-            if repo is not None and dat['directory'] != repo:
-                continue
-            tserie.append((dat['results'], dat['time']))
+    def _write_computation_time_graph(self, stream, kind, repo=None):
+        tserie = self.db.times(kind, repo)
         def rcolor(r):
             if 'ok' in r:
                 return 'blue'
@@ -175,32 +269,14 @@ class ReportTask:
         stream.write('\\node at (0.75,-0.25) {45s};\n')
         stream.write('\\node at (1,-0.25) {60s};\n')
         for telem, ttime in tserie:
-            tcolor = rcolor(telem)
+            tcolor = rcolor(telem.split('+'))
             stream.write('\\draw [color={0}] ({1},0.05) -- ({1},0.45);\n'.format(tcolor, ttime/60))
         stream.write('\\end{tikzpicture}')
 
     def _write_global_frame(self, stream, repo=None):
-        cat_exp = dict()
-        cat_exe = dict()
-        cat_rob = dict()
-        for dat in self.rdata:
-            if repo is not None and dat['directory'] != repo:
-                continue
-            target = '+'.join(dat['targets'])
-            result = '+'.join(dat['results'])
-            if not target in cat_exp:
-                cat_exp[target] = 0
-            if not result in cat_exe:
-                cat_exe[result] = 0
-            cat_exp[target] += 1
-            cat_exe[result] += 1
-        for dat in self.sdata:
-            if repo is not None and dat['directory'] != repo:
-                continue
-            result = '+'.join(dat['results'])
-            if not result in cat_rob:
-                cat_rob[result] = 0
-            cat_rob[result] += 1
+        cat_exp = self.db.categories('binsec', 'targets', repo)
+        cat_exe = self.db.categories('binsec', 'results', repo)
+        cat_rob = self.db.categories('robust', 'results', repo)
         stream.write('\\begin{frame}\n')
         stream.write('\\tiny\n')
         stream.write('\\frametitle{{{}}}\n'.format(repo if repo is not None else 'Global'))
@@ -211,26 +287,26 @@ class ReportTask:
         stream.write('\\begin{column}{0.5\\textwidth}\n')
         stream.write('\\begin{block}{Expected}\n')
         stream.write('\\begin{itemize}\n')
-        for cat in sorted(cat_exp.keys(), key=lambda k : -cat_exp[k]):
-            stream.write('\\item {} : {}\n'.format(cat, cat_exp[cat]))
+        for cat, count in cat_exp:
+            stream.write('\\item {} : {}\n'.format(cat, count))
         stream.write('\\end{itemize}\n')
         stream.write('\\end{block}\n')
 
         stream.write('\\begin{block}{Got}\n')
         if len(cat_exe) > 0:
             stream.write('\\begin{itemize}\n')
-            for cat in sorted(cat_exe.keys(), key=lambda k : -cat_exe[k]):
+            for cat, count in cat_exe:
                 if 'model' in cat or 'unreachable' in cat:
                     color = 'blue' if 'model' in cat else 'red'
-                    stream.write('\\item \\textbf{{\\color{{{}}}{{{} : {}}}}}\n'.format(color, cat, cat_exe[cat]))
+                    stream.write('\\item \\textbf{{\\color{{{}}}{{{} : {}}}}}\n'.format(color, cat, count))
                 else:
-                    stream.write('\\item {} : {}\n'.format(cat, cat_exe[cat]))
+                    stream.write('\\item {} : {}\n'.format(cat, count))
             stream.write('\\end{itemize}\n')
         stream.write('\\end{block}\n')
 
         if repo is not None:
             stream.write('\\begin{block}{Standard Computation Time}\n')
-            self._write_computation_time_graph(stream, self.rdata, repo)
+            self._write_computation_time_graph(stream, 'binsec', repo)
             stream.write('\\end{block}\n')
 
         stream.write('\\end{column}\n')
@@ -240,18 +316,18 @@ class ReportTask:
         stream.write('\\begin{block}{Robust}\n')
         if len(cat_rob) > 0:
             stream.write('\\begin{itemize}\n')
-            for cat in sorted(cat_rob.keys(), key=lambda k : -cat_rob[k]):
+            for cat, count in cat_rob:
                 if 'model' in cat or 'unreachable' in cat:
                     color = 'blue' if 'model' in cat else 'red'
-                    stream.write('\\item \\textbf{{\\color{{{}}}{{{} : {}}}}}\n'.format(color, cat, cat_rob[cat]))
+                    stream.write('\\item \\textbf{{\\color{{{}}}{{{} : {}}}}}\n'.format(color, cat, count))
                 else:
-                    stream.write('\\item {} : {}\n'.format(cat, cat_rob[cat]))
+                    stream.write('\\item {} : {}\n'.format(cat, count))
             stream.write('\\end{itemize}\n')
         stream.write('\\end{block}\n')
 
         if repo is not None:
             stream.write('\\begin{block}{Robust Computation Time}\n')
-            self._write_computation_time_graph(stream, self.sdata, repo)
+            self._write_computation_time_graph(stream, 'robust', repo)
             stream.write('\\end{block}\n')
 
         stream.write('\\end{column}\n')
@@ -261,9 +337,6 @@ class ReportTask:
         stream.write('\\end{frame}\n')
 
     def _write_repos_frames(self, stream):
-        repos = set()
-        for dat in self.rdata:
-            repos.add(dat['directory'])
-        for repo in sorted(repos):
+        for repo in self.db.repos():
             self._write_global_frame(stream, repo)
 # ----------------------------------------
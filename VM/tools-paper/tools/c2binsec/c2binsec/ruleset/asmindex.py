@@ -0,0 +1,327 @@
+# ----------------------------------------
+import os
+import re
+import pickle
+from ..buildcache import inputs_digest, sources_version
+# ----------------------------------------
+INSTR_RE = re.compile(r'^(?:[0-9a-f]{2}(?:\s+[0-9a-f]{2})*)\s+([a-z.]+)\s*(.*)$')
+REG_RE = re.compile(r'(eax|ebx|ecx|edx|esi|edi|ebp|esp|ax|bx|cx|dx|si|di|bp|sp|al|ah|bl|bh|cl|ch|dl|dh)')
+REG_QUALIFIERS_RE = re.compile(r'\b(?:byte|word|dword|qword|ptr|ds|ss|cs|es|fs|gs)\b')
+TEST_QUALIFIERS_RE = re.compile(r'\b(?:byte|word|dword|qword|ptr)\b')
+ADDR_RE = re.compile(r'0x([0-9a-f]{7,16})')
+RAW_ADDR_RE = re.compile(r'0x[0-9a-fA-F]{7,16}')
+PCT_REG_RE = re.compile(r'%([a-z0-9]+)\b')
+CALL_LABEL_RE = re.compile(r'<([^>]+)>')
+CALL_ADDR_RE = re.compile(r'\b0x[0-9a-fA-F]+\b')
+BRANCH_TARGET_RE = re.compile(r'\b([0-9a-fA-F]{6,16})\b')
+CMP_MNEM_RE = re.compile(r'^(cmp|test|ucomi|comi)\b')
+ATT_IMM_RE = re.compile(r'\$(-?(?:0x[0-9a-fA-F]+|\d+))')
+INTEL_IMM_RE = re.compile(r'(?:,|\s)(-?(?:0x[0-9a-fA-F]+|\d+))\s*$')
+
+BYTE_REGS = { 'al', 'ah', 'bl', 'bh', 'cl', 'ch', 'dl', 'dh' }
+WORD_REGS = { 'eax', 'ebx', 'ecx', 'edx', 'esi', 'edi', 'ebp', 'esp' }
+REG32 = {
+    'al': 'eax', 'ah': 'eax', 'ax': 'eax', 'eax': 'eax',
+    'bl': 'ebx', 'bh': 'ebx', 'bx': 'ebx', 'ebx': 'ebx',
+    'cl': 'ecx', 'ch': 'ecx', 'cx': 'ecx', 'ecx': 'ecx',
+    'dl': 'edx', 'dh': 'edx', 'dx': 'edx', 'edx': 'edx',
+    'si': 'esi', 'esi': 'esi',
+    'di': 'edi', 'edi': 'edi',
+    'bp': 'ebp', 'ebp': 'ebp',
+    'sp': 'esp', 'esp': 'esp',
+}
+# ----------------------------------------
+def decode_instruction(inst):
+    text = ' '.join(inst.lower().replace('\t', ' ').split(';')[0].split())
+    imatch = INSTR_RE.match(text)
+    if imatch:
+        return text, imatch.group(1), imatch.group(2)
+    parts = text.split(None, 1)
+    return text, parts[0] if parts else '', parts[1] if len(parts) > 1 else ''
+# ----------------------------------------
+def _operand_reg(op):
+    token = op.lower().strip().replace('%', '').replace('*', '')
+    token = REG_QUALIFIERS_RE.sub('', token)
+    token = token.replace(':', '').replace('[', '').replace(']', '').strip()
+    return token if REG_RE.fullmatch(token) else None
+# ----------------------------------------
+def _operand_addr(op):
+    match = ADDR_RE.search(op.lower())
+    if not match:
+        return None
+    return '0x{:08x}'.format(int(match.group(1), 16))
+# ----------------------------------------
+def _test_operand(op):
+    op = op.strip().lower().replace('%', '')
+    op = TEST_QUALIFIERS_RE.sub('', op)
+    return ' '.join(op.split())
+# ----------------------------------------
+class FunctionIndex:
+
+    # Facts about the instructions of a function, extracted in a single pass.
+    #   head       : addresses of the first two instructions
+    #   adds       : (address, instruction) of add instructions (c2bc marker candidates)
+    #   text       : instructions joined by newlines (for reference lookups)
+    #   branch     : target of the first conditional jump
+    #   compare    : address of the first cmp instruction
+    #   calls      : call sites, as ('label', name) or ('addr', address)
+    #   memrefs    : referenced data segment addresses, in order of appearance
+    #   widths     : byte/word access width of the addresses compared in branch logic
+    #   immediates : constants compared in the function, in order of appearance
+
+    def __init__(self, instructions):
+        self.head = []
+        self.adds = []
+        self.text = '\n'.join(inst for _, inst in instructions)
+        self.branch = None
+        self.compare = None
+        self.calls = []
+        self.memrefs = []
+        self.widths = {}
+        self.immediates = []
+        reg_sources = {}
+        for loc, inst in instructions:
+            if len(self.head) < 2:
+                self.head.append(loc)
+            if 'add' in inst:
+                self.adds.append((loc, inst))
+            if self.branch is None:
+                self.branch = self._branch_target(inst)
+            if self.compare is None and 'cmp' in inst:
+                self.compare = loc
+            self._memrefs(inst)
+            text, mnem, operands = decode_instruction(inst)
+            ops = [ op.strip() for op in operands.split(',') ] if operands else []
+            if mnem.startswith('call'):
+                self._call(inst)
+            self._widths(text, mnem, ops, reg_sources)
+            if CMP_MNEM_RE.match(mnem):
+                self._immediates(mnem, operands, ops)
+
+    def _branch_target(self, inst):
+        asm_part = inst.split('\t')[-1].strip()
+        parts = asm_part.split()
+        if len(parts) < 2:
+            return None
+        op = parts[0].strip().lower()
+        # Conditional jumps start with j* but exclude plain jmp.
+        if not op.startswith('j') or op == 'jmp':
+            return None
+        # objdump format is usually "... <tab>jne    804991e <...>".
+        match = BRANCH_TARGET_RE.search(asm_part)
+        return int(match.group(1), 16) if match is not None else None
+
+    def _memrefs(self, inst):
+        for match in RAW_ADDR_RE.findall(inst):
+            mh = match.lower()
+            # Keep only likely data-segment addresses (x86 static bins
+            # used in this pipeline place data around 0x080e....).
+            if not (mh.startswith('0x080e') or mh.startswith('0x80e')):
+                continue
+            norm = '0x{:08x}'.format(int(mh, 16))
+            if norm not in self.memrefs:
+                self.memrefs.append(norm)
+
+    def _call(self, inst):
+        mname = CALL_LABEL_RE.search(inst)
+        if mname:
+            self.calls.append(('label', mname.group(1).split('+', 1)[0].strip()))
+            return
+        maddr = CALL_ADDR_RE.search(inst)
+        if maddr:
+            self.calls.append(('addr', int(maddr.group(0), 16)))
+
+    def _hint(self, addr_hex, hint):
+        if self.widths.get(addr_hex) == 'byte' and hint == 'word':
+            return
+        self.widths[addr_hex] = hint
+
+    def _reg_hint(self, reg, reg_sources):
+        reg32 = REG32.get(reg)
+        if reg32 is None:
+            return
+        addr_hex = reg_sources.get(reg32)
+        if addr_hex is None:
+            return
+        if reg in BYTE_REGS:
+            self._hint(addr_hex, 'byte')
+        elif reg in WORD_REGS:
+            self._hint(addr_hex, 'word')
+
+    def _widths(self, text, mnem, ops, reg_sources):
+        # Infer whether a memref is used as byte or word in branch logic.
+        if mnem.startswith('mov') and len(ops) >= 2:
+            src_addr, dst_addr = _operand_addr(ops[0]), _operand_addr(ops[1])
+            src_reg, dst_reg = _operand_reg(ops[0]), _operand_reg(ops[1])
+            # AT&T load: mov 0xADDR,%eax
+            if src_addr is not None and dst_reg is not None:
+                if REG32.get(dst_reg) is not None:
+                    reg_sources[REG32[dst_reg]] = src_addr
+            # Intel load: mov eax,[0xADDR]
+            elif src_reg is not None and dst_addr is not None:
+                if REG32.get(src_reg) is not None:
+                    reg_sources[REG32[src_reg]] = dst_addr
+        if mnem.startswith('cmp') or mnem.startswith('test'):
+            if mnem.startswith('cmpb') or mnem.startswith('testb'):
+                default_hint = 'byte'
+            elif mnem.startswith('cmpl') or mnem.startswith('testl'):
+                default_hint = 'word'
+            else:
+                default_hint = None
+            regs = []
+            for op in ops:
+                op_addr, op_reg = _operand_addr(op), _operand_reg(op)
+                if op_addr is not None and default_hint is not None:
+                    self._hint(op_addr, default_hint)
+                if op_reg is not None:
+                    regs.append(op_reg)
+            for reg in regs:
+                self._reg_hint(reg, reg_sources)
+        # Legacy fallback for odd objdump formats with `%` registers in raw text.
+        for reg in PCT_REG_RE.findall(text):
+            self._reg_hint(reg, reg_sources)
+
+    def _immediates(self, mnem, operands, ops):
+        # Only comparison-like instructions are considered, to avoid
+        # stack/frame immediates (e.g., 0x14, 0x1c) unrelated to policy.
+        # Common compiler lowering for "x == 0" is "test x, x" (no immediate).
+        if mnem.startswith('test') and len(ops) == 2:
+            lhs, rhs = _test_operand(ops[0]), _test_operand(ops[1])
+            if lhs and lhs == rhs and '0x' not in lhs and '(' not in lhs and '[' not in lhs:
+                self.immediates.append('0x0')
+        # Prefer AT&T immediates ($0xNN); also support Intel-like
+        # operand forms ending with ", 0xNN".
+        matches = ATT_IMM_RE.findall(operands)
+        if not matches:
+            mm = INTEL_IMM_RE.search(operands)
+            if mm:
+                matches = [ mm.group(1) ]
+        for match in matches:
+            try:
+                val = int(match, 0)
+            except ValueError:
+                continue
+            if val >= 0:
+                self.immediates.append('0x{:x}'.format(val))
+# ----------------------------------------
+class AsmIndex:
+
+    # Assembly data (attribute accesses are forwarded to the wrapped object) with
+    # memoized per-function facts and binary-wide queries. Function facts are only
+    # extracted for queried functions: static binaries embed the whole libc, most of
+    # which the rules never look at. Facts and queries can be stored next to the
+    # dump they derive from, and are reused while the dump is unchanged.
+
+    def __init__(self, asm, cachefile=None, sources=()):
+        self.asm = asm
+        self.cachefile = cachefile
+        self.key = inputs_digest('asmindex', sources, [ sources_version(__name__) ])
+        self.functions = {}
+        self.queries = {}
+        self.dirty = False
+        if cachefile is not None:
+            self._load()
+
+    def __getattr__(self, name):
+        return getattr(self.asm, name)
+
+    @classmethod
+    def of(cls, asm):
+        return asm if isinstance(asm, cls) else cls(asm)
+
+    def _load(self):
+        try:
+            with open(self.cachefile, 'rb') as istr:
+                key, functions, queries = pickle.load(istr)
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+            return
+        if key == self.key:
+            self.functions, self.queries = functions, queries
+
+    def save(self):
+        if self.cachefile is None or not self.dirty:
+            return
+        tmp = '{}.tmp'.format(self.cachefile)
+        with open(tmp, 'wb') as ostr:
+            pickle.dump((self.key, self.functions, self.queries), ostr, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.cachefile)
+        self.dirty = False
+
+    def function(self, fname):
+        if fname not in self.functions:
+            self.functions[fname] = FunctionIndex(list(self.asm.instructions(fname)))
+            self.dirty = True
+        return self.functions[fname]
+
+    def query(self, key, compute):
+        if key not in self.queries:
+            self.queries[key] = compute()
+            self.dirty = True
+        return self.queries[key]
+
+    def marked_locs(self, fname, marker):
+        return [ loc for loc, inst in self.function(fname).adds if marker in inst ]
+
+    def references(self, fname, needle):
+        return needle in self.function(fname).text
+
+    def entry_function(self):
+        for fname in ('c2bc_main', 'fun', 'main'):
+            if self.asm.has_function(fname):
+                return fname
+        return None
+
+    def text_symbols(self):
+        return self.query('text-symbols', lambda: {
+            self.asm.address_of(label, '.text') : label for label in self.asm.labels(section='.text')
+        } if self.asm.has_section('.text') else {})
+
+    def data_symbol_sizes(self):
+        def compute():
+            sizes = {}
+            for label in self.asm.labels(sections=('.bss', '.data')):
+                try:
+                    addr = self.asm.address_of(label)
+                    size = self.asm.bytesize_of(label)
+                except KeyError:
+                    continue
+                if size > 0 and addr not in sizes:
+                    sizes[addr] = size
+            return sizes
+        return self.query('data-symbol-sizes', compute)
+
+    def literal_sources(self):
+        # The entry and its one-hop direct callees are the sources for constants.
+        # This keeps literals focused on program logic and avoids libc noise.
+        # Only callees named in the dump are followed: calls to plain addresses
+        # have never contributed literals, and resolving them would change the
+        # generated literals and rules.
+        def compute():
+            entry = self.entry_function()
+            if entry is None:
+                return []
+            res = [ entry ]
+            for kind, target in self.function(entry).calls:
+                if kind == 'label' and target not in res and self.asm.has_function(target):
+                    res.append(target)
+            return res
+        return self.query('literal-sources', compute)
+
+    def callees(self, fname, limit=16):
+        # Functions transitively called from fname (included), with their address.
+        # None if a call target is unknown or if there are more than limit functions.
+        def compute():
+            res, todo = {}, [ fname ]
+            while todo:
+                name = todo.pop()
+                if name in res:
+                    continue
+                if name is None or not self.asm.has_function(name) or len(res) >= limit:
+                    return None
+                res[name] = self.asm.address_of(name, '.text')
+                for kind, target in self.function(name).calls:
+                    todo.append(target if kind == 'label' else self.text_symbols().get(target))
+            return res
+        return self.query(('callees', fname, limit), compute)
+# ----------------------------------------
+# ----------------------------------------
@@ -0,0 +1,179 @@
+# ----------------------------------------
+import re
+# ----------------------------------------
+HEADER_RE = re.compile(r'^#\s*--\s*(0x[0-9a-fA-F]+)\b')
+STMT_RE = re.compile(r'^\s*\d+:\s*(.*)$')
+VAR_RE = re.compile(r'(?<![\w.])([A-Za-z_][A-Za-z0-9_]*)<\d+>')
+CONST_RE = re.compile(r'^\(?\s*(0x[0-9a-fA-F]+|\d+)(?:<\d+>)?\s*\)?$')
+CALL_RE = re.compile(r'^goto\s+\((0x[0-9a-fA-F]+),\s*\d+\)\s*#\s*call\b')
+IF_RE = re.compile(r'^if\s+(.+?)\s+goto\b')
+GUARD_RE = re.compile(r'^(?:assert|assume)\s+(.+)$')
+STACK_REGS = { 'esp', 'ebp' }
+# ----------------------------------------
+def _memory_accesses(expr):
+    # (address expression, size) of the @[addr,<-,size] accesses of an expression,
+    # and the expression without them
+    accesses, rest, idx = [], [], 0
+    while True:
+        start = expr.find('@[', idx)
+        if start < 0:
+            rest.append(expr[idx:])
+            return accesses, ''.join(rest)
+        rest.append(expr[idx:start])
+        depth, end = 0, start + 1
+        while end < len(expr):
+            if expr[end] == '[':
+                depth += 1
+            elif expr[end] == ']':
+                depth -= 1
+                if depth == 0:
+                    break
+            end += 1
+        inner = expr[start+2:end]
+        parts = inner.rsplit(',', 2)
+        size = int(parts[-1]) if len(parts) == 3 and parts[-1].strip().isdigit() else 1
+        accesses.append((parts[0].strip(), size))
+        idx = end + 1
+def write_unrestricted_slice(stream):
+    stream.write('# input relevance slice\nregister:*\nmemory:*\n')
+# ----------------------------------------
+class DbaSlice:
+
+    # Flow-insensitive backward slice of DBA programs from their branch and guard
+    # conditions: the registers and memory bytes that can flow into a decision.
+    # Memory is split into constant addresses (precise, by byte), the stack (esp or
+    # ebp based addresses, as a whole) and any other address, which makes the whole
+    # memory relevant. Calls to non disassembled functions make the slice unknown
+    # (function entries default to the first instruction of each DBA file, and must
+    # be disassembled otherwise), as do programs without any condition, for which
+    # the DBA most likely failed to be parsed.
+    #   registers : relevant registers (temporaries and flags included)
+    #   memory    : relevant memory bytes, None if the whole memory is relevant
+    #   complete  : False if the slice is unknown
+
+    def __init__(self, dba_files, entries=()):
+        self.assignments = []
+        self.seeds = []
+        self.entries = set(entries)
+        self.headers = set()
+        self.calls = set()
+        for filename in dba_files:
+            with open(filename, 'r') as dba:
+                self._parse(dba)
+        self.registers = set()
+        self.memory = set()
+        self.stack = False
+        self.anymem = False
+        self.complete = (len(self.seeds) > 0 and self.calls.issubset(self.entries)
+                         and self.entries.issubset(self.headers))
+        if self.complete:
+            self._slice()
+        if self.anymem:
+            self.memory = None
+
+    def _parse(self, stream):
+        statement, first = None, True
+        for line in stream:
+            header = HEADER_RE.match(line)
+            if header:
+                self.headers.add(int(header.group(1), 16))
+                if first:
+                    self.entries.add(int(header.group(1), 16))
+                    first = False
+                continue
+            if line.startswith('#'):
+                continue
+            smatch = STMT_RE.match(line)
+            if smatch:
+                self._statement(statement)
+                statement = smatch.group(1)
+            elif statement is not None and line.strip():
+                statement += ' ' + line.strip()
+        self._statement(statement)
+
+    def _statement(self, statement):
+        if statement is None:
+            return
+        call = CALL_RE.match(statement.strip())
+        if call:
+            self.calls.add(int(call.group(1), 16))
+            return
+        if '#return' in statement.replace(' ', ''):
+            return
+        statement = statement.split('#')[0].strip().rstrip(';').strip()
+        cond = IF_RE.match(statement) or GUARD_RE.match(statement)
+        if cond:
+            self.seeds.append(cond.group(1))
+        elif statement.startswith('goto') and not statement.startswith('goto ('):
+            self.seeds.append(statement[4:])
+        elif ':=' in statement:
+            lhs, rhs = statement.split(':=', 1)
+            self.assignments.append((lhs.strip(), rhs.strip()))
+
+    def _location(self, addr, size):
+        # ('const', bytes), ('stack', None) or ('any', None)
+        cmatch = CONST_RE.match(addr)
+        if cmatch:
+            base = int(cmatch.group(1), 0)
+            return 'const', range(base, base + size)
+        if set(VAR_RE.findall(addr)).issubset(STACK_REGS):
+            return 'stack', None
+        return 'any', None
+
+    def _relevant_location(self, kind, locs):
+        if kind == 'const':
+            return self.anymem or any(loc in self.memory for loc in locs)
+        if kind == 'stack':
+            return self.anymem or self.stack
+        return self.anymem or self.stack or len(self.memory) > 0
+
+    def _add_deps(self, expr):
+        accesses, rest = _memory_accesses(expr)
+        changed = False
+        for var in VAR_RE.findall(rest):
+            if not var in self.registers:
+                self.registers.add(var)
+                changed = True
+        for addr, size in accesses:
+            changed |= self._add_deps(addr)
+            kind, locs = self._location(addr, size)
+            if kind == 'const' and not set(locs).issubset(self.memory):
+                self.memory.update(locs)
+                changed = True
+            elif kind == 'stack' and not self.stack:
+                self.stack = changed = True
+            elif kind == 'any' and not self.anymem:
+                self.anymem = changed = True
+        return changed
+
+    def _slice(self):
+        for seed in self.seeds:
+            self._add_deps(seed)
+        changed = True
+        while changed:
+            changed = False
+            for lhs, rhs in self.assignments:
+                if lhs.startswith('@['):
+                    (addr, size), = _memory_accesses(lhs)[0]
+                    if self._relevant_location(*self._location(addr, size)):
+                        changed |= self._add_deps(rhs)
+                        changed |= self._add_deps(addr)
+                else:
+                    lvar = VAR_RE.match(lhs)
+                    if lvar is not None and lvar.group(1) in self.registers:
+                        changed |= self._add_deps(rhs)
+
+    def write(self, stream):
+        if not self.complete:
+            write_unrestricted_slice(stream)
+            return
+        stream.write('# input relevance slice\n')
+        for reg in sorted(self.registers):
+            stream.write('register:{}\n'.format(reg))
+        if self.memory is None:
+            stream.write('memory:*\n')
+            return
+        for loc in sorted(self.memory):
+            stream.write('memory:0x{:08x}\n'.format(loc))
+# ----------------------------------------
+# ----------------------------------------
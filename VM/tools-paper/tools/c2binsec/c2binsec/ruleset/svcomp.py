@@ -2,6 +2,7 @@
 import os
 import os.path
 import re
+import json
 from pycparser import c_generator
 import yaml
 try:
@@ -9,6 +10,7 @@ try:
 except ImportError:
     from yaml import Loader as ymlLoader
 from .core import GenericRuleSet
+from .asmindex import AsmIndex
 from . import svcomp_templates as templates
 # ----------------------------------------
 class SVCompRSDirectives:
@@ -135,108 +137,66 @@ class SVCompBConfig:
     negative_reach_hook_func = 'c2bc_abort'
 
     def detect_rlocs(self, asm):
+        index = AsmIndex.of(asm)
         res = []
-        if asm.has_function(self.reach_hook_func):
-            for loc, inst in asm.instructions(self.reach_hook_func):
-                if 'add' in inst and '$0x3' in inst:
-                    res.append(loc)
+        if index.has_function(self.reach_hook_func):
+            res = index.marked_locs(self.reach_hook_func, '$0x3')
         if len(res) == 0:
             # Fallback: use reach_error / __VERIFIER_error entry if available.
             for fname in ('reach_error', '__VERIFIER_error'):
-                if asm.has_function(fname):
-                    for loc, _ in asm.instructions(fname):
-                        res.append(loc)
-                        break
-                if res:
+                if index.has_function(fname) and index.function(fname).head:
+                    res = index.function(fname).head[:1]
                     break
         if len(res) == 0:
             raise ValueError('no reach location found')
         return res
 
     def detect_nrlocs(self, asm):
+        index = AsmIndex.of(asm)
         res = []
-        if asm.has_function(self.negative_reach_hook_func):
-            for loc, inst in asm.instructions(self.negative_reach_hook_func):
-                if 'add' in inst and '$0x3' in inst:
-                    res.append(loc)
+        if index.has_function(self.negative_reach_hook_func):
+            res = index.marked_locs(self.negative_reach_hook_func, '$0x3')
         if len(res) == 0:
             raise ValueError('no negative reach location found')
         return res
 
     def detect_clocs(self, asm):
-        res = []
-        main_name = 'c2bc_main' if asm.has_function('c2bc_main') else 'main'
+        index = AsmIndex.of(asm)
+        main_name = 'c2bc_main' if index.has_function('c2bc_main') else 'main'
         # OK cut locations
-        for loc, inst in asm.instructions(main_name):
-            if 'add' in inst and '$0x7' in inst:
-                res.append(loc)
+        res = index.marked_locs(main_name, '$0x7')
         if len(res) == 0 and main_name != 'main':
             # Fallback to original main if c2bc_main has no cut markers.
-            for loc, inst in asm.instructions('main'):
-                if 'add' in inst and '$0x7' in inst:
-                    res.append(loc)
+            res = index.marked_locs('main', '$0x7')
         if len(res) == 0:
             # No cut markers found; proceed without cuts.
             return res
         # Error wrapping cut locations
-        if asm.has_function(self.cut_hook_func):
-            for loc, inst in asm.instructions(self.cut_hook_func):
-                if 'add' in inst and '$0x7' in inst:
-                    res.append(loc)
-            for loc, inst in asm.instructions(self.reach_hook_func):
-                if 'add' in inst and '$0x7' in inst:
-                    res.append(loc)
+        if index.has_function(self.cut_hook_func):
+            res += index.marked_locs(self.cut_hook_func, '$0x7')
+            res += index.marked_locs(self.reach_hook_func, '$0x7')
         return res
 
     def detect_alocs(self, asm):
+        index = AsmIndex.of(asm)
         # Preferred positive goal: explicit success hook when available and
         # actually referenced from executable code.
-        if asm.has_function('reach_success'):
-            succ_loc = None
-            for loc, _ in asm.instructions('reach_success'):
-                succ_loc = loc
-                break
-            if succ_loc is not None:
-                succ_hex = '0x{:x}'.format(succ_loc)
-                succ_tag = '<reach_success>'
-                for fname in ('c2bc_main', 'main', 'fun'):
-                    if not asm.has_function(fname):
-                        continue
-                    for _, inst in asm.instructions(fname):
-                        if succ_hex in inst or succ_tag in inst:
-                            return [succ_loc]
-                # If the hook exists but is not referenced (e.g., inlined safe
-                # branch), fall through to branch-target heuristics below.
+        if index.has_function('reach_success') and index.function('reach_success').head:
+            succ_loc = index.function('reach_success').head[0]
+            succ_hex = '0x{:x}'.format(succ_loc)
+            for fname in ('c2bc_main', 'main', 'fun'):
+                if not index.has_function(fname):
+                    continue
+                if index.references(fname, succ_hex) or index.references(fname, '<reach_success>'):
+                    return [succ_loc]
+            # If the hook exists but is not referenced (e.g., inlined safe
+            # branch), fall through to branch-target heuristics below.
         # Try to use the first conditional jump target in c2bc_main/fun.
         for fname in ('c2bc_main', 'fun', 'main'):
-            if not asm.has_function(fname):
-                continue
-            for _, inst in asm.instructions(fname):
-                asm_part = inst.split('\t')[-1].strip()
-                if not asm_part:
-                    continue
-                parts = asm_part.split()
-                if len(parts) < 2:
-                    continue
-                op = parts[0].strip().lower()
-                # Conditional jumps start with j* but exclude plain jmp.
-                if not op.startswith('j') or op == 'jmp':
-                    continue
-                # objdump format is usually "... <tab>jne    804991e <...>".
-                m = re.search(r'\b([0-9a-fA-F]{6,16})\b', asm_part)
-                if m is None:
-                    continue
-                try:
-                    return [int(m.group(1), 16)]
-                except ValueError:
-                    continue
-        cpt = 0
-        main_name = 'c2bc_main' if asm.has_function('c2bc_main') else 'main'
-        for loc, _ in asm.instructions(main_name):
-            cpt += 1
-            if cpt > 1:
-                return [loc]
-        return []
+            if index.has_function(fname) and index.function(fname).branch is not None:
+                return [index.function(fname).branch]
+        main_name = 'c2bc_main' if index.has_function('c2bc_main') else 'main'
+        return index.function(main_name).head[1:2]
 
     def directives(self, rlocs, clocs, alocs):
         dstr = [ 'reach 0x{:x}'.format(loc) for loc in rlocs ]
@@ -263,6 +223,9 @@ class SVCompBConfig:
                 yield '@[0x{:08x},4]'.format(addr)
 
     def symbolic_memlocs(self, asm, symbols=set()):
+        return iter(AsmIndex.of(asm).query('symbolic-memlocs', lambda: list(self._symbolic_memlocs(asm))))
+
+    def _symbolic_memlocs(self, asm):
         for label in asm.labels(sections=('.data', '.rodata', '.bss')):
             if label.startswith('_stub') and (label.endswith('_data') or label.endswith('_array')):
                 try:
@@ -432,17 +395,31 @@ class SVCompRuleSet(GenericRuleSet):
         stream.write('cat "{}" "{}" > "$tmp_script"\n'.format(config, memory))
         stream.write('exec "${{BINSEC:-binsec}}" -sse -sse-script "$tmp_script" "{}" "$@"\n'.format(binary))
 
-    def write_abduction_runner(self, stream, config, rconfig, memory, binary, literals, directives, asmaddr, timeout, autocontrol=False, ct_mode=False, stack=[]):
+    def make_abduction_arguments(self, config, rconfig, memory, binary, literals, directives, asmaddr, timeout, autocontrol=False, ct_mode=False, input_slice=None):
+        arguments = ['--binsec-config', config, '--binsec-memory', memory, '--binsec-binary', binary, '--binsec-addr', asmaddr,
+                     '--literals', literals, '--binsec-directives', directives, '--binsec-timeout', str(timeout)]
+        if autocontrol:
+            arguments += ['--binsec-robust', '--robust-config', rconfig]
+        if ct_mode:
+            arguments += ['--ct-mode']
+        if input_slice is not None:
+            arguments += ['--input-slice', input_slice]
+        return arguments
+
+    def write_abduction_runner(self, stream, config, rconfig, memory, binary, literals, directives, asmaddr, timeout, autocontrol=False, ct_mode=False, input_slice=None, stack=[]):
         stream.write('#!/usr/bin/env bash\n')
         stream.write('export PYTHONHASHSEED="${PYTHONHASHSEED:-0}"\n')
         stream.write('if [[ "${ABDUCE_PAPER_MODE:-0}" = "1" ]]; then\n')
         stream.write('  set -- --paper-mode "$@"\n')
         stream.write('fi\n')
-        ctarg = '--ct-mode ' if ct_mode else ''
-        if autocontrol:
-            stream.write('exec "${{PYABDUCE:-pyabduce}}" --binsec-config {} --binsec-memory {} --binsec-binary {} --binsec-addr {} --literals {} --binsec-directives {} --binsec-timeout {} --binsec-robust --robust-config {} {}$@\n'.format(config, memory, binary, asmaddr, literals, directives, timeout, rconfig, ctarg))
-        else:
-            stream.write('exec "${{PYABDUCE:-pyabduce}}" --binsec-config {} --binsec-memory {} --binsec-binary {} --binsec-addr {} --literals {} --binsec-directives {} --binsec-timeout {} {}$@\n'.format(config, memory, binary, asmaddr, literals, directives, timeout, ctarg))
+        arguments = self.make_abduction_arguments(config, rconfig, memory, binary, literals, directives, asmaddr, timeout, autocontrol=autocontrol,
+                                                  ct_mode=ct_mode, input_slice=input_slice)
+        stream.write('exec "${{PYABDUCE:-pyabduce}}" {} $@\n'.format(' '.join(arguments)))
+
+    def write_abduction_problem(self, stream, infile, config, rconfig, memory, binary, literals, directives, asmaddr, timeout, autocontrol=False, ct_mode=False, input_slice=None, stack=[]):
+        arguments = self.make_abduction_arguments(config, rconfig, memory, binary, literals, directives, asmaddr, timeout, autocontrol=autocontrol,
+                                                  ct_mode=ct_mode, input_slice=input_slice)
+        json.dump({ 'id': infile, 'args': arguments }, stream, indent=2)
 
     def build_c_prepatch(self, fdata):
         patch = []
@@ -455,7 +432,8 @@ class SVCompRuleSet(GenericRuleSet):
         if prepatch is not None:
             stream.write(prepatch)
             stream.write('\n')
-        for undecl in data.undeclared:
+        # sorted so that generated sources are reproducible (and stay build cache hits)
+        for undecl in sorted(data.undeclared):
             try:
                 stream.write(self.crules.stubs[undecl].declaration)
                 stream.write('\n')
@@ -470,7 +448,7 @@ class SVCompRuleSet(GenericRuleSet):
         stream.write(generator.visit(ast))
 
     def _list_missing_stubs(self, data):
-        for m in data.undefined:
+        for m in sorted(data.undefined):
             yield m
         yield 'c2bc_bss_exhibiter_keystring'
 
@@ -499,19 +477,15 @@ class SVCompRuleSet(GenericRuleSet):
                                 return parts[2]
             except OSError:
                 pass
+        index = AsmIndex.of(asm)
         # Fallback 1: first cmp in fun/c2bc_main from disassembly.
         for fname in ('fun', 'c2bc_main', 'main'):
-            if not asm.has_function(fname):
-                continue
-            for loc, inst in asm.instructions(fname):
-                if 'cmp' in inst:
-                    return '0x{:x}'.format(loc)
+            if index.has_function(fname) and index.function(fname).compare is not None:
+                return '0x{:x}'.format(index.function(fname).compare)
         # Fallback 2: function entry before branch execution.
         for fname in ('fun', 'c2bc_main', 'main'):
-            if not asm.has_function(fname):
-                continue
-            for loc, _ in asm.instructions(fname):
-                return '0x{:x}'.format(loc)
+            if index.has_function(fname) and index.function(fname).head:
+                return '0x{:x}'.format(index.function(fname).head[0])
         # Final fallback: positive reach location.
         alocs = self.brules.detect_alocs(asm)
         return '0x{:x}'.format(alocs[0])
@@ -644,211 +618,15 @@ class SVCompRuleSet(GenericRuleSet):
             stream.write(directive)
             stream.write('\n')
 
-    def _entry_function_name(self, asm):
-        for fname in ('c2bc_main', 'fun', 'main'):
-            if asm.has_function(fname):
-                return fname
-        return None
-
-    def _literal_source_functions(self, asm):
-        # Use the entry and one-hop direct callees as sources for constants.
-        # This keeps literals focused on program logic and avoids libc noise.
-        entry = self._entry_function_name(asm)
-        if entry is None:
-            return []
-
-        res = [entry]
-        seen = set(res)
-        addr_to_name = {}
-
-        try:
-            for lbl in asm.labels(sections=('.text',)):
-                try:
-                    addr_to_name[int(asm.address_of(lbl), 16)] = lbl
-                except Exception:
-                    continue
-        except Exception:
-            pass
-
-        instr_re = re.compile(r'^(?:[0-9a-f]{2}(?:\s+[0-9a-f]{2})*)\s+([a-z.]+)\s*(.*)$')
-
-        try:
-            for _, inst in asm.instructions(entry):
-                text = ' '.join(inst.lower().replace('\t', ' ').split(';')[0].split())
-                imatch = instr_re.match(text)
-                if imatch:
-                    mnem = imatch.group(1)
-                else:
-                    mnem = text.split(None, 1)[0] if text else ''
-                if not mnem.startswith('call'):
-                    continue
-
-                mname = re.search(r'<([^>]+)>', inst)
-                if mname:
-                    raw = mname.group(1).split('+', 1)[0].strip()
-                    if raw not in seen and asm.has_function(raw):
-                        seen.add(raw)
-                        res.append(raw)
-                    continue
-
-                maddr = re.search(r'\b0x[0-9a-fA-F]+\b', inst)
-                if not maddr:
-                    continue
-                try:
-                    tgt = int(maddr.group(0), 16)
-                except ValueError:
-                    continue
-                tname = addr_to_name.get(tgt)
-                if tname and tname not in seen and asm.has_function(tname):
-                    seen.add(tname)
-                    res.append(tname)
-        except Exception:
-            pass
-
-        return res
-
-    def _data_symbol_sizes(self, asm):
-        sizes = {}
-        for label in asm.labels(sections=('.bss', '.data')):
-            try:
-                addr = asm.address_of(label)
-                size = asm.bytesize_of(label)
-            except KeyError:
-                continue
-            if size > 0 and addr not in sizes:
-                sizes[addr] = size
-        return sizes
-
-    def _reg_to_32(self, reg):
-        r = reg.lower()
-        alias = {
-            'al': 'eax', 'ah': 'eax', 'ax': 'eax', 'eax': 'eax',
-            'bl': 'ebx', 'bh': 'ebx', 'bx': 'ebx', 'ebx': 'ebx',
-            'cl': 'ecx', 'ch': 'ecx', 'cx': 'ecx', 'ecx': 'ecx',
-            'dl': 'edx', 'dh': 'edx', 'dx': 'edx', 'edx': 'edx',
-            'si': 'esi', 'esi': 'esi',
-            'di': 'edi', 'edi': 'edi',
-            'bp': 'ebp', 'ebp': 'ebp',
-            'sp': 'esp', 'esp': 'esp',
-        }
-        return alias.get(r)
-
-    def _infer_entry_memref_widths(self, asm):
-        # Infer whether an entry memref is used as byte or word in branch logic.
-        fname = self._entry_function_name(asm)
-        if fname is None:
-            return {}
-        hints = {}
-        reg_sources = {}
-        byte_regs = {'al', 'ah', 'bl', 'bh', 'cl', 'ch', 'dl', 'dh'}
-        word_regs = {'eax', 'ebx', 'ecx', 'edx', 'esi', 'edi', 'ebp', 'esp'}
-        instr_re = re.compile(r'^(?:[0-9a-f]{2}(?:\s+[0-9a-f]{2})*)\s+([a-z.]+)\s*(.*)$')
-
-        def _set_hint(addr_hex, hint):
-            prev = hints.get(addr_hex)
-            if prev == 'byte' and hint == 'word':
-                return
-            hints[addr_hex] = hint
-
-        def _extract_reg(op):
-            token = op.lower().strip().replace('%', '').replace('*', '')
-            token = re.sub(r'\b(?:byte|word|dword|qword|ptr|ds|ss|cs|es|fs|gs)\b', '', token)
-            token = token.replace(':', '').replace('[', '').replace(']', '').strip()
-            if re.fullmatch(r'(eax|ebx|ecx|edx|esi|edi|ebp|esp|ax|bx|cx|dx|si|di|bp|sp|al|ah|bl|bh|cl|ch|dl|dh)', token):
-                return token
-            return None
-
-        def _extract_addr(op):
-            match = re.search(r'0x([0-9a-f]{7,16})', op.lower())
-            if not match:
-                return None
-            return '0x{:08x}'.format(int(match.group(1), 16))
-
-        for _, inst in asm.instructions(fname):
-            text = ' '.join(inst.lower().replace('\t', ' ').split(';')[0].split())
-            imatch = instr_re.match(text)
-            if imatch:
-                mnem = imatch.group(1)
-                operands = imatch.group(2)
-            else:
-                parts = text.split(None, 1)
-                mnem = parts[0] if parts else ''
-                operands = parts[1] if len(parts) > 1 else ''
-            ops = [op.strip() for op in operands.split(',')] if operands else []
-
-            if mnem.startswith('mov') and len(ops) >= 2:
-                src = ops[0]
-                dst = ops[1]
-                src_addr = _extract_addr(src)
-                dst_addr = _extract_addr(dst)
-                src_reg = _extract_reg(src)
-                dst_reg = _extract_reg(dst)
-                # AT&T load: mov 0xADDR,%eax
-                if src_addr is not None and dst_reg is not None:
-                    reg32 = self._reg_to_32(dst_reg)
-                    if reg32 is not None:
-                        reg_sources[reg32] = src_addr
-                # Intel load: mov eax,[0xADDR]
-                elif src_reg is not None and dst_addr is not None:
-                    reg32 = self._reg_to_32(src_reg)
-                    if reg32 is not None:
-                        reg_sources[reg32] = dst_addr
-
-            if mnem.startswith('cmp') or mnem.startswith('test'):
-                if mnem.startswith('cmpb') or mnem.startswith('testb'):
-                    default_hint = 'byte'
-                elif mnem.startswith('cmpl') or mnem.startswith('testl'):
-                    default_hint = 'word'
-                else:
-                    default_hint = None
-
-                regs = []
-                addrs = []
-                for op in ops:
-                    op_addr = _extract_addr(op)
-                    op_reg = _extract_reg(op)
-                    if op_addr is not None:
-                        addrs.append(op_addr)
-                    if op_reg is not None:
-                        regs.append(op_reg)
-
-                for addr_hex in addrs:
-                    if default_hint is not None:
-                        _set_hint(addr_hex, default_hint)
-
-                for reg in regs:
-                    reg32 = self._reg_to_32(reg)
-                    if reg32 is None:
-                        continue
-                    addr_hex = reg_sources.get(reg32)
-                    if addr_hex is None:
-                        continue
-                    if reg in byte_regs:
-                        _set_hint(addr_hex, 'byte')
-                    elif reg in word_regs:
-                        _set_hint(addr_hex, 'word')
-
-            # Legacy fallback for odd objdump formats with `%` registers in raw text.
-            for reg in re.findall(r'%([a-z0-9]+)\b', text):
-                reg32 = self._reg_to_32(reg)
-                if reg32 is not None:
-                    addr_hex = reg_sources.get(reg32)
-                    if addr_hex is None:
-                        continue
-                    if reg in byte_regs:
-                        _set_hint(addr_hex, 'byte')
-                    elif reg in word_regs:
-                        _set_hint(addr_hex, 'word')
-
-        return hints
-
     def write_abduct_literals(self, stream, asm, controlled, dba_file=None):
         # Emit a non-empty literal grammar even when no controlled vars exist.
+        index = AsmIndex.of(asm)
         emitted = set()
         consts_emitted = set()
         max_vars = 12
-        width_hints = self._infer_entry_memref_widths(asm)
-        symbol_sizes = self._data_symbol_sizes(asm)
+        entry = index.entry_function()
+        width_hints = index.function(entry).widths if entry is not None else {}
+        symbol_sizes = index.data_symbol_sizes()
 
         def _add_var(name):
             if len(emitted) >= max_vars:
@@ -926,85 +704,19 @@ class SVCompRuleSet(GenericRuleSet):
                 _add_const(cval)
 
         def _add_consts_from_entry_immediates():
-            # Extract numeric immediates from relevant program functions so
-            # constants come from this binary, not hardcoded seeds.
-            fnames = self._literal_source_functions(asm)
-            if not fnames:
-                return
-            instr_re = re.compile(r'^(?:[0-9a-f]{2}(?:\s+[0-9a-f]{2})*)\s+([a-z.]+)\s*(.*)$')
-
-            def _norm_test_operand(op):
-                op = op.strip().lower().replace('%', '')
-                op = re.sub(r'\b(?:byte|word|dword|qword|ptr)\b', '', op)
-                return ' '.join(op.split())
-
-            for fname in fnames:
-                try:
-                    insns = asm.instructions(fname)
-                except Exception:
-                    continue
-                for _, inst in insns:
-                    text = ' '.join(inst.lower().replace('\t', ' ').split(';')[0].split())
-                    imatch = instr_re.match(text)
-                    if imatch:
-                        mnem = imatch.group(1)
-                        operands = imatch.group(2)
-                    else:
-                        parts = text.split(None, 1)
-                        mnem = parts[0] if parts else ''
-                        operands = parts[1] if len(parts) > 1 else ''
-                    # Keep only comparison-like instructions to avoid
-                    # stack/frame immediates (e.g., 0x14, 0x1c) unrelated to policy.
-                    if not re.match(r'^(cmp|test|ucomi|comi)\b', mnem):
-                        continue
-                    # Common compiler lowering for "x == 0" is "test x, x"
-                    # (no immediate), so add 0 explicitly for this pattern.
-                    ops = [o.strip() for o in operands.split(',')] if operands else []
-                    if mnem.startswith('test') and len(ops) == 2:
-                        lhs = _norm_test_operand(ops[0])
-                        rhs = _norm_test_operand(ops[1])
-                        if lhs and lhs == rhs and '0x' not in lhs and '(' not in lhs and '[' not in lhs:
-                            _add_const('0x0')
-                    # Prefer AT&T immediates ($0xNN); also support Intel-like
-                    # operand forms ending with ", 0xNN".
-                    matches = re.findall(r'\$(-?(?:0x[0-9a-fA-F]+|\d+))', operands)
-                    if not matches:
-                        mm = re.search(r'(?:,|\s)(-?(?:0x[0-9a-fA-F]+|\d+))\s*$', operands)
-                        if mm:
-                            matches = [mm.group(1)]
-                    for m in matches:
-                        try:
-                            val = int(m, 0)
-                        except ValueError:
-                            continue
-                        if val < 0:
-                            continue
-                        _add_const('0x{:x}'.format(val))
+            # Constants compared in the relevant program functions, so that
+            # they come from this binary rather than from hardcoded seeds.
+            for fname in index.literal_sources():
+                for value in index.function(fname).immediates:
+                    _add_const(value)
 
         def _add_from_entry_memrefs():
             # Recover data addresses directly referenced by entry code
             # (typically c2bc_main) to capture true decision variables such as
             # user globals, even when auto-controlled vars only expose stubs.
-            fname = self._entry_function_name(asm)
-            if fname is None:
+            if entry is None:
                 return
-            seen = set()
-            ordered = []
-            for _, inst in asm.instructions(fname):
-                for m in re.findall(r'0x[0-9a-fA-F]{7,16}', inst):
-                    mh = m.lower()
-                    # Keep only likely data-segment addresses (x86 static bins
-                    # used in this pipeline place data around 0x080e....).
-                    if not (mh.startswith('0x080e') or mh.startswith('0x80e')):
-                        continue
-                    try:
-                        norm = '0x{:08x}'.format(int(mh, 16))
-                    except ValueError:
-                        continue
-                    if norm in seen:
-                        continue
-                    seen.add(norm)
-                    ordered.append(norm)
+            ordered = index.function(entry).memrefs
 
             # If branch-width inference succeeded, keep only addresses that
             # actually influence compare/test conditions.
@@ -1,11 +1,35 @@
 # ----------------------------------------
 import sys
 import os
-import io
+import re
+import json
 import time
+import shutil
+import threading
+from collections import deque
 from .core import TaskStatus, TaskException
 from .utils import clog_reasons
-from pulseutils.system import execute_command
+from pulseutils.system import stream_command
+from pulseutils.batch import BatchServerPool
+# ----------------------------------------
+class LogClassifier:
+
+    # Streaming detection of risk keys in log lines. A single precompiled
+    # alternation rejects the (vast majority of) lines containing no key; keys
+    # are only tested one by one on matching lines, so that overlapping keys
+    # are all detected as with independent substring tests.
+
+    def __init__(self, risks):
+        self.risks = risks
+        self.pattern = re.compile('|'.join(re.escape(risk) for risk in sorted(risks, key=len, reverse=True)))
+        self.found = set()
+        self.count = len(set(risks.values()))
+
+    def feed(self, line):
+        if len(self.found) < self.count and self.pattern.search(line):
+            for risk, riskline in self.risks.items():
+                if risk in line:
+                    self.found.add(riskline)
 # ----------------------------------------
 # ----------------------------------------
 class RunnerFiles:
@@ -19,6 +43,9 @@ class RunnerFiles:
         corename = os.path.basename(os.path.splitext(filename)[0])
         self.runner = os.path.join(self.outdir, '{}.{}run.bash'.format(corename, prefix))
         self.blog   = os.path.join(self.outdir, '{}.{}binsec.log'.format(corename, prefix))
+        self.bout   = os.path.join(self.outdir, '{}.{}binsec.stdout.part'.format(corename, prefix))
+        self.berr   = os.path.join(self.outdir, '{}.{}binsec.stderr.part'.format(corename, prefix))
+        self.problem = os.path.join(self.outdir, '{}.{}problem.json'.format(corename, prefix))
 # ----------------------------------------
 class BinsecTask:
 
@@ -34,6 +61,9 @@ class BinsecTask:
         'Goal unreachable' : 'unreachable',
     }
 
+    # number of trailing log lines kept in memory for failure reports
+    log_tail = 200
+
     def __init__(self, ifile, args, runner_prefix=''):
         self.files = RunnerFiles(ifile, args.output_dir, prefix=runner_prefix)
         self.args = args
@@ -44,26 +74,45 @@ class BinsecTask:
     def _generate_command(self):
         return [ self.files.runner ]
 
+    def _run_command(self, command, classifier):
+        # outputs are classified and spooled to disk as they are produced
+        tail = deque(maxlen=self.log_tail)
+        with open(self.files.bout, 'w') as ostr, open(self.files.berr, 'w') as estr:
+            def handler(stream):
+                def handle(line):
+                    classifier.feed(line)
+                    tail.append(line)
+                    stream.write(line)
+                return handle
+            ret, to = stream_command(command, handler(ostr), handler(estr), timeout=self.args.runner_timeout)
+        return ret, to, ''.join(tail)
+
+    def _write_log(self, reasons):
+        with open(self.files.blog, 'w') as ostr:
+            ostr.write('[source] {}\n'.format(self.files.input))
+            ostr.write(reasons)
+            ostr.write('\n')
+            for part in (self.files.bout, self.files.berr):
+                with open(part) as istr:
+                    shutil.copyfileobj(istr, ostr)
+                os.remove(part)
+
     def __call__(self):
         try:
             self.status = TaskStatus.Running
             command = self._generate_command()
             self.debug_stack.append('run {}'.format(' '.join(command)))
+            classifier = LogClassifier(self.risks)
             t_start = time.time()
-            ret, to, out, err = execute_command(command, timeout=self.args.runner_timeout, merge_output=False)
+            ret, to, tail = self._run_command(command, classifier)
             t_stop = time.time()
             exectime = t_stop - t_start
             self.debug_stack.append('executed in {} s'.format(exectime))
-            reasons = self._find_reasons(ret, to, out, err, exectime)
+            reasons = self._find_reasons(ret, to, classifier.found, exectime)
             clog_reasons(sys.stdout, reasons)
-            with open(self.files.blog, 'w') as ostr:
-                ostr.write('[source] {}\n'.format(self.files.input))
-                ostr.write(reasons)
-                ostr.write('\n')
-                ostr.write(out)
-                ostr.write(err)
+            self._write_log(reasons)
             if ret != 0 and not to:
-                raise TaskException(reasons, out+err)
+                raise TaskException(reasons, tail)
             self.status = TaskStatus.Complete
         except TaskException as e:
             self.status = TaskStatus.Failure
@@ -73,28 +122,34 @@ class BinsecTask:
             self.status = TaskStatus.HardFailure
             self.debug_stack.append(e)
 
-    def _reasons_set(self, ret, to, out, err, etime):
-        reasons = set()
+    def _reasons_set(self, ret, to, risks, etime):
+        reasons = set(risks)
         if ret != 0:
             reasons.add('nzr')
         if to:
             reasons.add('timeout')
-        for logstr in out, err:
-            with io.StringIO(logstr) as stream:
-                for line in stream:
-                    for risk, riskline in self.risks.items():
-                        if risk in line:
-                            reasons.add(riskline)
         if not reasons or reasons == { 'model' }:
             reasons.add('ok')
         return reasons
 
-    def _find_reasons(self, ret, to, out, err, etime):
-        reasons = self._reasons_set(ret, to, out, err, etime)
+    def _find_reasons(self, ret, to, risks, etime):
+        reasons = self._reasons_set(ret, to, risks, etime)
         ldata = list(reasons)
         ldata.sort()
         return '[{}binsec:run] {} in {} seconds'.format(self.runner_prefix, '+'.join(ldata), etime)
 # ----------------------------------------
+ABDUCE_SERVERS = None
+ABDUCE_SERVERS_LOCK = threading.Lock()
+def abduce_servers():
+    # warm `pyabduce --serve` processes, one per runner thread
+    global ABDUCE_SERVERS
+    with ABDUCE_SERVERS_LOCK:
+        if ABDUCE_SERVERS is None:
+            env = dict(os.environ)
+            env.setdefault('PYTHONHASHSEED', '0')
+            ABDUCE_SERVERS = BatchServerPool([ os.environ.get('PYABDUCE', 'pyabduce'), '--serve' ], env=env)
+        return ABDUCE_SERVERS
+# ----------------------------------------
 class AbduceTask(BinsecTask):
 
     risks = {
@@ -110,8 +165,35 @@ class AbduceTask(BinsecTask):
     def _generate_command(self):
         return [ self.files.runner ] + self.args.forward_to_runner
 
-    def _reasons_set(self, ret, to, out, err, etime):
-        reasons = super()._reasons_set(ret, to, out, err, etime)
+    def _run_command(self, command, classifier):
+        if not getattr(self.args, 'abduce_server', False):
+            return super()._run_command(command, classifier)
+        # same problem as the runner script, solved by a warm server writing the log to the spool file
+        with open(self.files.problem) as istr:
+            problem = json.load(istr)
+        if os.environ.get('ABDUCE_PAPER_MODE', '0') == '1':
+            problem['args'].append('--paper-mode')
+        problem['args'] += self.args.forward_to_runner
+        problem['log'] = self.files.bout
+        problem['timeout'] = self.args.runner_timeout
+        result = abduce_servers().solve(problem, timeout=self.args.runner_timeout)
+        self.debug_stack.append('abduce server: {} in {} s'.format(result['status'], result.get('time')))
+        tail = deque(maxlen=self.log_tail)
+        # the log is missing when the server could not even load the problem
+        open(self.files.bout, 'a').close()
+        with open(self.files.berr, 'w') as estr:
+            if 'error' in result:
+                estr.write('{}\n'.format(result['error']))
+        for part in (self.files.bout, self.files.berr):
+            with open(part) as istr:
+                for line in istr:
+                    classifier.feed(line)
+                    tail.append(line)
+        ret = result['returncode'] if result['returncode'] is not None else -9
+        return ret, result['status'] == 'timeout', ''.join(tail)
+
+    def _reasons_set(self, ret, to, risks, etime):
+        reasons = super()._reasons_set(ret, to, risks, etime)
         if 'solution(s)' in reasons or 'solution(c)' in reasons:
             reasons.add('ok')
         return reasons
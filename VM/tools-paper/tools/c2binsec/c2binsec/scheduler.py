@@ -0,0 +1,160 @@
+# ----------------------------------------
+import time
+import threading
+from .core import TaskStatus, TaskException
+from .compilation import CompilationTask
+from .runners import BinsecTask, AbduceTask
+# ----------------------------------------
+STAGES = ('compile', 'binsec', 'robust', 'abduce')
+# ----------------------------------------
+def task_stage(task):
+    if isinstance(task, CompilationTask):
+        return 'compile'
+    if isinstance(task, AbduceTask):
+        return 'abduce'
+    if isinstance(task, BinsecTask):
+        return 'robust' if task.runner_prefix.startswith('robust') else 'binsec'
+    raise ValueError('unsupported task type: {}'.format(type(task).__name__))
+# ----------------------------------------
+class TaskNode:
+
+    def __init__(self, task):
+        self.task = task
+        self.stage = task_stage(task)
+        self.rank = STAGES.index(self.stage)
+        self.dependents = []
+        self.waiting = 0
+        self.elapsed = 0
+        self.cause = None
+
+    @property
+    def skipped(self):
+        return self.cause is not None
+
+    @property
+    def failed(self):
+        return self.task.status in (TaskStatus.Failure, TaskStatus.HardFailure)
+# ----------------------------------------
+class TaskGraph:
+
+    # Per input file, tasks are chained in stage order (compile -> binsec -> robust -> abduce).
+    # Only a compilation failure blocks the following stages of its file: runner
+    # failures are analysis results, as in sequential runs.
+
+    def __init__(self, tasks):
+        self.nodes = [ TaskNode(task) for task in tasks ]
+        chains = dict()
+        for node in self.nodes:
+            chains.setdefault(node.task.files.input, []).append(node)
+        for chain in chains.values():
+            chain.sort(key=lambda n: n.rank)
+            for prev, node in zip(chain, chain[1:]):
+                prev.dependents.append(node)
+                node.waiting += 1
+
+    def roots(self):
+        return [ node for node in self.nodes if node.waiting == 0 ]
+# ----------------------------------------
+class GraphExecutor:
+
+    # Runs a task graph with a pool of threads pulling from a shared ready list.
+    # Tasks mostly wait on child processes (compilers, binsec, pyabduce), so
+    # threads are enough to keep the machine busy. Ready tasks of later stages
+    # are picked first, so that file pipelines complete (and get reported) early.
+    # Completion callbacks run outside of the scheduling lock, one at a time.
+
+    def __init__(self, graph, jobs, limits=None, on_done=None, stop_on_failure=False):
+        self.graph = graph
+        self.jobs = max(1, jobs)
+        self.limits = limits if limits is not None else {}
+        self.on_done = on_done
+        self.stop_on_failure = stop_on_failure
+        self.cond = threading.Condition()
+        self.report_lock = threading.Lock()
+        self.ready = []
+        self.running = { stage : 0 for stage in STAGES }
+        self.remaining = len(graph.nodes)
+        self.failure = None
+
+    def _has_capacity(self, stage):
+        limit = self.limits.get(stage)
+        return limit is None or self.running[stage] < limit
+
+    def _next(self):
+        with self.cond:
+            while True:
+                if self.remaining == 0 or (self.failure is not None and sum(self.running.values()) == 0):
+                    return None
+                if self.failure is None:
+                    for index, node in enumerate(self.ready):
+                        if self._has_capacity(node.stage):
+                            self.running[node.stage] += 1
+                            return self.ready.pop(index)
+                self.cond.wait()
+
+    def _push(self, node):
+        self.ready.append(node)
+        self.ready.sort(key=lambda n: -n.rank)
+
+    def _skip(self, node, cause, finished):
+        node.task.status = TaskStatus.Failure
+        node.cause = cause
+        node.task.debug_stack.append(TaskException('skipped: {} failed for {}'.format(cause.stage, cause.task.files.input), ''))
+        self._done(node, finished)
+
+    def _done(self, node, finished):
+        # nodes done (the node and its skipped dependents) are collected in finished
+        self.remaining -= 1
+        finished.append(node)
+        if node.failed and self.stop_on_failure and self.failure is None:
+            self.failure = node
+        for dependent in node.dependents:
+            if node.skipped:
+                self._skip(dependent, node.cause, finished)
+                continue
+            if node.failed and node.stage == 'compile':
+                self._skip(dependent, node, finished)
+                continue
+            dependent.waiting -= 1
+            if dependent.waiting == 0:
+                self._push(dependent)
+
+    def _run_task(self, node):
+        t_start = time.time()
+        try:
+            node.task()
+        except Exception as e:
+            # tasks report their own failures, this one escaped: it is a hard failure
+            node.task.status = TaskStatus.HardFailure
+            node.task.debug_stack.append(e)
+        finally:
+            node.elapsed = time.time() - t_start
+            finished = []
+            with self.cond:
+                self.running[node.stage] -= 1
+                self._done(node, finished)
+                self.cond.notify_all()
+            if self.on_done is not None:
+                with self.report_lock:
+                    for done in finished:
+                        self.on_done(done)
+
+    def _worker(self):
+        while True:
+            node = self._next()
+            if node is None:
+                return
+            self._run_task(node)
+
+    def run(self):
+        for node in self.graph.roots():
+            self._push(node)
+        workers = [ threading.Thread(target=self._worker, daemon=True) for _ in range(min(self.jobs, max(1, len(self.graph.nodes)))) ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        if self.failure is not None:
+            raise self.failure.task.debug_stack[-1]
+# ----------------------------------------
+# ----------------------------------------
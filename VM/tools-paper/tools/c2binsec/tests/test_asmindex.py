@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+
+from pulseutils.assembly import x86AsmData
+from c2binsec.ruleset.asmindex import AsmIndex
+
+
+Dump = '''
+Disassembly of section .text:
+
+080498b0 <helper>:
+ 80498b0:	0f b6 05 40 3f 0e 08 	movzbl 0x80e3f40,%eax
+ 80498b7:	3c 07                	cmp    $0x7,%al
+ 80498b9:	c3                   	ret
+
+080498c0 <other>:
+ 80498c0:	83 3d 44 3f 0e 08 02 	cmpl   $0x2,0x80e3f44
+ 80498c7:	c3                   	ret
+
+080498e6 <c2bc_main>:
+ 80498e6:	55                   	push   %ebp
+ 80498e7:	a1 54 3f 0e 08       	mov    0x80e3f54,%eax
+ 80498ec:	83 f8 03             	cmp    $0x3,%eax
+ 80498ef:	75 0a                	jne    80498fb <c2bc_main+0x15>
+ 80498f1:	e8 ba ff ff ff       	call   80498b0 <helper>
+ 80498f6:	e8 c5 ff ff ff       	call   0x80498c0
+ 80498fb:	5d                   	pop    %ebp
+ 80498fc:	c3                   	ret
+'''
+
+
+class TestAsmIndex(unittest.TestCase):
+    def setUp(self):
+        self.asm = x86AsmData('test.bin', Dump)
+
+    def test_function_facts(self):
+        facts = AsmIndex(self.asm).function('c2bc_main')
+        self.assertEqual(facts.head, [0x080498e6, 0x080498e7])
+        self.assertEqual(facts.calls, [('label', 'helper'), ('addr', 0x080498c0)])
+        self.assertEqual(facts.memrefs, ['0x080e3f54'])
+        self.assertEqual(facts.immediates, ['0x3'])
+        self.assertEqual(facts.branch, 0x080498fb)
+        self.assertEqual(facts.compare, 0x080498ec)
+        self.assertEqual(AsmIndex(self.asm).function('helper').widths, { '0x080e3f40': 'byte' })
+
+    def test_text_symbols_map_addresses_to_labels(self):
+        self.assertEqual(AsmIndex(self.asm).text_symbols(),
+                         { 0x080498b0: 'helper', 0x080498c0: 'other', 0x080498e6: 'c2bc_main' })
+
+    def test_literal_sources_only_follow_named_callees(self):
+        # calls to plain addresses never were literal sources
+        self.assertEqual(AsmIndex(self.asm).literal_sources(), ['c2bc_main', 'helper'])
+
+    def test_callees_resolve_plain_addresses(self):
+        index = AsmIndex(self.asm)
+        self.assertEqual(index.callees('c2bc_main'), { 'c2bc_main': 0x080498e6, 'helper': 0x080498b0, 'other': 0x080498c0 })
+        self.assertIsNone(index.callees('c2bc_main', limit=2))
+
+    def test_facts_are_reused_from_the_cache_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = os.path.join(tmpdir, 'test.bin.s')
+            with open(source, 'w') as stream:
+                stream.write(Dump)
+            cachefile = os.path.join(tmpdir, 'test.bin.s.idx')
+            index = AsmIndex(self.asm, cachefile=cachefile, sources=(source,))
+            sources = index.literal_sources()
+            index.save()
+            cached = AsmIndex(None, cachefile=cachefile, sources=(source,))
+            self.assertEqual(cached.literal_sources(), sources)
+            self.assertIn('c2bc_main', cached.functions)
+            with open(source, 'a') as stream:
+                stream.write('\n')
+            self.assertEqual(AsmIndex(self.asm, cachefile=cachefile, sources=(source,)).functions, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import os
+import tempfile
+import unittest
+
+from c2binsec import buildcache
+from c2binsec.buildcache import BuildStamps, inputs_digest, source_dependencies
+
+
+class TestBuildStamps(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.source = self.path('prog.c')
+        self.output = self.path('prog.bin')
+        self.write(self.source, 'int main() { return 0; }\n')
+        self.write(self.output, 'binary')
+        self.stamps = self.path('prog.stamps')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    def write(self, filename, data):
+        with open(filename, 'w') as stream:
+            stream.write(data)
+
+    def record(self):
+        digest = inputs_digest('compile', (self.source,), [ 'gcc' ])
+        BuildStamps(self.stamps).record('compile', digest, { 'symbols': ['x'] }, (self.output,))
+        return digest
+
+    def test_unchanged_inputs_hit(self):
+        digest = self.record()
+        self.assertEqual(BuildStamps(self.stamps).lookup('compile', digest, (self.output,)), { 'symbols': ['x'] })
+
+    def test_changed_input_or_params_rebuild(self):
+        self.record()
+        self.write(self.source, 'int main() { return 1; }\n')
+        digest = inputs_digest('compile', (self.source,), [ 'gcc' ])
+        self.assertIsNone(BuildStamps(self.stamps).lookup('compile', digest, (self.output,)))
+        self.assertNotEqual(digest, inputs_digest('compile', (self.source,), [ 'clang' ]))
+
+    def test_changed_or_missing_output_rebuilds(self):
+        digest = self.record()
+        self.write(self.output, 'corrupted')
+        self.assertIsNone(BuildStamps(self.stamps).lookup('compile', digest, (self.output,)))
+        os.remove(self.output)
+        self.assertIsNone(BuildStamps(self.stamps).lookup('compile', digest, (self.output,)))
+
+    def test_rebuild_disables_reuse(self):
+        digest = self.record()
+        self.assertIsNone(BuildStamps(self.stamps, reuse=False).lookup('compile', digest, (self.output,)))
+
+    def test_invalidated_stage_rebuilds(self):
+        digest = self.record()
+        BuildStamps(self.stamps).invalidate('compile')
+        self.assertIsNone(BuildStamps(self.stamps).lookup('compile', digest, (self.output,)))
+
+
+class TestSourceDependencies(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.header = os.path.join(self.tmpdir.name, 'config.h')
+        self.source = os.path.join(self.tmpdir.name, 'prog.c')
+        self.depfile = os.path.join(self.tmpdir.name, 'prog.deps')
+        with open(self.header, 'w') as stream:
+            stream.write('#define SIZE 4\n')
+        with open(self.source, 'w') as stream:
+            stream.write('#include "config.h"\nint buffer[SIZE];\n')
+        buildcache._dependencies.clear()
+        self.calls = 0
+        execute_command = buildcache.execute_command
+        def counting(*args, **kwargs):
+            self.calls += 1
+            return execute_command(*args, **kwargs)
+        buildcache.execute_command = counting
+        self.addCleanup(setattr, buildcache, 'execute_command', execute_command)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def digest(self):
+        return inputs_digest('generate', tuple(source_dependencies(self.source, depfile=self.depfile)), [])
+
+    def test_included_header_is_a_dependency(self):
+        deps = source_dependencies(self.source)
+        self.assertEqual(deps[0], self.source)
+        self.assertIn(self.header, deps)
+
+    def test_changed_header_rebuilds(self):
+        digest = self.digest()
+        self.assertEqual(self.digest(), digest)
+        with open(self.header, 'w') as stream:
+            stream.write('#define SIZE 8\n')
+        self.assertNotEqual(self.digest(), digest)
+
+    def test_dependencies_are_memoized_while_unchanged(self):
+        source_dependencies(self.source, depfile=self.depfile)
+        source_dependencies(self.source, depfile=self.depfile)
+        self.assertEqual(self.calls, 1)
+        # a new run only has the dependency file
+        buildcache._dependencies.clear()
+        source_dependencies(self.source, depfile=self.depfile)
+        self.assertEqual(self.calls, 1)
+        with open(self.header, 'a') as stream:
+            stream.write('#define OTHER 1\n')
+        source_dependencies(self.source, depfile=self.depfile)
+        self.assertEqual(self.calls, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
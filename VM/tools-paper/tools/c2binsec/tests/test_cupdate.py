@@ -0,0 +1,72 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from c2binsec import buildcache
+from c2binsec.cupdate import ParseCache, get_parser
+
+
+class TestParser(unittest.TestCase):
+    def test_one_parser_per_thread(self):
+        parser = get_parser()
+        self.assertIs(get_parser(), parser)
+        others = []
+        thread = threading.Thread(target=lambda: others.append(get_parser()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(others[0], parser)
+
+
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = ParseCache(os.path.join(self.tmpdir.name, 'cache'))
+        buildcache._dependencies.clear()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def make_source(self, dirname, size):
+        dirname = os.path.join(self.tmpdir.name, dirname)
+        os.makedirs(dirname)
+        with open(os.path.join(dirname, 'config.h'), 'w') as stream:
+            stream.write('#define SIZE {}\n'.format(size))
+        source = os.path.join(dirname, 'prog.c')
+        with open(source, 'w') as stream:
+            stream.write('#include "config.h"\nint buffer[SIZE];\n')
+        return source
+
+    def entries(self, kind):
+        root = os.path.join(self.cache.directory, kind)
+        return sum(len(files) for _, _, files in os.walk(root))
+
+    def test_identical_sources_share_their_entries(self):
+        first, second = self.make_source('a', 4), self.make_source('b', 4)
+        text = self.cache.preprocess(first)
+        self.assertIn(first, text)
+        copy = self.cache.preprocess(second)
+        self.assertEqual(self.entries('cpp'), 1)
+        self.assertIn(second, copy)
+        self.assertNotIn(first, copy)
+
+    def test_changed_header_misses(self):
+        source = self.make_source('a', 4)
+        self.cache.preprocess(source)
+        with open(os.path.join(os.path.dirname(source), 'config.h'), 'w') as stream:
+            stream.write('#define SIZE 16\n')
+        self.assertIn('16', self.cache.preprocess(source))
+        self.assertEqual(self.entries('cpp'), 2)
+
+    def test_asts_are_cached(self):
+        source = self.make_source('a', 4)
+        text = self.cache.preprocess(source)
+        ast = self.cache.parse(text, source, get_parser())
+        self.assertEqual(self.entries('ast'), 1)
+        cached = self.cache.parse(text, source, get_parser())
+        self.assertIsNot(cached, ast)
+        self.assertEqual(cached.ext[0].name, 'buffer')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import io
+import os
+import tempfile
+import unittest
+
+from c2binsec.ruleset.dbaslice import DbaSlice
+
+
+Function = '''\
+# -- 0x080498e6 55                                     push ebp
+ 0: esp<32> := (esp<32> - 4<32>);
+ 1: @[esp<32>,<-,4] := ebp<32>;
+ 2: goto (0x080498e7, 0)
+# -- 0x080498e7  mov eax, [0x80e3f54]
+ 0: eax<32> := @[0x080e3f54,<-,4];
+ 1: goto (0x080498e8, 0)
+# -- 0x080498e8  mov ecx, [0x80e3f40]
+ 0: ecx<32> := @[0x080e3f40,<-,4];
+ 1: goto (0x080498e9, 0)
+# -- 0x080498e9  cmp eax, 0x3
+ 0: res32<32> := (eax<32> - 3<32>);
+ 1: ZF<1> := (0<32> = res32<32>);
+ 2: goto (0x080498ea, 0)
+# -- 0x080498ea  jne
+ 0: if ZF<1> goto (0x080498ce, 0) else goto (0x080498b4, 0)
+# -- 0x080498eb  ret
+ 0: esp<32> := (esp<32> + 4<32>);
+ 1: goto @[(esp<32> - 4<32>),<-,4] #return
+'''
+
+Call = '''\
+# -- 0x080498ec  call 0x08049900
+ 0: esp<32> := (esp<32> - 4<32>);
+ 1: @[esp<32>,<-,4] := 0x080498f1<32>;
+ 2: goto (0x08049900, 0) #call
+'''
+
+Callee = '''\
+# -- 0x08049900  mov edx, [ebx]
+ 0: edx<32> := @[ebx<32>,<-,4];
+ 1: goto (0x08049902, 0)
+# -- 0x08049902  test edx, edx
+ 0: ZF<1> := (0<32> = edx<32>);
+ 1: goto (0x08049903, 0)
+# -- 0x08049903  ret
+ 0: esp<32> := (esp<32> + 4<32>);
+ 1: goto @[(esp<32> - 4<32>),<-,4] #return
+'''
+
+
+class TestDbaSlice(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def make_slice(self, *contents, entries=()):
+        files = []
+        for idx, content in enumerate(contents):
+            filename = os.path.join(self.tmpdir.name, 'f{}.dba'.format(idx))
+            with open(filename, 'w') as stream:
+                stream.write(content)
+            files.append(filename)
+        return DbaSlice(files, entries=entries)
+
+    def written(self, dslice):
+        stream = io.StringIO()
+        dslice.write(stream)
+        return stream.getvalue().splitlines()
+
+    def test_branch_dependencies_are_sliced_by_byte(self):
+        dslice = self.make_slice(Function)
+        self.assertTrue(dslice.complete)
+        self.assertEqual(dslice.registers, { 'ZF', 'res32', 'eax' })
+        self.assertEqual(dslice.memory, set(range(0x080e3f54, 0x080e3f58)))
+        self.assertFalse(dslice.stack)
+        self.assertEqual(self.written(dslice), [ '# input relevance slice', 'register:ZF', 'register:eax', 'register:res32',
+                                                 'memory:0x080e3f54', 'memory:0x080e3f55', 'memory:0x080e3f56', 'memory:0x080e3f57' ])
+
+    def test_unknown_callee_leaves_the_slice_unrestricted(self):
+        dslice = self.make_slice(Function + Call)
+        self.assertFalse(dslice.complete)
+        self.assertEqual(self.written(dslice), [ '# input relevance slice', 'register:*', 'memory:*' ])
+
+    def test_disassembled_callee_is_sliced(self):
+        dslice = self.make_slice(Function + Call, Callee)
+        self.assertTrue(dslice.complete)
+        self.assertIn('edx', dslice.registers)
+        self.assertIn('ebx', dslice.registers)
+        self.assertIsNone(dslice.memory)
+        self.assertIn('memory:*', self.written(dslice))
+        self.assertNotIn('register:ecx', self.written(dslice))
+
+    def test_entry_without_dba_leaves_the_slice_unrestricted(self):
+        dslice = self.make_slice(Function, entries=(0x08049900,))
+        self.assertFalse(dslice.complete)
+
+    def test_no_condition_leaves_the_slice_unrestricted(self):
+        dslice = self.make_slice(Function.split('# -- 0x080498ea')[0])
+        self.assertFalse(dslice.complete)
+        self.assertEqual(self.written(dslice), [ '# input relevance slice', 'register:*', 'memory:*' ])
+
+
+if __name__ == '__main__':
+    unittest.main()
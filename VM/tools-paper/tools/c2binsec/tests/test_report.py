@@ -0,0 +1,117 @@
+import os
+import types
+import tempfile
+import unittest
+
+from c2binsec.report import ReportData, ReportDatabase, ReportTask
+
+
+LOGS = (
+    ('repo-a/p0', 'binsec', 'model+ok', 1.5, 'x'),
+    ('repo-a/p0', 'robust-binsec', 'unreachable', 3.0, 'x'),
+    ('repo-a/p1', 'binsec', 'ok', 0.5, 'x+y'),
+    ('repo-b/p2', 'binsec', 'model+ok', 2.0, 'y'),
+    ('repo-b/p2', 'robust-binsec', 'model', 2.5, 'y'),
+    ('repo-b/p3', 'binsec', 'nzr+timeout', 60.0, 'x'),
+)
+
+
+def write_log(tmpdir, problem, kind, results, time, targets):
+    filename = os.path.join(tmpdir, '{}.{}.log'.format(problem, kind))
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    with open(filename, 'w') as ostr:
+        ostr.write('[source] {}.c\n'.format(os.path.join(tmpdir, problem)))
+        if results is not None:
+            ostr.write('[{}:run] {} in {} seconds\n'.format(kind, results, time))
+        ostr.write('[c2bc] expect {}\n'.format(targets))
+        ostr.write('binsec output\n')
+    return filename
+
+
+def baseline_categories(data, key, repo=None):
+    # in-memory aggregation of the reports before the summary database
+    counts = dict()
+    for dat in data:
+        if repo is not None and dat['directory'] != repo:
+            continue
+        cat = '+'.join(dat[key])
+        counts[cat] = counts.get(cat, 0) + 1
+    return [ (cat, counts[cat]) for cat in sorted(counts.keys(), key=lambda k : -counts[k]) ]
+
+
+def baseline_times(data, repo=None):
+    return [ ('+'.join(dat['results']), dat['time']) for dat in data if repo is None or dat['directory'] == repo ]
+
+
+def baseline_interest(rdata, sdata, maxi=False):
+    interest = set()
+    for dat in rdata:
+        robust = ''
+        for sdat in sdata:
+            if sdat['directory'] == dat['directory'] and sdat['problem'] == dat['problem']:
+                robust = '+'.join(sdat['results'])
+        if 'model' in '+'.join(dat['results']) and ((not maxi) or 'unreachable' in robust or 'model' in robust):
+            interest.add(os.path.join(dat['directory'], dat['problem']))
+    return interest
+
+
+class TestReportDatabase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.files = [ write_log(self.tmpdir.name, *log) for log in LOGS ]
+        # a log given twice is counted twice, as the in-memory aggregation did
+        self.files.append(self.files[2])
+        self.db = ReportDatabase(os.path.join(self.tmpdir.name, 'report.db'), [])
+        self.db.ingest(self.files)
+        self.rdata = [ ReportData(f, []) for f in self.files if f.endswith('.binsec.log') ]
+        self.sdata = [ ReportData(f, []) for f in self.files if f.endswith('.robust-binsec.log') ]
+
+    def tearDown(self):
+        self.db.close()
+        self.tmpdir.cleanup()
+
+    def interest(self, maxi=False):
+        task = ReportTask.__new__(ReportTask)
+        task.db, task._atpr = self.db, True
+        return set(task._list_interesting_examples(maxi=maxi))
+
+    def test_aggregates_match_the_in_memory_report(self):
+        repos = sorted({ dat['directory'] for dat in self.rdata })
+        self.assertEqual(self.db.repos(), repos)
+        for repo in [ None ] + repos:
+            self.assertEqual(self.db.categories('binsec', 'targets', repo), baseline_categories(self.rdata, 'targets', repo))
+            self.assertEqual(self.db.categories('binsec', 'results', repo), baseline_categories(self.rdata, 'results', repo))
+            self.assertEqual(self.db.categories('robust', 'results', repo), baseline_categories(self.sdata, 'results', repo))
+            self.assertEqual(self.db.times('binsec', repo), baseline_times(self.rdata, repo))
+            self.assertEqual(self.db.times('robust', repo), baseline_times(self.sdata, repo))
+        self.assertIn(('ok', 2), self.db.categories('binsec', 'results'))
+        self.assertEqual(self.interest(), baseline_interest(self.rdata, self.sdata))
+        self.assertEqual(self.interest(maxi=True), baseline_interest(self.rdata, self.sdata, maxi=True))
+
+    def test_unchanged_logs_are_not_parsed_again(self):
+        stack = []
+        db = ReportDatabase(self.db.filename, stack)
+        db.ingest(self.files)
+        self.assertEqual(stack, [ 'parsed 0 of {} logs into {}'.format(len(self.files), self.db.filename) ])
+        self.assertEqual(db.categories('binsec', 'results'), self.db.categories('binsec', 'results'))
+        db.close()
+
+    def test_logs_without_run_summary(self):
+        files = self.files + [ write_log(self.tmpdir.name, 'repo-b/p4', 'binsec', None, None, 'x'),
+                               write_log(self.tmpdir.name, 'repo-b/p4', 'robust-binsec', None, None, 'x') ]
+        self.db.ingest(files)
+        self.assertIn(('', 1), self.db.categories('binsec', 'results'))
+        self.assertEqual(self.db.times('binsec'), baseline_times(self.rdata))
+        self.assertEqual(self.db.times('robust'), baseline_times(self.sdata))
+        repo = os.path.join(self.tmpdir.name, 'repo-b')
+        self.assertIn((repo, 'p4.c', '', ''), self.db.results(repo))
+        self.assertEqual(self.interest(maxi=True), baseline_interest(self.rdata, self.sdata, maxi=True))
+        args = types.SimpleNamespace(output_file=os.path.join(self.tmpdir.name, 'report.tex'), input_files=files,
+                                     database=os.path.join(self.tmpdir.name, 'task.db'))
+        ReportTask(args)()
+        with open(args.output_file + '.rse.data') as istr:
+            self.assertEqual(istr.read(), '2.5\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
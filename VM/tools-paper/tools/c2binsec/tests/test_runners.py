@@ -0,0 +1,180 @@
+import os
+import sys
+import json
+import types
+import tempfile
+import unittest
+
+from c2binsec import runners
+from c2binsec.core import TaskStatus
+from c2binsec.runners import LogClassifier, BinsecTask, AbduceTask
+
+
+LINES = (
+    'Model @ 0x8049000\n',
+    '[sse:warning] Dynamic jump @ 0x8049010 could lead to UNKNOWN\n',
+    'Depth exceeded\n',
+    '[sse:result] Goal unreachable.\n',
+    'nothing to see here\n',
+    'Fatal error: Uncaught exception Not_found\n',
+    '\n',
+)
+
+
+class TestLogClassifier(unittest.TestCase):
+    def classify(self, risks, lines):
+        classifier = LogClassifier(risks)
+        for line in lines:
+            classifier.feed(line)
+        return classifier.found
+
+    def test_lines_are_classified_as_by_substring_tests(self):
+        for risks in (BinsecTask.risks, AbduceTask.risks):
+            for end in range(len(LINES) + 1):
+                expected = { riskline for line in LINES[:end] for risk, riskline in risks.items() if risk in line }
+                self.assertEqual(self.classify(risks, LINES[:end]), expected)
+
+    def test_overlapping_keys_are_all_detected(self):
+        risks = { 'warning': 'warning', 'warning: timeout': 'timeout', 'out': 'out', 'ok': 'ok' }
+        self.assertEqual(self.classify(risks, [ 'warning: timeout\n' ]), { 'warning', 'timeout', 'out' })
+        self.assertEqual(self.classify(risks, [ 'no key\n', 'WARNING\n' ]), set())
+
+    def test_keys_are_not_regular_expressions(self):
+        risks = { 'solution(s)': 'solution', 'a.b': 'dot' }
+        self.assertEqual(self.classify(risks, [ 'solutions\n', 'axb\n' ]), set())
+        self.assertEqual(self.classify(risks, [ 'a.b solution(s)\n' ]), { 'solution', 'dot' })
+
+
+class TestBinsecRunner(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.args = types.SimpleNamespace(output_dir=self.tmpdir.name, runner_timeout=10)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def run_task(self, script):
+        task = BinsecTask('input.c', self.args)
+        with open(task.files.runner, 'w') as ostr:
+            ostr.write('#!{}\n{}'.format(sys.executable, script))
+        os.chmod(task.files.runner, 0o755)
+        task()
+        with open(task.files.blog) as istr:
+            log = istr.read()
+        return task, log
+
+    def test_command_failing_partway(self):
+        task, log = self.run_task('import sys\n'
+                                  'for idx in range(1000):\n'
+                                  '    print("Model line {}".format(idx), flush=True)\n'
+                                  'print("Fatal error: Uncaught exception", file=sys.stderr, flush=True)\n'
+                                  'sys.exit(2)\n')
+        self.assertEqual(task.status, TaskStatus.Failure)
+        self.assertIn('[binsec:run] exception+model+nzr in', log)
+        # every line produced before the failure is spooled, the report keeps the tail only
+        self.assertIn('Model line 0\n', log)
+        self.assertIn('Model line 999\n', log)
+        self.assertTrue(log.endswith('Fatal error: Uncaught exception\n'))
+        tail = task.debug_stack[-1].log
+        self.assertEqual(len(tail.splitlines()), BinsecTask.log_tail)
+        self.assertNotIn('Model line 0\n', tail)
+        self.assertIn('Uncaught exception', tail)
+
+    def test_command_timing_out_partway(self):
+        self.args.runner_timeout = 0.5
+        task, log = self.run_task('import time\n'
+                                  'print("Model found", flush=True)\n'
+                                  'time.sleep(60)\n')
+        self.assertEqual(task.status, TaskStatus.Complete)
+        self.assertIn('[binsec:run] model+nzr+timeout in', log)
+        self.assertIn('Model found\n', log)
+
+
+class FakePool:
+    def __init__(self, result, log=None):
+        self.result = result
+        self.log = log
+        self.problems = []
+
+    def solve(self, problem, timeout=None):
+        self.problems.append((problem, timeout))
+        if self.log is not None:
+            with open(problem['log'], 'w') as ostr:
+                ostr.write(self.log)
+        return dict(self.result, id=problem.get('id'))
+
+
+class TestAbduceServerClient(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.servers = runners.ABDUCE_SERVERS
+        self.args = types.SimpleNamespace(output_dir=self.tmpdir.name, forward_to_runner=['--max-depth', '1'],
+                                          runner_timeout=10, abduce_server=True)
+
+    def tearDown(self):
+        runners.ABDUCE_SERVERS = self.servers
+        self.tmpdir.cleanup()
+
+    def run_task(self, pool):
+        runners.ABDUCE_SERVERS = pool
+        task = AbduceTask('input.c', self.args)
+        with open(task.files.problem, 'w') as ostr:
+            json.dump({ 'id': 'input.c', 'args': ['--binsec-binary', 'input.bin'] }, ostr)
+        task()
+        with open(task.files.blog) as istr:
+            log = istr.read()
+        return task, log
+
+    def test_solved_problem(self):
+        pool = FakePool({ 'status': 'ok', 'returncode': 0, 'time': 1.0 }, log="[result] : satisfying solution: {'eax = 0'}\n")
+        task, log = self.run_task(pool)
+        problem, timeout = pool.problems[0]
+        self.assertEqual(problem['args'], ['--binsec-binary', 'input.bin', '--max-depth', '1'])
+        self.assertEqual((problem['log'], problem['timeout'], timeout), (task.files.bout, 10, 10))
+        self.assertEqual(task.status, TaskStatus.Complete)
+        self.assertIn('[abduce-binsec:run] ok+solution(s) in', log)
+        self.assertIn('satisfying solution', log)
+        self.assertFalse(os.path.exists(task.files.bout))
+        self.assertFalse(os.path.exists(task.files.berr))
+
+    def test_error_reply_without_log(self):
+        pool = FakePool({ 'status': 'error', 'returncode': 1, 'error': 'invalid problem arguments: []' })
+        task, log = self.run_task(pool)
+        self.assertEqual(task.status, TaskStatus.Failure)
+        self.assertIn('[abduce-binsec:run] nzr in', log)
+        self.assertIn('invalid problem arguments', log)
+        self.assertIn('invalid problem arguments', task.debug_stack[-1].log)
+
+    def test_problem_timeout(self):
+        pool = FakePool({ 'status': 'timeout', 'returncode': 1 }, log='[fatal]  : top-level termination\n')
+        task, log = self.run_task(pool)
+        self.assertEqual(task.status, TaskStatus.Complete)
+        self.assertIn('[abduce-binsec:run] nzr+timeout+top-level in', log)
+
+    def test_killed_server(self):
+        # client side timeouts and crashes have no return code nor log
+        task, log = self.run_task(FakePool({ 'status': 'timeout', 'returncode': None }))
+        self.assertEqual(task.status, TaskStatus.Complete)
+        self.assertIn('[abduce-binsec:run] nzr+timeout in', log)
+        task, log = self.run_task(FakePool({ 'status': 'crash', 'returncode': None }))
+        self.assertEqual(task.status, TaskStatus.Failure)
+        self.assertIn('[abduce-binsec:run] nzr in', log)
+
+    def test_runner_script_without_server(self):
+        self.args.abduce_server = False
+        runners.ABDUCE_SERVERS = None
+        task = AbduceTask('input.c', self.args)
+        with open(task.files.runner, 'w') as ostr:
+            ostr.write('#!/bin/bash\necho "[result] : nas condition: $*"\n')
+        os.chmod(task.files.runner, 0o755)
+        task()
+        self.assertIsNone(runners.ABDUCE_SERVERS)
+        self.assertEqual(task.status, TaskStatus.Complete)
+        with open(task.files.blog) as istr:
+            log = istr.read()
+        self.assertIn('[abduce-binsec:run] ok+solution(c) in', log)
+        self.assertIn('nas condition: --max-depth 1', log)
+
+
+if __name__ == '__main__':
+    unittest.main()
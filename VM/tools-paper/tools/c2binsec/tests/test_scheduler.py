@@ -0,0 +1,112 @@
+import threading
+import types
+import unittest
+
+from c2binsec.core import TaskStatus, TaskException
+from c2binsec.compilation import CompilationTask
+from c2binsec.runners import BinsecTask, AbduceTask
+from c2binsec.scheduler import TaskGraph, GraphExecutor
+
+
+class FakeMixin:
+    def setup(self, ifile, log, outcome='ok', runner_prefix=''):
+        self.files = types.SimpleNamespace(input=ifile)
+        self.runner_prefix = runner_prefix
+        self.status = TaskStatus.Pending
+        self.debug_stack = []
+        self.log = log
+        self.outcome = outcome
+
+    def __call__(self):
+        with self.log['lock']:
+            self.log['order'].append((self.files.input, type(self).__name__))
+        if self.outcome == 'raise':
+            raise RuntimeError('unexpected error in {}'.format(self.files.input))
+        if self.outcome == 'fail':
+            self.status = TaskStatus.Failure
+            self.debug_stack.append(TaskException('failure', ''))
+        else:
+            self.status = TaskStatus.Complete
+
+
+class FakeCompilation(FakeMixin, CompilationTask):
+    def __init__(self, *args, **kwargs):
+        self.setup(*args, **kwargs)
+
+
+class FakeBinsec(FakeMixin, BinsecTask):
+    def __init__(self, *args, **kwargs):
+        self.setup(*args, **kwargs)
+
+
+class FakeAbduce(FakeMixin, AbduceTask):
+    def __init__(self, *args, **kwargs):
+        self.setup(*args, **kwargs, runner_prefix='abduce-')
+
+
+def make_tasks(log, inputs, outcomes=None):
+    outcomes = outcomes if outcomes is not None else {}
+    tasks = []
+    for ifile in inputs:
+        # listed out of stage order on purpose
+        tasks.append(FakeAbduce(ifile, log, outcome=outcomes.get((ifile, 'abduce'), 'ok')))
+        tasks.append(FakeBinsec(ifile, log, outcome=outcomes.get((ifile, 'binsec'), 'ok')))
+        tasks.append(FakeCompilation(ifile, log, outcome=outcomes.get((ifile, 'compile'), 'ok')))
+    return tasks
+
+
+class TestGraphExecutor(unittest.TestCase):
+    def setUp(self):
+        self.log = { 'lock': threading.Lock(), 'order': [] }
+        self.done = []
+
+    def run_graph(self, tasks, jobs=4, **kwargs):
+        executor = GraphExecutor(TaskGraph(tasks), jobs, on_done=lambda node: self.done.append(node), **kwargs)
+        executor.run()
+        return executor
+
+    def test_stages_of_a_file_run_in_order(self):
+        tasks = make_tasks(self.log, [ 'a.c', 'b.c', 'c.c' ])
+        self.run_graph(tasks)
+        for ifile in ('a.c', 'b.c', 'c.c'):
+            order = [ kind for name, kind in self.log['order'] if name == ifile ]
+            self.assertEqual(order, [ 'FakeCompilation', 'FakeBinsec', 'FakeAbduce' ])
+        self.assertEqual(len(self.done), len(tasks))
+        self.assertTrue(all(task.status == TaskStatus.Complete for task in tasks))
+
+    def test_compilation_failure_skips_the_file_stages(self):
+        tasks = make_tasks(self.log, [ 'a.c', 'b.c' ], { ('a.c', 'compile'): 'fail' })
+        self.run_graph(tasks)
+        self.assertEqual([ name for name, _ in self.log['order'] ].count('a.c'), 1)
+        skipped = [ node for node in self.done if node.skipped ]
+        self.assertEqual(sorted(node.stage for node in skipped), [ 'abduce', 'binsec' ])
+        for node in skipped:
+            self.assertEqual(node.task.status, TaskStatus.Failure)
+            self.assertIsInstance(node.task.debug_stack[-1], TaskException)
+        self.assertTrue(all(task.status == TaskStatus.Complete for task in tasks if task.files.input == 'b.c'))
+
+    def test_runner_failure_does_not_block_later_stages(self):
+        tasks = make_tasks(self.log, [ 'a.c' ], { ('a.c', 'binsec'): 'fail' })
+        self.run_graph(tasks)
+        self.assertEqual(len(self.log['order']), 3)
+        self.assertFalse(any(node.skipped for node in self.done))
+
+    def test_raising_task_is_recorded_and_does_not_hang(self):
+        tasks = make_tasks(self.log, [ 'a.c', 'b.c', 'c.c' ], { ('b.c', 'compile'): 'raise' })
+        thread = threading.Thread(target=self.run_graph, args=(tasks,), daemon=True)
+        thread.start()
+        thread.join(timeout=10)
+        self.assertFalse(thread.is_alive())
+        failed = [ task for task in tasks if task.files.input == 'b.c' and isinstance(task, CompilationTask) ][0]
+        self.assertEqual(failed.status, TaskStatus.HardFailure)
+        self.assertIsInstance(failed.debug_stack[-1], RuntimeError)
+        self.assertEqual(len(self.done), len(tasks))
+
+    def test_stop_on_failure_raises_the_failure(self):
+        tasks = make_tasks(self.log, [ 'a.c' ], { ('a.c', 'compile'): 'raise' })
+        with self.assertRaises(RuntimeError):
+            self.run_graph(tasks, jobs=1, stop_on_failure=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,18 +4,14 @@ import sys
 import enum
 import concurrent.futures
 # --------------------
-import yaml
-try:
-    from yaml import CLoader as ymlLoader, CDumper as ymlDumper
-except ImportError:
-    from yaml import Loader as ymlLoader, Dumper as ymlDumper
-# --------------------
 from pulseutils.logging import Logger
 # --------------------
 from fistic.placers.core import BinaryMutant
 from fistic.placers import *
 from fistic.faulters import *
 from fistic.evaluators import *
+from fistic.results import ResultsSink, load_results
+from fistic.results import export_results as export_results_sink
 # --------------------
 class ArticulationMode(enum.Enum):
     '''Articulation mode for the fistic mutant handling.
@@ -54,6 +50,8 @@ Placers = {
     'address': AddressesPlacer,
     'function': FunctionsPlacer,
     'on-function': OnFunctionPlacer,
+    'covered-function': CoveredFunctionsPlacer,
+    'on-covered-function': OnCoveredFunctionPlacer,
 }
 Faulters = {
     'none': NoFault,
@@ -76,13 +74,19 @@ class FisticOptions:
     identical to the option attribute name.
 
     :param binary: source binary to mutate, default `input.bin`
+    :param results_sink: JSON lines file results are appended to as mutants are evaluated, default `fistic-results.jsonl`
+    :param yaml_export: export the results sink to `output_file` once the evaluation completes, default True
     :param textaddr: address of the `.text` segment of the source binary, reads from `args.text_segment_address`, default `0x8000`
     :param golden_mutant: evaluation key for the results of the source binary, must not conflict with `faulted_binaries_template`, default to `**golden**`
+    :param deduplicate: only evaluate the first of byte-identical mutants, others are recorded as aliases, default to True
     :param log: logging option flags, reads from `log_debug`, `log_color` and `log_progress` (except: `args.debug`), default to False
 
     :type binary: str
+    :type results_sink: str
+    :type yaml_export: bool
     :type textaddr: int
     :type golden_mutant: str
+    :type deduplicate: bool
     :type log: dict(str, bool)
 
     .. todo::
@@ -100,10 +104,19 @@ class FisticOptions:
         self.output_file = (kwargs['output_file'] if 'output_file' in kwargs else
                             args.output_file if args is not None else
                             'fistic-results.yml')
+        self.results_sink = (kwargs['results_sink'] if 'results_sink' in kwargs else
+                             args.results_sink if args is not None else
+                             'fistic-results.jsonl')
+        self.yaml_export = (kwargs['yaml_export'] if 'yaml_export' in kwargs else
+                            args.yaml_export if args is not None else
+                            True)
 
         self.golden_mutant = (kwargs['golden_mutant'] if 'golden_mutant' in kwargs else
                               args.golden_mutant if args is not None else
                               '**golden**')
+        self.deduplicate = (kwargs['deduplicate'] if 'deduplicate' in kwargs else
+                            args.deduplicate if args is not None else
+                            True)
 
         self.log = {
             'debug': (kwargs['log_debug'] if 'log_debug' in kwargs else
@@ -154,6 +167,15 @@ class FisticOptions:
         self.dont_fault_data = (kwargs['dont_fault_data'] if 'dont_fault_data' in kwargs else
                                 args.dont_fault_data if args is not None else
                                 False)
+        self.shard = (kwargs['shard'] if 'shard' in kwargs else
+                      args.shard if args is not None else
+                      None)
+        self.sample_budget = (kwargs['sample_budget'] if 'sample_budget' in kwargs else
+                              args.sample if args is not None else
+                              None)
+        self.sample_seed = (kwargs['sample_seed'] if 'sample_seed' in kwargs else
+                            args.sample_seed if args is not None else
+                            None)
 
         self.functions = (kwargs['functions'] if 'functions' in kwargs else
                           args.functions if args is not None else
@@ -161,6 +183,12 @@ class FisticOptions:
         self.addresses = (kwargs['addresses'] if 'addresses' in kwargs else
                           args.addresses if args is not None else
                           ())
+        self.coverage_trace = (kwargs['coverage_trace'] if 'coverage_trace' in kwargs else
+                               args.coverage_trace if args is not None else
+                               None)
+        self.coverage_weighted = (kwargs['coverage_weighted'] if 'coverage_weighted' in kwargs else
+                                  args.coverage_weighted if args is not None else
+                                  False)
 
         self.evaluation_timeout = (kwargs['evaluation_timeout'] if 'evaluation_timeout' in kwargs else
                                    args.evaluation_timeout if args is not None else
@@ -212,17 +240,35 @@ class FisticOptions:
 class Articulator:
     '''Main class for running a complete fistic evaluation.
 
+    Results are appended to :class:`fistic.FisticOptions`:code:`.results_sink` as each mutant
+    evaluation completes, and are not kept in memory.
+
     :param opts: options for the evaluation
     :param log: logging utility class
-    :param results: evaluation results, set after call
+    :param sink: results store, open during call
+    :param representatives: evaluated mutant, by binary content hash
+    :param statuses: evaluation result of the representative mutants
     :type opts: :class:`fistic.FisticOptions`
-    :type results: dict(:class:`fistic.placers.BinaryMutant`, :class:`fistic.evaluators.EvaluationStatus`)
+    :type sink: :class:`fistic.results.ResultsSink`
+    :type representatives: dict(str, :class:`fistic.placers.BinaryMutant`)
+    :type statuses: dict(:class:`fistic.placers.BinaryMutant`, :class:`fistic.evaluators.EvaluationStatus`)
     '''
 
     def __init__(self, opts):
         self.opts = opts
         self.log = Logger(level=4 if opts.log['debug'] else 3, color=opts.log['color'], log_progress=opts.log['progress'])
-        self.results = {}
+        self.sink = ResultsSink(self.opts.results_sink)
+        self.representatives = {}
+        self.statuses = {}
+        self.pending_aliases = {}
+
+    @property
+    def results(self):
+        '''Evaluation results, loaded from the results sink.
+
+        :rtype: dict(:class:`fistic.placers.BinaryMutant`, :class:`fistic.evaluators.EvaluationStatus`)
+        '''
+        return load_results(self.opts.results_sink)
 
     def export_results(self, target):
         '''Export the results to the target file descriptor.
@@ -230,7 +276,7 @@ class Articulator:
         :param target: target to write the results to
         :type target: fp('w')
         '''
-        yaml.dump(self.results, target, Dumper=ymlDumper)
+        export_results_sink(self.opts.results_sink, target)
 
     def __call__(self):
         '''Run the complete fistic evaluation.
@@ -242,45 +288,82 @@ class Articulator:
         faulter = self.opts.create_faulter(self.log)
         evaluator = self.opts.create_evaluator(self.log)
 
-        self.log.info(f'performing golden run (target: {self.opts.binary})')
-        golden, grr = evaluator(BinaryMutant(self.opts.binary, []), golden=True)
-        self.results[golden] = grr
-        self.log.info(f'golden run evaluation result: {grr}')
-
-        if self.opts.mode == ArticulationMode.Linear:
-            self.__articulate_linear(placer, faulter, evaluator)
-        elif self.opts.mode == ArticulationMode.Parallel:
-            self.__articulate_parallel(placer, faulter, evaluator)
-        elif self.opts.mode == ArticulationMode.Communicate:
-            self.__articulate_communicate(placer, faulter, evaluator)
-
-        with open(self.opts.output_file, 'w') as stream:
-            self.export_results(stream)
+        with self.sink:
+            self.log.info(f'performing golden run (target: {self.opts.binary})')
+            golden, grr = evaluator(BinaryMutant(self.opts.binary, []), golden=True)
+            self.log.info(f'golden run evaluation result: {grr}')
+            if self.opts.deduplicate:
+                self.representatives[golden.compute_digest()] = golden
+                self.statuses[golden] = grr
+            self.sink.record(golden, grr, golden=True)
+
+            if self.opts.mode == ArticulationMode.Linear:
+                self.__articulate_linear(placer, faulter, evaluator)
+            elif self.opts.mode == ArticulationMode.Parallel:
+                self.__articulate_parallel(placer, faulter, evaluator)
+            elif self.opts.mode == ArticulationMode.Communicate:
+                self.__articulate_communicate(placer, faulter, evaluator)
+
+        if self.opts.yaml_export:
+            with open(self.opts.output_file, 'w') as stream:
+                self.export_results(stream)
+
+    def __should_evaluate(self, mutant):
+        '''Check whether a mutant should be evaluated or is an alias of a byte-identical one.
+
+        Aliases of already evaluated mutants are recorded immediately, others once their
+        representative evaluation completes.
+
+        :rtype: bool
+        '''
+        if not self.opts.deduplicate or mutant.digest is None:
+            return True
+        representative = self.representatives.get(mutant.digest)
+        if representative is None:
+            self.representatives[mutant.digest] = mutant
+            return True
+        mutant.alias = representative.binary
+        self.log.debug(f'{mutant.binary} is identical to {representative.binary}')
+        if representative in self.statuses:
+            self.__record(mutant, self.statuses[representative])
+        else:
+            self.pending_aliases.setdefault(representative, []).append(mutant)
+        return False
+
+    def __record(self, mutant, result):
+        alias = f' (alias of {mutant.alias})' if mutant.alias is not None else ''
+        self.log.result(f'faulted binary {mutant.binary} (mutated: {mutant.targets_str}): {result}{alias}')
+        self.sink.record(mutant, result)
+        if self.representatives.get(mutant.digest) is mutant:
+            self.statuses[mutant] = result
+        for amutant in self.pending_aliases.pop(mutant, ()):
+            self.__record(amutant, result)
 
     def __articulate_linear(self, placer, faulter, evaluator):
         for mutant in placer.generate_mutants(faulter):
-            self.log.debug(f'evaluating {mutant.binary} (mutated: {mutant.targets_str})')
-            _, result = evaluator(mutant)
-            self.log.result(f'faulted binary {mutant.binary} (mutated: {mutant.targets_str}): {result}')
-            self.results[mutant] = result
+            if self.__should_evaluate(mutant):
+                self.log.debug(f'evaluating {mutant.binary} (mutated: {mutant.targets_str})')
+                _, result = evaluator(mutant)
+                self.__record(mutant, result)
 
     def __articulate_parallel(self, placer, faulter, evaluator):
         with concurrent.futures.ThreadPoolExecutor() as executor:
-            tp = ( executor.submit(evaluator, mutant) for mutant in placer.generate_mutants(faulter) )
+            tp = ( executor.submit(evaluator, mutant) for mutant in placer.generate_mutants(faulter)
+                   if self.__should_evaluate(mutant) )
             for tres in concurrent.futures.as_completed(tp):
                 mutant, result = tres.result()
-                self.log.result(f'faulted binary {mutant.binary} (mutated: {mutant.targets_str}): {result}')
-                self.results[mutant] = result
+                self.__record(mutant, result)
 
     def __articulate_communicate(self, placer, faulter, evaluator):
         self.log.result(f'expected number of binaries: {placer.estimate}')
         self.__get_communicated('next')
         for mutant in placer.generate_mutants(faulter):
-            self.log.debug(f'evaluating {mutant.binary} (mutated: {mutant.targets_str})')
-            _, result = evaluator(mutant)
-            self.log.result(f'faulted binary {mutant.binary} (mutated: {mutant.targets_str}): {result}')
-            self.results[mutant] = result
-            self.__get_communicated('next')
+            # aliases are never run, so they do not wait for the handshake
+            if self.__should_evaluate(mutant):
+                self.log.debug(f'evaluating {mutant.binary} (mutated: {mutant.targets_str})')
+                _, result = evaluator(mutant)
+                self.__record(mutant, result)
+                self.__get_communicated('next')
         self.log.result('evaluation completed')
 
     def __get_communicated(self, command):
@@ -3,3 +3,4 @@
 from .core import NowherePlacer, BinaryMutant
 from .address import AddressesPlacer
 from .function import FunctionsPlacer, OnFunctionPlacer
+from .coverage import CoveredFunctionsPlacer, OnCoveredFunctionPlacer
@@ -3,7 +3,7 @@
 import math
 import itertools
 # --------------------
-from .core import GenericPlacer
+from .core import GenericPlacer, ranked_combinations
 # --------------------
 class AddressesPlacer(GenericPlacer):
     '''Placer generating mutation targets from a set of addresses.
@@ -14,8 +14,8 @@ class AddressesPlacer(GenericPlacer):
     '''
 
     @property
-    def estimate(self):
-        return math.comb(len(self.opts.addresses), self.opts.fault_count)
+    def space(self):
+        return math.comb(len(list(self.generate_addresses())), self.opts.fault_count)
 
     def generate_addresses(self):
         '''Recover the addresses to fault.
@@ -28,6 +28,10 @@ class AddressesPlacer(GenericPlacer):
         addrs = self.generate_addresses()
         for target in itertools.combinations(addrs, self.opts.fault_count):
             yield target
+
+    def generate_ranked_targets(self, ranks):
+        addrs = list(self.generate_addresses())
+        return ranked_combinations(addrs, self.opts.fault_count, ranks)
 # --------------------
 # --------------------
 # --------------------
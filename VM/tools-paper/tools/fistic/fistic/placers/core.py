@@ -1,23 +1,147 @@
 '''Base classes for building mutant placers, that decide where to mutate a binary file'''
 # --------------------
 import os.path
+import math
+import random
 import shutil
+import hashlib
 # --------------------
 from pulseutils.files import create_directory
 from fistic.mapper import Mapper, MapperFromMap
 # --------------------
+def unrank_combination(n, k, rank):
+    '''Recover the combination of given rank, in :code:`itertools.combinations` order.
+
+    :param n: size of the combined set
+    :param k: size of the combinations
+    :param rank: rank of the combination, in :code:`[0, comb(n, k))`
+    :type n: int
+    :type k: int
+    :type rank: int
+    :return: the indices of the combined elements
+    :rtype: list(int)
+    '''
+    result = []
+    x = 0
+    for i in range(k):
+        while True:
+            count = math.comb(n - x - 1, k - i - 1)
+            if rank < count:
+                break
+            rank -= count
+            x += 1
+        result.append(x)
+        x += 1
+    return result
+# --------------------
+def rank_combination(n, indices):
+    '''Compute the rank of a combination, in :code:`itertools.combinations` order.
+
+    Inverse of :code:`unrank_combination`.
+
+    :param n: size of the combined set
+    :param indices: increasing indices of the combined elements
+    :type n: int
+    :type indices: list(int)
+    :return: the rank of the combination, in :code:`[0, comb(n, len(indices)))`
+    :rtype: int
+    '''
+    k = len(indices)
+    rank = 0
+    x = 0
+    for i, index in enumerate(indices):
+        for y in range(x, index):
+            rank += math.comb(n - y - 1, k - i - 1)
+        x = index + 1
+    return rank
+# --------------------
+def next_combination(indices, n):
+    '''Compute the combination following the given one, in :code:`itertools.combinations` order.
+
+    :param indices: the indices of the combined elements
+    :param n: size of the combined set
+    :type indices: list(int)
+    :type n: int
+    :return: the indices of the next combination, or None if :code:`indices` is the last one
+    :rtype: list(int) or None
+    '''
+    k = len(indices)
+    for i in reversed(range(k)):
+        if indices[i] < n - k + i:
+            result = indices[:i] + [indices[i] + 1]
+            for _ in range(i + 1, k):
+                result.append(result[-1] + 1)
+            return result
+    return None
+# --------------------
+def ranked_combinations(elements, k, ranks):
+    '''Generate the combinations of given ranks, in :code:`itertools.combinations` order.
+
+    Consecutive ranks are enumerated incrementally rather than unranked.
+
+    :param elements: the combined set
+    :param k: size of the combinations
+    :param ranks: increasing ranks of the combinations to generate
+    :type elements: list
+    :type k: int
+    :type ranks: iterable(int)
+    :return: generator returning each rank and its combination
+    :rtype: generator(int, tuple)
+    '''
+    current, last = None, None
+    for rank in ranks:
+        if current is not None and rank == last + 1:
+            current = next_combination(current, len(elements))
+        else:
+            current = unrank_combination(len(elements), k, rank)
+        last = rank
+        yield rank, tuple((elements[i] for i in current))
+# --------------------
+def stratified_sample(space, budget, seed=None):
+    '''Sample ranks in :code:`[0, space)`, one uniformly in each of :code:`budget` equal strata.
+
+    :param space: size of the sampled space
+    :param budget: number of ranks to sample
+    :param seed: prng seed
+    :type space: int
+    :type budget: int
+    :type seed: int or None
+    :return: the increasing sampled ranks
+    :rtype: list(int) or range
+    '''
+    if budget >= space:
+        return range(space)
+    prng = random.Random(seed)
+    return [ prng.randrange(i * space // budget, (i + 1) * space // budget) for i in range(budget) ]
+# --------------------
 class BinaryMutant:
     '''Abstract representation of a binary mutant.
 
     :param binary: the binary file of the mutant
     :param targets: faulted instruction adresses
+    :param digest: content hash of the binary file, set once faulted
+    :param alias: binary file of an identical mutant evaluated in place of this one, if any
     :type binary: str
     :type targets: list(int)
+    :type digest: str or None
+    :type alias: str or None
     '''
 
     def __init__(self, binary, targets):
         self.binary = binary
         self.targets = targets
+        self.digest = None
+        self.alias = None
+
+    def compute_digest(self):
+        '''Compute and store the content hash of the mutant binary file.
+
+        :return: the hex digest of the binary file content
+        :rtype: str
+        '''
+        with open(self.binary, 'rb') as stream:
+            self.digest = hashlib.sha256(stream.read()).hexdigest()
+        return self.digest
 
     @property
     def targets_str(self):
@@ -52,45 +176,108 @@ class GenericPlacer:
         else:
             self.mapping = MapperFromMap(self.opts.binary, self.log, self.opts.map)
 
+    @property
+    def space(self):
+        '''Size of the complete fault space of this placer.
+
+        :return: the number of targets generated by :code:`generate_targets`
+        :rtype: int
+        '''
+        raise NotImplementedError(self)
+
+    @property
+    def partial(self):
+        '''Whether only a subset of the fault space is generated (shard or sample).
+
+        :rtype: bool
+        '''
+        return self.opts.shard is not None or self.opts.sample_budget is not None
+
     @property
     def estimate(self):
         '''Estimate the number of mutants to generate for this fault placer.
 
+        Accounts for :class:`fistic.FisticOptions`:code:`.sample_budget` and :code:`.shard`.
+
         :return: an estimation of the number of mutants that will be generated
         :rtype: int
         '''
-        raise NotImplementedError(self)
+        count = self.space
+        if self.opts.sample_budget is not None:
+            count = min(count, self.opts.sample_budget)
+        if self.opts.shard is not None:
+            shard, shards = self.opts.shard
+            count = (shard + 1) * count // shards - shard * count // shards
+        return count
+
+    def selected_ranks(self):
+        '''Select the ranks of the targets to generate in the complete fault space.
+
+        Ranks are first sampled if :class:`fistic.FisticOptions`:code:`.sample_budget` is set,
+        then the selected ranks are restricted to the :code:`k`-th of :code:`N` contiguous slices
+        if :class:`fistic.FisticOptions`:code:`.shard` is set to :code:`(k, N)`.
 
-    def _new_binary(self):
+        :return: increasing ranks of the targets to generate
+        :rtype: sequence(int)
+        '''
+        ranks = range(self.space)
+        if self.opts.sample_budget is not None:
+            ranks = stratified_sample(self.space, self.opts.sample_budget, self.opts.sample_seed)
+        if self.opts.shard is not None:
+            shard, shards = self.opts.shard
+            count = ranks.stop if isinstance(ranks, range) else len(ranks)
+            ranks = ranks[shard * count // shards:(shard + 1) * count // shards]
+        return ranks
+
+    def _new_binary(self, cid=None):
         '''Create a new copy of the source binary.
 
         Creates a new copy of :code:`opts.binary` in :code:`opts.faulted_binaries_dir`,
                 named :code:`opts.faulted_binaries_template.format(id)` and increases the internal binary id.
 
+        :param cid: binary id, defaults to the internal binary id
+        :type cid: int or None
         :return: path to the new binary copy
         :rtype: str
         '''
+        cid = self.cid if cid is None else cid
         create_directory(self.opts.faulted_binaries_dir)
-        binfile = self.opts.faulted_binaries_template.format(self.cid)
+        binfile = self.opts.faulted_binaries_template.format(cid)
         binfile = os.path.join(self.opts.faulted_binaries_dir, binfile)
         shutil.copyfile(self.opts.binary, binfile)
-        self.cid += 1
+        self.cid = cid + 1
         return binfile
 
     def generate_mutants(self, faulter):
         '''Generate the faulted mutants.
 
         Generates in :code:`opts.faulted_binaries_dir` all the mutants corresponding the application of the underlying fault model.
+        The content hash of each mutant is computed once faulted.
+        Mutants are identified by the rank of their target in the complete fault space, so that
+        identifiers of sharded or sampled runs match the ones of a complete run.
 
         :return: generator returning the fistic representation of the created binary mutant, fault applied
         :rtype: generator(:class:`fistic.placers.BinaryMutant`)
         '''
-        for target in self.generate_targets():
-            binfile = self._new_binary()
+        for cid, target in self.generate_indexed_targets():
+            binfile = self._new_binary(cid)
             mutant = BinaryMutant(binfile, target)
             faulter(mutant, self.mapping)
+            mutant.compute_digest()
             yield mutant
 
+    def generate_indexed_targets(self):
+        '''Generate the targets to fault, with their rank in the complete fault space.
+
+        Restricted to :code:`selected_ranks` if only a subset of the fault space is generated.
+
+        :return: generator returning each rank and its target addresses
+        :rtype: generator(int, tuple(int))
+        '''
+        if self.partial:
+            return self.generate_ranked_targets(self.selected_ranks())
+        return enumerate(self.generate_targets())
+
     def generate_targets(self):
         '''Generate the list of addresses to fault for each mutant to fault.
 
@@ -98,13 +285,33 @@ class GenericPlacer:
         :rtype: generator(tuple(int))
         '''
         raise NotImplementedError(self)
+
+    def generate_ranked_targets(self, ranks):
+        '''Generate the targets of given ranks in :code:`generate_targets` order.
+
+        Placers should override this with direct unranking, the default implementation
+        filters the complete enumeration.
+
+        :param ranks: increasing ranks of the targets to generate
+        :type ranks: iterable(int)
+        :return: generator returning each rank and its target addresses
+        :rtype: generator(int, tuple(int))
+        '''
+        ranks = iter(ranks)
+        wanted = next(ranks, None)
+        for rank, target in enumerate(self.generate_targets()):
+            if wanted is None:
+                return
+            if rank == wanted:
+                yield rank, target
+                wanted = next(ranks, None)
 # --------------------
 class NowherePlacer(GenericPlacer):
     '''Utility class for placing no mutation whatsoever.
     '''
 
     @property
-    def estimate(self):
+    def space(self):
         return 0
 
     def generate_targets(self):
@@ -0,0 +1,217 @@
+'''Placers restricting fault locations to the instructions covered by the golden run'''
+# --------------------
+import re
+import os
+import math
+import shlex
+import itertools
+import tempfile
+from subprocess import Popen, TimeoutExpired, DEVNULL
+# --------------------
+from fistic.evaluators.qemu import QemuEvaluator
+from .core import rank_combination
+from .function import FunctionsPlacer, OnFunctionPlacer
+# --------------------
+class GoldenCoverage:
+    '''Instruction coverage of a golden run.
+
+    :param hits: execution count, by instruction address
+    :type hits: dict(int, int)
+    '''
+
+    def __init__(self, hits=None):
+        self.hits = hits if hits is not None else {}
+
+    def __contains__(self, addr):
+        return addr in self.hits
+
+    def __getitem__(self, addr):
+        return self.hits.get(addr, 0)
+
+    def __len__(self):
+        return len(self.hits)
+# --------------------
+class QemuTraceParser:
+    '''Parser for qemu :code:`-d in_asm,exec,nochain` execution logs.
+
+    The :code:`exec` entries give the start address of each executed translation block,
+    the :code:`in_asm` entries give the instructions each translation block contains.
+    Hit counts of a block are propagated to all its instructions; blocks for which no
+    disassembly was logged only account for their start address.
+
+    :param coverage: the recovered instruction coverage
+    :type coverage: :class:`fistic.placers.coverage.GoldenCoverage`
+    '''
+
+    InAsmStart = re.compile(r'^IN:')
+    InAsmInsn = re.compile(r'^0x([0-9a-fA-F]+):')
+    ExecTrace = re.compile(r'^Trace\s+(?:\d+:\s+)?\S+\s+\[([^\]]*)\]')
+
+    def __init__(self, stream):
+        self.blocks = {}
+        self.tb_hits = {}
+        self.coverage = GoldenCoverage()
+        self._parse(stream)
+
+    @staticmethod
+    def _exec_pc(bracket):
+        fields = bracket.split('/')
+        if len(fields) >= 2:
+            return int(fields[1], 16)
+        return int(fields[0].split(':')[-1].strip(), 16)
+
+    def _parse(self, stream):
+        current = None
+        for line in stream:
+            if self.InAsmStart.match(line):
+                current = []
+                continue
+            if current is not None:
+                match = self.InAsmInsn.match(line)
+                if match:
+                    current.append(int(match.group(1), 16))
+                    continue
+                if current:
+                    self.blocks[current[0]] = current
+                current = None
+            match = self.ExecTrace.match(line)
+            if match:
+                pc = self._exec_pc(match.group(1))
+                self.tb_hits[pc] = self.tb_hits.get(pc, 0) + 1
+        if current:
+            self.blocks[current[0]] = current
+        for pc, count in self.tb_hits.items():
+            for addr in self.blocks.get(pc, (pc,)):
+                self.coverage.hits[addr] = self.coverage.hits.get(addr, 0) + count
+# --------------------
+class QemuTracer:
+    '''Utility class for tracing a golden run with qemu.
+
+    Uses the same qemu server as :class:`fistic.evaluators.QemuEvaluator`, with execution
+    logging enabled.
+
+    :param opts: context fistic options
+    :param log: logging utility class
+    :type opts: :class:`fistic.FisticOptions`
+    '''
+
+    TraceFlags = '-d in_asm,exec,nochain -D {}'
+
+    def __init__(self, opts, logger):
+        self.opts = opts
+        self.log = logger
+
+    def generate_command(self, binary, tracefile):
+        '''Generates the qemu command to execute for tracing a binary.
+
+        :param binary: target filename
+        :param tracefile: qemu log output filename
+        :type binary: str
+        :type tracefile: str
+        :rtype: str
+        '''
+        evaluator = QemuEvaluator(self.opts, self.log)
+        return f'{evaluator.server} {binary} {self.TraceFlags.format(shlex.quote(tracefile))}'
+
+    def __call__(self, binary):
+        '''Trace a binary execution and recover its coverage.
+
+        :param binary: target filename
+        :type binary: str
+        :rtype: :class:`fistic.placers.coverage.GoldenCoverage`
+        '''
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tracefile = os.path.join(tmpdir, 'golden.trace')
+            command = self.generate_command(binary, tracefile)
+            self.log.debug(f'tracing golden run: {command}')
+            proc = Popen(shlex.split(command), stdout=DEVNULL, stderr=DEVNULL)
+            try:
+                proc.wait(timeout=self.opts.evaluation_timeout or QemuEvaluator.DefaultTimeout)
+            except TimeoutExpired:
+                proc.kill()
+                proc.wait()
+                self.log.warning('golden run tracing timed out; coverage may be partial')
+            with open(tracefile, errors='ignore') as stream:
+                return QemuTraceParser(stream).coverage
+# --------------------
+class CoveredFunctionsPlacer(FunctionsPlacer):
+    '''Place faults on the addresses of the target functions executed by the golden run.
+
+    Behaves as :class:`fistic.placers.FunctionsPlacer`, discarding the instructions that
+    the golden run never executes, as skipping them produces mutants equivalent to the
+    golden run. The coverage is read from :class:`fistic.FisticOptions`:code:`.coverage_trace`
+    if given, and obtained by tracing the golden run with qemu otherwise.
+
+    Inline data addresses are never executed, hence are kept unless
+    :class:`fistic.FisticOptions`:code:`.dont_fault_data` is set.
+
+    If :class:`fistic.FisticOptions`:code:`.coverage_weighted` is set, combinations are
+    enumerated on addresses ordered by decreasing hit count, so that mutants on hot instructions
+    are generated first. Mutants keep the identifier of their target in address order, hence
+    the same identifiers as without weighting. Weighting does not apply to sharded or sampled runs.
+    '''
+
+    def __init__(self, opts, logger):
+        super().__init__(opts, logger)
+        self._coverage = None
+
+    @property
+    def coverage(self):
+        '''Instruction coverage of the golden run, computed on first access.
+
+        :rtype: :class:`fistic.placers.coverage.GoldenCoverage`
+        '''
+        if self._coverage is None:
+            if self.opts.coverage_trace is not None:
+                self.log.info(f'loading golden run coverage from {self.opts.coverage_trace}')
+                with open(self.opts.coverage_trace, errors='ignore') as stream:
+                    self._coverage = QemuTraceParser(stream).coverage
+            else:
+                self.log.info(f'tracing golden run coverage (target: {self.opts.binary})')
+                self._coverage = QemuTracer(self.opts, self.log)(self.opts.binary)
+            self.log.info(f'golden run covered instruction count: {len(self._coverage)}')
+        return self._coverage
+
+    def generate_function_addresses(self, fun):
+        return [ a for a, bdl in self.mapping[fun].items()
+                 if a in self.coverage or (bdl.is_data() and not self.opts.dont_fault_data) ]
+
+    def generate_address_groups(self):
+        '''Generate the sets of addresses whose combinations make up the fault space.
+
+        :rtype: generator(list(int))
+        '''
+        yield list(self.generate_addresses())
+
+    def generate_indexed_targets(self):
+        if not self.opts.coverage_weighted or self.partial:
+            return super().generate_indexed_targets()
+        return self.generate_weighted_targets()
+
+    def generate_weighted_targets(self):
+        '''Generate the targets to fault, most executed addresses first.
+
+        :return: generator returning each rank in the complete fault space and its target addresses
+        :rtype: generator(int, tuple(int))
+        '''
+        offset = 0
+        for addrs in self.generate_address_groups():
+            index = { a: i for i, a in enumerate(addrs) }
+            hot = sorted(addrs, key=lambda a: self.coverage[a], reverse=True)
+            for target in itertools.combinations(hot, self.opts.fault_count):
+                indices = sorted((index[a] for a in target))
+                yield offset + rank_combination(len(addrs), indices), tuple((addrs[i] for i in indices))
+            offset += math.comb(len(addrs), self.opts.fault_count)
+# --------------------
+class OnCoveredFunctionPlacer(CoveredFunctionsPlacer, OnFunctionPlacer):
+    '''Place faults on single function addresses executed by the golden run.
+
+    Behaves as :class:`fistic.placers.CoveredFunctionsPlacer` for single faults.
+    For multifault, faults are always injected in the same function.
+    '''
+
+    def generate_address_groups(self):
+        for fun in self.opts.functions:
+            yield list(self.generate_function_addresses(fun))
+# --------------------
+# --------------------
@@ -3,6 +3,7 @@
 import math
 import itertools
 # --------------------
+from .core import ranked_combinations
 from .address import AddressesPlacer
 # --------------------
 class FunctionsPlacer(AddressesPlacer):
@@ -14,10 +15,6 @@ class FunctionsPlacer(AddressesPlacer):
     Build combinations on the complete set of addresses.
     '''
 
-    @property
-    def estimate(self):
-        return math.comb(sum((len(self.mapping[f]) for f in self.opts.functions)), self.opts.fault_count)
-
     def generate_function_addresses(self, fun):
         '''Generates the set of addresses of a given function.
 
@@ -45,10 +42,30 @@ class OnFunctionPlacer(FunctionsPlacer):
     For multifault, faults are always injected in the same function.
     '''
 
+    @property
+    def space(self):
+        return sum((math.comb(len(list(self.generate_function_addresses(fun))), self.opts.fault_count)
+                    for fun in self.opts.functions))
+
     def generate_targets(self):
         for fun in self.opts.functions:
             addrs = self.generate_function_addresses(fun)
             for target in itertools.combinations(addrs, self.opts.fault_count):
                 yield target
+
+    def generate_ranked_targets(self, ranks):
+        ranks = iter(ranks)
+        offset = 0
+        rank = next(ranks, None)
+        for fun in self.opts.functions:
+            addrs = list(self.generate_function_addresses(fun))
+            count = math.comb(len(addrs), self.opts.fault_count)
+            franks = []
+            while rank is not None and rank < offset + count:
+                franks.append(rank - offset)
+                rank = next(ranks, None)
+            for frank, target in ranked_combinations(addrs, self.opts.fault_count, franks):
+                yield offset + frank, target
+            offset += count
 # --------------------
 # --------------------
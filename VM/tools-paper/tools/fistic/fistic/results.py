@@ -0,0 +1,129 @@
+'''Fistic results storage, written incrementally as mutants are evaluated'''
+# --------------------
+import json
+# --------------------
+import yaml
+try:
+    from yaml import CLoader as ymlLoader, CDumper as ymlDumper
+except ImportError:
+    from yaml import Loader as ymlLoader, Dumper as ymlDumper
+# --------------------
+from fistic.placers.core import BinaryMutant
+from fistic.evaluators.core import EvaluationStatus
+# --------------------
+class ResultsSink:
+    '''Append-only JSON lines store for mutant evaluation results.
+
+    Each evaluated mutant is written and flushed as a single line as soon as its
+    evaluation completes, so that interrupted runs keep their partial results.
+
+    :param filename: target JSON lines file
+    :param flush_every: number of records between two flushes
+    :type filename: str
+    :type flush_every: int
+    '''
+
+    def __init__(self, filename, flush_every=1):
+        self.filename = filename
+        self.flush_every = flush_every
+        self.count = 0
+        self.stream = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def open(self):
+        '''Open the sink, discarding the results of any previous run.'''
+        self.stream = open(self.filename, 'w')
+        self.count = 0
+
+    def close(self):
+        '''Flush and close the sink.'''
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+    def record(self, mutant, status, golden=False):
+        '''Append the evaluation result of a mutant.
+
+        :param mutant: evaluated mutant
+        :param status: evaluation result
+        :param golden: whether the mutant is the golden run
+        :type mutant: :class:`fistic.placers.BinaryMutant`
+        :type status: :class:`fistic.evaluators.EvaluationStatus`
+        :type golden: bool
+        '''
+        entry = {
+            'binary': mutant.binary,
+            'targets': list(mutant.targets),
+            'digest': mutant.digest,
+            'alias': mutant.alias,
+            'status': status.value,
+            'golden': golden,
+        }
+        self.stream.write(json.dumps(entry) + '\n')
+        self.count += 1
+        if self.count % self.flush_every == 0:
+            self.stream.flush()
+# --------------------
+def iter_results(filename):
+    '''Read the records of a results sink.
+
+    Truncated trailing lines, as left by a killed run, are ignored.
+
+    :param filename: results sink file
+    :type filename: str
+    :return: generator returning each record as a dict
+    :rtype: generator(dict)
+    '''
+    with open(filename) as stream:
+        for line in stream:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+# --------------------
+def load_results(filename):
+    '''Load the results of a results sink as fistic objects.
+
+    :param filename: results sink file
+    :type filename: str
+    :return: evaluation results
+    :rtype: dict(:class:`fistic.placers.BinaryMutant`, :class:`fistic.evaluators.EvaluationStatus`)
+    '''
+    results = {}
+    for entry in iter_results(filename):
+        mutant = BinaryMutant(entry['binary'], entry['targets'] if entry['golden'] else tuple(entry['targets']))
+        mutant.digest = entry['digest']
+        mutant.alias = entry['alias']
+        results[mutant] = EvaluationStatus(entry['status'])
+    return results
+# --------------------
+def golden_result(filename):
+    '''Recover the golden run evaluation result from a results sink.
+
+    :param filename: results sink file
+    :type filename: str
+    :return: the golden run result, if recorded
+    :rtype: :class:`fistic.evaluators.EvaluationStatus` or None
+    '''
+    for entry in iter_results(filename):
+        if entry['golden']:
+            return EvaluationStatus(entry['status'])
+    return None
+# --------------------
+def export_results(filename, target):
+    '''Export the results of a results sink to the legacy yaml format.
+
+    :param filename: results sink file
+    :param target: target to write the results to
+    :type filename: str
+    :type target: fp('w')
+    '''
+    yaml.dump(load_results(filename), target, Dumper=ymlDumper)
+# --------------------
+# --------------------
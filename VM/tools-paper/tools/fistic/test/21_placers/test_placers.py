@@ -1,10 +1,13 @@
 # -------------------------------------
 import os
+import itertools
 import pulseutils.logging
 import pytest
 from fistic import FisticOptions
 from fistic.placers import *
-from fistic.placers.core import GenericPlacer
+from fistic.placers.core import GenericPlacer, ranked_combinations, unrank_combination, rank_combination, stratified_sample
+from fistic.placers.coverage import QemuTraceParser
+from fistic.mapper import MapperCore, Bundler, IType
 from fistic.faulters import NoFault
 # -------------------------------------
 Logger = pulseutils.logging.Logger(4, False, False)
@@ -69,3 +72,83 @@ for tid, binary, addresses, daddrs, functions in zip(('bex1', 'bex2'),
     exec(f'test_functions_single_fault_{tid} = lambda : ensure_single(FunctionsPlacer, {binary}, {addresses}, {functions})')
     exec(f'test_functions_single_fault_nodata_{tid} = lambda : ensure_single(FunctionsPlacer, {binary}, {addresses}, {functions}, {daddrs})')
 # -------------------------------------
+QemuTraceExample = '''IN: verifyPIN_A
+0x000001d0:  b580       push     {r7, lr}
+0x000001d2:  af00       add      r7, sp, #0
+0x000001d4:  f000 f80e  bl       #0x1f4
+
+Trace 0: 0x7f1c34000100 [00000000/000001d0/0x40000000] verifyPIN_A
+IN: verifyPIN_A
+0x000001f4:  4b04       ldr      r3, [pc, #0x10]
+
+Trace 0: 0x7f1c34000200 [00000000/000001f4/0x40000000] verifyPIN_A
+Trace 0: 0x7f1c34000100 [00000000/000001d0/0x40000000] verifyPIN_A
+Trace 0: 0x7f1c34000300 [00000000/00000200/0x40000000] verifyPIN_A
+'''
+# -------------------------------------
+def test_coverage_trace_parser():
+    coverage = QemuTraceParser(QemuTraceExample.splitlines(keepends=True)).coverage
+    assert coverage.hits == { 0x1d0: 2, 0x1d2: 2, 0x1d4: 2, 0x1f4: 1, 0x200: 1 }
+    assert 0x1d8 not in coverage
+    assert coverage[0x1d8] == 0
+# -------------------------------------
+def test_ranked_combinations():
+    elements = list(range(9))
+    for k in (1, 2, 3):
+        expected = list(itertools.combinations(elements, k))
+        assert list(ranked_combinations(elements, k, range(len(expected)))) == list(enumerate(expected))
+        assert [ tuple(unrank_combination(9, k, r)) for r in range(len(expected)) ] == expected
+        assert [ rank_combination(9, c) for c in expected ] == list(range(len(expected)))
+        sparse = [ 0, 3, 4, 5, len(expected) - 1 ]
+        assert list(ranked_combinations(elements, k, sparse)) == [ (r, expected[r]) for r in sparse ]
+# -------------------------------------
+def test_stratified_sample():
+    sample = stratified_sample(10**30, 100, seed=42)
+    assert sample == stratified_sample(10**30, 100, seed=42)
+    assert len(sample) == 100 and sample == sorted(sample)
+    assert all((i * 10**28 <= r < (i + 1) * 10**28 for i, r in enumerate(sample)))
+    assert stratified_sample(10, 100) == range(10)
+# -------------------------------------
+def covered_setup(placerclass, tmp_path, functions, fc, dfd, weighted):
+    # map of the example binary, so that placers need no disassembler
+    mapping = MapperCore(ExampleBinary1, Logger)
+    mapping.mapping = {
+        fun: { **{ a: Bundler(a, IType.INSN, 2) for a in insns }, **{ a: Bundler(a, IType.DATA, 4) for a in data } }
+        for fun, insns, data in ((ExampleBinary1Funcs[0], ExampleBinary1CoreAddrs, ExampleBinary1DataAddrs),
+                                 (ExampleBinary1Main[0], ExampleBinary1MainAddrs, ExampleBinary1MainDataAddrs))
+    }
+    mapping.parsed = True
+    with open(tmp_path / 'example.map', 'w') as stream:
+        mapping.write_config(stream)
+    trace = tmp_path / 'golden.trace'
+    trace.write_text(QemuTraceExample)
+    opts = FisticOptions(binary=ExampleBinary1, textaddr=0x10000, functions=functions, fault_count=fc, skip_count=1,
+                         dont_fault_data=dfd, map=str(tmp_path / 'example.map'),
+                         coverage_trace=str(trace), coverage_weighted=weighted)
+    return placerclass(opts, Logger)
+# -------------------------------------
+ExampleBinary1Covered = [ 0x1d0, 0x1d2, 0x1d4, 0x1f4, 0x200 ]
+# -------------------------------------
+def test_covered_placer_drops_uncovered_addresses(tmp_path):
+    placer = covered_setup(CoveredFunctionsPlacer, tmp_path, ExampleBinary1Funcs, 1, True, False)
+    assert list(placer.generate_targets()) == [ (addr,) for addr in ExampleBinary1Covered ]
+    assert placer.space == len(ExampleBinary1Covered)
+    placer = covered_setup(CoveredFunctionsPlacer, tmp_path, ExampleBinary1Funcs, 1, False, False)
+    assert list(placer.generate_targets()) == [ (addr,) for addr in ExampleBinary1Covered + ExampleBinary1DataAddrs ]
+    placer = covered_setup(OnCoveredFunctionPlacer, tmp_path, ExampleBinary1Funcs + ExampleBinary1Main, 1, True, False)
+    assert list(placer.generate_targets()) == [ (addr,) for addr in ExampleBinary1Covered ]
+# -------------------------------------
+@pytest.mark.parametrize('placerclass', (CoveredFunctionsPlacer, OnCoveredFunctionPlacer))
+@pytest.mark.parametrize('fc', (1, 2, 3))
+def test_covered_weighted_placer_keeps_mutant_ids(tmp_path, placerclass, fc):
+    functions = ExampleBinary1Funcs + ExampleBinary1Main
+    expected = list(enumerate(covered_setup(placerclass, tmp_path, functions, fc, False, False).generate_targets()))
+    placer = covered_setup(placerclass, tmp_path, functions, fc, False, True)
+    weighted = list(placer.generate_indexed_targets())
+    assert sorted(weighted) == expected
+    if fc == 1:
+        # hot instructions first, ties in address order
+        assert [ target for _, target in weighted[:5] ] == [ (0x1d0,), (0x1d2,), (0x1d4,), (0x1f4,), (0x200,) ]
+        assert weighted[0][0] == 0 and weighted[3][0] == 3
+    placer.opts.shard = (1, 2)
+    assert list(placer.generate_indexed_targets()) == expected[len(expected) // 2:]
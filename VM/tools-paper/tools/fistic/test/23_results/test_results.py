@@ -0,0 +1,30 @@
+# -------------------------------------
+import os
+from fistic.placers import BinaryMutant
+from fistic.evaluators import EvaluationStatus
+from fistic.results import ResultsSink, load_results, golden_result
+# -------------------------------------
+OutputSink = 'fistic-results.test.jsonl'
+# -------------------------------------
+def test_results_sink_roundtrip():
+    golden = BinaryMutant('source.bin', [])
+    mutant = BinaryMutant('f0.bin', (0x1d0, 0x1d2))
+    mutant.alias = 'source.bin'
+    with ResultsSink(OutputSink) as sink:
+        sink.record(golden, EvaluationStatus.Valid, golden=True)
+        sink.record(mutant, EvaluationStatus.Invalid)
+    results = { m.binary: (m.targets, m.alias, r) for m, r in load_results(OutputSink).items() }
+    assert results == { 'source.bin': ([], None, EvaluationStatus.Valid),
+                        'f0.bin': ((0x1d0, 0x1d2), 'source.bin', EvaluationStatus.Invalid) }
+    assert golden_result(OutputSink) == EvaluationStatus.Valid
+    os.remove(OutputSink)
+# -------------------------------------
+def test_results_sink_truncated():
+    with ResultsSink(OutputSink) as sink:
+        sink.record(BinaryMutant('f0.bin', (0x1d0,)), EvaluationStatus.Timeout)
+    with open(OutputSink, 'a') as stream:
+        stream.write('{"binary": "f1.b')
+    assert len(load_results(OutputSink)) == 1
+    assert golden_result(OutputSink) is None
+    os.remove(OutputSink)
+# -------------------------------------
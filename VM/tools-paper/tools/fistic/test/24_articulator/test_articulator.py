@@ -0,0 +1,81 @@
+# -------------------------------------
+import io
+import sys
+import pytest
+from fistic import FisticOptions, Articulator
+from fistic.core import ArticulationMode
+from fistic.placers import BinaryMutant
+from fistic.faulters import NoFault
+from fistic.evaluators import EvaluationStatus
+from fistic.results import load_results
+# -------------------------------------
+Contents = [ b'a', b'b', b'a', b'golden', b'b' ]
+Statuses = { b'golden': EvaluationStatus.Valid, b'a': EvaluationStatus.Invalid, b'b': EvaluationStatus.Timeout }
+# -------------------------------------
+class ContentPlacer:
+
+    def __init__(self, opts, logger):
+        self.directory = opts.faulted_binaries_dir
+        self.estimate = len(Contents)
+
+    def generate_mutants(self, faulter):
+        for idx, content in enumerate(Contents):
+            binary = str(self.directory / f'f{idx}.bin')
+            with open(binary, 'wb') as stream:
+                stream.write(content)
+            mutant = BinaryMutant(binary, (idx,))
+            mutant.compute_digest()
+            yield mutant
+# -------------------------------------
+class ContentEvaluator:
+
+    evaluated = []
+
+    def __init__(self, opts, logger):
+        pass
+
+    def __call__(self, mutant, golden=False):
+        with open(mutant.binary, 'rb') as stream:
+            content = stream.read()
+        ContentEvaluator.evaluated.append(mutant.binary)
+        return mutant, Statuses[content]
+# -------------------------------------
+def run_articulator(tmp_path, mode, deduplicate=True):
+    golden = tmp_path / 'golden.bin'
+    golden.write_bytes(b'golden')
+    ContentEvaluator.evaluated = []
+    opts = FisticOptions(binary=str(golden), results_sink=str(tmp_path / 'results.jsonl'), yaml_export=False,
+                         placer=ContentPlacer, faulter=NoFault, evaluator=ContentEvaluator,
+                         articulation_mode=mode, faulted_binaries_dir=tmp_path, deduplicate=deduplicate)
+    Articulator(opts)()
+    return { m.binary: (m.alias, r) for m, r in load_results(opts.results_sink).items() }
+# -------------------------------------
+@pytest.mark.parametrize('mode', [ ArticulationMode.Linear, ArticulationMode.Parallel ])
+def test_identical_mutants_evaluated_once(tmp_path, mode):
+    results = run_articulator(tmp_path, mode)
+    assert sorted(ContentEvaluator.evaluated) == sorted([ str(tmp_path / 'golden.bin'),
+                                                          str(tmp_path / 'f0.bin'), str(tmp_path / 'f1.bin') ])
+    assert len(results) == len(Contents) + 1
+# -------------------------------------
+@pytest.mark.parametrize('mode', [ ArticulationMode.Linear, ArticulationMode.Parallel ])
+def test_aliases_get_representative_status(tmp_path, mode):
+    results = run_articulator(tmp_path, mode)
+    path = lambda name: str(tmp_path / name)
+    assert results[path('f2.bin')] == (path('f0.bin'), EvaluationStatus.Invalid)
+    assert results[path('f3.bin')] == (path('golden.bin'), EvaluationStatus.Valid)
+    assert results[path('f4.bin')] == (path('f1.bin'), EvaluationStatus.Timeout)
+    assert results[path('f0.bin')] == (None, EvaluationStatus.Invalid)
+# -------------------------------------
+def test_no_deduplication_evaluates_all(tmp_path):
+    results = run_articulator(tmp_path, ArticulationMode.Linear, deduplicate=False)
+    assert len(ContentEvaluator.evaluated) == len(Contents) + 1
+    assert all(alias is None for alias, _ in results.values())
+# -------------------------------------
+def test_communicate_aliases_skip_handshake(tmp_path, monkeypatch):
+    stdin = io.StringIO('next\n' * 10)
+    monkeypatch.setattr(sys, 'stdin', stdin)
+    results = run_articulator(tmp_path, ArticulationMode.Communicate)
+    assert len(results) == len(Contents) + 1
+    # one handshake to start, then one per evaluated mutant
+    assert stdin.getvalue()[:stdin.tell()].count('next') == 3
+# -------------------------------------
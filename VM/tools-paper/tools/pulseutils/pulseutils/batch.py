@@ -0,0 +1,102 @@
+# ----------------------------------------
+import json
+import queue
+import atexit
+import threading
+from subprocess import Popen, PIPE, DEVNULL
+# ----------------------------------------
+class BatchServer:
+    """Client of a warm batch server process (e.g. `pyabduce --serve`).
+
+    The server reads one JSON problem per line on its standard input and answers each of them,
+    in order, with one JSON result line on its standard output.
+    The process is started with `cmd` (list of parameters, typed for `Popen`), `env` and `cwd` on first use,
+    and restarted after a crash or a timeout.
+    """
+
+    def __init__(self, cmd, env=None, stderr=DEVNULL, cwd=None):
+        self.cmd = cmd
+        self.env = env
+        self.stderr = stderr
+        self.cwd = cwd
+        self.proc = None
+        self.responses = None
+
+    def _start(self):
+        self.proc = Popen(self.cmd, stdin=PIPE, stdout=PIPE, stderr=self.stderr, env=self.env, cwd=self.cwd, text=True, bufsize=1)
+        self.responses = queue.Queue()
+        def pump(stream, responses):
+            with stream:
+                for line in stream:
+                    responses.put(line)
+            responses.put(None)
+        threading.Thread(target=pump, args=(self.proc.stdout, self.responses), daemon=True).start()
+
+    def solve(self, problem, timeout=None, grace=10):
+        """Submits the `problem` dictionary to the server and returns its decoded result dictionary.
+
+        If no result is received within `timeout` seconds (plus `grace` seconds, as the server is
+        expected to enforce the problem timeout itself), the server is killed and the returned result has
+        status `timeout`. If the server dies while solving, the returned result has status `crash`.
+        """
+        if self.proc is None or self.proc.poll() is not None:
+            self._start()
+        try:
+            self.proc.stdin.write(json.dumps(problem) + '\n')
+            self.proc.stdin.flush()
+            line = self.responses.get(timeout=(timeout + grace if timeout is not None else None))
+        except BrokenPipeError:
+            line = None
+        except queue.Empty:
+            self.close(kill=True)
+            return { 'id': problem.get('id'), 'status': 'timeout', 'returncode': None }
+        if line is None:
+            self.close(kill=True)
+            return { 'id': problem.get('id'), 'status': 'crash', 'returncode': None }
+        return json.loads(line)
+
+    def close(self, kill=False):
+        """Stops the server process (closing its input, or killing it if `kill` is `True`)."""
+        if self.proc is None:
+            return
+        if kill:
+            self.proc.kill()
+        else:
+            try:
+                self.proc.stdin.close()
+            except BrokenPipeError:
+                pass
+        self.proc.wait()
+        self.proc = None
+# ----------------------------------------
+class BatchServerPool:
+    """Per-thread pool of `BatchServer` instances sharing the same command.
+
+    Each thread submitting problems gets its own server process, so that parallel tasks never
+    wait on each other. All servers are stopped on `close` (and at interpreter exit).
+    """
+
+    def __init__(self, cmd, env=None, stderr=DEVNULL):
+        self.cmd = cmd
+        self.env = env
+        self.stderr = stderr
+        self.servers = []
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        atexit.register(self.close)
+
+    def server(self):
+        if getattr(self.local, 'server', None) is None:
+            self.local.server = BatchServer(self.cmd, env=self.env, stderr=self.stderr)
+            with self.lock:
+                self.servers.append(self.local.server)
+        return self.local.server
+
+    def solve(self, problem, timeout=None):
+        return self.server().solve(problem, timeout=timeout)
+
+    def close(self):
+        with self.lock:
+            for server in self.servers:
+                server.close()
+# ----------------------------------------
@@ -1,5 +1,6 @@
 # ----------------------------------------
 import sys
+import threading
 from subprocess import Popen, STDOUT, PIPE, TimeoutExpired
 # ----------------------------------------
 def execute_command(cmd, timeout=None, stdin=None, merge_output=True):
@@ -25,3 +26,34 @@ def execute_command(cmd, timeout=None, stdin=None, merge_output=True):
         cout, cerr = proc.communicate()
     return proc.returncode, to_status, cout.decode(sys.stdout.encoding, errors='ignore'), cerr.decode(sys.stderr.encoding, errors='ignore') if cerr is not None else None
 # ----------------------------------------
+def stream_command(cmd, out_handler, err_handler, timeout=None):
+    """Executes the system command `cmd` (list of parameters, typed for `Popen`), streaming its output.
+
+    Each line of the standard output (resp. standard error) is decoded and passed to `out_handler`
+    (resp. `err_handler`) as soon as it is produced, so that outputs are never held in memory as a whole.
+    Handlers are called from two reader threads.
+    Stops the execution after `timeout` seconds (never if `timeout` is `None`).
+
+    Returns a tuple `rc`, `to` with `rc` the return code of the execution and
+    `to` a boolean value set to `True` iff timeout was exceeded.
+    """
+    proc = Popen(cmd, stdout=PIPE, stderr=PIPE)
+    def pump(stream, handler, encoding):
+        with stream:
+            for line in stream:
+                handler(line.decode(encoding, errors='ignore'))
+    readers = [ threading.Thread(target=pump, args=(proc.stdout, out_handler, sys.stdout.encoding), daemon=True),
+                threading.Thread(target=pump, args=(proc.stderr, err_handler, sys.stderr.encoding), daemon=True) ]
+    for reader in readers:
+        reader.start()
+    to_status = False
+    try:
+        proc.wait(timeout=timeout)
+    except TimeoutExpired:
+        to_status = True
+        proc.kill()
+        proc.wait()
+    for reader in readers:
+        reader.join()
+    return proc.returncode, to_status
+# ----------------------------------------
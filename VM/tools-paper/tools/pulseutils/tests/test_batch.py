@@ -0,0 +1,72 @@
+import sys
+import threading
+import unittest
+
+from pulseutils.batch import BatchServer, BatchServerPool
+
+# answers each problem with the pid of the server, crashes or hangs on request
+SERVER = r'''
+import os, sys, json, time
+for line in sys.stdin:
+    problem = json.loads(line)
+    if problem.get('action') == 'crash':
+        sys.exit(3)
+    if problem.get('action') == 'hang':
+        time.sleep(60)
+    print(json.dumps({ 'id': problem['id'], 'status': 'ok', 'returncode': 0, 'pid': os.getpid() }), flush=True)
+'''
+
+
+class TestBatchServer(unittest.TestCase):
+    def setUp(self):
+        self.server = BatchServer([ sys.executable, '-c', SERVER ])
+
+    def tearDown(self):
+        self.server.close()
+
+    def test_replies_come_from_a_single_warm_process(self):
+        replies = [ self.server.solve({ 'id': idx }, timeout=10) for idx in range(3) ]
+        self.assertEqual([ r['id'] for r in replies ], [0, 1, 2])
+        self.assertEqual(len({ r['pid'] for r in replies }), 1)
+
+    def test_restart_after_crash(self):
+        first = self.server.solve({ 'id': 'a' }, timeout=10)
+        crashed = self.server.solve({ 'id': 'b', 'action': 'crash' }, timeout=10)
+        self.assertEqual(crashed, { 'id': 'b', 'status': 'crash', 'returncode': None })
+        self.assertIsNone(self.server.proc)
+        second = self.server.solve({ 'id': 'c' }, timeout=10)
+        self.assertEqual(second['status'], 'ok')
+        self.assertNotEqual(first['pid'], second['pid'])
+
+    def test_restart_after_timeout(self):
+        first = self.server.solve({ 'id': 'a' }, timeout=10)
+        proc = self.server.proc
+        hung = self.server.solve({ 'id': 'b', 'action': 'hang' }, timeout=0.2, grace=0.2)
+        self.assertEqual(hung, { 'id': 'b', 'status': 'timeout', 'returncode': None })
+        # the hung server is killed, not left behind
+        self.assertIsNotNone(proc.poll())
+        second = self.server.solve({ 'id': 'c' }, timeout=10)
+        self.assertEqual(second['id'], 'c')
+        self.assertNotEqual(first['pid'], second['pid'])
+
+
+class TestBatchServerPool(unittest.TestCase):
+    def test_one_server_per_thread(self):
+        pool = BatchServerPool([ sys.executable, '-c', SERVER ])
+        pids = {}
+        def solve(name):
+            pids[name] = [ pool.solve({ 'id': idx }, timeout=10)['pid'] for idx in range(2) ]
+        threads = [ threading.Thread(target=solve, args=(name,)) for name in ('a', 'b') ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        pool.close()
+        self.assertEqual(len(set(pids['a'])), 1)
+        self.assertEqual(len(set(pids['b'])), 1)
+        self.assertNotEqual(pids['a'], pids['b'])
+        self.assertTrue(all(server.proc is None for server in pool.servers))
+
+
+if __name__ == '__main__':
+    unittest.main()
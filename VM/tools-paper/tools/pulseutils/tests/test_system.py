@@ -0,0 +1,50 @@
+import sys
+import time
+import unittest
+
+from pulseutils.system import stream_command
+
+
+class TestStreamCommand(unittest.TestCase):
+    def stream(self, script, timeout=None):
+        out, err = [], []
+        ret, to = stream_command([ sys.executable, '-c', script ], out.append, err.append, timeout=timeout)
+        return ret, to, out, err
+
+    def test_lines_are_handled_per_stream(self):
+        ret, to, out, err = self.stream('import sys\n'
+                                        'print("out 1", flush=True)\n'
+                                        'print("err 1", file=sys.stderr, flush=True)\n'
+                                        'print("out 2", flush=True)\n'
+                                        'sys.stdout.write("partial")\n')
+        self.assertEqual((ret, to), (0, False))
+        self.assertEqual(out, [ 'out 1\n', 'out 2\n', 'partial' ])
+        self.assertEqual(err, [ 'err 1\n' ])
+
+    def test_command_failing_partway(self):
+        ret, to, out, err = self.stream('import sys\n'
+                                        'for idx in range(5000):\n'
+                                        '    print(idx)\n'
+                                        'sys.stdout.flush()\n'
+                                        'raise SystemExit("failure")\n')
+        self.assertEqual((ret, to), (1, False))
+        self.assertEqual(out, [ '{}\n'.format(idx) for idx in range(5000) ])
+        self.assertEqual(err, [ 'failure\n' ])
+
+    def test_command_timing_out_partway(self):
+        t_start = time.time()
+        ret, to, out, err = self.stream('import time\n'
+                                        'print("started", flush=True)\n'
+                                        'time.sleep(60)\n', timeout=0.5)
+        self.assertLess(time.time() - t_start, 30)
+        self.assertTrue(to)
+        self.assertNotEqual(ret, 0)
+        self.assertEqual((out, err), ([ 'started\n' ], []))
+
+    def test_missing_command(self):
+        with self.assertRaises(OSError):
+            stream_command([ '/nonexistent/command' ], print, print)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+# -------------------$
+import os
+import re
+import json
+import glob
+import time
+from statistics import median
+# --------------------
+# Regression thresholds: a metric regresses when its value exceeds the baseline
+# value times ratio plus slack (the slack absorbs timing noise on small problems).
+DEFAULT_THRESHOLDS = {
+    'time':             { 'ratio': 1.25, 'slack': 1.0 },
+    'first_solution':   { 'ratio': 1.25, 'slack': 1.0 },
+    'binsec_calls':     { 'ratio': 1.0,  'slack': 0 },
+    'minibinsec_calls': { 'ratio': 1.10, 'slack': 10 },
+    'considered':       { 'ratio': 1.10, 'slack': 10 },
+    'evaluated':        { 'ratio': 1.0,  'slack': 0 },
+}
+# --------------------
+PROBLEM_PATTERN = '*.abduce-problem.json'
+# --------------------
+def parse_threshold(text):
+    # metric=ratio[:slack]
+    metric, value = text.split('=', 1)
+    ratio, _, slack = value.partition(':')
+    return metric, { 'ratio': float(ratio), 'slack': float(slack) if slack else DEFAULT_THRESHOLDS.get(metric, {}).get('slack', 0) }
+# --------------------
+def load_problems(filename):
+    # Returns the problems and the thresholds of a benchmark input, which is either a
+    # suite file (problems relative to its root), a batch manifest, a single problem
+    # file as generated by c2bc, or a directory searched for c2bc problem files.
+    # Problems of manifests and problem files are relative to the current directory.
+    if os.path.isdir(filename):
+        problems = []
+        for pfile in sorted(glob.glob(os.path.join(filename, '**', PROBLEM_PATTERN), recursive=True)):
+            problems += load_problems(pfile)[0]
+        return problems, dict()
+    with open(filename) as stream:
+        if filename.endswith('.jsonl'):
+            problems = [ json.loads(line) for line in stream if line.strip() ]
+            suite = dict()
+        else:
+            suite = json.load(stream)
+            problems = suite['problems'] if 'problems' in suite else [ suite ]
+    root = os.path.abspath(os.path.join(os.path.dirname(filename), suite['root']) if 'root' in suite else os.getcwd())
+    for problem in problems:
+        problem.setdefault('root', root)
+        problem.setdefault('timeout', suite.get('timeout'))
+    return problems, suite.get('thresholds', dict())
+# --------------------
+def problem_name(pid):
+    return re.sub(r'[^\w.-]+', '_', pid).strip('_')
+# --------------------
+def trace_name(traces, pid):
+    return os.path.join(os.path.abspath(traces), '{}.jsonl.gz'.format(problem_name(pid)))
+# --------------------
+def problem_metrics(result):
+    summary = result.get('summary') or dict()
+    stats = summary.get('stats', dict())
+    oracles = stats.get('oracles', dict())
+    generation = stats.get('generation', dict())
+    solutions = stats.get('core', dict()).get('solutions', 0)
+    return {
+        'status': result.get('status'),
+        'time': result.get('time'),
+        'binsec_calls': oracles.get('binsec', dict()).get('calls', 0),
+        'minibinsec_calls': oracles.get('minibinsec', dict()).get('calls', 0),
+        'considered': generation.get('considered', 0),
+        'evaluated': generation.get('evaluated', 0),
+        'pruned': dict(generation.get('pruned', dict())),
+        'solutions': solutions,
+        'first_solution': stats.get('timers', dict()).get('solution', dict()).get('first') if solutions else None,
+        'condition': summary.get('policy_condition'),
+    }
+# --------------------
+def merge_metrics(repeats):
+    # Counters are deterministic (fixed hash seed, replayed oracle): they are taken from
+    # the first repeat, times are medians over all repeats.
+    metrics = dict(repeats[0])
+    for key in ('time', 'first_solution'):
+        values = [ m[key] for m in repeats if m[key] is not None ]
+        metrics[key] = median(values) if len(values) == len(repeats) else None
+    if len(set(m['status'] for m in repeats)) > 1:
+        metrics['status'] = 'unstable'
+    return metrics
+# --------------------
+def compare_metrics(baseline, current, thresholds):
+    # Returns the (problem, metric, baseline value, current value) regressions of the
+    # current run. Problems missing from the baseline are new and never regress.
+    regressions = []
+    for pid, metrics in current.items():
+        if not pid in baseline:
+            continue
+        reference = baseline[pid]
+        if reference['status'] == 'ok' and metrics['status'] != 'ok':
+            regressions.append((pid, 'status', reference['status'], metrics['status']))
+            continue
+        for metric, threshold in thresholds.items():
+            old, new = reference.get(metric), metrics.get(metric)
+            if old is None:
+                continue
+            if new is None or new > old * threshold['ratio'] + threshold['slack']:
+                regressions.append((pid, metric, old, new))
+    return regressions
+# --------------------
+class BenchmarkHistory:
+
+    # JSON history of benchmark runs. Each run records its label, date, host, oracle
+    # mode and the metrics of each problem; runs are only compared with earlier runs
+    # of the same oracle mode (replayed and live timings are not comparable).
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.runs = []
+        if os.path.exists(filename):
+            with open(filename) as stream:
+                self.runs = json.load(stream)['runs']
+
+    def baseline(self, oracle, label=None):
+        for run in reversed(self.runs):
+            if run['oracle'] == oracle and (label is None or run['label'] == label):
+                return run
+        return None
+
+    def append(self, problems, oracle, label=None, repeat=1):
+        run = { 'label': label, 'date': time.strftime('%Y-%m-%dT%H:%M:%S'), 'host': os.uname().nodename,
+                'oracle': oracle, 'repeat': repeat, 'problems': problems }
+        self.runs.append(run)
+        return run
+
+    def save(self):
+        tmpname = '{}.tmp'.format(self.filename)
+        with open(tmpname, 'w') as stream:
+            json.dump({ 'runs': self.runs }, stream, indent=2, sort_keys=True)
+        os.replace(tmpname, self.filename)
+# --------------------
@@ -6,11 +6,13 @@ import re
 import subprocess
 import time
 import itertools
+import functools
 from subprocess import Popen, PIPE, STDOUT, TimeoutExpired
 from datetime import datetime
 import configparser
 # --------------------
 from . import minibinsec
+from .trace import make_oracle_trace
 from .checkers import CheckerResult, AbstractChecker
 from pulseutils.files import create_directory
 # --------------------
@@ -38,6 +40,8 @@ class BinsecLogParser:
             'goal-unreachable': False,
             'checkct-program-status': None,
             'checkct-leaks': [],
+            'solver-unknown': False,
+            'complete': True,
         }
 
         self._parse(data)
@@ -65,6 +69,9 @@ class BinsecLogParser:
 
     def _parse_chunks(self):
         for chunk in self.logdata:
+            if 'UNKNOWN' in chunk.data or 'TIMEOUT' in chunk.data:
+                # an inconclusive solver query: unreached goals are not proven unreachable
+                self.status['solver-unknown'] = True
             handler = '_parse_{}_chunk'.format(chunk.bswitch)
             if hasattr(self, handler):
                 getattr(self, handler)(chunk)
@@ -105,6 +112,28 @@ class BinsecLogParser:
         if not os.path.isfile(self._last_smt):
             self.logger.warning('recovering unlogged smtfile: {}'.format(self._last_smt))
 
+    def _handle_sse_directive(self, chunk):
+        self._detect_sse_enumerate(chunk)
+
+    def _detect_sse_enumerate(self, chunk):
+        hookl = r'enumerate\s+possible values \(([0-9]+)\)'
+        hookv = r'\{([0-9]+); ([0-9]+)\}'
+
+        lmatch = re.search(hookl, chunk.data)
+        if lmatch is not None:
+            vcount = int(lmatch[1])
+            if vcount > 0:
+                values = []
+                for vmatch in re.finditer(hookv, chunk.data):
+                    values.append((int(vmatch[1]), int(vmatch[2])))
+                if len(values) != vcount:
+                    self.logger.warning('recovering {} enumeration value while expecting {}'.format(len(values), vcount))
+                self.logger.debug('recovered enumeration values: {}'.format(values))
+                if self._last_model is not None:
+                    self._last_model['enum'] = values
+                else:
+                    self.logger.warning('recovered out of context enumeration value')
+
     def _handle_sse_model(self, chunk):
         self._push_last_model()
         hookd = r'Model @ ([0-9a-f]+)'
@@ -179,8 +208,93 @@ def execute_command(cmd, log, timeout=None, stdin=None):
         to_status = True
         proc.kill()
         cout, cerr = proc.communicate()
+    except BaseException:
+        # interrupted from outside (termination, batch problem timeout): never leave binsec running
+        proc.kill()
+        proc.wait()
+        raise
     return proc.returncode, to_status, cout.decode(sys.stdout.encoding, errors='ignore'), cerr.decode(sys.stderr.encoding, errors='ignore') if cerr is not None else None
 # --------------------
+@functools.lru_cache(maxsize=64)
+def symbol_input_regions(binary, size, mtime):
+    # Input regions from the symbol table of the binary. Memoized on the binary file
+    # state, so that batch problems on the same binary only run objdump once.
+    regions = []
+    try:
+        proc = subprocess.run(
+            ['objdump', '-t', binary],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            check=False,
+        )
+    except Exception:
+        return tuple(regions)
+    if proc.returncode != 0:
+        return tuple(regions)
+    for line in proc.stdout.splitlines():
+        parts = line.split()
+        if len(parts) < 6:
+            continue
+        addr_s, size_s, name = parts[0], parts[4], parts[5]
+        if not re.fullmatch(r'[0-9a-fA-F]{8}', addr_s):
+            continue
+        if not re.fullmatch(r'[0-9a-fA-F]{8}', size_s):
+            continue
+        if not (
+            name.startswith('__VERIFIER_nondet_slot')
+            or name.startswith('public_')
+            or name == '_stub_int_array'
+            or re.match(r'^_stub_.*_index$', name)
+        ):
+            continue
+        base = int(addr_s, 16)
+        rsize = int(size_s, 16)
+        if rsize > 0:
+            regions.append((base, rsize))
+    return tuple(regions)
+# --------------------
+class InputSlice:
+
+    # Registers and memory bytes that a static slice of the program (c2binsec
+    # '*.abd.slice.txt' files) found able to flow into a branch or guard condition.
+    # A '*' entry lifts the restriction on its kind of location.
+    #   registers : relevant register names, None if unrestricted
+    #   memory    : relevant byte addresses, None if unrestricted
+
+    def __init__(self, filename):
+        self.registers = set()
+        self.memory = set()
+        with open(filename, 'r') as stream:
+            for line in stream:
+                kind, _, value = line.strip().partition(':')
+                value = value.strip()
+                if kind == 'register':
+                    if value == '*':
+                        self.registers = None
+                    elif self.registers is not None:
+                        self.registers.add(value)
+                elif kind == 'memory':
+                    if value == '*':
+                        self.memory = None
+                    elif self.memory is not None:
+                        self.memory.add(int(value, 16))
+
+    def relevant(self, vstr, offset=None):
+        # Relevance of a variable, or of its byte at the given offset.
+        if minibinsec.detect_bvar_type(vstr) != minibinsec.BVarType.MemoryLoc:
+            return self.registers is None or vstr in self.registers
+        if self.memory is None:
+            return True
+        try:
+            addr, nbytes = minibinsec.parse_memloc(vstr)
+        except ValueError:
+            return True
+        base = int(addr, 16)
+        if offset is not None:
+            return base + offset in self.memory
+        return any(base + idx in self.memory for idx in range(nbytes))
+# --------------------
 class BinsecAutoCandidateGenerator:
 
     def __init__(self, args, checkers, stats, logger):
@@ -196,8 +310,11 @@ class BinsecAutoCandidateGenerator:
         self.ncoreset = None
         self.restart = False
         self._rvars = set()
+        self._sliced = set()
         self._dyn_consts = {}
         self._max_dyn_consts_per_var = max(1, int(getattr(self.args, 'dynamic_constants_per_var', 3)))
+        islice = getattr(self.args, 'input_slice', None)
+        self.islice = InputSlice(islice) if islice else None
         self._init_vars()
         self._init_varengine()
 
@@ -376,11 +493,31 @@ class BinsecAutoCandidateGenerator:
                             # input word variable (e.g. 0xADDR:4).
                             if _is_covered_by_input_word(key):
                                 continue
+                            # Model variables that cannot influence any decision
+                            # of the program only add irrelevant literals.
+                            if not self._is_relevant(key):
+                                continue
                             self.checkers.context.declare_var(key)
                             self.vars.add(key)
                     if key in self.checkers.context.vars:
                         self._add_dynamic_const_from_model(key, val)
 
+    def _is_relevant(self, vstr, offset=None):
+        if self.islice is None or vstr in self._rvars:
+            return True
+        if self.islice.relevant(vstr, offset):
+            return True
+        self._sliced.add((vstr, offset))
+        self.stats.generation.sliced = len(self._sliced)
+        return False
+
+    def _relevant_parts(self, var, parts):
+        # Drops the bytes and bits of memory variables located at irrelevant addresses.
+        if self.islice is None or self.checkers.context.get_type(var) != minibinsec.BVarType.MemoryLoc:
+            return parts
+        context = self.checkers.context
+        return [ part for part in parts if self._is_relevant(var, context.vars[part][0].idx // 8) ]
+
     def _update_operators(self):
         # TODO : Use a config file instead
         self.operators.add(minibinsec.Operator.Equal)
@@ -493,6 +630,7 @@ class BinsecAutoCandidateGenerator:
         if var1s != var2s:
             var1bytes = self.checkers.context.create_bytes(var1) if var1s > 8 and var1t != minibinsec.BVarType.Literal else []
             var2bytes = self.checkers.context.create_bytes(var2) if var2s > 8 and var2t != minibinsec.BVarType.Literal else []
+            var1bytes, var2bytes = self._relevant_parts(var1, var1bytes), self._relevant_parts(var2, var2bytes)
             if len(var1bytes) == 0 and len(var2bytes) != 0:
                 var1bytes = [var1]
             if len(var1bytes) != 0 and len(var2bytes) == 0:
@@ -511,6 +649,7 @@ class BinsecAutoCandidateGenerator:
         if var1s != var2s:
             var1bits = self.checkers.context.create_bits(var1) if var1t != minibinsec.BVarType.Literal else []
             var2bits = self.checkers.context.create_bits(var2) if var2t != minibinsec.BVarType.Literal else []
+            var1bits, var2bits = self._relevant_parts(var1, var1bits), self._relevant_parts(var2, var2bits)
             if len(var1bits) == 0 and len(var2bits) != 0:
                 var1bits = [var1]
             if len(var1bits) != 0 and len(var2bits) == 0:
@@ -522,6 +661,34 @@ class BinsecAutoCandidateGenerator:
                         lits.append(literal)
         return lits
 
+    def _relate_literals(self, lits):
+        if not self.args.literal_graph:
+            return
+        graph = self.checkers.context.graph
+        with self.stats.span('literal-graph'):
+            self.stats.get_oracle('literal-graph').calls += graph.update(lits, budget=self.args.literal_graph_queries)
+        self.stats.generation.implications = graph.implications
+        self.stats.generation.contradictions = graph.contradictions
+
+    def _combinations(self, lits, depth):
+        # Same as itertools.combinations, without the conjunctions that contain
+        # contradictory literals or a literal implied by another one: the latter
+        # are equivalent to a smaller conjunction, considered before.
+        excluded = self.checkers.context.graph.excluded
+        if not excluded:
+            yield from itertools.combinations(lits, depth)
+            return
+        def extend(start, prefix, pexcluded):
+            if len(prefix) == depth:
+                yield prefix
+                return
+            for idx in range(start, len(lits) - depth + len(prefix) + 1):
+                lit = lits[idx]
+                if lit.uid in pexcluded:
+                    continue
+                yield from extend(idx + 1, prefix + (lit,), pexcluded | excluded.get(lit.uid, frozenset()))
+        yield from extend(0, (), frozenset())
+
     def restart_local_generation(self):
         self.restart = True
 
@@ -530,7 +697,7 @@ class BinsecAutoCandidateGenerator:
         self.restart = False
         self._update_vars()
         # Initial try with no constraint
-        yield set()
+        yield frozenset()
         while True:
             self._update_vars()
             self.log.debug(f'loaded variables: {self.vars}')
@@ -547,6 +714,7 @@ class BinsecAutoCandidateGenerator:
             self._update_operators()
             lits = self._generate_literals()
             self.stats.generation.literals = len(lits)
+            self._relate_literals(lits)
             if self.args.lit_ordering:
                 mtable = { lit : (-sum(self.checkers.check_satisfied({lit}, model)[0] for model in self.exset), lit.complexity()) for lit in lits }
                 self.log.debug('literals ordering table: {}'.format(mtable))
@@ -555,16 +723,16 @@ class BinsecAutoCandidateGenerator:
             for depth in range(2):
                 # Initial max2 to redetect variables on necessary checks
                 # TODO: This exploration algorithm must be reworked
-                for candidate in itertools.combinations(lits, depth):
-                    yield set(c for c in candidate)
+                for candidate in self._combinations(lits, depth):
+                    yield frozenset(candidate)
                     if self.restart:
                         break
                 if self.restart:
                     break
         rangeout = self.args.max_depth + 1 if self.args.max_depth is not None else len(lits) + 1
         for depth in range(2, rangeout):
-            for candidate in itertools.combinations(lits, depth):
-                yield set(c for c in candidate)
+            for candidate in self._combinations(lits, depth):
+                yield frozenset(candidate)
 # --------------------
 class BinsecCheckers(AbstractChecker):
 
@@ -585,6 +753,7 @@ class BinsecCheckers(AbstractChecker):
         self.input_regions = self._load_input_regions()
         if self.input_regions:
             self.log.debug('canonical input regions: {}'.format(self.input_regions))
+        self.trace = make_oracle_trace(args, logger)
 
     def _load_config(self):
         # Strip reach/cut/assume directives from the base config so abduction
@@ -658,42 +827,10 @@ class BinsecCheckers(AbstractChecker):
         return regions
 
     def _load_symbol_input_regions(self):
-        regions = []
         if not self.binary or not os.path.isfile(self.binary):
-            return regions
-        try:
-            proc = subprocess.run(
-                ['objdump', '-t', self.binary],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.DEVNULL,
-                text=True,
-                check=False,
-            )
-        except Exception:
-            return regions
-        if proc.returncode != 0:
-            return regions
-        for line in proc.stdout.splitlines():
-            parts = line.split()
-            if len(parts) < 6:
-                continue
-            addr_s, size_s, name = parts[0], parts[4], parts[5]
-            if not re.fullmatch(r'[0-9a-fA-F]{8}', addr_s):
-                continue
-            if not re.fullmatch(r'[0-9a-fA-F]{8}', size_s):
-                continue
-            if not (
-                name.startswith('__VERIFIER_nondet_slot')
-                or name.startswith('public_')
-                or name == '_stub_int_array'
-                or re.match(r'^_stub_.*_index$', name)
-            ):
-                continue
-            base = int(addr_s, 16)
-            size = int(size_s, 16)
-            if size > 0:
-                regions.append((base, size))
-        return regions
+            return []
+        stat = os.stat(self.binary)
+        return list(symbol_input_regions(os.path.abspath(self.binary), stat.st_size, stat.st_mtime))
 
     def _chunk_input_regions(self, regions):
         # Keep the model small and word-centric.
@@ -790,6 +927,12 @@ class BinsecCheckers(AbstractChecker):
             self.log.debug('loaded binsec directives: {}'.format(directives))
             return directives
 
+    def _execute_binsec(self, command, script, timeout=None):
+        execute = lambda: execute_command(command, self.log, timeout=timeout)
+        if self.trace is None:
+            return execute()
+        return self.trace(command, script, self.binary, execute)
+
     def _get_local_cfname(self):
         timestamp = datetime.now().strftime('%Y-%m-%d.%H-%M-%S.%f')
         filename = self.Temporary_Binsec_Configfile.format(timestamp)
@@ -822,9 +965,11 @@ class BinsecCheckers(AbstractChecker):
             self.log.debug('necessary condition check (ct mode)')
             if any(len(sol) == 0 for sol in solutions):
                 # "true" policy already covers all inputs.
+                self.necessity_conclusive = True
                 return True
             constraint = self._format_solution_set(solutions)
             status, leaks, _ = self._check_ct_candidate(constraint, [], formatted=False)
+            self.necessity_conclusive = status != 'unknown'
             if status == 'unknown':
                 self.log.warning('ct necessity check is unknown; treating as non-necessary')
                 return False
@@ -834,13 +979,18 @@ class BinsecCheckers(AbstractChecker):
         if any(len(sol) == 0 for sol in solutions):
             # In classic mode too: once "true" is in the solution set, the
             # policy is trivially necessary and sufficient.
+            self.necessity_conclusive = True
             return True
         # In classic mode, necessity means: outside current solutions
         # (i.e. under the negated disjunction), the positive goal is unreachable.
-        # Reuse the reachability helper so "reach ... then print model" is
+        # Reuse the reachability query so "reach ... then print model" is
         # enforced; otherwise parser.models may stay empty even when reachable.
+        # A model proves reachability, but no model only proves unreachability
+        # when binsec ran to completion without timeouts or unknown queries.
         constraint = self._format_solution_set(solutions)
-        reachable, _model, _core = self._check_dgoal_reachable_util(constraint, [])
+        parser = self._dgoal_reachable_parser(constraint, [])
+        reachable = len(parser.models) > 0
+        self.necessity_conclusive = reachable or parser.status['complete']
         return not reachable
 
     def check_vulnerability(self, candidate, reject, complete=False):
@@ -873,7 +1023,7 @@ class BinsecCheckers(AbstractChecker):
                 cmodel[varid] = wval
         return cmodel
 
-    def _check_dgoal_reachable_util(self, candidate, reject, complete=False):
+    def _dgoal_reachable_parser(self, candidate, reject, complete=False, count=1):
         directives = [ d for d in self.directives['all'] ]
         directives.extend(self.directives['positive'])
         # Ensure BINSEC prints a model when the goal is reachable.
@@ -881,12 +1031,21 @@ class BinsecCheckers(AbstractChecker):
             (d + ' then print model') if d.startswith('reach ') and 'then print model' not in d else d
             for d in directives
         ]
+        if count > 1:
+            # Reach goals along count distinct paths, printing a model for each of them.
+            directives = [
+                re.sub(r'^reach\s+(\S+)', r'reach \1 {} times'.format(count), d) if d.startswith('reach ') and not ' times' in d else d
+                for d in directives
+            ]
         for example in reject:
             directive_op = minibinsec.Operator.And if complete else minibinsec.Operator.Or
             rdir = self._generate_rejection_directive(example, op=directive_op)
             if rdir:
                 directives.append(rdir)
-        parser = self._run_binsec_command(candidate, directives)
+        return self._run_binsec_command(candidate, directives)
+
+    def _check_dgoal_reachable_util(self, candidate, reject, complete=False):
+        parser = self._dgoal_reachable_parser(candidate, reject, complete)
         status = len(parser.models) > 0
         model = parser.models[0]['model'] if len(parser.models) > 0 else None
         model = self._sanitize_model(model)
@@ -895,6 +1054,18 @@ class BinsecCheckers(AbstractChecker):
     def _check_dgoal_reachable(self, candidate):
         return self._check_dgoal_reachable_util(candidate, [])
 
+    def harvest_vulnerability_models(self, reject, count):
+        if getattr(self.args, 'ct_mode', False) or count <= 1:
+            return super().harvest_vulnerability_models(reject, count)
+        self.log.debug('vulnerability models harvest')
+        parser = self._dgoal_reachable_parser([], reject, count=count)
+        models = []
+        for pmodel in parser.models:
+            model = self._sanitize_model(pmodel['model'])
+            if model is not None and not model in models:
+                models.append(model)
+        return models
+
     def _check_ngoal_unreachable(self, candidate):
         directives = [ d for d in self.directives['all'] ]
         directives.extend(self.directives['negative'])
@@ -1047,9 +1218,9 @@ class BinsecCheckers(AbstractChecker):
         command += ['-sse-script', local_config_file, self.binary]
         if run_timeout is not None:
             command += ['-sse-timeout', str(run_timeout)]
-        btime = time.time()
-        rc, to, out, err = execute_command(command, self.log, timeout=run_timeout)
-        atime = time.time()
+        btime = time.perf_counter()
+        rc, to, out, err = self._execute_binsec(command, script, timeout=run_timeout)
+        atime = time.perf_counter()
         if to:
             self.log.warning('command timeouted')
             self.stats.get_oracle('binsec').timeouts += 1
@@ -1057,15 +1228,20 @@ class BinsecCheckers(AbstractChecker):
             self.log.warning('command failed')
             self.stats.get_oracle('binsec').crashes += 1
         else:
-            self.stats.get_oracle('binsec').times.append(atime - btime)
+            self.stats.oracle_time('binsec', btime, atime)
         parser = BinsecLogParser(out, self.log)
+        parser.status['complete'] = not to and rc == 0 and not parser.status['solver-unknown']
         if self.args.binsec_delete_configs:
             os.remove(local_config_file)
         return parser
 
     def check_consistency(self, candidate):
-        self.stats.get_oracle('minibinsec').calls += 1
-        return minibinsec.check_sat(candidate, self.context), None, None
+        cache = self.context.consistency
+        queries, hits = cache.queries, cache.hits
+        status = cache.check(candidate)
+        self.stats.get_oracle('minibinsec').calls += cache.queries - queries
+        self.stats.get_oracle('consistency-cache').calls += cache.hits - hits
+        return status, None, None
 
     def _collect_candidate_vars(self, term, out):
         # Walk minibinsec term trees and collect base variable ids.
@@ -1115,7 +1291,9 @@ class BinsecCheckers(AbstractChecker):
 
     def _precheck_consequence(self, implicant, implicate):
         '''only works for conjunctions'''
-        return implicate.issubset(implicant)
+        if implicate.issubset(implicant):
+            return True
+        return self.context.graph.implies(implicant, implicate)
 
     def check_consequence(self, implicant, implicate, mode_override=None):
         if self._precheck_consequence(implicant, implicate):
@@ -1237,9 +1415,9 @@ class RobustBinsecCheckers(BinsecCheckers):
         command = [binsec, '-sse', '-sse-script', local_config_file, self.binary]
         if self.args.binsec_timeout is not None:
             command += ['-sse-timeout', str(self.args.binsec_timeout)]
-        btime = time.time()
-        rc, to, out, err = execute_command(command, self.log, timeout=self.args.binsec_timeout)
-        atime = time.time()
+        btime = time.perf_counter()
+        rc, to, out, err = self._execute_binsec(command, script, timeout=self.args.binsec_timeout)
+        atime = time.perf_counter()
         if to:
             self.log.warning('command timeouted')
             self.stats.get_oracle('binsec').timeouts += 1
@@ -1247,8 +1425,9 @@ class RobustBinsecCheckers(BinsecCheckers):
             self.log.warning('command failed')
             self.stats.get_oracle('binsec').crashes += 1
         else:
-            self.stats.get_oracle('binsec').times.append(atime - btime)
+            self.stats.oracle_time('binsec', btime, atime)
         parser = BinsecLogParser(out, self.log, robust=True, translation=self.memory.translator)
+        parser.status['complete'] = not to and rc == 0 and not parser.status['solver-unknown']
         if self.args.binsec_delete_configs:
             os.remove(local_config_file)
             os.remove(local_memory_file)
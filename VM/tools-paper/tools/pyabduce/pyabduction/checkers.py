@@ -24,6 +24,9 @@ class AbstractChecker:
         self.args = args
         self.stats = stats
         self.log = logger
+        # whether the last necessity check answered definitely (no oracle timeout
+        # or unknown status), and can thus be memoized
+        self.necessity_conclusive = True
 
     def check_consistency(self, candidate):
         raise NotImplementedError(self)
@@ -34,6 +37,11 @@ class AbstractChecker:
     def check_vulnerability(self, candidate, reject, complete=False):
         raise NotImplementedError(self)
 
+    def harvest_vulnerability_models(self, reject, count):
+        # Up to count distinct vulnerability models, not rejected; one per check by default.
+        status, model, _ = self.check_vulnerability([], reject)
+        return [ model ] if status and model is not None else []
+
     def check_goals(self, candidate):
         raise NotImplementedError(self)
 
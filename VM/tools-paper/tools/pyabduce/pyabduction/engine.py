@@ -60,10 +60,7 @@ class AbstractCandidateEngine:
         self.necessary.store(lit)
 
     def extract_necessary_component(self):
-        component = set()
-        for lit in self.necessary:
-            component = component | lit
-        return component
+        return frozenset().union(*self.necessary)
 # --------------------
 class SimpleCandidateEngine(AbstractCandidateEngine):
 
@@ -105,60 +102,75 @@ class SimpleCandidateEngine(AbstractCandidateEngine):
             self.add_example(smodel)
         else:
             self.log.debug('necessary constants to recover')
-            for key, val in emodel.items():
-                if key != 'default' and not self.checkers.fully_assumed(key):
-                    self.log.debug('checking necessary constant for {}'.format(key))
-                    self.stats.get_oracle('constant-test').calls += 1
-                    rstatus, _, _ = self.checkers.check_vulnerability([], [{key: val}], complete=True)
-                    if not rstatus:
-                        literal = self.checkers.as_literal({key: val})
-                        self.log.result('necessary constraint: {}'.format(stringify(set([literal]))))
-                        self.add_necessary_lit(set([literal]))
+            for key in self.necessary_constant_keys(emodel, [ key for key in emodel if key != 'default' ]):
+                literal = self.checkers.as_literal({key: emodel[key]})
+                self.log.result('necessary constraint: {}'.format(stringify(set([literal]))))
+                self.add_necessary_lit(set([literal]))
+
+    def necessary_constant_keys(self, model, keys):
+        # Adaptive group testing, assuming that avoiding all the model values of keys
+        # makes the vulnerability unreachable. It can remain reachable while avoiding
+        # the values of a whole group only if no key of the group is a necessary
+        # constant: only the other groups are split further, down to single key
+        # checks. This takes O(k log n) checks for k necessary constants.
+        if len(keys) <= 1:
+            return keys
+        necessary = []
+        for group in (keys[:len(keys) // 2], keys[len(keys) // 2:]):
+            self.log.debug('checking necessary constants for {}'.format(group))
+            self.stats.get_oracle('constant-test').calls += 1
+            rstatus, _, _ = self.checkers.check_vulnerability([], [{ key: model[key] for key in group }], complete=True)
+            if not rstatus:
+                necessary += self.necessary_constant_keys(model, group)
+        return necessary
 
     def next_candidate(self):
         self.restart_local_generation()
-        yield self.extract_necessary_component(), set()
-        for candidate in self.coregen.generate():
-            self.log.debug('pre-checking candidate: {}'.format(candidate))
+        yield self.extract_necessary_component(), frozenset()
+        for candidate in self.stats.spanned('generation', self.coregen.generate()):
+            self.log.debug('pre-checking candidate: {}'.format(set(candidate)))
             self.stats.generation.considered += 1
             valid = True
             ncomponent = self.extract_necessary_component()
             rcandidate = (ncomponent | candidate)
             # Consistency pruning
-            cstatus, cmodel, ccore = self.check_consistency(candidate)
+            with self.stats.span('consistency-check'):
+                cstatus, cmodel, ccore = self.check_consistency(candidate)
             if not cstatus:
                 self.log.debug('candidate is inconsistent')
                 self.stats.generation.pruned['consistency'] += 1
                 continue
             # Counter-example pruning
             if self.args.prune_counterex:
-                for cex in self.counter_examples:
-                    # Skip pruning when the model carries no concrete assignments.
-                    # An empty model makes every candidate appear "satisfied" and
-                    # incorrectly prunes the entire search space.
-                    if isinstance(cex, dict):
-                        cex_nonmeta = {k: v for k, v in cex.items() if k != '*controlled'}
-                        if (not cex_nonmeta) and (cex.get('*controlled') in (None, set())):
-                            continue
-                    status, _, _ = self.check_satisfied(rcandidate, cex)
-                    if status:
-                        self.log.debug('satisfied by {}'.format(cex))
-                        valid = False
-                        break
+                with self.stats.span('counterex-pruning'):
+                    for cex in self.counter_examples:
+                        # Skip pruning when the model carries no concrete assignments.
+                        # An empty model makes every candidate appear "satisfied" and
+                        # incorrectly prunes the entire search space.
+                        if isinstance(cex, dict):
+                            cex_nonmeta = {k: v for k, v in cex.items() if k != '*controlled'}
+                            if (not cex_nonmeta) and (cex.get('*controlled') in (None, set())):
+                                continue
+                        status, _, _ = self.check_satisfied(rcandidate, cex)
+                        if status:
+                            self.log.debug('satisfied by {}'.format(cex))
+                            valid = False
+                            break
                 if not valid:
                     self.stats.generation.pruned['counterex'] += 1
                     continue
             # Solutions, unsolutions and necessity pruning
             if self.args.prune_necessary:
-                for strid, storage_struct, direct in (('solution', self.storage, True), ('unsolution', self.storage_unsol, True), ('necessary', self.necessary, False)):
-                    for sol in storage_struct:
-                        status, _, _ = self.check_consequence(rcandidate, sol) if direct else self.check_consequence(sol, rcandidate)
-                        if status:
-                            self.log.debug('has for consequence {}'.format(sol))
-                            # TODO : distinguish stats and log for each storage structure
-                            self.stats.generation.pruned[strid] += 1
-                            valid = False
-                            break
+                with self.stats.span('necessity-pruning'):
+                    for strid, storage_struct, direct in (('solution', self.storage, True), ('unsolution', self.storage_unsol, True), ('necessary', self.necessary, False)):
+                        for sol in storage_struct:
+                            status, _, _ = self.check_consequence(rcandidate, sol) if direct else self.check_consequence(sol, rcandidate)
+                            if status:
+                                self.log.debug('has for consequence {}'.format(sol))
+                                # TODO : distinguish stats and log for each storage structure
+                                self.stats.generation.pruned[strid] += 1
+                                valid = False
+                                break
             if valid:
                 yield rcandidate, candidate
 # --------------------
@@ -192,5 +204,5 @@ class SimpleCandidateGenerator:
         self._load()
         for depth in range(self.args.max_depth + 1):
             for candidate in itertools.combinations(self.lits, depth):
-                yield set(candidate)
+                yield frozenset(candidate)
 # --------------------
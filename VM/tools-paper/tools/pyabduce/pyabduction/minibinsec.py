@@ -3,6 +3,7 @@ import sys
 import re
 import copy
 import enum
+from collections import OrderedDict
 import cvc5
 from cvc5 import Kind
 # ====================
@@ -63,7 +64,27 @@ def detect_bvar_type(data):
         return BVarType.MemoryLoc
     return BVarType.Register
 # --------------------
+_setslot = object.__setattr__
+# --------------------
 class BFormulaCore:
+    # Terms are immutable and hash-consed by their Context: two structurally equal
+    # terms of a context are the same object. They are identified (and hashed) by a
+    # small integer uid, which keeps literal sets cheap and their order reproducible.
+    # Slots are only set by the constructors (and the lazily computed string cache
+    # by __str__), through _setslot: attribute assignment always raises.
+    __slots__ = ('uid',)
+
+    def __init__(self, uid):
+        _setslot(self, 'uid', uid)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('cannot assign {} of immutable term {}'.format(name, self))
+
+    def __delattr__(self, name):
+        raise AttributeError('cannot delete {} of immutable term {}'.format(name, self))
+
+    def __hash__(self):
+        return self.uid
 
     def __str__(self):
         raise NotImplementedError(self)
@@ -81,11 +102,14 @@ class BFormulaCore:
         return str(self), self.bvsize()
 # --------------------
 class BVar(BFormulaCore):
+    __slots__ = ('core', 'type', 'size', '_str')
 
-    def __init__(self, core, forcetype=None):
-        self.core = core
-        self.type = detect_bvar_type(core) if forcetype is None else forcetype
-        self.size = self._compute_size()
+    def __init__(self, uid, core, forcetype=None):
+        super().__init__(uid)
+        _setslot(self, 'core', core)
+        _setslot(self, 'type', detect_bvar_type(core) if forcetype is None else forcetype)
+        _setslot(self, 'size', self._compute_size())
+        _setslot(self, '_str', self._compute_str())
 
     def bvsize(self):
         return self.size
@@ -103,7 +127,7 @@ class BVar(BFormulaCore):
             return 4*len(self.core.replace('0x', '')) if self.core.startswith('0x') else len(self.core.replace('0b', ''))
         raise NotImplementedError((self, self.type))
 
-    def __str__(self):
+    def _compute_str(self):
         if self.type == BVarType.MemoryLoc:
             addr, nbytes = parse_memloc(self.core)
             return '@[{},{}]'.format(addr, nbytes)
@@ -112,14 +136,19 @@ class BVar(BFormulaCore):
         if self.type == BVarType.Literal:
             return self.core
         raise NotImplementedError((self, self.type))
+
+    def __str__(self):
+        return self._str
 # --------------------
 class BVarByte(BFormulaCore):
+    __slots__ = ('var', 'idx', 'type', 'size')
 
-    def __init__(self, var, idx):
-        self.var = var
-        self.idx = idx
-        self.type = var.type
-        self.size = 8
+    def __init__(self, uid, var, idx):
+        super().__init__(uid)
+        _setslot(self, 'var', var)
+        _setslot(self, 'idx', idx)
+        _setslot(self, 'type', var.type)
+        _setslot(self, 'size', 8)
 
     def bvsize(self):
         return self.size
@@ -131,12 +160,14 @@ class BVarByte(BFormulaCore):
         return '({}{{{},{}}})'.format(self.var, self.idx, self.idx+7)
 # --------------------
 class BVarBit(BFormulaCore):
+    __slots__ = ('var', 'idx', 'type', 'size')
 
-    def __init__(self, var, idx):
-        self.var = var
-        self.idx = idx
-        self.type = var.type
-        self.size = 1
+    def __init__(self, uid, var, idx):
+        super().__init__(uid)
+        _setslot(self, 'var', var)
+        _setslot(self, 'idx', idx)
+        _setslot(self, 'type', var.type)
+        _setslot(self, 'size', 1)
 
     def bvsize(self):
         return self.size
@@ -148,12 +179,14 @@ class BVarBit(BFormulaCore):
         return f'({self.var}{{{self.idx},{self.idx}}})'
 # --------------------
 class BUnaryTerm(BFormulaCore):
+    __slots__ = ('op', 'var', 'smt_term', '_str_cache')
 
-    def __init__(self, op, var, smt_term):
-        self.op = op
-        self.var = var
-        self.smt_term = smt_term
-        self._str_cache = None
+    def __init__(self, uid, op, var, smt_term):
+        super().__init__(uid)
+        _setslot(self, 'op', op)
+        _setslot(self, 'var', var)
+        _setslot(self, 'smt_term', smt_term)
+        _setslot(self, '_str_cache', None)
 
     def bvsize(self):
         return self.var.bvsize()
@@ -161,92 +194,86 @@ class BUnaryTerm(BFormulaCore):
     def complexity(self):
         return self.var.complexity() + self.op.complexity
 
-    def _compute_str(self):
-        self._str_cache = '{}({})'.format(self.op, self.var)
-
     def __str__(self):
         if self._str_cache is None:
-            self._compute_str()
+            _setslot(self, '_str_cache', '{}({})'.format(self.op, self.var))
         return self._str_cache
 # --------------------
 class BBinaryTerm(BFormulaCore):
-
-    def __init__(self, op, var1, var2, smt_term):
-        self.op = op
-        self.var1 = var1
-        self.var2 = var2
-        self.smt_term = smt_term
-        self._str_cache = None
-        self._siz_cache = None
-        self._cpl_cache = None
+    # Operands are ordered by size by the context (var1 is the narrower one).
+    __slots__ = ('op', 'var1', 'var2', 'smt_term', 'size', 'cpl', '_str_cache')
+
+    def __init__(self, uid, op, var1, var2, smt_term):
+        super().__init__(uid)
+        _setslot(self, 'op', op)
+        _setslot(self, 'var1', var1)
+        _setslot(self, 'var2', var2)
+        _setslot(self, 'smt_term', smt_term)
+        _setslot(self, 'size', max(var1.bvsize(), var2.bvsize()))
+        _setslot(self, 'cpl', var1.complexity() + var2.complexity() + op.complexity)
+        _setslot(self, '_str_cache', None)
 
     def _compute_str(self):
-        sz1, sz2 = self.var1.bvsize(), self.var2.bvsize()
-        if sz1 > sz2:
-            vart, szt = self.var1, sz1
-            self.var1, sz1 = self.var2, sz2
-            self.var2, sz2 = vart, szt
         dpad = ''
-        if sz1 != sz2:
-            dsiz = sz2 - sz1
+        dsiz = self.var2.bvsize() - self.var1.bvsize()
+        if dsiz != 0:
             if dsiz % 4 == 0:
                 dpad = '0x{}::'.format('0'*int(dsiz/4))
             else:
                 dpad = '0b{}::'.format('0'*dsiz)
-        self._str_cache = '({}{} {} {})'.format(dpad, self.var1, self.op, self.var2)
+        return '({}{} {} {})'.format(dpad, self.var1, self.op, self.var2)
 
     def bvsize(self):
-        if self._siz_cache is None:
-            self._siz_cache = max(self.var1.bvsize(), self.var2.bvsize())
-        return self._siz_cache
+        return self.size
 
     def complexity(self):
-        if self._cpl_cache is None:
-            self._cpl_cache = self.var1.complexity() + self.var2.complexity() + self.op.complexity
-        return self._cpl_cache
+        return self.cpl
 
     def __str__(self):
         if self._str_cache is None:
-            self._compute_str()
+            _setslot(self, '_str_cache', self._compute_str())
         return self._str_cache
 # --------------------
 class BMultiTerm(BFormulaCore):
+    __slots__ = ('op', 'terms', 'smt_term', 'cpl', '_str_cache')
 
-    def __init__(self, op, terms, smt_term):
-        self.op = op
-        self.terms = terms
-        self.smt_term = smt_term
-        self._str_cache = None
-        self._cpl_cache = None
+    def __init__(self, uid, op, terms, smt_term):
+        super().__init__(uid)
+        _setslot(self, 'op', op)
+        _setslot(self, 'terms', terms)
+        _setslot(self, 'smt_term', smt_term)
+        _setslot(self, 'cpl', sum((t.complexity() for t in self.terms)) + self.op.complexity)
+        _setslot(self, '_str_cache', None)
 
     def bvsize(self):
         return 0 # TODO: Handle for non logical operators
 
     def complexity(self):
-        if self._cpl_cache is None:
-            self._cpl_cache = sum((t.complexity() for t in self.terms)) + self.op.complexity
-        return self._cpl_cache
-
-    def _compute_str(self):
-        self._str_cache = ' {} '.format(self.op).join(('{}'.format(term) for term in self.terms))
+        return self.cpl
 
     def __str__(self):
         if self._str_cache is None:
-            self._compute_str()
+            _setslot(self, '_str_cache', ' {} '.format(self.op).join(('{}'.format(term) for term in self.terms)))
         return self._str_cache
 # --------------------
 class Context:
 
     def __init__(self, logger):
         self.vars = dict()
+        # Hash-consing: terms by structural key, and by uid
         self._tcache = dict()
+        self.terms = []
         self.solver = cvc5.Solver()
         self.solver.setOption('produce-models', 'true')
+        self.solver.setOption('produce-unsat-assumptions', 'true')
         self.solver.setLogic('ALL')
         self._const_header = '*const:'
         self._byte_header = '*byte:'
         self._bit_header ='*bit:'
         self.bvsorts = dict()
+        self._vcache = dict()
+        self.graph = LiteralGraph(self)
+        self.consistency = ConsistencyCache(self)
         self.log = logger
 
     def _constid(self, val):
@@ -267,6 +294,33 @@ class Context:
     def is_bit_restriction(self, var):
         return var.startswith(self._bit_header)
 
+    def _intern(self, key, build, *args):
+        term = self._tcache.get(key)
+        if term is None:
+            term = build(len(self.terms), *args)
+            self._tcache[key] = term
+            self.terms.append(term)
+        return term
+
+    def get_term(self, uid):
+        return self.terms[uid]
+
+    def term_vars(self, term):
+        # Ids of the (non constant) variables of a term
+        if not term.uid in self._vcache:
+            if isinstance(term, BVar):
+                tvars = frozenset() if term.type == BVarType.Literal else frozenset([term.core])
+            elif isinstance(term, (BVarByte, BVarBit, BUnaryTerm)):
+                tvars = self.term_vars(term.var)
+            elif isinstance(term, BBinaryTerm):
+                tvars = self.term_vars(term.var1) | self.term_vars(term.var2)
+            elif isinstance(term, BMultiTerm):
+                tvars = frozenset().union(*(self.term_vars(t) for t in term.terms))
+            else:
+                raise NotImplementedError(term)
+            self._vcache[term.uid] = tvars
+        return self._vcache[term.uid]
+
     def get_type(self, var):
         return self.vars[var][0].type
 
@@ -275,7 +329,7 @@ class Context:
 
     def declare_var(self, vstr):
         if not vstr in self.vars:
-            bvar = self.build_binsec_var(vstr)
+            bvar = self._intern(('v', vstr), BVar, vstr)
             svar = self.build_smt_var(vstr, bvar.bvsize())
             self.vars[vstr] = (bvar, svar)
         return vstr
@@ -283,7 +337,7 @@ class Context:
     def declare_const(self, cstr):
         cid = self._constid(cstr)
         if not cid in self.vars:
-            bvar = BVar(cstr, forcetype=BVarType.Literal)
+            bvar = self._literal(cstr)
             svar = self.solver.mkBitVector(bvar.bvsize(), int(cstr, 16))
             self.vars[cid] = (bvar, svar)
         return cid
@@ -298,7 +352,7 @@ class Context:
         bid = self._byteid(vstr, idx)
         if not bid in self.vars:
             var, smtvar = self.vars[vstr]
-            bvar = BVarByte(var, idx)
+            bvar = self._intern(('byte', var.uid, idx), BVarByte, var, idx)
             extop = self.solver.mkOp(Kind.BITVECTOR_EXTRACT, idx+7, idx)
             svar = self.solver.mkTerm(extop, smtvar)
             self.vars[bid] = (bvar, svar)
@@ -314,7 +368,7 @@ class Context:
         bid = self._bitid(vstr, idx)
         if not bid in self.vars:
             var, smtvar = self.vars[vstr]
-            bvar = BVarBit(var, idx)
+            bvar = self._intern(('bit', var.uid, idx), BVarBit, var, idx)
             extop = self.solver.mkOp(Kind.BITVECTOR_EXTRACT, idx, idx)
             svar = self.solver.mkTerm(extop, smtvar)
             self.vars[bid] = (bvar, svar)
@@ -326,19 +380,19 @@ class Context:
         if not tkey in self._tcache:
             self.declare_var(varid)
             var = self.vars[varid]
-            valr = BVar(val, forcetype=BVarType.Literal)
+            valr = self._literal(val)
             dsize = valr.bvsize() - var[0].bvsize()
             #self.log.debug('create smt assign {}[{}] = {}[{}]'.format(var, var[0].bvsize(), valr, valr.bvsize()))
             if dsize >= 0:
-                self._tcache[tkey] =  BBinaryTerm(operator, var[0], valr, self._build_smt_binary_term
-                                                    (operator, var[1], self.solver.mkBitVector(valr.bvsize(), int(val, 16)), dsize))
+                self._intern(tkey, BBinaryTerm, operator, var[0], valr, self._build_smt_binary_term
+                             (operator, var[1], self.solver.mkBitVector(valr.bvsize(), int(val, 16)), dsize))
             else:
-                self._tcache[tkey] =  BBinaryTerm(operator, valr, var[0], self._build_smt_binary_term
-                                                    (operator, self.solver.mkBitVector(valr.bvsize(), int(val, 16)), var[1], -dsize))
+                self._intern(tkey, BBinaryTerm, operator, valr, var[0], self._build_smt_binary_term
+                             (operator, self.solver.mkBitVector(valr.bvsize(), int(val, 16)), var[1], -dsize))
         return self._tcache[tkey]
 
-    def build_binsec_var(self, vstr):
-        return BVar(vstr)
+    def _literal(self, val):
+        return self._intern(('lit', val), BVar, val, BVarType.Literal)
 
     def build_smt_var(self, vstr, size):
         if not size in self.bvsorts:
@@ -356,21 +410,26 @@ class Context:
             if var1[0].bvsize() > var2[0].bvsize():
                 vart = var1
                 var1, var2 = var2, vart
-            self._tcache[tkey] = BBinaryTerm(operator, var1[0], var2[0],
-                                             self._build_smt_binary_term(operator, var1[1], var2[1], var2[0].bvsize() - var1[0].bvsize()))
+            self._intern(tkey, BBinaryTerm, operator, var1[0], var2[0],
+                         self._build_smt_binary_term(operator, var1[1], var2[1], var2[0].bvsize() - var1[0].bvsize()))
         return self._tcache[tkey]
 
     def create_negation(self, terms, iterable=True):
-        # TODO: Use term cache
-        if not iterable:
-            terms = set(terms)
-        return BUnaryTerm(Operator.Not, BMultiTerm(Operator.And, terms, 'not-computed'), self._build_smt_set_negation(terms))
+        # Negated conjunctions are unordered: their terms are sorted by uid
+        conj = self.create_multiterm(Operator.And, sorted(set(terms), key=lambda t: t.uid))
+        tkey = ('not', conj.uid)
+        if not tkey in self._tcache:
+            self._intern(tkey, BUnaryTerm, Operator.Not, conj, self.solver.mkTerm(Kind.NOT, conj.smt_term))
+        return self._tcache[tkey]
 
     def create_multiterm(self, operator, terms, iterable=True):
-        # TODO: use term cache
         if not iterable:
             terms = set(terms)
-        return BMultiTerm(operator, terms, self._build_smt_multiterm(operator, terms))
+        terms = tuple(terms)
+        tkey = ('mt', operator, tuple(t.uid for t in terms))
+        if not tkey in self._tcache:
+            self._intern(tkey, BMultiTerm, operator, terms, self._build_smt_multiterm(operator, terms))
+        return self._tcache[tkey]
 
     def _build_smt_binary_term(self, operator, var1, var2, dsize):
         if dsize > 0:
@@ -378,9 +437,6 @@ class Context:
             var1 = self.solver.mkTerm(extop, var1)
         return self.solver.mkTerm(OperatorTable[operator], var1, var2)
 
-    def _build_smt_set_negation(self, terms):
-        return self.solver.mkTerm(Kind.NOT, self._build_smt_multiterm(Operator.And, terms))
-
     def _build_smt_multiterm(self, operator, elems):
         term = None
         for elem in elems:
@@ -390,6 +446,197 @@ class Context:
                 term = self.solver.mkTerm(OperatorTable[operator], term, elem.smt_term)
         return term
 # --------------------
+class LiteralGraph:
+    # Pairwise implications and contradictions between literals. Only literals on a
+    # common variable can be related: equalities to constants are related
+    # syntactically, other pairs with (at most three) solver queries. Relations are
+    # sound but partial (unrelated pairs, exhausted query budget).
+
+    def __init__(self, context):
+        self.context = context
+        self.known = set()
+        self.byvar = dict()
+        self.implied = dict()
+        self.conflicts = dict()
+        # Literals a conjunction with the key literal should not contain
+        self.excluded = dict()
+        self.implications = 0
+        self.contradictions = 0
+
+    def update(self, lits, budget=None):
+        queries = 0
+        for lit in lits:
+            if lit.uid in self.known:
+                continue
+            self.known.add(lit.uid)
+            lvars = self.context.term_vars(lit)
+            others = { other for var in lvars for other in self.byvar.get(var, ()) }
+            for var in lvars:
+                self.byvar.setdefault(var, []).append(lit)
+            for other in sorted(others, key=lambda t: t.uid):
+                relation = self._syntactic_relation(lit, other)
+                if relation is None:
+                    if budget is not None and queries + 3 > budget:
+                        continue
+                    relation, count = self._semantic_relation(lit, other)
+                    queries += count
+                self._relate(lit, other, relation)
+        return queries
+
+    def _const_equality(self, lit):
+        # (operand, value, op) of equalities and disequalities to constants
+        if not isinstance(lit, BBinaryTerm) or not lit.op in (Operator.Equal, Operator.Distinct):
+            return None
+        for var, const in ((lit.var1, lit.var2), (lit.var2, lit.var1)):
+            if isinstance(const, BVar) and const.type == BVarType.Literal and not (isinstance(var, BVar) and var.type == BVarType.Literal):
+                if const.bvsize() != var.bvsize() or var.bvsize() <= 1:
+                    return None
+                return var, int(const.core, 0), lit.op
+        return None
+
+    def _syntactic_relation(self, lit1, lit2):
+        ceq1, ceq2 = self._const_equality(lit1), self._const_equality(lit2)
+        if ceq1 is None or ceq2 is None or ceq1[0] is not ceq2[0]:
+            return None
+        (_, val1, op1), (_, val2, op2) = ceq1, ceq2
+        if op1 == Operator.Equal and op2 == Operator.Equal:
+            return 'conflict' if val1 != val2 else 'equivalent'
+        if op1 == Operator.Distinct and op2 == Operator.Distinct:
+            return 'equivalent' if val1 == val2 else 'none'
+        if val1 == val2:
+            return 'conflict'
+        return 'implies' if op1 == Operator.Equal else 'implied'
+
+    def _semantic_relation(self, lit1, lit2):
+        if check_sat_core([lit1, lit2], [], self.context.solver).isUnsat():
+            return 'conflict', 1
+        forward = check_consequence([lit1], [lit2], self.context)
+        backward = check_consequence([lit2], [lit1], self.context)
+        if forward and backward:
+            return 'equivalent', 3
+        if forward:
+            return 'implies', 3
+        return ('implied' if backward else 'none'), 3
+
+    def _relate(self, lit1, lit2, relation):
+        if relation == 'none':
+            return
+        if relation == 'implied':
+            lit1, lit2, relation = lit2, lit1, 'implies'
+        if relation == 'conflict':
+            self.contradictions += 1
+            self.conflicts.setdefault(lit1.uid, set()).add(lit2.uid)
+            self.conflicts.setdefault(lit2.uid, set()).add(lit1.uid)
+        else:
+            self.implications += 1
+            self.implied.setdefault(lit1.uid, set()).add(lit2.uid)
+            if relation == 'equivalent':
+                self.implied.setdefault(lit2.uid, set()).add(lit1.uid)
+        self.excluded.setdefault(lit1.uid, set()).add(lit2.uid)
+        self.excluded.setdefault(lit2.uid, set()).add(lit1.uid)
+
+    def implies(self, implicant, implicate):
+        '''sufficient condition for conjunctions: each literal of the implicate is
+        implied by a literal of the implicant, or the implicant is contradictory'''
+        uids = { lit.uid for lit in implicant }
+        closure = set(uids)
+        for uid in uids:
+            if not uids.isdisjoint(self.conflicts.get(uid, ())):
+                return True
+            closure.update(self.implied.get(uid, ()))
+        return all(lit.uid in closure for lit in implicate)
+# --------------------
+class ConsistencyCache:
+    # Satisfiability of conjunctions of literals, checked under assumptions.
+    # Minimal unsat cores are indexed by their lowest literal uid: supersets of a
+    # core are inconsistent without solver query. Models of consistent conjunctions
+    # are kept: adding a literal satisfied by the model keeps them consistent.
+    # Both are bounded, the least recently used ones being evicted first.
+
+    def __init__(self, context, max_models=4096, max_cores=16384):
+        self.context = context
+        self.cores = dict()
+        self.models = OrderedDict()
+        self.core_uses = OrderedDict()
+        self.max_models = max_models
+        self.max_cores = max_cores
+        self.true = context.solver.mkTrue()
+        self.queries = 0
+        self.hits = 0
+
+    def check(self, terms):
+        lits = frozenset(terms)
+        if not lits:
+            return True
+        uids = frozenset(lit.uid for lit in lits)
+        if uids in self.models:
+            self.models.move_to_end(uids)
+            self.hits += 1
+            return True
+        for uid in uids:
+            for core in self.cores.get(uid, ()):
+                if core <= uids:
+                    self.core_uses.move_to_end(core)
+                    self.hits += 1
+                    return False
+        for lit in lits:
+            model = self.models.get(uids - { lit.uid })
+            if model is not None and self._satisfies(model, lit):
+                self.hits += 1
+                self._add_model(uids, model)
+                return True
+        return self._solve(lits, uids)
+
+    def _add_model(self, uids, model):
+        self.models[uids] = model
+        while len(self.models) > self.max_models:
+            self.models.popitem(last=False)
+
+    def _add_core(self, core):
+        # no known core is included in the conjunction the new core comes from
+        self.cores.setdefault(min(core), []).append(core)
+        self.core_uses[core] = None
+        while len(self.core_uses) > self.max_cores:
+            ecore, _ = self.core_uses.popitem(last=False)
+            ecores = self.cores[min(ecore)]
+            ecores.remove(ecore)
+            if not ecores:
+                del self.cores[min(ecore)]
+
+    def _satisfies(self, model, lit):
+        lvars = self.context.term_vars(lit)
+        if not lvars.issubset(model):
+            return False
+        lvars = list(lvars)
+        term = lit.smt_term.substitute([self.context.vars[v][1] for v in lvars], [model[v] for v in lvars])
+        return self.context.solver.simplify(term) == self.true
+
+    def _check(self, lits):
+        self.queries += 1
+        return self.context.solver.checkSatAssuming(*[lit.smt_term for lit in lits])
+
+    def _solve(self, lits, uids):
+        if self._check(lits).isSat():
+            svars = list(frozenset().union(*(self.context.term_vars(lit) for lit in lits)))
+            values = self.context.solver.getValue([self.context.vars[v][1] for v in svars]) if svars else []
+            self._add_model(uids, dict(zip(svars, values)))
+            return True
+        self._add_core(self._minimize(lits))
+        return False
+
+    def _minimize(self, lits):
+        # Deletion-based minimization of the core found by the solver
+        byterm = { lit.smt_term: lit for lit in lits }
+        core = sorted((byterm[t] for t in self.context.solver.getUnsatAssumptions()), key=lambda t: t.uid)
+        idx = 0
+        while idx < len(core):
+            rest = core[:idx] + core[idx+1:]
+            if rest and self._check(rest).isUnsat():
+                core = rest
+            else:
+                idx += 1
+        return frozenset(lit.uid for lit in core)
+# --------------------
 def check_sat_core(asserts, assigns, solver):
     solver.push()
     for asn in assigns:
@@ -15,6 +15,7 @@ class AbductionSolver:
         self.checkers = checkers
         self.stats = stats
         self.log = logger
+        self.necessity_cache = dict()
         self.result_summary = {
             'selected_policy': None,
             'alternatives': [],
@@ -30,10 +31,23 @@ class AbductionSolver:
         return self.engine.next_candidate()
 
     def check_goals(self, candidate):
-        return self.checkers.check_goals(candidate)
+        with self.stats.span('check-goals'):
+            return self.checkers.check_goals(candidate)
 
     def check_necessity(self, formula):
-        return self.checkers.check_necessity(formula)
+        # Necessity only depends on the disjunction of the solutions: results are
+        # memoized on their (unordered) literal strings. Inconclusive answers
+        # (oracle timeouts, unknown statuses) are not memoized, so that they are
+        # asked again rather than reused as definite answers.
+        key = frozenset(frozenset(stringify(sol)) for sol in formula)
+        if key in self.necessity_cache:
+            self.stats.get_oracle('necessity-cache').calls += 1
+            return self.necessity_cache[key]
+        with self.stats.span('necessity-check'):
+            necessary = self.checkers.check_necessity(formula)
+        if getattr(self.checkers, 'necessity_conclusive', True):
+            self.necessity_cache[key] = necessary
+        return necessary
 
     def check_vulnerability(self, candidate, reject):
         return self.checkers.check_vulnerability(candidate, reject)
@@ -49,14 +63,23 @@ class AbductionSolver:
 
     def get_initital_examples(self):
         vinit_count = max(self.args.vexamples_init_count, 1 if self.args.const_detect else 0)
-        for cpt in range(vinit_count):
-            vmodel = self.get_vulnerability_model(self.engine.examples)
-            if vmodel is not None:
-                self.log.info('initialization vulnerability example: {}'.format(vmodel))
-                self.engine.add_example(vmodel)
+        harvest = max(getattr(self.args, 'vexamples_harvest', 1), 1)
+        cpt = 0
+        while cpt < vinit_count:
+            if harvest > 1:
+                # all distinct models of a harvest are kept, even beyond the requested count
+                vmodels = self.checkers.harvest_vulnerability_models(self.engine.examples, harvest)
             else:
+                vmodel = self.get_vulnerability_model(self.engine.examples)
+                vmodels = [ vmodel ] if vmodel is not None else []
+            if len(vmodels) == 0:
                 self.log.warning('could not recover as many vulnerability models as requested ({} only)'.format(cpt))
                 #TODO : act in consequence
+                break
+            for vmodel in vmodels:
+                self.log.info('initialization vulnerability example: {}'.format(vmodel))
+                self.engine.add_example(vmodel)
+                cpt += 1
 
     def recover_necessary_constants(self):
         self.engine.recover_necessary_constants()
@@ -547,6 +570,9 @@ class AbductionSolver:
                 'restarts': self.stats.generation.restart,
                 'variables': self.stats.generation.vars,
                 'literals': self.stats.generation.literals,
+                'implications': self.stats.generation.implications,
+                'contradictions': self.stats.generation.contradictions,
+                'sliced': self.stats.generation.sliced,
                 'evaluated': self.stats.generation.evaluated,
                 'considered': self.stats.generation.considered,
                 'pruned': dict(self.stats.generation.pruned),
@@ -556,7 +582,7 @@ class AbductionSolver:
                     'calls': data.calls,
                     'timeouts': data.timeouts,
                     'crashes': data.crashes,
-                    'times': list(data.times),
+                    'latency': data.latency.summary(),
                 }
                 for name, data in self.stats.oracle_stats.items()
             },
@@ -567,41 +593,59 @@ class AbductionSolver:
                 }
                 for name, timer in self.stats.timers.items()
             },
+            'phases': {
+                name: histogram.summary()
+                for name, histogram in self.stats.spans.items()
+            },
         }
 
+    def result_record(self, status):
+        # Machine-readable result: the summary extended with the current sufficient
+        # conditions, necessary constraints and statistics, so that it is meaningful
+        # even when the search was interrupted.
+        record = dict(self.result_summary)
+        record['status'] = status
+        record['exact'] = 'policy_condition' in self.result_summary
+        record['constraints'] = [sorted(stringify(sol)) for sol in self.engine.get_solutions()]
+        record['necessary'] = [sorted(stringify(lit)) for lit in self.engine.necessary]
+        record['stats'] = self._stats_to_dict()
+        return record
+
     def _semantic_post_filter_solutions(self, solutions):
         # Remove semantically redundant sufficient conditions with BINSEC
         # necessity checks (real semantics, not only syntactic subset checks).
+        # Necessity is monotone (adding a disjunct keeps a necessary condition
+        # necessary): a minimal necessary subset is extracted QuickXplain-style,
+        # with O(k log(n/k)) checks for k kept solutions out of n. Solutions are
+        # scanned from the end, so that later solutions are preferred as before.
         solutions = [set(sol) for sol in solutions]
         if len(solutions) <= 1:
             return solutions
-
-        changed = True
-        while changed and len(solutions) > 1:
-            changed = False
-            for idx, solution in enumerate(list(solutions)):
-                trial = solutions[:idx] + solutions[idx+1:]
-                if len(trial) == 0:
-                    continue
-                if self.check_necessity(trial):
-                    self.log.debug('semantic post-filter removed: {}'.format(stringify(solution)))
-                    solutions = trial
-                    changed = True
-                    break
-
-        # If one solution alone is already necessary, keep that single formula.
-        if len(solutions) > 1:
-            singleton_necessary = [sol for sol in solutions if self.check_necessity([sol])]
-            if len(singleton_necessary) > 0:
-                best = min(singleton_necessary, key=lambda sol: (len(sol), len(stringify(sol))))
-                self.log.debug('semantic post-filter selected singleton: {}'.format(stringify(best)))
-                solutions = [best]
-
-        return solutions
+        kept = { id(sol) for sol in self._minimal_necessary_subset([], False, solutions[::-1]) }
+        for solution in solutions:
+            if not id(solution) in kept:
+                self.log.debug('semantic post-filter removed: {}'.format(stringify(solution)))
+        # A minimal necessary subset with several solutions contains no necessary
+        # singleton, hence no further singleton checks.
+        return [sol for sol in solutions if id(sol) in kept]
+
+    def _minimal_necessary_subset(self, background, checked, candidates):
+        # Minimal subset of candidates that is necessary together with background,
+        # assuming background + candidates is necessary. When checked, background
+        # alone (never empty then) is tested first.
+        if checked and self.check_necessity(background):
+            return []
+        if len(candidates) == 1:
+            return candidates
+        first, second = candidates[:len(candidates) // 2], candidates[len(candidates) // 2:]
+        kept_second = self._minimal_necessary_subset(background + first, True, second)
+        kept_first = self._minimal_necessary_subset(background + kept_second, len(kept_second) > 0, first)
+        return kept_first + kept_second
 
     def _finalize_nas_result(self):
         original = [set(sol) for sol in self.engine.get_solutions()]
-        general = self._semantic_post_filter_solutions(original)
+        with self.stats.span('post-filter'):
+            general = self._semantic_post_filter_solutions(original)
         if not self.check_necessity(general):
             self.log.warning('semantic post-filter broke necessity; restoring original result set')
             general = original
@@ -678,9 +722,9 @@ class AbductionSolver:
             if has_timeout and (time.time() - start_time) >= solver_timeout:
                 self.log.warning('solver timeout reached ({}s), stopping search'.format(solver_timeout))
                 break
-            self.log.debug('trying candidate: {}'.format(candidate))
+            self.log.debug('trying candidate: {}'.format(set(candidate)))
             self.log.debug('candidate is consistent')
-            self.log.info('evaluating candidate: {}'.format(candidate))
+            self.log.info('evaluating candidate: {}'.format(set(candidate)))
             self.stats.generation.evaluated += 1
             gstatus, rstatus, gmodel, rmodel, gcore, rcore = self.check_goals(candidate)
             if gstatus and rstatus:
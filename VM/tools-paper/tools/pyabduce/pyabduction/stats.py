@@ -1,6 +1,11 @@
 # -------------------$
+import os
 import sys
+import math
+import json
 import time
+import threading
+import contextlib
 from statistics import mean, median
 # --------------------
 def cwrap(cmd, lst):
@@ -33,13 +38,75 @@ class StatTimer:
         self.lstop = time.time()
         self.total += self.lstop - self.lstart
 # --------------------
+class LatencyHistogram:
+
+    # Log-linear latency histogram (HDR-style): values are counted in buckets whose
+    # bounds grow geometrically by (1 + precision), so that memory stays bounded and
+    # percentiles are reported within the given relative precision.
+
+    def __init__(self, precision=0.01, lowest=1e-6):
+        self.base = math.log1p(precision)
+        self.lowest = lowest
+        self.buckets = dict()
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def record(self, value):
+        index = int(math.log(value / self.lowest) / self.base) if value > self.lowest else 0
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, p):
+        if self.count == 0:
+            return None
+        rank = max(1, math.ceil(self.count * p / 100))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(max(self.lowest * math.exp(self.base * (index + 1)), self.min), self.max)
+        return self.max
+
+    def summary(self):
+        return { 'count': self.count, 'total': self.total, 'min': self.min,
+                 'p50': self.percentile(50), 'p90': self.percentile(90), 'p99': self.percentile(99), 'max': self.max }
+
+    def describe(self):
+        if self.count == 0:
+            return 'count 0'
+        return 'count {}, total {:.6f}, p50 {:.6f}, p90 {:.6f}, p99 {:.6f}, max {:.6f}'.format(
+            self.count, self.total, self.percentile(50), self.percentile(90), self.percentile(99), self.max)
+# --------------------
+class TraceEvents:
+
+    # Complete events in the Chrome/Perfetto trace-event JSON format, timestamps
+    # being relative to the trace creation.
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.pid = os.getpid()
+        self.events = []
+
+    def add(self, name, category, start, end):
+        self.events.append({ 'name': name, 'cat': category, 'ph': 'X', 'pid': self.pid, 'tid': threading.get_ident(),
+                             'ts': (start - self.origin) * 1e6, 'dur': (end - start) * 1e6 })
+
+    def write(self, filename):
+        with open(filename, 'w') as stream:
+            json.dump({ 'traceEvents': self.events, 'displayTimeUnit': 'ms' }, stream)
+# --------------------
 class OracleStats:
 
     def __init__(self):
         self.calls = 0
         self.timeouts = 0
         self.crashes = 0
-        self.times = []
+        self.latency = LatencyHistogram()
 # --------------------
 class GWrapper(dict):
 
@@ -56,6 +123,9 @@ class GenerationStats:
         self.restart = 0
         self.vars = 0
         self.literals = 0
+        self.implications = 0
+        self.contradictions = 0
+        self.sliced = 0
         self.pruned = GWrapper()
 # --------------------
 class Stats:
@@ -75,6 +145,15 @@ class Stats:
         self.generation   = GenerationStats()
 
         self.timers       = {}
+        self.spans        = {}
+        self.trace        = None
+
+    def enable_trace(self):
+        self.trace = TraceEvents()
+
+    def write_trace(self, filename):
+        if self.trace is not None:
+            self.trace.write(filename)
 
     def get_oracle(self, key):
         if not key in self.oracle_stats:
@@ -90,6 +169,39 @@ class Stats:
         for key in keys:
             self.get_timer(key).start()
 
+    def get_span(self, key):
+        if not key in self.spans:
+            self.spans[key] = LatencyHistogram()
+        return self.spans[key]
+
+    @contextlib.contextmanager
+    def span(self, key):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.get_span(key).record(end - start)
+            if self.trace is not None:
+                self.trace.add(key, 'phase', start, end)
+
+    def spanned(self, key, iterable):
+        # Times the production of each element of iterable (e.g. candidate generation).
+        iterator = iter(iterable)
+        while True:
+            with self.span(key):
+                try:
+                    element = next(iterator)
+                except StopIteration:
+                    return
+            yield element
+
+    def oracle_time(self, key, start, end):
+        # start and end are time.perf_counter() values of an oracle call.
+        self.get_oracle(key).latency.record(end - start)
+        if self.trace is not None:
+            self.trace.add(key, 'oracle', start, end)
+
     def log(self, logger):
         logger.result('execution statistics:')
 
@@ -109,13 +221,18 @@ class Stats:
             logger.result('      * {} calls:    {}'.format(oracle, ostats.calls))
             logger.result('      * {} timeouts: {}'.format(oracle, ostats.timeouts))
             logger.result('      * {} crashes:  {}'.format(oracle, ostats.crashes))
-            logger.result('      * {} times:    {}'.format(oracle, ostats.times))
+            if ostats.latency.count > 0:
+                logger.result('      * {} total time: {}'.format(oracle, ostats.latency.total))
+                logger.result('      * {} latency:    {}'.format(oracle, ostats.latency.describe()))
 
         logger.result('')
         logger.result('  candidates generation:')
         logger.result('    number of restarts:     {}'.format(self.generation.restart))
         logger.result('    number of variables:    {}'.format(self.generation.vars))
         logger.result('    number of literals:     {}'.format(self.generation.literals))
+        logger.result('    literal implications:   {}'.format(self.generation.implications))
+        logger.result('    literal contradictions: {}'.format(self.generation.contradictions))
+        logger.result('    sliced out locations:   {}'.format(self.generation.sliced))
         logger.result('    evaluated candidates:   {}'.format(self.generation.evaluated))
         logger.result('    considered candidates:  {}'.format(self.generation.considered))
         logger.result('    pruned candidates:      {}'.format(sum(self.generation.pruned.values())))
@@ -128,5 +245,10 @@ class Stats:
             logger.result('    {}:'.format(timer))
             logger.result('      * first {}: {}'.format(timer, tstat.first))
             logger.result('      * last  {}: {}'.format(timer, tstat.last))
+
+        logger.result('')
+        logger.result('  phases:')
+        for span, hstat in self.spans.items():
+            logger.result('    {}: {}'.format(span, hstat.describe()))
 # --------------------
 # --------------------
@@ -14,13 +14,13 @@ class StorageTable:
     def store(self, solution):
         # Fast syntactic antichain pruning:
         # keep only subset-minimal conjunctions (drop supersets/redundant joins).
-        solution_set = set(solution)
+        # Solutions are stored as frozensets of (hash-consed) literals.
+        solution = frozenset(solution)
         kept = []
         for existing in self.solutions:
-            existing_set = set(existing)
-            if existing_set.issubset(solution_set):
+            if existing <= solution:
                 return
-            if solution_set.issubset(existing_set):
+            if solution < existing:
                 continue
             kept.append(existing)
         self.solutions = kept
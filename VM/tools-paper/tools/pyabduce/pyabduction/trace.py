@@ -0,0 +1,110 @@
+# -------------------$
+import os
+import gzip
+import json
+import time
+import hashlib
+import functools
+from collections import deque
+# --------------------
+class UnseenOracleQuery(Exception):
+    pass
+# --------------------
+@functools.lru_cache(maxsize=64)
+def binary_digest(binary, size, mtime):
+    digest = hashlib.sha256()
+    with open(binary, 'rb') as stream:
+        for block in iter(lambda: stream.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()
+# --------------------
+def query_options(command, binary):
+    return [ c for c in command[1:] if c != binary and not c.endswith('.script') ]
+# --------------------
+def normalize_script(script):
+    # Assumptions are conjunctive, but candidates are sets whose iteration order varies
+    # between runs: assumption lines are sorted in place.
+    lines = [ l.strip() for l in script.strip().split('\n') ]
+    positions = [ i for i, l in enumerate(lines) if l.startswith('at ') and ' assume ' in l ]
+    for position, line in zip(positions, sorted(lines[i] for i in positions)):
+        lines[position] = line
+    return '\n'.join(lines)
+# --------------------
+def query_key(command, script, binary):
+    # Queries are identified by the binsec options, the normalized script and the binary
+    # content: temporary script paths and binary locations do not matter.
+    stat = os.stat(binary)
+    data = json.dumps([ query_options(command, binary), normalize_script(script), binary_digest(os.path.abspath(binary), stat.st_size, stat.st_mtime) ])
+    return hashlib.sha256(data.encode()).hexdigest()
+# --------------------
+def open_trace(filename, mode):
+    if filename.endswith('.gz'):
+        return gzip.open(filename, mode + 't')
+    return open(filename, mode)
+# --------------------
+class OracleRecorder:
+
+    # Appends every binsec query and its raw response to a JSON lines trace archive
+    # (gzip compressed if its name ends with .gz). Entries are flushed one by one,
+    # so that interrupted runs still leave a usable trace.
+
+    def __init__(self, filename, logger):
+        self.filename = filename
+        self.log = logger
+        self.stream = open_trace(filename, 'a')
+
+    def __call__(self, command, script, binary, execute):
+        btime = time.time()
+        rc, to, out, err = execute()
+        elapsed = time.time() - btime
+        entry = { 'key': query_key(command, script, binary), 'options': query_options(command, binary), 'script': normalize_script(script),
+                  'returncode': rc, 'timeout': to, 'output': out, 'time': elapsed }
+        self.stream.write(json.dumps(entry) + '\n')
+        self.stream.flush()
+        return rc, to, out, err
+
+    def close(self):
+        self.stream.close()
+# --------------------
+class OracleReplayer:
+
+    # Serves binsec responses from a trace archive, without running binsec. A query
+    # recorded several times is answered with its responses in recording order (the
+    # last one being repeated). Latency is either a fixed delay in seconds or
+    # 'recorded' to replay recorded durations. Unseen queries raise.
+
+    def __init__(self, filename, logger, latency=0):
+        self.filename = filename
+        self.log = logger
+        self.latency = latency
+        self.responses = dict()
+        with open_trace(filename, 'r') as stream:
+            for line in stream:
+                if line.strip():
+                    entry = json.loads(line)
+                    self.responses.setdefault(entry['key'], deque()).append(entry)
+        self.log.debug('loaded {} recorded binsec queries from {}'.format(len(self.responses), filename))
+
+    def __call__(self, command, script, binary, execute):
+        key = query_key(command, script, binary)
+        if not key in self.responses:
+            raise UnseenOracleQuery('binsec query {} not found in trace {}:\n{}'.format(key, self.filename, normalize_script(script)))
+        responses = self.responses[key]
+        entry = responses.popleft() if len(responses) > 1 else responses[0]
+        time.sleep(entry['time'] if self.latency == 'recorded' else self.latency)
+        return entry['returncode'], entry['timeout'], entry['output'], None
+
+    def close(self):
+        pass
+# --------------------
+def make_oracle_trace(args, logger):
+    record = getattr(args, 'binsec_record', None)
+    replay = getattr(args, 'binsec_replay', None)
+    if record and replay:
+        raise ValueError('--binsec-record and --binsec-replay are exclusive')
+    if record:
+        return OracleRecorder(record, logger)
+    if replay:
+        return OracleReplayer(replay, logger, latency=getattr(args, 'binsec_replay_latency', 0))
+    return None
+# --------------------
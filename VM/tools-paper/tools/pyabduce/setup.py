@@ -8,7 +8,7 @@ setup(name='pyabduction',
         author_email='yanis.sellami@cea.fr',
         licence='None',
         packages=['pyabduction'],
-        scripts=['pyabduce', 'pyabduce-sat'],
+        scripts=['pyabduce', 'pyabduce-sat', 'pyabduce-bench'],
         install_requires=['colorama', 'tqdm', 'configparser', 'cvc5',
             'pulseutils @ git+ssh://git@git-dscin.intra.cea.fr/pulse-ia/pulseutils.git'],
         include_package_data=True,
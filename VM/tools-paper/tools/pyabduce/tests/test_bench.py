@@ -0,0 +1,69 @@
+import os
+import json
+import tempfile
+import unittest
+
+from pyabduction.bench import DEFAULT_THRESHOLDS, BenchmarkHistory, load_problems, problem_metrics, merge_metrics, compare_metrics
+
+
+def result(status='ok', time=2.0, binsec=10, minibinsec=100, evaluated=5, solutions=1, first=1.0):
+    return {
+        'id': 'p', 'status': status, 'time': time,
+        'summary': {
+            'policy_condition': 'x = 1',
+            'stats': {
+                'core': {'solutions': solutions},
+                'generation': {'considered': 50, 'evaluated': evaluated, 'pruned': {'counterex': 3}},
+                'oracles': {'binsec': {'calls': binsec}, 'minibinsec': {'calls': minibinsec}},
+                'timers': {'solution': {'first': first, 'last': first}},
+            },
+        },
+    }
+
+
+class TestBench(unittest.TestCase):
+    def test_metrics_are_extracted_from_results(self):
+        metrics = problem_metrics(result())
+        self.assertEqual((metrics['binsec_calls'], metrics['minibinsec_calls']), (10, 100))
+        self.assertEqual(metrics['pruned'], {'counterex': 3})
+        self.assertEqual(metrics['first_solution'], 1.0)
+        self.assertIsNone(problem_metrics(result(solutions=0))['first_solution'])
+        self.assertEqual(problem_metrics({'status': 'timeout', 'returncode': None})['binsec_calls'], 0)
+        merged = merge_metrics([problem_metrics(result(time=t)) for t in (3.0, 1.0, 2.0)])
+        self.assertEqual(merged['time'], 2.0)
+
+    def test_regressions_use_thresholds(self):
+        baseline = {'p': problem_metrics(result()), 'q': problem_metrics(result())}
+        current = {
+            'p': problem_metrics(result(time=2.5, binsec=11, minibinsec=105)),
+            'q': problem_metrics(result(status='timeout')),
+            'new': problem_metrics(result(binsec=1000)),
+        }
+        regressions = compare_metrics(baseline, current, DEFAULT_THRESHOLDS)
+        self.assertEqual(sorted((pid, metric) for pid, metric, _, _ in regressions), [('p', 'binsec_calls'), ('q', 'status')])
+
+    def test_history_and_problem_files(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            os.makedirs(os.path.join(tmpdir, 'c2bc', 'a.dir'))
+            with open(os.path.join(tmpdir, 'c2bc', 'a.dir', 'a.abduce-problem.json'), 'w') as stream:
+                json.dump({'id': 'a.c', 'args': ['--max-depth', '2']}, stream)
+            with open(os.path.join(tmpdir, 'suite.json'), 'w') as stream:
+                json.dump({'root': 'c2bc', 'timeout': 60, 'thresholds': {'time': {'ratio': 2, 'slack': 0}},
+                           'problems': [{'id': 's', 'args': []}]}, stream)
+            problems, _ = load_problems(os.path.join(tmpdir, 'c2bc'))
+            self.assertEqual([p['id'] for p in problems], ['a.c'])
+            problems, thresholds = load_problems(os.path.join(tmpdir, 'suite.json'))
+            self.assertEqual(problems[0]['root'], os.path.join(tmpdir, 'c2bc'))
+            self.assertEqual((problems[0]['timeout'], thresholds['time']['ratio']), (60, 2))
+
+            history = BenchmarkHistory(os.path.join(tmpdir, 'history.json'))
+            history.append({'s': problem_metrics(result())}, 'replay', label='base')
+            history.append({'s': problem_metrics(result())}, 'live')
+            history.save()
+            history = BenchmarkHistory(os.path.join(tmpdir, 'history.json'))
+            self.assertEqual(history.baseline('replay')['label'], 'base')
+            self.assertIsNone(history.baseline('live', label='base'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+from pyabduction.binsec import BinsecLogParser
+
+
+class DummyLogger:
+    def debug(self, *_args, **_kwargs):
+        return None
+
+    def warning(self, *_args, **_kwargs):
+        return None
+
+
+def model_chunk(value):
+    return '\n'.join([
+        '[sse:result] Model @ 2f8',
+        '--- Model ---',
+        '# Memory',
+        '0x20000138 : 0x11',
+        '0x2000013c : {}'.format(value),
+    ])
+
+
+class TestBinsecLogParser(unittest.TestCase):
+    def test_all_models_of_a_run_are_parsed(self):
+        log = '\n'.join([model_chunk('0x11'), '[sse:info] Path 2', model_chunk('0x12'), model_chunk('0x13')])
+        parser = BinsecLogParser(log, DummyLogger())
+        self.assertEqual([m['model']['0x2000013c'] for m in parser.models], ['0x11', '0x12', '0x13'])
+
+    def test_enumerated_values_are_attached_to_the_last_model(self):
+        log = '\n'.join([model_chunk('0x11'), '[sse:result] Directive :: enumerate possible values (2): {17; 8}, {18; 8}'])
+        parser = BinsecLogParser(log, DummyLogger())
+        self.assertEqual(parser.models[0]['enum'], [(17, 8), (18, 8)])
+
+    def test_unknown_solver_queries_are_flagged(self):
+        parser = BinsecLogParser('[sse:info] Path 2\n[sse:warning] Solver returned UNKNOWN', DummyLogger())
+        self.assertTrue(parser.status['solver-unknown'])
+        parser = BinsecLogParser('[sse:info] Path 2\n[sse:result] Goal unreachable.', DummyLogger())
+        self.assertFalse(parser.status['solver-unknown'])
+        self.assertTrue(parser.status['goal-unreachable'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,9 @@
+import json
 import unittest
 from types import SimpleNamespace
 
 from pyabduction.solver import AbductionSolver
+from pyabduction.stats import Stats
 
 
 class DummyLogger:
@@ -91,6 +93,7 @@ class FakeEngine:
     def __init__(self, solutions):
         self._solutions = solutions
         self.storage = SimpleNamespace(solutions=list(solutions))
+        self.necessary = []
 
     def get_solutions(self):
         return list(self._solutions)
@@ -112,7 +115,7 @@ def make_solver(selection_mode='branch-first'):
         args=args,
         engine=FakeEngine([]),
         checkers=FakeCheckers(),
-        stats=SimpleNamespace(),
+        stats=Stats(),
         logger=DummyLogger(),
     )
 
@@ -174,6 +177,58 @@ class TestCTRegression(unittest.TestCase):
         self.assertTrue(len(summary['branch_guided_policies']) >= 1)
         self.assertTrue(summary['branch_guided_policies'][0]['recommended_split'])
 
+    def test_result_record_extends_summary(self):
+        solutions = [{Lit('(@[0x080e3f4c,4] = 0x00000007)')}]
+        solver = make_solver()
+        solver.engine = FakeEngine(solutions)
+        self.assertFalse(solver.result_record('timeout')['exact'])
+        solver._finalize_nas_result()
+        record = json.loads(json.dumps(solver.result_record('ok'), default=str))
+        self.assertTrue(record['exact'])
+        self.assertEqual(record['constraints'], [['(@[0x080e3f4c,4] = 0x00000007)']])
+        self.assertEqual(record['necessary'], [])
+        self.assertEqual(record['selected_policy'], solver.result_summary['selected_policy'])
+        self.assertIn('generation', record['stats'])
+
+    def test_semantic_post_filter_keeps_a_minimal_necessary_subset(self):
+        required = {'(a = 1)', '(b = 2)'}
+        solutions = [{Lit('(x{} = 0)'.format(i))} for i in range(30)]
+        solutions[7], solutions[21] = {Lit('(a = 1)')}, {Lit('(b = 2)')}
+        calls = []
+
+        def check_necessity(formula):
+            calls.append(formula)
+            return required <= {str(l) for sol in formula for l in sol}
+
+        solver = make_solver()
+        solver.checkers.check_necessity = check_necessity
+        kept = solver._semantic_post_filter_solutions(solutions)
+        self.assertEqual([str(next(iter(sol))) for sol in kept], ['(a = 1)', '(b = 2)'])
+        self.assertLess(len(calls), 20)
+        self.assertTrue(all(len(formula) > 0 for formula in calls))
+        ncalls = len(calls)
+        self.assertTrue(solver.check_necessity(list(reversed(kept))))
+        self.assertFalse(solver.check_necessity(solutions[:1]))
+        self.assertFalse(solver.check_necessity(solutions[:1]))
+        self.assertEqual(len(calls), ncalls + 1)
+
+    def test_inconclusive_necessity_answers_are_not_cached(self):
+        calls = []
+
+        def check_necessity(formula):
+            calls.append(formula)
+            # first answer is a timeout, treated as non-necessary
+            solver.checkers.necessity_conclusive = len(calls) > 1
+            return len(calls) > 1
+
+        solver = make_solver()
+        solver.checkers.check_necessity = check_necessity
+        formula = [{Lit('(a = 1)')}]
+        self.assertFalse(solver.check_necessity(formula))
+        self.assertTrue(solver.check_necessity(formula))
+        self.assertTrue(solver.check_necessity(formula))
+        self.assertEqual(len(calls), 2)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+from types import SimpleNamespace
+
+from pyabduction.engine import SimpleCandidateEngine
+from pyabduction.stats import Stats
+
+
+class DummyLogger:
+    def debug(self, *_args, **_kwargs):
+        return None
+
+    def info(self, *_args, **_kwargs):
+        return None
+
+    def warning(self, *_args, **_kwargs):
+        return None
+
+    def result(self, *_args, **_kwargs):
+        return None
+
+
+class FakeGenerator:
+    def set_ex_set(self, _exset):
+        return None
+
+    def set_cex_set(self, _cexset):
+        return None
+
+
+class FakeCheckers:
+    # The vulnerability requires the model values of the necessary keys.
+    def __init__(self, model, necessary):
+        self.model = model
+        self.necessary = necessary
+        self.rejections = []
+
+    def fully_assumed(self, _key):
+        return False
+
+    def check_vulnerability(self, _candidate, reject, complete=False):
+        avoided = set(reject[0])
+        self.rejections.append(avoided)
+        reachable = not (avoided & self.necessary)
+        return reachable, (dict(self.model) if reachable else None), None
+
+    def check_consequence(self, first, second, mode_override=None):
+        return set(first) == set(second), None, None
+
+    def as_literal(self, model):
+        return ' '.join('{}={}'.format(k, v) for k, v in model.items())
+
+
+def make_engine(checkers):
+    args = SimpleNamespace(consequence_checks_mode='exact')
+    return SimpleCandidateEngine(args, checkers, FakeGenerator(), Stats(), DummyLogger())
+
+
+class TestEngine(unittest.TestCase):
+    def test_necessary_constants_are_recovered_by_group_testing(self):
+        model = {'v{}'.format(i): i for i in range(64)}
+        checkers = FakeCheckers(model, {'v3', 'v40'})
+        engine = make_engine(checkers)
+        engine.add_example(dict(model, default=0))
+        engine.recover_necessary_constants()
+        self.assertEqual(sorted(str(l) for lits in engine.necessary for l in lits), ['v3=3', 'v40=40'])
+        self.assertLess(len(checkers.rejections), 30)
+        self.assertTrue(all('default' not in avoided for avoided in checkers.rejections[1:]))
+
+    def test_no_necessary_constant_costs_one_check(self):
+        model = {'v{}'.format(i): i for i in range(8)}
+        checkers = FakeCheckers(model, set())
+        engine = make_engine(checkers)
+        engine.add_example(model)
+        engine.recover_necessary_constants()
+        self.assertEqual(len(checkers.rejections), 1)
+        self.assertEqual(list(engine.necessary), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import unittest
+from types import SimpleNamespace
+
+from pyabduction.binsec import BinsecCheckers
+from pyabduction.solver import AbductionSolver
+from pyabduction.stats import Stats
+
+
+class DummyLogger:
+    def __init__(self):
+        self.warnings = []
+
+    def debug(self, *_args, **_kwargs):
+        return None
+
+    def info(self, *_args, **_kwargs):
+        return None
+
+    def warning(self, message, *_args, **_kwargs):
+        self.warnings.append(message)
+
+
+class FakeEngine:
+    def __init__(self):
+        self.examples = []
+
+    def add_example(self, model):
+        self.examples.append(model)
+
+
+class FakeCheckers:
+    # answers harvests from a fixed list of models, never repeating a rejected one
+    def __init__(self, models):
+        self.models = models
+        self.calls = []
+
+    def check_vulnerability(self, candidate, reject, complete=False):
+        self.calls.append(('check', len(reject)))
+        models = [ m for m in self.models if not m in reject ]
+        return (True, models[0], None) if models else (False, None, None)
+
+    def harvest_vulnerability_models(self, reject, count):
+        self.calls.append(('harvest', len(reject)))
+        return [ m for m in self.models if not m in reject ][:count]
+
+
+def make_solver(models, init_count, harvest=None, const_detect=False):
+    args = SimpleNamespace(ct_mode=False, selection_mode='branch-first', solver_timeout=None, collect_until_timeout=False,
+                           const_detect=const_detect, vexamples_init_count=init_count)
+    if harvest is not None:
+        args.vexamples_harvest = harvest
+    log = DummyLogger()
+    solver = AbductionSolver(args=args, engine=FakeEngine(), checkers=FakeCheckers(models), stats=Stats(), logger=log)
+    return solver, log
+
+
+MODELS = [ { 'eax': '0x{:08x}'.format(idx) } for idx in range(7) ]
+
+
+class TestInitialExamples(unittest.TestCase):
+    def test_one_model_per_check_without_harvest(self):
+        solver, log = make_solver(MODELS, 3)
+        solver.get_initital_examples()
+        self.assertEqual(solver.engine.examples, MODELS[:3])
+        self.assertEqual(solver.checkers.calls, [ ('check', 0), ('check', 1), ('check', 2) ])
+        self.assertEqual(log.warnings, [])
+
+    def test_harvests_keep_all_their_models(self):
+        solver, log = make_solver(MODELS, 4, harvest=3)
+        solver.get_initital_examples()
+        # the second harvest goes beyond the requested count, and its models are all kept
+        self.assertEqual(solver.engine.examples, MODELS[:6])
+        self.assertEqual(solver.checkers.calls, [ ('harvest', 0), ('harvest', 3) ])
+        self.assertEqual(log.warnings, [])
+
+    def test_exhausted_harvest(self):
+        solver, log = make_solver(MODELS[:2], 4, harvest=3)
+        solver.get_initital_examples()
+        self.assertEqual(solver.engine.examples, MODELS[:2])
+        self.assertEqual(solver.checkers.calls, [ ('harvest', 0), ('harvest', 2) ])
+        self.assertEqual(log.warnings, [ 'could not recover as many vulnerability models as requested (2 only)' ])
+
+    def test_constant_detection_requires_one_example(self):
+        solver, _ = make_solver(MODELS, 0, harvest=2, const_detect=True)
+        solver.get_initital_examples()
+        self.assertEqual(solver.engine.examples, MODELS[:2])
+        solver, _ = make_solver(MODELS, 0, harvest=2)
+        solver.get_initital_examples()
+        self.assertEqual(solver.engine.examples, [])
+
+
+class FakeParser:
+    def __init__(self, models):
+        self.models = [ { 'model': model } for model in models ]
+        self.status = { 'complete': True }
+
+
+class FakeBinsecCheckers(BinsecCheckers):
+    # directive generation of the binsec checkers, without binsec
+    def __init__(self, models):
+        self.args = SimpleNamespace(ct_mode=False)
+        self.log = DummyLogger()
+        self.context = SimpleNamespace(vars={})
+        self.directives = {
+            'all': [ 'starting from core' ],
+            'positive': [ 'reach 0x8049000', 'reach 0x8049010 then print model', 'reach 0x8049020 2 times then print model' ],
+        }
+        self.models = models
+        self.runs = []
+
+    def _run_binsec_command(self, candidate, directives):
+        self.runs.append(directives)
+        return FakeParser(self.models)
+
+
+class TestHarvestDirectives(unittest.TestCase):
+    def test_reach_directives_are_repeated_for_harvests(self):
+        checkers = FakeBinsecCheckers([ { 'eax': '0x1' }, { 'eax': '0x2' } ])
+        checkers.check_vulnerability([], [])
+        self.assertEqual(checkers.runs[-1], [ 'starting from core', 'reach 0x8049000 then print model',
+                                              'reach 0x8049010 then print model', 'reach 0x8049020 2 times then print model' ])
+        checkers.harvest_vulnerability_models([], 5)
+        self.assertEqual(checkers.runs[-1], [ 'starting from core', 'reach 0x8049000 5 times then print model',
+                                              'reach 0x8049010 5 times then print model', 'reach 0x8049020 2 times then print model' ])
+
+    def test_harvested_models_are_sanitized_and_distinct(self):
+        checkers = FakeBinsecCheckers([ { 'eax': '0x1', 'from_file!1': '0x0' }, { 'eax': '0x1' }, { 'eax': '0x2', 'default': '0x0' } ])
+        self.assertEqual(checkers.harvest_vulnerability_models([], 3), [ { 'eax': '0x1' }, { 'eax': '0x2' } ])
+        self.assertEqual(checkers.harvest_vulnerability_models([], 1), [ { 'eax': '0x1' } ])
+        self.assertEqual(len(checkers.runs), 2)
+        self.assertNotIn(' times', ' '.join(checkers.runs[-1][1:3]))
+
+
+if __name__ == '__main__':
+    unittest.main()
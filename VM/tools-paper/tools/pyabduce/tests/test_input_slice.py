@@ -0,0 +1,39 @@
+import os
+import tempfile
+import unittest
+
+from pyabduction.binsec import InputSlice
+
+
+def make_slice(lines):
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as stream:
+        stream.write('# input relevance slice\n')
+        stream.write(''.join('{}\n'.format(line) for line in lines))
+    try:
+        return InputSlice(stream.name)
+    finally:
+        os.remove(stream.name)
+
+
+class TestInputSlice(unittest.TestCase):
+    def test_registers_and_memory_bytes(self):
+        islice = make_slice(['register:eax', 'memory:0x080e3f54', 'memory:0x080e3f55'])
+        self.assertTrue(islice.relevant('eax'))
+        self.assertFalse(islice.relevant('ecx'))
+        self.assertTrue(islice.relevant('0x080e3f54'))
+        self.assertTrue(islice.relevant('0x080e3f52:4'))
+        self.assertFalse(islice.relevant('0x080e3f40:4'))
+
+    def test_bytes_of_a_memory_variable(self):
+        islice = make_slice(['memory:0x080e3f55'])
+        self.assertFalse(islice.relevant('0x080e3f54:4', 0))
+        self.assertTrue(islice.relevant('0x080e3f54:4', 1))
+
+    def test_unrestricted_slice(self):
+        islice = make_slice(['register:*', 'memory:*'])
+        self.assertTrue(islice.relevant('ecx'))
+        self.assertTrue(islice.relevant('0x080e3f40:4', 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import unittest
+
+from pyabduction import minibinsec
+from pyabduction.minibinsec import Context, Operator
+
+
+class DummyLogger:
+    def debug(self, *_args, **_kwargs):
+        return None
+
+
+def make_context():
+    ctx = Context(DummyLogger())
+    for var in ('eax', 'ebx', '0x20000138:4'):
+        ctx.declare_var(var)
+    return ctx
+
+
+class TestMinibinsec(unittest.TestCase):
+    def test_terms_are_hash_consed(self):
+        ctx = make_context()
+        cid = ctx.declare_const('0x00000011')
+        lit = ctx.create_binary_term(Operator.Equal, 'eax', cid)
+        self.assertIs(ctx.create_binary_term(Operator.Equal, 'eax', cid), lit)
+        self.assertIs(ctx.create_var_assignment(Operator.Equal, 'eax', '0x00000011'), ctx.create_var_assignment(Operator.Equal, 'eax', '0x00000011'))
+        self.assertIs(ctx.get_term(lit.uid), lit)
+        self.assertEqual(hash(lit), lit.uid)
+        self.assertEqual(str(lit), '(eax<32> = 0x00000011)')
+        self.assertFalse(hasattr(lit, '__dict__'))
+        byte = ctx.declare_byte('0x20000138:4', 8)
+        self.assertEqual(str(ctx.vars[byte][0]), '(@[0x20000138,4]{8,15})')
+
+    def test_terms_are_immutable(self):
+        ctx = make_context()
+        lit = ctx.create_binary_term(Operator.Equal, 'eax', 'ebx')
+        self.assertEqual(str(lit), '(eax<32> = ebx<32>)')
+        with self.assertRaises(AttributeError):
+            lit.uid = lit.uid + 1
+        with self.assertRaises(AttributeError):
+            lit.var1 = lit.var2
+        with self.assertRaises(AttributeError):
+            lit._str_cache = 'eax = ebx'
+        with self.assertRaises(AttributeError):
+            lit.fresh = True
+        with self.assertRaises(AttributeError):
+            del lit.op
+        self.assertIs(ctx.create_binary_term(Operator.Equal, 'eax', 'ebx'), lit)
+
+    def test_negations_are_shared_by_unordered_conjunctions(self):
+        ctx = make_context()
+        lit1 = ctx.create_binary_term(Operator.Equal, 'eax', 'ebx')
+        lit2 = ctx.create_binary_term(Operator.Distinct, 'eax', 'ebx')
+        neg = ctx.create_negation(frozenset([lit1, lit2]))
+        self.assertIs(ctx.create_negation([lit2, lit1]), neg)
+        self.assertEqual(str(neg), '!({} & {})'.format(lit1, lit2))
+        self.assertTrue(minibinsec.check_consequence(frozenset([lit1]), frozenset([lit1]), ctx))
+        self.assertFalse(minibinsec.check_sat(frozenset([lit1, lit2]), ctx))
+        self.assertTrue(minibinsec.check_sat_model(frozenset([lit1]), {'eax': '0x00000001', 'ebx': '0x00000001'}, ctx))
+
+    def test_literal_graph_relates_literals_on_common_variables(self):
+        ctx = make_context()
+        c1, c2 = ctx.declare_const('0x00000011'), ctx.declare_const('0x00000012')
+        eq1 = ctx.create_binary_term(Operator.Equal, 'eax', c1)
+        eq2 = ctx.create_binary_term(Operator.Equal, 'eax', c2)
+        ne2 = ctx.create_binary_term(Operator.Distinct, 'eax', c2)
+        other = ctx.create_binary_term(Operator.Equal, 'ebx', c1)
+        byte = ctx.create_binary_term(Operator.Equal, ctx.declare_byte('eax', 0), ctx.declare_const('0x11'))
+        queries = ctx.graph.update([eq1, eq2, ne2, other, byte])
+        self.assertEqual(queries, 7)
+        self.assertEqual(ctx.graph.conflicts[eq1.uid], {eq2.uid})
+        self.assertEqual(ctx.graph.conflicts[eq2.uid], {eq1.uid, ne2.uid, byte.uid})
+        self.assertEqual(ctx.graph.implied[eq1.uid], {ne2.uid, byte.uid})
+        self.assertEqual(ctx.graph.implied[byte.uid], {ne2.uid})
+        self.assertNotIn(other.uid, ctx.graph.excluded.get(eq1.uid))
+        self.assertTrue(ctx.graph.implies({eq1, other}, {ne2, other}))
+        self.assertTrue(ctx.graph.implies({eq1, eq2}, {other}))
+        self.assertFalse(ctx.graph.implies({ne2}, {eq1}))
+        self.assertEqual(ctx.graph.update([eq1, eq2]), 0)
+        fresh = make_context()
+        self.assertEqual(fresh.graph.update([fresh.create_binary_term(Operator.Equal, 'eax', 'ebx'),
+                                             fresh.create_binary_term(Operator.Distinct, 'eax', 'ebx')], budget=2), 0)
+        self.assertEqual(fresh.graph.excluded, {})
+
+    def test_consistency_cache_reuses_cores_and_models(self):
+        ctx = make_context()
+        ctx.declare_var('ecx')
+        c1, c2 = ctx.declare_const('0x00000011'), ctx.declare_const('0x00000012')
+        eq1 = ctx.create_binary_term(Operator.Equal, 'eax', c1)
+        eq2 = ctx.create_binary_term(Operator.Equal, 'ebx', c2)
+        same = ctx.create_binary_term(Operator.Equal, 'eax', 'ebx')
+        ne = ctx.create_binary_term(Operator.Distinct, 'eax', c2)
+        other = ctx.create_binary_term(Operator.Equal, 'ecx', c1)
+        cache = ctx.consistency
+        self.assertFalse(cache.check([eq1, eq2, same, other]))
+        self.assertEqual(list(cache.cores.values()), [[frozenset([eq1.uid, eq2.uid, same.uid])]])
+        queries = cache.queries
+        self.assertFalse(cache.check([eq1, eq2, same, ne]))
+        self.assertTrue(cache.check([eq1, eq2]))
+        self.assertTrue(cache.check([eq1, eq2, ne]))
+        self.assertTrue(cache.check([eq2, eq1]))
+        self.assertEqual((cache.queries - queries, cache.hits), (1, 3))
+        self.assertTrue(cache.check([eq1, eq2, other]))
+        self.assertEqual(cache.queries - queries, 2)
+
+    def test_consistency_cache_evicts_least_recently_used_entries(self):
+        ctx = make_context()
+        c1, c2 = ctx.declare_const('0x00000011'), ctx.declare_const('0x00000012')
+        eq1 = ctx.create_binary_term(Operator.Equal, 'eax', c1)
+        eq2 = ctx.create_binary_term(Operator.Equal, 'eax', c2)
+        ne1 = ctx.create_binary_term(Operator.Distinct, 'eax', c1)
+        eb1 = ctx.create_binary_term(Operator.Equal, 'ebx', c1)
+        eb2 = ctx.create_binary_term(Operator.Equal, 'ebx', c2)
+        cache = minibinsec.ConsistencyCache(ctx, max_models=2, max_cores=2)
+        for lit in (eq1, eb1, eq1, eb2):
+            self.assertTrue(cache.check([lit]))
+        self.assertEqual(list(cache.models), [frozenset([eq1.uid]), frozenset([eb2.uid])])
+        queries = cache.queries
+        self.assertTrue(cache.check([eb1]))
+        self.assertEqual(cache.queries - queries, 1)
+        for lits in ([eq1, eq2], [eb1, eb2], [eq1, eq2], [eq1, ne1]):
+            self.assertFalse(cache.check(lits))
+        self.assertEqual(list(cache.core_uses), [frozenset([eq1.uid, eq2.uid]), frozenset([eq1.uid, ne1.uid])])
+        self.assertEqual(cache.cores, {min(eq1.uid, eq2.uid): [frozenset([eq1.uid, eq2.uid]), frozenset([eq1.uid, ne1.uid])]})
+        queries = cache.queries
+        self.assertFalse(cache.check([eq1, eq2]))
+        self.assertEqual(cache.queries, queries)
+        self.assertFalse(cache.check([eb1, eb2]))
+        self.assertGreater(cache.queries, queries)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+
+from pyabduction.trace import OracleRecorder, OracleReplayer, UnseenOracleQuery, normalize_script
+
+
+class DummyLogger:
+    def debug(self, *_args, **_kwargs):
+        return None
+
+
+SCRIPT = '\n'.join([
+    'reach 0x306 then print model',
+    'at 0x2e2 assume (@[0x20000138,1] = 0x01)',
+    'at 0x2e2 assume (@[0x2000013c,1] <> 0x02)',
+])
+
+PERMUTED = '\n'.join([
+    'reach 0x306 then print model',
+    'at 0x2e2 assume (@[0x2000013c,1] <> 0x02)',
+    'at 0x2e2 assume (@[0x20000138,1] = 0x01)',
+])
+
+
+class TestOracleTrace(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.binary = os.path.join(self.tmpdir.name, 'f.bin')
+        with open(self.binary, 'wb') as stream:
+            stream.write(b'\x7fELF')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def command(self, script_file):
+        return ['binsec', '-sse', '-sse-script', script_file, self.binary, '-sse-timeout', '30']
+
+    def record(self, trace, responses):
+        recorder = OracleRecorder(trace, DummyLogger())
+        for response in responses:
+            recorder(self.command('temp.binsec.a.script'), SCRIPT, self.binary, lambda: response)
+        recorder.close()
+
+    def test_assumption_order_is_normalized(self):
+        self.assertEqual(normalize_script(SCRIPT), normalize_script(PERMUTED))
+        self.assertTrue(normalize_script(SCRIPT).startswith('reach 0x306'))
+
+    def test_replay_serves_recorded_responses_in_order(self):
+        for name in ('trace.jsonl', 'trace.jsonl.gz'):
+            trace = os.path.join(self.tmpdir.name, name)
+            self.record(trace, [(0, False, 'first', None), (0, False, 'second', None)])
+            replayer = OracleReplayer(trace, DummyLogger())
+            fail = lambda: self.fail('binsec must not run on replay')
+            outputs = [ replayer(self.command('temp.binsec.b.script'), PERMUTED, self.binary, fail)[2] for _ in range(3) ]
+            self.assertEqual(outputs, ['first', 'second', 'second'])
+
+    def test_replay_fails_on_unseen_query(self):
+        trace = os.path.join(self.tmpdir.name, 'trace.jsonl')
+        self.record(trace, [(0, False, 'out', None)])
+        replayer = OracleReplayer(trace, DummyLogger())
+        with self.assertRaises(UnseenOracleQuery):
+            replayer(self.command('temp.binsec.b.script'), SCRIPT + '\ncut at 0x312', self.binary, None)
+        timeout_command = self.command('temp.binsec.b.script')[:-1] + ['60']
+        with self.assertRaises(UnseenOracleQuery):
+            replayer(timeout_command, SCRIPT, self.binary, None)
+
+
+if __name__ == '__main__':
+    unittest.main()
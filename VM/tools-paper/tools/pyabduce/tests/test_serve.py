@@ -0,0 +1,94 @@
+import os
+import sys
+import json
+import time
+import signal
+import tempfile
+import subprocess
+import unittest
+import importlib.util
+import importlib.machinery
+from argparse import ArgumentParser
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'pyabduce')
+_loader = importlib.machinery.SourceFileLoader('pyabduce_script', SCRIPT)
+pyabduce = importlib.util.module_from_spec(importlib.util.spec_from_loader(_loader.name, _loader))
+_loader.exec_module(pyabduce)
+
+
+def problem_parser():
+    ap = ArgumentParser(prog='pyabduce')
+    ap.add_argument('-d', '--debug', action='store_true')
+    ap.add_argument('--no-stats', action='store_false', dest='log_stats')
+    ap.add_argument('--max-depth', type=int, default=2)
+    ap.add_argument('--serve', action='store_true')
+    ap.add_argument('--batch')
+    return ap
+
+
+class TestServeProtocol(unittest.TestCase):
+    def serve(self, lines):
+        env = dict(os.environ)
+        root = os.path.dirname(os.path.dirname(SCRIPT))
+        env['PYTHONPATH'] = os.pathsep.join([os.path.join(root, 'pulseutils'), os.path.dirname(SCRIPT)])
+        proc = subprocess.run([sys.executable, SCRIPT, '--serve', '--no-stats'], input=''.join(lines),
+                              capture_output=True, text=True, env=env, cwd=os.path.dirname(SCRIPT), timeout=120)
+        self.assertEqual(proc.returncode, 0)
+        return [json.loads(line) for line in proc.stdout.splitlines()]
+
+    def test_one_ordered_reply_per_problem_line(self):
+        replies = self.serve([
+            'not json\n',
+            '\n',
+            json.dumps({'id': 'unknown-option', 'options': {'nope': 1}}) + '\n',
+            '   \n',
+            json.dumps({'id': 'bad-args', 'args': ['--bogus']}) + '\n',
+            json.dumps({'id': 'no-binary'}) + '\n',
+        ])
+        self.assertEqual([r['id'] for r in replies], [None, 'unknown-option', 'bad-args', 'no-binary'])
+        self.assertTrue(all(r['status'] == 'error' and r['returncode'] == 1 for r in replies))
+        self.assertIn('Expecting value', replies[0]['error'])
+        self.assertEqual(replies[1]['error'], 'unknown problem option: nope')
+        self.assertEqual(replies[2]['error'], "invalid problem arguments: ['--bogus']")
+        # solver errors are reported with the log a standalone run would have printed
+        self.assertIn('top-level exception recovery', replies[3]['output'])
+
+
+class TestProblemTimeout(unittest.TestCase):
+    def setUp(self):
+        self.solve = pyabduce.solve
+        self.handler = signal.signal(signal.SIGALRM, pyabduce.alarm_handler)
+
+    def tearDown(self):
+        pyabduce.solve = self.solve
+        signal.signal(signal.SIGALRM, self.handler)
+
+    def test_timeout_is_not_an_exception(self):
+        self.assertFalse(issubclass(pyabduce.ProblemTimeout, Exception))
+        self.assertEqual(pyabduce.result_status(pyabduce.ProblemTimeout()), 'timeout')
+
+    def test_timeout_escapes_broad_recoveries(self):
+        def solve(args, stats, logger):
+            # mimics the solver and oracle recoveries, which must not absorb the problem timeout
+            deadline = time.time() + 5
+            while time.time() < deadline:
+                try:
+                    time.sleep(0.05)
+                except Exception:
+                    pass
+            return {}
+        pyabduce.solve = solve
+        args = problem_parser().parse_args(['--no-stats'])
+        result = pyabduce.run_problem(problem_parser(), args, json.dumps({'id': 7, 'timeout': 0.2}))
+        self.assertEqual((result['id'], result['status'], result['returncode']), (7, 'timeout', 1))
+        self.assertIn('top-level termination', result['output'])
+
+    def test_reply_is_written_to_the_result_file(self):
+        pyabduce.solve = lambda args, stats, logger: {'max_depth': args.max_depth}
+        args = problem_parser().parse_args(['--no-stats'])
+        with tempfile.TemporaryDirectory() as tmpdir:
+            rfile = os.path.join(tmpdir, 'result.json')
+            result = pyabduce.run_problem(problem_parser(), args, json.dumps({'id': 8, 'args': ['--max-depth', '3'], 'result': rfile}))
+            with open(rfile) as istr:
+                self.assertEqual(json.load(istr)['summary'], {'max_depth': 3})
+        self.assertEqual((result['status'], result['returncode'], result['summary']), ('ok', 0, {'max_depth': 3}))
@@ -0,0 +1,42 @@
+import os
+import json
+import random
+import tempfile
+import unittest
+
+from pyabduction.stats import LatencyHistogram, Stats
+
+
+class TestStats(unittest.TestCase):
+    def test_histogram_percentiles_are_within_precision(self):
+        rng = random.Random(0)
+        values = sorted(rng.expovariate(10) for _ in range(10000))
+        histogram = LatencyHistogram(precision=0.01)
+        for value in values:
+            histogram.record(value)
+        for p in (50, 90, 99):
+            exact = values[int(len(values) * p / 100) - 1]
+            self.assertAlmostEqual(histogram.percentile(p) / exact, 1, delta=0.02)
+        self.assertEqual(histogram.max, values[-1])
+        self.assertLess(len(histogram.buckets), 2000)
+        self.assertIsNone(LatencyHistogram().percentile(50))
+
+    def test_spans_feed_histograms_and_trace_events(self):
+        stats = Stats()
+        stats.enable_trace()
+        self.assertEqual(list(stats.spanned('generation', range(3))), [0, 1, 2])
+        with stats.span('check-goals'):
+            stats.oracle_time('binsec', 1.0, 1.5)
+        self.assertEqual(stats.get_span('generation').count, 4)
+        self.assertEqual(stats.get_oracle('binsec').latency.total, 0.5)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            trace = os.path.join(tmpdir, 'trace.json')
+            stats.write_trace(trace)
+            with open(trace) as stream:
+                events = json.load(stream)['traceEvents']
+        self.assertEqual(sorted(set(e['name'] for e in events)), ['binsec', 'check-goals', 'generation'])
+        self.assertTrue(all(e['ph'] == 'X' and e['dur'] >= 0 for e in events))
+
+
+if __name__ == '__main__':
+    unittest.main()
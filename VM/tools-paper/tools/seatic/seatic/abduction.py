@@ -2,9 +2,16 @@
 import os
 import re
 import io
+import copy
+import json
+import time
+import uuid
 import zipfile
-from .core import Task, SystemTask
+import threading
+from subprocess import run, PIPE, DEVNULL, TimeoutExpired
+from .core import Task, SystemTask, CmdResult
 from pulseutils import logging as log
+from pulseutils.batch import BatchServerPool
 # --------------------
 class AbducerLogParser:
 
@@ -18,12 +25,17 @@ class AbducerLogParser:
         (' binsec timeouts',              'count-binsec-timeout'),
         (' binsec crashes',               'count-binsec-crash'),
         (' binsec times',                 'times-binsec'),
+        (' binsec total time',            'time-binsec'),
         ('minibinsec calls',              'count-minibinsec-call'),
         ('binsec-unsat-consistent calls', 'count-binsec-consistency-call'),
         ('constant-test calls',           'count-constant-test-call'),
+        ('literal-graph calls',           'count-literal-graph-call'),
         ('number of restarts',            'count-restart'),
         ('number of variables',           'count-variable'),
         ('number of literals',            'count-literal'),
+        ('literal implications',          'count-literal-implication'),
+        ('literal contradictions',        'count-literal-contradiction'),
+        ('sliced out locations',          'count-sliced-location'),
         ('evaluated candidates',          'candidates-evaluated'),
         ('considered candidates',         'candidates-considered'),
         ('pruned candidates',             'candidates-pruned'),
@@ -70,6 +82,117 @@ class AbducerLogParser:
                         value = eval(line.split(':')[-1].strip())
                         self.stats[stat] = value
 # --------------------
+class AbducerResultFile:
+
+    # Reads the machine-readable result of pyabduce (--result-file) into the same
+    # constraints, necessary constraints, exactness and statistics as the log parser.
+
+    CoreStats = (
+        ('solutions',          'count-solution'),
+        ('unsolutions',        'count-unsolution'),
+        ('examples',           'count-example'),
+        ('counterexamples',    'count-counterex'),
+        ('necessary_literals', 'count-necessary'),
+    )
+
+    OracleStats = (
+        ('binsec',                  'calls',    'count-binsec-call'),
+        ('binsec',                  'timeouts', 'count-binsec-timeout'),
+        ('binsec',                  'crashes',  'count-binsec-crash'),
+        ('minibinsec',              'calls',    'count-minibinsec-call'),
+        ('binsec-unsat-consistent', 'calls',    'count-binsec-consistency-call'),
+        ('constant-test',           'calls',    'count-constant-test-call'),
+        ('literal-graph',           'calls',    'count-literal-graph-call'),
+    )
+
+    GenerationStats = (
+        ('restarts',   'count-restart'),
+        ('variables',  'count-variable'),
+        ('literals',       'count-literal'),
+        ('implications',   'count-literal-implication'),
+        ('contradictions', 'count-literal-contradiction'),
+        ('sliced',         'count-sliced-location'),
+        ('evaluated',      'candidates-evaluated'),
+        ('considered',     'candidates-considered'),
+    )
+
+    TimerStats = (
+        ('solution',   'solution'),
+        ('unsolution', 'unsolution'),
+        ('counterex',  'counterex'),
+        ('example',    'example'),
+        ('necessaryc', 'necessary'),
+    )
+
+    def __init__(self, filename, logger):
+        self.log = logger
+        with open(filename) as stream:
+            data = json.load(stream)
+        self.status = data.get('status')
+        self.constraints = [ set(c) for c in data.get('constraints', []) ]
+        self.necessary = [ set(c) for c in data.get('necessary', []) ]
+        self.exact = bool(data.get('exact', False))
+        self.stats = self._translate_stats(data.get('stats', {}))
+
+    def _translate_stats(self, data):
+        stats = dict()
+        for key, stat in self.CoreStats:
+            if key in data.get('core', {}):
+                stats[stat] = data['core'][key]
+        oracles = data.get('oracles', {})
+        for oracle, key, stat in self.OracleStats:
+            if oracle in oracles:
+                stats[stat] = oracles[oracle][key]
+        if 'binsec' in oracles and 'latency' in oracles['binsec']:
+            stats['time-binsec'] = oracles['binsec']['latency']['total']
+        generation = data.get('generation', {})
+        for key, stat in self.GenerationStats:
+            if key in generation:
+                stats[stat] = generation[key]
+        if 'pruned' in generation:
+            stats['candidates-pruned'] = sum(generation['pruned'].values())
+            for pcat, pval in generation['pruned'].items():
+                stats['candidates-pruned-{}'.format(pcat)] = pval
+        for timer, name in self.TimerStats:
+            if timer in data.get('timers', {}):
+                stats['time-first-{}'.format(name)] = data['timers'][timer]['first']
+                stats['time-last-{}'.format(name)] = data['timers'][timer]['last']
+        return stats
+# --------------------
+ABDUCER_SERVERS = {}
+ABDUCER_SERVERS_LOCK = threading.Lock()
+def abducer_command(ctx):
+    tool = ctx['tool.abducer']
+    return list(tool) if isinstance(tool, list) else [ tool ]
+
+def abducer_servers(ctx):
+    # warm `pyabduce --serve` processes, one per analysis thread, shared by contexts using the same
+    # abducer in the same environment (the temporary directory is the only per-context variable)
+    command = tuple(abducer_command(ctx))
+    key = (command, ctx['environ.TMPDIR'])
+    with ABDUCER_SERVERS_LOCK:
+        if not key in ABDUCER_SERVERS:
+            env = copy.deepcopy(os.environ)
+            env['TMPDIR'] = ctx['environ.TMPDIR']
+            if not os.path.isdir(env['TMPDIR']):
+                os.makedirs(env['TMPDIR'])
+            ABDUCER_SERVERS[key] = BatchServerPool(list(command) + [ '--serve' ], env=env)
+        return ABDUCER_SERVERS[key]
+
+ABDUCER_RESULT_SUPPORT = {}
+ABDUCER_RESULT_SUPPORT_LOCK = threading.Lock()
+def abducer_result_support(ctx):
+    # older abducers reject --result-file: their output is parsed from logs instead
+    key = tuple(abducer_command(ctx))
+    with ABDUCER_RESULT_SUPPORT_LOCK:
+        if not key in ABDUCER_RESULT_SUPPORT:
+            try:
+                proc = run(list(key) + [ '--help' ], stdout=PIPE, stderr=DEVNULL, text=True, timeout=60)
+                ABDUCER_RESULT_SUPPORT[key] = '--result-file' in proc.stdout
+            except (OSError, TimeoutExpired):
+                ABDUCER_RESULT_SUPPORT[key] = False
+        return ABDUCER_RESULT_SUPPORT[key]
+# --------------------
 class AbductionAnalysisTask(SystemTask):
 
     def __init__(self, ctx, mutant, mutant_data, logger):
@@ -101,6 +224,10 @@ class AbductionAnalysisTask(SystemTask):
             cmd += [ '--no-constant-detection' ]
         if ctx['opt.debug']:
             cmd += [ '--debug' ]
+        self.result_file = None
+        if abducer_result_support(ctx):
+            self.result_file = os.path.abspath(os.path.join(ctx['environ.TMPDIR'], 'abducer.{}.json'.format(uuid.uuid4().hex)))
+            cmd += [ '--result-file', self.result_file ]
         super().__init__(cmd, logger, timeout=ctx['timeout.abducer'], log_errors=False, softkill=True)
         self.ctx = ctx
         self.mutant = mutant
@@ -115,13 +242,30 @@ class AbductionAnalysisTask(SystemTask):
     def _preprocess(self):
         if self.ctx['opt.task_logging'] and not os.path.isdir(self.ctx['log.abducer']):
             os.makedirs(self.ctx['log.abducer'])
+        if self.result_file is not None and not os.path.isdir(os.path.dirname(self.result_file)):
+            os.makedirs(os.path.dirname(self.result_file))
+
+    def _execute(self):
+        if not self.ctx['opt.abducer_server']:
+            return super()._execute()
+        self.log.debug('submitting to abducer server: {}'.format(' '.join(self.cmd)))
+        prvp_time = time.time()
+        result = abducer_servers(self.ctx).solve({ 'id': self.mutant, 'args': self.cmd[len(abducer_command(self.ctx)):], 'timeout': self.timeout }, timeout=self.timeout)
+        proc_time = round(time.time() - prvp_time, 6)
+        self.log.debug('abducer server elapsed time: {}s'.format(proc_time))
+        returncode = result['returncode'] if result['returncode'] is not None else -9
+        self.cmd_result = CmdResult(result.get('output', ''), None, returncode, proc_time, result['status'] == 'timeout')
 
     def _postprocess(self):
         logfile = self.ctx.mutant_logtarget(self.mutant, 'abducer')
         if self.ctx['opt.task_logging']:
             self._log_output(logfile)
         self.data['abducer'] = {'time': self.cmd_result.time, 'timeout': self.cmd_result.timeout, 'returncode': self.cmd_result.returncode}
-        parser = AbducerLogParser(self.output, self.log)
+        if self.result_file is not None and os.path.isfile(self.result_file):
+            parser = AbducerResultFile(self.result_file, self.log)
+            os.remove(self.result_file)
+        else:
+            parser = AbducerLogParser(self.output, self.log)
         target = self.data['abducer']
         target['constraints'] = parser.constraints
         target['necessary'] = parser.necessary
@@ -16,6 +16,7 @@ class FullAnalysisTask(Task):
         super().__init__(logger)
         self.ctxs = ctx if merged else [ ctx ]
         self.subtasks = {}
+        self.aliases = {}
 
     def _detect_mutants(self):
         for ctx in self.ctxs:
@@ -54,6 +55,9 @@ class FullAnalysisTask(Task):
                             break
                     if pflag:
                         continue
+                if 'alias' in mdata and (ctx, mdata['alias']) in self.subtasks:
+                    self.aliases[ctx, mutant] = mdata['alias']
+                    continue
                 mwdata = copy.deepcopy(mdata)
                 manalysis = MutantAnalysisTask(ctx, mutant, self.log, analyzers, mwdata)
                 self.subtasks[ctx, mutant] = manalysis
@@ -91,8 +95,13 @@ class FullAnalysisTask(Task):
                 results[ctx] = {}
             if not task.to_discard:
                 results[ctx][mutant] = task.get_results()
+        for (ctx, mutant), representative in self.aliases.items():
+            if representative in results[ctx]:
+                mdata = copy.deepcopy(results[ctx][representative])
+                mdata['alias'] = representative
+                results[ctx][mutant] = mdata
         for ctx, mdata in results.items():
-            ctx['mutants'] = mdata
+            ctx.set_mutants(mdata)
 # --------------------
 class MutantAnalysisTask(Task):
 
@@ -0,0 +1,162 @@
+# --------------------
+import statistics
+import numpy as np
+from .results import VStatus
+# --------------------
+def native(value, values=None):
+    # converts numpy scalars back to python values, keeping integral statistics
+    # of integer columns as int as the statistics module does
+    value = value.item() if isinstance(value, np.generic) else value
+    if values is not None and values.dtype.kind in 'biu' and isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+# --------------------
+def npsum(values):
+    return native(np.sum(values))
+# --------------------
+def npmean(values):
+    return native(np.mean(values), values) if len(values) > 0 else 'no value'
+# --------------------
+def npmedian(values):
+    if len(values) == 0:
+        return 'no value'
+    return native(np.median(values), values if len(values) % 2 else None)
+# --------------------
+def nppercent(values):
+    return 100*npmean(values) if len(values) > 0 else 'no value'
+# --------------------
+class MetaColumns:
+    # Columnar view of the mutants of a set of meta-contexts.
+    # Every per-mutant metric used by the meta scripts is extracted once into a
+    # numpy array (one row per mutant, rows sorted by context then mutant name);
+    # tables are dicts of (values, where) columns, and aggregations select rows
+    # with boolean masks instead of looking mutants up one by one.
+
+    Tools = ('binsec', 'robust', 'abduction', 'abduction_necessary', 'abduction_nas', 'simu', 'vsimu')
+    Severities = ('binsec', 'robust', 'abduction', 'simu', 'vsimu')
+    Times = (('binsec', 'binsec'), ('robust', 'binsec-robust'), ('abducer', 'abducer'),
+             ('simu', 'simulation'), ('vsimu', 'vsimulation'))
+    AbducerStats = ('candidates-considered', 'candidates-evaluated', 'candidates-pruned',
+                    'count-literal', 'count-binsec-call', 'count-restart',
+                    'time-first-solution', 'time-first-necessary', 'time-last-solution', 'time-last-necessary')
+    CountStats = ('candidates-considered', 'candidates-evaluated', 'candidates-pruned',
+                  'count-literal', 'count-binsec-call', 'count-restart')
+
+    def __init__(self, metadata, logger, sortkey=None):
+        self.log = logger
+        self.builders = []
+        self.rows = []
+        self._masks = {}
+        self._extract(metadata, sortkey)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _extract(self, metadata, sortkey):
+        self.log.info('extracting meta-context mutant metrics')
+        context, status, vseverity, pseverity, times, abdstats = [], [], [], [], [], []
+        abducer, timeout, exact, solcount, sollength, binsectime, vulnerable = [], [], [], [], [], [], []
+        for builder in metadata.values():
+            bid = len(self.builders)
+            self.builders.append(builder)
+            for mutant in sorted(builder.ctx.mutants.keys(), key=sortkey):
+                md = builder.ctx.mutants[mutant]
+                self.rows.append((builder, mutant))
+                context.append(bid)
+                status.append([ builder.get_merged_vstatus(mutant, tool).value for tool in self.Tools ])
+                vseverity.append([ builder.get_vseverity(mutant, tool) for tool in self.Severities ])
+                pseverity.append(builder.get_pseverity(mutant, 'abduction'))
+                times.append([ md[key]['time'] if key in md else 0 for _, key in self.Times ])
+                abdata = md['abducer'] if 'abducer' in md else None
+                stats = abdata['statistics'] if abdata is not None and 'statistics' in abdata else {}
+                abdstats.append([ stats[stat] if stat in stats else np.nan for stat in self.AbducerStats ])
+                # older abducers log every binsec call time instead of the total
+                binsectime.append(stats['time-binsec'] if 'time-binsec' in stats else sum(stats['times-binsec']) if 'times-binsec' in stats else 0)
+                abducer.append(abdata is not None)
+                timeout.append(abdata is not None and abdata['timeout'])
+                exact.append(abdata is not None and bool(abdata.get('exact', False)))
+                constraints = abdata['constraints'] if abdata is not None else []
+                solcount.append(len(constraints))
+                sollength.append(statistics.mean((len(c) for c in constraints)) if len(constraints) > 0 else 0)
+                vulnerable.append(bool(builder.ctx.is_vulnerable(mutant)))
+        count = len(self.rows)
+        self.context = np.array(context, dtype=np.int64)
+        self.sources = [ builder.ctx['source'] for builder in self.builders ]
+        self.status = { tool: np.array([ s[i] for s in status ], dtype='<U1') for i, tool in enumerate(self.Tools) }
+        self.vseverity = { tool: np.array([ s[i] for s in vseverity ]) for i, tool in enumerate(self.Severities) }
+        self.pseverity = { 'abduction': np.array(pseverity) }
+        self.times = { tool: np.array([ t[i] for t in times ]) for i, (tool, _) in enumerate(self.Times) }
+        self.abdstats = { stat: np.array([ s[i] for s in abdstats ], dtype=np.float64) for i, stat in enumerate(self.AbducerStats) }
+        self.abdstats['times-binsec'] = np.array(binsectime, dtype=np.float64)
+        self.abducer = np.array(abducer, dtype=bool)
+        self.abducer_timeout = np.array(timeout, dtype=bool)
+        self.abducer_exact = np.array(exact, dtype=bool)
+        self.solution_count = np.array(solcount, dtype=np.int64)
+        self.solution_length = np.array(sollength)
+        self.vulnerable = np.array(vulnerable, dtype=bool)
+        self.log.info('extracted metrics of {} mutants from {} contexts'.format(count, len(self.builders)))
+
+    @property
+    def all(self):
+        return np.ones(len(self.rows), dtype=bool)
+
+    @property
+    def ones(self):
+        return np.ones(len(self.rows), dtype=np.int64)
+
+    def is_status(self, tool, status):
+        return self.status[tool] == status.value
+
+    def vuln(self, tool):
+        return self.is_status(tool, VStatus.Vuln)
+
+    def unknown(self, tool):
+        return self.is_status(tool, VStatus.Unknown)
+
+    def abdstat(self, stat, default=0):
+        values = self.abdstats[stat]
+        values = np.where(np.isnan(values), default, values)
+        return values.astype(np.int64) if stat in self.CountStats else values
+
+    def abdstat_diff(self, statp, statm, default=0):
+        valp, valm = self.abdstats[statp], self.abdstats[statm]
+        return np.where(np.isnan(valp) | np.isnan(valm), default, np.maximum(valp - valm, 0)).astype(np.int64)
+
+    def corrected_abducer_time(self):
+        return np.where(self.vuln('robust'), self.times['robust'], self.times['abducer'])
+
+    def context_mask(self, predicate):
+        # row mask from a predicate on context sources, evaluated once per context
+        return np.array([ predicate(source) for source in self.sources ], dtype=bool)[self.context]
+
+    def owner(self, optl):
+        key = ('owner', optl)
+        if key not in self._masks:
+            self._masks[key] = self.context_mask(lambda source: optl in source)
+        return self._masks[key]
+
+    def source(self, src):
+        key = ('source', src)
+        if key not in self._masks:
+            self._masks[key] = self.context_mask(lambda source: source == src)
+        return self._masks[key]
+
+    def select(self, mask):
+        return [ self.rows[i] for i in np.flatnonzero(mask) ]
+
+    @staticmethod
+    def aggregate_table(table, categories):
+        # table: { key: (values, where) }, where values is indexed by rows on its first
+        # axis and where is an optional mask restricting the aggregated rows
+        # categories: [ (group mask, aggregators, formatters) ]
+        atable = { key : [] for key in table }
+        for group, aggregators, formatters in categories:
+            for key, (values, where) in table.items():
+                if group.any():
+                    avalue = aggregators[key](values[group if where is None else group & where])
+                    formatter = formatters[key]
+                    atable[key].append(formatter(avalue) if formatter is not None and not isinstance(avalue, str) else avalue)
+                else:
+                    atable[key].append('no value')
+        return atable
+# --------------------
@@ -15,6 +15,7 @@ try:
     from yaml import CLoader as ymlLoader, CDumper as ymlDumper
 except ImportError:
     from yaml import Loader as ymlLoader, Dumper as ymlDumper
+from .store import MutantStore
 # --------------------
 SEATIC_TASK_ID = 0
 def generate_task_id():
@@ -146,7 +147,8 @@ class SeaticContext:
         def update_dict(target, source):
             for key in source:
                 if key in target:
-                    if isinstance(target[key], dict):
+                    # mutants of an attached store are merged in place, not replaced
+                    if isinstance(target[key], (dict, MutantStore)):
                         update_dict(target[key], source[key])
                     else:
                         self.log.info('updating context @{}: {} <- {}'.format(key, target[key], source[key]))
@@ -162,6 +164,7 @@ class SeaticContext:
             self['tool.binsec'] = self['tool.binsec-robust']
         self._override_fargs(args)
         self._prefixate_fargs(args)
+        self._store_fargs(args)
 
     def _override_fargs(self, args):
         for override in args.override_context:
@@ -175,6 +178,54 @@ class SeaticContext:
                 if key in self:
                     self[key] = os.path.join(args.context_prefix, self[key])
 
+    def _store_fargs(self, args):
+        if args.mutant_store is not None:
+            if not self.has_store or self.mutants.filename != os.path.abspath(args.mutant_store):
+                self.attach_store(args.mutant_store)
+
+    @property
+    def store_scope(self):
+        return self['store.scope'] if 'store.scope' in self else ''
+
+    @property
+    def has_store(self):
+        return isinstance(self.data.get('mutants'), MutantStore)
+
+    def attach_store(self, filename):
+        # global context stays in yaml, mutant data is lazily loaded from the store
+        # (in the scope of the context, as a store can be shared by merged contexts)
+        filename = os.path.abspath(filename)
+        self.log.info('attaching mutant store {} (scope: {})'.format(filename, self.store_scope))
+        store = MutantStore(filename, self.log, scope=self.store_scope)
+        mdata = self.data.get('mutants')
+        if mdata:
+            store.import_mutants(mdata)
+        self.data['mutants'] = store
+        self['store.mutants'] = filename
+        self['store.scope'] = store.scope
+
+    def sync(self):
+        # writes back in place modifications of the loaded mutants
+        if self.has_store:
+            self.mutants.sync()
+
+    def set_mutants(self, mdata):
+        if self.has_store:
+            self.mutants.replace(mdata)
+        else:
+            self.data['mutants'] = mdata
+
+    def dump(self, stream, full=False):
+        data = self.data
+        if self.has_store:
+            self.mutants.sync()
+            data = dict(self.data)
+            if full:
+                data['mutants'] = self.mutants.export_mutants()
+            else:
+                data.pop('mutants')
+        yaml.dump(data, stream, Dumper=ymlDumper)
+
     def mutant_logtarget(self, mutant, logdir, ext='log'):
         return os.path.join(self['log'][logdir], '{}.{}'.format(os.path.basename(mutant), ext))
 
@@ -70,6 +70,11 @@ class SeaticEngine:
         self.log.debug('starting task manager tasks')
         while self.tasks:
             self.tasks.pop(0).execute()
+            self.sync_contexts()
+
+    def sync_contexts(self):
+        # task results are saved to the mutant stores as soon as the task ends
+        self.ctx.sync()
 
     def flush_tasklist(self):
         self.tasks.clear()
@@ -82,6 +87,10 @@ class SeaticMergedEngine(SeaticEngine):
         self.ctxs = ctxs
         self.tasks = []
 
+    def sync_contexts(self):
+        for ctx in self.ctxs:
+            ctx.sync()
+
     def generate_tasks_prepare(self):
         for ctx in self.ctxs:
             self.tasks.append(GetSourceInfoTask(ctx, self.log))
@@ -111,6 +120,8 @@ class ContextLoader:
         try:
             ldata = yaml.load(stream, Loader=ymlLoader)
             self.ctx.update_from(ldata)
+            if 'store.mutants' in self.ctx:
+                self.ctx.attach_store(self.ctx['store.mutants'])
         except yaml.YAMLError as e:
             if hasattr(e, 'problem_mark'):
                 mark = e.problem_mark
@@ -136,10 +147,9 @@ class SeaticBaseRunner:
     def __del__(self):
         timestamp = datetime.now().strftime('%Y-%m-%d.%H-%M-%S.%f')
         logfile = 'seatic.{}.yml'.format(timestamp)
-        data = self.ctx.data
         self.log.info('dumping context to {}'.format(logfile))
         with open(logfile, 'w') as stream:
-            yaml.dump(data, stream, Dumper=ymlDumper)
+            self.ctx.dump(stream, full=self.args.full_context_dump)
 
     def run(self):
         if self.args.tempdir_cleanup:
@@ -161,16 +171,18 @@ class SeaticBaseMergedRunner:
         self.args = args
         self.ctxs = { context_file: ContextLoader(self.log, context_file, args=args).ctx for context_file in args.meta_context }
         for ctxif, ctx in self.ctxs.items():
+            if not ctx.has_store:
+                # merged contexts may share a mutant store, each one in its own scope
+                ctx['store.scope'] = os.path.abspath(ctxif)
             ctx.update_fargs(args)
 
     def __del__(self):
         timestamp = datetime.now().strftime('%Y-%m-%d.%H-%M-%S.%f')
         for ctxif, ctx in self.ctxs.items():
             logfile = os.path.join(os.path.dirname(ctxif), 'seatic.{}.yml'.format(timestamp))
-            data = ctx.data
             self.log.info('dumping {}-imported context to {}'.format(ctxif, logfile))
             with open(logfile, 'w') as stream:
-                yaml.dump(data, stream, Dumper=ymlDumper)
+                ctx.dump(stream, full=self.args.full_context_dump)
 
     def run(self):
         if self.args.tempdir_cleanup:
@@ -2,20 +2,39 @@
 import os
 import re
 import io
+import hashlib
 from .core import Task, SystemTask
-from pulseutils.files import prefixate
+from pulseutils.files import prefixate, create_file_directory
 from pulseutils import logging as log
 # --------------------
 # --------------------
+def mutant_digest(mutant):
+    with open(mutant, 'rb') as stream:
+        return hashlib.sha256(stream.read()).hexdigest()
+# --------------------
 def detect_mutants(ctx, logger):
     generated_dir = ctx['mutation.outdir']
-    generated = os.listdir(generated_dir)
+    generated = sorted(os.listdir(generated_dir))
     new_mutants = { os.path.join(generated_dir, mutant) : dict() for mutant in generated }
     for nmutant, nmdata in new_mutants.items():
         if not nmutant in ctx['mutants']:
             ctx['mutants'][nmutant] = nmdata
+    group_mutant_aliases(ctx, new_mutants, logger)
     logger.info('generated mutant count: {}'.format(len(new_mutants)))
 # --------------------
+def group_mutant_aliases(ctx, mutants, logger):
+    # byte-identical mutants are analyzed once, aliases refer to the first of their class
+    representatives = {}
+    for mutant in mutants:
+        mdata = ctx['mutants'][mutant]
+        mdata['digest'] = mutant_digest(mutant)
+        mdata.pop('alias', None)
+        if mdata['digest'] in representatives:
+            mdata['alias'] = representatives[mdata['digest']]
+        else:
+            representatives[mdata['digest']] = mutant
+    logger.info('distinct mutant count: {}'.format(len(representatives)))
+# --------------------
 class AutodetectMutantsTask(Task):
 
     def __init__(self, ctx):
@@ -61,14 +80,22 @@ class FisticMutationTask(SystemTask):
 class FisticSimulationTask(SystemTask):
 
     def __init__(self, ctx, mutant, mutant_data, logger):
+        sink = os.path.join(ctx['log.fistic'], '{}.fistic-results.jsonl'.format(os.path.basename(mutant)))
         cmd  = [ctx['tool']['fistic'], '-b', mutant]
         cmd += ['--fault-model', 'none', '--placer', 'none']
         cmd += ['-e', 'qemu', '--no-color', '--no-progress']
+        cmd += ['--results-sink', sink, '--no-yaml-export']
         # TODO: recover golden timeout/results and 1. use this timeout, 2. compare result
         super().__init__(cmd, logger)
         self.ctx = ctx
         self.mutant = mutant
         self.data = mutant_data
+        self.sink = sink
+
+    def _preprocess(self):
+        create_file_directory(self.sink)
+        if os.path.isfile(self.sink):
+            os.remove(self.sink)
 
     def should_run(self):
         return True
@@ -83,7 +110,7 @@ class FisticSimulationTask(SystemTask):
             self._log_output(logfile)
 
     def _recover_result(self):
-        parser = FisticLogParser(self.output, self.log)
+        parser = FisticLogParser(self.output, self.log, sink=self.sink)
         bname = os.path.basename(self.mutant)
         self.data['simulation'] = {'data': parser.results['golden'],
                                    'time': self.cmd_result.time,
@@ -128,6 +155,25 @@ class LegacyFisticLogParser:
 # --------------------
 class FisticLogParser(LegacyFisticLogParser):
 
+    def __init__(self, data, logger, sink=None):
+        self.sink = sink
+        super().__init__(data, logger)
+
+    def _parse(self, data):
+        if self.sink is not None and os.path.isfile(self.sink):
+            self.log.debug('reading fistic results sink')
+            self._parse_sink()
+        else:
+            super()._parse(data)
+
+    def _parse_sink(self):
+        # sinks are only written by fistic runs, fistic is thus installed when reading one
+        from fistic.results import iter_results
+        for entry in iter_results(self.sink):
+            if entry['golden']:
+                self._push_result(entry['status'])
+                return
+
     def _push_result(self, res):
         self.results['golden'] = dict(result=None, crash=False, timeout=False)
         if res == 'timeout':
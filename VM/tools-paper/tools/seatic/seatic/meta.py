@@ -7,6 +7,7 @@ import datetime
 import copy
 import itertools
 import statistics
+import numpy as np
 import pulseutils.arith
 import pulseutils.files
 from pulseutils import logging as log
@@ -15,15 +16,19 @@ from . import plots
 from . import utils
 from .engine import SeaticBaseRunner, ContextLoader
 from .results import ExportResultsTask, VStatus
+from .columns import MetaColumns, npsum, npmean, npmedian, nppercent
 from .utils import extract_optimization
 # --------------------
 class MetaTask:
 
+    OptLevels = ('O0', 'O1', 'O2', 'O3', 'Os')
+
     def __init__(self, ctx, metactx, logger, sourcekey=''):
         self.ctx = ctx
         self.metactx = metactx
         self.log = logger
         self.metadata = None
+        self.columns = None
         self.sourcekey = sourcekey
 
     def execute(self):
@@ -32,36 +37,26 @@ class MetaTask:
     def _execute(self):
         raise NotImplementedError(self)
 
-    def get_table(self, elements, sortkey=None):
-        table = { key : [] for key, _, _ in elements }
-        table[self.sourcekey] = []
-        for mctx, builder in self.metadata.items():
-            for mutant in sorted(builder.ctx.mutants.keys(), key=sortkey):
-                table[self.sourcekey].append((builder, mutant))
-                for key, kgetter, kformatter in elements:
-                    pval = kgetter(builder, mutant, builder.ctx.mutants[mutant])
-                    table[key].append(kformatter(pval) if kformatter is not None else pval)
-        return table
-
     def aggregate_table(self, table, categories):
-        atable = { key : [] for key in table if key != self.sourcekey }
-        for ownership, aggregators, formatters in categories:
-            for key, vlist in table.items():
-                if key != self.sourcekey:
-                    mlist = [ m for m in table[self.sourcekey] if ownership(m) ]
-                    if len(mlist) > 0:
-                        aggregator = aggregators[key]
-                        avalue = aggregator([ vlist[i] for i in (table[self.sourcekey].index(m) for m in mlist)])
-                        formatter = formatters[key]
-                        atable[key].append(formatter(avalue) if formatter is not None else avalue)
-                    else:
-                        atable[key].append('no value')
-        return atable
+        return self.columns.aggregate_table(table, categories)
+
+    def optl_categories(self, aggregators, formatters, split=True, where=None):
+        masks = [ self.columns.owner(optl) for optl in self.OptLevels ] if split else []
+        masks.append(self.columns.all)
+        return [ (mask if where is None else mask & where, aggregators, formatters) for mask in masks ]
+
+    def optl_firstcols(self, split=True):
+        return list(self.OptLevels) + ['total'] if split else ['total']
+
+    @staticmethod
+    def table_columns(table):
+        return { key : values for key, (values, _) in table.items() }
 # --------------------
 class MetaDataTask(MetaTask):
 
     def extract_data(self):
         self.metadata = { mctx : self.extract_data_from(ctx) for mctx, ctx in self.metactx.items() }
+        self.columns = MetaColumns(self.metadata, self.log)
 
     def extract_data_from(self, ctx):
         raise NotImplementedError(self)
@@ -72,6 +67,10 @@ class MetaDataTask(MetaTask):
 # --------------------
 class ResultsComparatorMDT(MetaDataTask):
 
+    def __init__(self, ctx, metactx, logger, sourcekey=''):
+        super().__init__(ctx, metactx, logger, sourcekey)
+        self.plots = plots.PlotRenderer(logger, workers=ctx['opt.parallel_workers'], cached=ctx['opt.plot_cache'])
+
     def extract_data_from(self, ctx):
         return ExportResultsTask(ctx, self.log)
 
@@ -89,6 +88,7 @@ class ResultsComparatorMDT(MetaDataTask):
             except AttributeError as e:
                 self.log.error('unknown meta script command: {}'.format(command))
                 raise e
+        self.plots.render()
 
     def _execute_all(self):
         self._print_vulnerability_tables()
@@ -108,85 +108,65 @@ class ResultsComparatorMDT(MetaDataTask):
     def _generate_vsimulation_list(self):
         self.log.info('generate vsimulation vulnerabilities list file in vsimulation-vuln-list.txt')
         with open('vsimulation-vuln-list.txt', 'w') as stream:
-            for mctx, builder in self.metadata.items():
-                for mutant in builder.ctx.mutants.keys():
-                    if builder.get_merged_vstatus(mutant, 'vsimu') == VStatus.Vuln:
-                        stream.write('{}:{}\n'.format(builder.ctx['source'], mutant))
+            for builder, mutant in self.columns.select(self.columns.vuln('vsimu')):
+                stream.write('{}:{}\n'.format(builder.ctx['source'], mutant))
 
     def _generate_split_vsimulation_list(self):
         self.log.info('generate split vsimulation vulnerabilities list files')
-        for mctx, builder in self.metadata.items():
+        vulns = self.columns.vuln('vsimu')
+        for bid, builder in enumerate(self.columns.builders):
             filename = '{}-vsimulation-vuln-list.txt'.format(pulseutils.files.flatten_path(pulseutils.files.deprefixate(builder.ctx['source'])))
             self.log.info(f'generate vsimulation vulnerabilities list for {filename}')
             with open(filename, 'w') as stream:
-                for mutant in builder.ctx.mutants.keys():
-                    if builder.get_merged_vstatus(mutant, 'vsimu') == VStatus.Vuln:
-                        stream.write('{}:{}\n'.format(pulseutils.files.deprefixate(builder.ctx['source']), pulseutils.files.deprefixate(mutant)))
+                for _, mutant in self.columns.select(vulns & (self.columns.context == bid)):
+                    stream.write('{}:{}\n'.format(pulseutils.files.deprefixate(builder.ctx['source']), pulseutils.files.deprefixate(mutant)))
 
     def _export_survival_data(self):
         self.log.info('generate survival data file in survival-rse.data')
         self.log.info('generate survival data file in survival-abd.data')
-        stream_rse = open('survival-rse.data', 'w')
-        stream_abd = open('survival-abd.data', 'w')
-        for mctx, builder in self.metadata.items():
-            for mutant in builder.ctx.mutants.keys():
-                if builder.get_merged_vstatus(mutant, 'robust') == VStatus.Vuln:
-                    tvalue = builder.ctx.mutants[mutant]['binsec-robust']['time']
-                    stream_rse.write('{}\n'.format(tvalue))
-                    stream_abd.write('{}\n'.format(tvalue))
-                elif builder.get_merged_vstatus(mutant, 'abduction') == VStatus.Vuln:
-                    try:
-                        tvalue = builder.ctx.mutants[mutant]['abducer']['statistics']['time-first-solution']
-                    except KeyError:
-                        tvalue = -1 # TODO check value consistency
-                    stream_abd.write('{}\n'.format(tvalue))
-        stream_rse.close()
-        stream_abd.close()
+        robust = self.columns.vuln('robust')
+        abduction = self.columns.vuln('abduction') & ~robust
+        # TODO check value consistency of missing first solution times
+        tvalues = np.where(robust, self.columns.times['robust'], self.columns.abdstat('time-first-solution', default=-1))
+        with open('survival-rse.data', 'w') as stream_rse:
+            for tvalue in tvalues[robust].tolist():
+                stream_rse.write('{}\n'.format(tvalue))
+        with open('survival-abd.data', 'w') as stream_abd:
+            for tvalue in tvalues[robust | abduction].tolist():
+                stream_abd.write('{}\n'.format(tvalue))
 
     def _print_match_tables(self):
         self.log.info('print match tables')
         tools = ('binsec', 'vsimu', 'abduction', 'simu', 'robust')
-        owner = lambda optl : lambda m : optl in m[0].ctx['source']
+        c = self.columns
         for t1, t2 in itertools.combinations(tools, 2):
-            elements = [
-                    ('#', lambda b, m, md: 1, None),
-                    ('?', lambda b, m, md: VStatus.Unknown in (b.get_merged_vstatus(m, t1), b.get_merged_vstatus(m, t2)), None),
-                    ('match', lambda b, m, md: b.get_merged_vstatus(m, t1) == b.get_merged_vstatus(m, t2) and b.get_merged_vstatus(m, t1) != VStatus.Unknown, None),
-                    ('{} !in {}'.format(t1, t2), lambda b, m, md: b.get_merged_vstatus(m, t1) == VStatus.Vuln and b.get_merged_vstatus(m, t2) != VStatus.Vuln, None),
-                    ('{} !in {}'.format(t2, t1), lambda b, m, md: b.get_merged_vstatus(m, t2) == VStatus.Vuln and b.get_merged_vstatus(m, t1) != VStatus.Vuln, None),
-            ]
-            table = self.get_table(elements)
-            aggregators = { k : sum for k in (e[0] for e in elements) }
-            formatters = { k : None for k in (e[0] for e in elements) }
-            categories = [ (owner(optl), aggregators, formatters) for optl in ('O0', 'O1', 'O2', 'O3', 'Os') ]
-            categories.append((lambda m: True, aggregators, formatters))
-            atable = self.aggregate_table(table, categories)
-            firstcols = ['O0', 'O1', 'O2', 'O3', 'Os', 'total']
+            table = {
+                    '#': (c.ones, None),
+                    '?': (c.unknown(t1) | c.unknown(t2), None),
+                    'match': ((c.status[t1] == c.status[t2]) & ~c.unknown(t1), None),
+                    '{} !in {}'.format(t1, t2): (c.vuln(t1) & ~c.vuln(t2), None),
+                    '{} !in {}'.format(t2, t1): (c.vuln(t2) & ~c.vuln(t1), None),
+            }
+            aggregators = { k : npsum for k in table }
+            formatters = { k : None for k in table }
+            atable = self.aggregate_table(table, self.optl_categories(aggregators, formatters))
             self.log.info('results matching tables for {} -> {}'.format(t1, t2))
-            pp.print_pretty_table(atable, sys.stdout, aslist=True, bdr=self.ctx['opt.rpp-bdr'], use_maxlen=False, split=True, firstcol=firstcols, withtotal=False)
+            pp.print_pretty_table(atable, sys.stdout, aslist=True, bdr=self.ctx['opt.rpp-bdr'], use_maxlen=False, split=True, firstcol=self.optl_firstcols(), withtotal=False)
 
     def _print_severity_tables(self):
         self.log.info('print severity tables')
-        validator = lambda b, m, md: (b.get_vseverity(m, 'binsec') >= 0 and
-                                      b.get_vseverity(m, 'robust') >= 0 and
-                                      b.get_vseverity(m, 'abduction') >= 0 and
-                                      b.get_vseverity(m, 'simu') >= 0 and
-                                      b.get_vseverity(m, 'vsimu') >= 0)
-        vseverity_getter = lambda tool, b, m, md: b.get_vseverity(m, tool) #if validator(b, m, md) else -1
-        pseverity_getter = lambda tool, b, m, md: b.get_pseverity(m, tool) #if validator(b, m, md) else -1
-        elements = [
-                ('#', lambda b, m, md: 1, None),
-                ('SE', lambda b, m, md: vseverity_getter('binsec', b, m, md), None),
-                ('RSE', lambda b, m, md: vseverity_getter('robust', b, m, md), None),
-                ('Abd-O', lambda b, m, md: vseverity_getter('abduction', b, m, md), None),
-                ('Abd-P', lambda b, m, md: pseverity_getter('abduction', b, m, md), None),
-                ('Sim', lambda b, m, md: vseverity_getter('simu', b, m, md), None),
-                ('Sim*', lambda b, m, md: vseverity_getter('vsimu', b, m, md), None),
-        ]
-        table = self.get_table(elements)
+        c = self.columns
+        sevcolumns = {
+                'SE': c.vseverity['binsec'],
+                'RSE': c.vseverity['robust'],
+                'Abd-O': c.vseverity['abduction'],
+                'Abd-P': c.pseverity['abduction'],
+                'Sim': c.vseverity['simu'],
+                'Sim*': c.vseverity['vsimu'],
+        }
         severities = set()
-        for tool in ('SE', 'RSE', 'Abd-O', 'Abd-P', 'Sim', 'Sim*'):
-            severities = severities | set(table[tool])
+        for values in sevcolumns.values():
+            severities = severities | set(values.tolist())
         stables = {}
         if self.ctx['opt.ranged_severity']:
             couples = { (-100, 0), (0, 1), (1, 2) }
@@ -218,35 +198,17 @@ class ResultsComparatorMDT(MetaDataTask):
                 couples.add((int(0.5*maxval), maxval))
             severities = couples
         for severity in severities:
-            elements = [
-                    ('#', lambda b, m, md: 1, None),
-                    ('SE', lambda b, m, md: severity[0] <= vseverity_getter('binsec', b, m, md), None),
-                    ('RSE', lambda b, m, md: severity[0] <= vseverity_getter('robust', b, m, md), None),
-                    ('Abd-O', lambda b, m, md: severity[0] <= vseverity_getter('abduction', b, m, md), None),
-                    ('Abd-P', lambda b, m, md: severity[0] <= pseverity_getter('abduction', b, m, md), None),
-                    ('Sim', lambda b, m, md: severity[0] <= vseverity_getter('simu', b, m, md), None),
-                    ('Sim*', lambda b, m, md: severity[0] <= vseverity_getter('vsimu', b, m, md), None),
-            ] if self.ctx['opt.cumulative_severity'] and severity[0] > 0 else [
-                    ('#', lambda b, m, md: 1, None),
-                    ('SE', lambda b, m, md: severity[0] <= vseverity_getter('binsec', b, m, md) < severity[1], None),
-                    ('RSE', lambda b, m, md: severity[0] <= vseverity_getter('robust', b, m, md) < severity[1], None),
-                    ('Abd-O', lambda b, m, md: severity[0] <= vseverity_getter('abduction', b, m, md) < severity[1], None),
-                    ('Abd-P', lambda b, m, md: severity[0] <= pseverity_getter('abduction', b, m, md) < severity[1], None),
-                    ('Sim', lambda b, m, md: severity[0] <= vseverity_getter('simu', b, m, md) < severity[1], None),
-                    ('Sim*', lambda b, m, md: severity[0] <= vseverity_getter('vsimu', b, m, md) < severity[1], None),
-            ] if self.ctx['opt.ranged_severity'] or self.ctx['opt.cumulative_severity'] else [
-                    ('#', lambda b, m, md: 1, None),
-                    ('SE', lambda b, m, md: vseverity_getter('binsec', b, m, md) == severity, None),
-                    ('RSE', lambda b, m, md: vseverity_getter('robust', b, m, md) == severity, None),
-                    ('Abd-O', lambda b, m, md: vseverity_getter('abduction', b, m, md) == severity, None),
-                    ('Abd-P', lambda b, m, md: pseverity_getter('abduction', b, m, md) == severity, None),
-                    ('Sim', lambda b, m, md: vseverity_getter('simu', b, m, md) == severity, None),
-                    ('Sim*', lambda b, m, md: vseverity_getter('vsimu', b, m, md) == severity, None),
-            ]
-            stable = self.get_table(elements)
-            aggregators = { k : sum for k in (e[0] for e in elements) }
-            formatters = { k : None for k in (e[0] for e in elements) }
-            categories = [ (lambda m: True, aggregators, formatters) ]
+            if self.ctx['opt.cumulative_severity'] and severity[0] > 0:
+                selector = lambda values: severity[0] <= values
+            elif self.ctx['opt.ranged_severity'] or self.ctx['opt.cumulative_severity']:
+                selector = lambda values: (severity[0] <= values) & (values < severity[1])
+            else:
+                selector = lambda values: values == severity
+            stable = { k : (selector(values), None) for k, values in sevcolumns.items() }
+            stable['#'] = (c.ones, None)
+            aggregators = { k : npsum for k in stable }
+            formatters = { k : None for k in stable }
+            categories = [ (c.all, aggregators, formatters) ]
             stables[severity] = self.aggregate_table(stable, categories)
         rtable = { k : [] for k in ('#', 'SE', 'RSE', 'Abd-O', 'Abd-P', 'Sim', 'Sim*') }
         sevs = []
@@ -284,61 +246,48 @@ class ResultsComparatorMDT(MetaDataTask):
 
     def _print_bysource_tables(self):
         self.log.info('print by-source summary tables')
-        stable = self.get_table([('source', lambda b, m, md: b.ctx['source'], None)])
-        sources = list(set(stable['source']))
-        sources.sort()
-        elements = [
-                ('#', lambda b, m, md: 1, None),
-                ('V. SE', lambda b, m, md: b.get_merged_vstatus(m, 'binsec') == VStatus.Vuln, None),
-                ('V. RSE', lambda b, m, md: b.get_merged_vstatus(m, 'robust') == VStatus.Vuln, None),
-                ('V. Abd', lambda b, m, md: b.get_merged_vstatus(m, 'abduction') == VStatus.Vuln, None),
-                ('V. Sim', lambda b, m, md: b.get_merged_vstatus(m, 'simu') == VStatus.Vuln, None),
-                ('V. Sim*', lambda b, m, md: b.get_merged_vstatus(m, 'vsimu') == VStatus.Vuln, None),
-        ]
-        vtable = self.get_table(elements)
-        owner = lambda src : lambda m : m[0].ctx['source'] == src
-        aggregators = { k : sum for k in (e[0] for e in elements) }
-        formatters = { k : None for k in (e[0] for e in elements) }
-        categories = [ (owner(source), aggregators, formatters) for source in sources ]
+        c = self.columns
+        sources = sorted({ c.sources[bid] for bid in np.unique(c.context).tolist() })
+        vtable = {
+                '#': (c.ones, None),
+                'V. SE': (c.vuln('binsec'), None),
+                'V. RSE': (c.vuln('robust'), None),
+                'V. Abd': (c.vuln('abduction'), None),
+                'V. Sim': (c.vuln('simu'), None),
+                'V. Sim*': (c.vuln('vsimu'), None),
+        }
+        aggregators = { k : npsum for k in vtable }
+        formatters = { k : None for k in vtable }
+        categories = [ (c.source(source), aggregators, formatters) for source in sources ]
         avtable = self.aggregate_table(vtable, categories)
         self.log.info('summarized by-source results table')
         pp.print_pretty_table(avtable, sys.stdout, aslist=True, bdr=self.ctx['opt.rpp-bdr'], use_maxlen=False, split=True, firstcol=sources, withtotal=False)
 
     def _print_abduction_detailedv_tables(self, split=True, percentify=True):
         self.log.info('print detailed abduction vulnerability tables')
-        velements = [
-                ('#', lambda b, m, md: b.get_merged_vstatus(m, 'binsec') == VStatus.Vuln, None),
-                ('Abd (suf) %', lambda b, m, md: (b.get_merged_vstatus(m, 'binsec') == VStatus.Vuln,
-                                                b.get_merged_vstatus(m, 'abduction') == VStatus.Vuln), None),
-                ('Abd (nec) %', lambda b, m, md: (b.get_merged_vstatus(m, 'binsec') == VStatus.Vuln,
-                                                b.get_merged_vstatus(m, 'abduction_necessary') == VStatus.Vuln), None),
-                ('Abd (any) %', lambda b, m, md: (b.get_merged_vstatus(m, 'binsec') == VStatus.Vuln,
-                                                b.get_merged_vstatus(m, 'abduction') == VStatus.Vuln or b.get_merged_vstatus(m, 'abduction_necessary') == VStatus.Vuln), None),
-                ('Abd (weakest) %', lambda b, m, md: (b.get_merged_vstatus(m, 'binsec') == VStatus.Vuln,
-                                                    b.get_merged_vstatus(m, 'abduction_nas') == VStatus.Vuln), None),
-                ('RSE %', lambda b, m, md: (b.get_merged_vstatus(m, 'binsec') == VStatus.Vuln,
-                                          b.get_merged_vstatus(m, 'robust') == VStatus.Vuln), None),
-                #('Abd (w/ regs)', lambda b, m, md: (b.get_merged_vstatus(m, 'binsec') == VStatus.Vuln,
-                #                                    b.get_merged_vstatus(m, 'abduction_registers') == VStatus.Vuln), None),
-                #('Abd (w/ consts)', lambda b, m, md: (b.get_merged_vstatus(m, 'binsec') == VStatus.Vuln,
-                #                                    b.get_merged_vstatus(m, 'abduction_constants') == VStatus.Vuln), None),
-        ]
-        vtable = self.get_table(velements)
-        owner = lambda optl : lambda m : optl in m[0].ctx['source']
+        c = self.columns
+        binsec = c.vuln('binsec')
+        # (binsec vulnerable, tool vulnerable) pairs
+        pair = lambda vuln: (np.stack((binsec, vuln), axis=1), None)
+        vtable = {
+                '#': (binsec, None),
+                'Abd (suf) %': pair(c.vuln('abduction')),
+                'Abd (nec) %': pair(c.vuln('abduction_necessary')),
+                'Abd (any) %': pair(c.vuln('abduction') | c.vuln('abduction_necessary')),
+                'Abd (weakest) %': pair(c.vuln('abduction_nas')),
+                'RSE %': pair(c.vuln('robust')),
+                #'Abd (w/ regs)': pair(c.vuln('abduction_registers')),
+                #'Abd (w/ consts)': pair(c.vuln('abduction_constants')),
+        }
         if percentify:
-            aggregators = { k : (lambda l: 100*(sum((t[1] for t in l))/sum((t[0] for t in l)))) for k in (e[0] for e in velements) }
+            aggregators = { k : (lambda a: 100*(npsum(a[:, 1])/npsum(a[:, 0]))) for k in vtable }
         else:
-            aggregators = { k : (lambda l: (sum((t[1] for t in l)))) for k in (e[0] for e in velements) }
-        aggregators['#'] = sum
-        #aggregators['Abd (all)'] = lambda l: 100*statistics.mean(l)
-        #aggregators['Abd (nec)'] = lambda l: 100*statistics.mean(l)
-        formatters = { k : (lambda v: round(v, 1)) for k in (e[0] for e in velements) }
-        categories = [ (owner(optl), aggregators, formatters) for optl in ('O0', 'O1', 'O2', 'O3', 'Os') ] if split else []
-        categories.append((lambda m: True, aggregators, formatters))
-        avtable = self.aggregate_table(vtable, categories)
-        firstcols = ['O0', 'O1', 'O2', 'O3', 'Os', 'total'] if split else ['total']
+            aggregators = { k : (lambda a: npsum(a[:, 1])) for k in vtable }
+        aggregators['#'] = npsum
+        formatters = { k : (lambda v: round(v, 1)) for k in vtable }
+        avtable = self.aggregate_table(vtable, self.optl_categories(aggregators, formatters, split=split))
         self.log.info('table of detailed aggregated abduction vulnerability percentages')
-        pp.print_pretty_table(avtable, sys.stdout, aslist=True, bdr=self.ctx['opt.rpp-bdr'], use_maxlen=False, split=True, firstcol=firstcols, withtotal=False)
+        pp.print_pretty_table(avtable, sys.stdout, aslist=True, bdr=self.ctx['opt.rpp-bdr'], use_maxlen=False, split=True, firstcol=self.optl_firstcols(split), withtotal=False)
 
     def _print_abduction_detailedv_tables_nosplit(self):
         self._print_abduction_detailedv_tables(split=False)
@@ -348,51 +297,42 @@ class ResultsComparatorMDT(MetaDataTask):
 
     def _print_local_vtables(self, mode=''):
         self.log.info('print local vulnerability tables')
-        velements = [
-                ('#', lambda b, m, md: b.get_merged_vstatus(m, 'binsec') == VStatus.Vuln, None),
-                ('RSE', lambda b, m, md: (b.get_merged_vstatus(m, 'binsec') == VStatus.Vuln, b.get_merged_vstatus(m, 'robust') == VStatus.Vuln), None),
-                ('Abd', lambda b, m, md: (b.get_merged_vstatus(m, 'binsec') == VStatus.Vuln, b.get_merged_vstatus(m, 'abduction{}'.format(mode)) == VStatus.Vuln), None),
-                ('Abd w/o RSE', lambda b, m, md: (b.get_merged_vstatus(m, 'binsec') == VStatus.Vuln,
-                                                  b.get_merged_vstatus(m, 'abduction{}'.format(mode)) == VStatus.Vuln and not b.get_merged_vstatus(m, 'robust') == VStatus.Vuln), None),
-        ]
-        vtable = self.get_table(velements)
-        owner = lambda optl : lambda m : optl in m[0].ctx['source']
-        aggregators = { k : (lambda l: 100*statistics.mean([v[1] for v in l if v[0]])) for k in (e[0] for e in velements) }
-        aggregators['#'] = sum
-        formatters = { k : (lambda v: round(v, 1)) for k in (e[0] for e in velements) }
-        categories = [ (owner(optl), aggregators, formatters) for optl in ('O0', 'O1', 'O2', 'O3', 'Os') ]
-        categories.append((lambda m: True, aggregators, formatters))
-        avtable = self.aggregate_table(vtable, categories)
-        firstcols = ['O0', 'O1', 'O2', 'O3', 'Os', 'total']
+        c = self.columns
+        binsec = c.vuln('binsec')
+        robust = c.vuln('robust')
+        abduction = c.vuln('abduction{}'.format(mode))
+        vtable = {
+                '#': (binsec, None),
+                'RSE': (robust, binsec),
+                'Abd': (abduction, binsec),
+                'Abd w/o RSE': (abduction & ~robust, binsec),
+        }
+        aggregators = { k : nppercent for k in vtable }
+        aggregators['#'] = npsum
+        formatters = { k : (lambda v: round(v, 1)) for k in vtable }
+        avtable = self.aggregate_table(vtable, self.optl_categories(aggregators, formatters))
         self.log.info('table of aggregated local vulnerability percentages (mode={})'.format(mode))
-        pp.print_pretty_table(avtable, sys.stdout, aslist=True, bdr=self.ctx['opt.rpp-bdr'], use_maxlen=False, split=True, firstcol=firstcols, withtotal=False)
+        pp.print_pretty_table(avtable, sys.stdout, aslist=True, bdr=self.ctx['opt.rpp-bdr'], use_maxlen=False, split=True, firstcol=self.optl_firstcols(), withtotal=False)
 
     def _print_local_ttables(self):
         self.log.info('print local time tables')
-        telements = [
-                ('#', lambda b, m, md: b.get_merged_vstatus(m, 'abduction') == VStatus.Vuln, None),
-                ('SE', lambda b, m, md: (b.get_merged_vstatus(m, 'abduction') == VStatus.Vuln, md['binsec']['time'] if 'binsec' in md else 0), None),
-                ('Abd', lambda b, m, md: (b.get_merged_vstatus(m, 'abduction') == VStatus.Vuln, b.get_corrected_abducer_time(m)), None),
-        ]
-        ttable = self.get_table(telements)
-        owner = lambda optl : lambda m : optl in m[0].ctx['source']
-        taggregators = { k : lambda l : sum([v[1] for v in l if v[0]]) for k in (e[0] for e in telements) }
-        taggregators['#'] = sum
-        tformatters = { k : (lambda v: datetime.timedelta(seconds=round(v))) for k in (e[0] for e in telements) }
+        c = self.columns
+        abduction = c.vuln('abduction')
+        ttable = {
+                '#': (abduction, None),
+                'SE': (c.times['binsec'], abduction),
+                'Abd': (c.corrected_abducer_time(), abduction),
+        }
+        taggregators = { k : npsum for k in ttable }
+        tformatters = { k : (lambda v: datetime.timedelta(seconds=round(v))) for k in ttable }
         tformatters['#'] = None
-        tcategories = [ (owner(optl), taggregators, tformatters) for optl in ('O0', 'O1', 'O2', 'O3', 'Os') ]
-        tcategories.append((lambda m: True, taggregators, tformatters))
-        attable = self.aggregate_table(ttable, tcategories)
-        meanagg = { k : lambda l : statistics.mean([v[1] for v in l if v[0]]) for k in (e[0] for e in telements) }
-        mednagg = { k : lambda l : statistics.median([v[1] for v in l if v[0]]) for k in (e[0] for e in telements) }
-        meanagg['#'] = sum
-        mednagg['#'] = sum
-        meancats = [ (owner(optl), meanagg, tformatters) for optl in ('O0', 'O1', 'O2', 'O3', 'Os') ]
-        meancats.append((lambda m: True, meanagg, tformatters))
-        medncats = [ (owner(optl), mednagg, tformatters) for optl in ('O0', 'O1', 'O2', 'O3', 'Os') ]
-        medncats.append((lambda m: True, mednagg, tformatters))
-        meanttable = self.aggregate_table(ttable, meancats)
-        mednttable = self.aggregate_table(ttable, medncats)
+        attable = self.aggregate_table(ttable, self.optl_categories(taggregators, tformatters))
+        meanagg = { k : npmean for k in ttable }
+        mednagg = { k : npmedian for k in ttable }
+        meanagg['#'] = npsum
+        mednagg['#'] = npsum
+        meanttable = self.aggregate_table(ttable, self.optl_categories(meanagg, tformatters))
+        mednttable = self.aggregate_table(ttable, self.optl_categories(mednagg, tformatters))
         attable['Sum (Abd)'] = attable['Abd']
         attable['Sum (SE)'] = attable['SE']
         attable.pop('Abd')
@@ -401,63 +341,42 @@ class ResultsComparatorMDT(MetaDataTask):
         attable['Mean (SE)'] = meanttable['SE']
         attable['Median (Abd)'] = mednttable['Abd']
         attable['Median (SE)'] = mednttable['SE']
-        firstcols = ['O0', 'O1', 'O2', 'O3', 'Os', 'total']
         self.log.info('vuln only table of computation times')
-        pp.print_pretty_table(attable, sys.stdout, aslist=True, bdr=self.ctx['opt.rpp-bdr'], use_maxlen=False, split=True, firstcol=firstcols, withtotal=False)
+        pp.print_pretty_table(attable, sys.stdout, aslist=True, bdr=self.ctx['opt.rpp-bdr'], use_maxlen=False, split=True, firstcol=self.optl_firstcols(), withtotal=False)
 
     def _print_vulnerability_tables(self):
         self.log.info('print vulnerability tables')
-        velements = [
-                ('#', lambda b, m, md: 1, None),
-                ('SE', lambda b, m, md: b.get_merged_vstatus(m, 'binsec') == VStatus.Vuln, None),
-                ('RSE', lambda b, m, md: b.get_merged_vstatus(m, 'robust') == VStatus.Vuln, None),
-                ('Abd', lambda b, m, md: b.get_merged_vstatus(m, 'abduction') == VStatus.Vuln, None),
-                ('Sim', lambda b, m, md: b.get_merged_vstatus(m, 'simu') == VStatus.Vuln, None),
-                ('Sim*', lambda b, m, md: b.get_merged_vstatus(m, 'vsimu') == VStatus.Vuln, None),
-        ]
-        uelements = [
-                ('#', lambda b, m, md: 1, None),
-                ('SE', lambda b, m, md: b.get_merged_vstatus(m, 'binsec') == VStatus.Unknown, None),
-                ('RSE', lambda b, m, md: b.get_merged_vstatus(m, 'robust') == VStatus.Unknown, None),
-                ('Abd', lambda b, m, md: b.get_merged_vstatus(m, 'abduction') == VStatus.Unknown, None),
-                ('Sim', lambda b, m, md: b.get_merged_vstatus(m, 'simu') == VStatus.Unknown, None),
-                ('Sim*', lambda b, m, md: b.get_merged_vstatus(m, 'vsimu') == VStatus.Unknown, None),
-        ]
-        abdtstatget = (lambda b, m, md, stat : md['binsec-robust']['time'] if 'binsec-robust' in md and b.get_merged_vstatus(m, 'robust') == VStatus.Vuln
-                                                                           else
-                                               md['abducer']['statistics'][stat] if 'abducer' in md and 'statistics' in md['abducer'] and stat in md['abducer']['statistics']
-                                                                           else 0)
-        telements = [
-                ('#', lambda b, m, md: 1, None),
-                ('SE', lambda b, m, md: md['binsec']['time'] if 'binsec' in md else 0, None),
-                ('RSE', lambda b, m, md: md['binsec-robust']['time'] if 'binsec-robust' in md else 0, None),
-                ('Abd', lambda b, m, md: b.get_corrected_abducer_time(m), None),
-                ('Abd-fsol', lambda b, m, md: abdtstatget(b, m, md, 'time-first-solution'), None),
-                ('Abd-fnec', lambda b, m, md: abdtstatget(b, m, md, 'time-first-necessary'), None),
-                ('Abd-lsol', lambda b, m, md: abdtstatget(b, m, md, 'time-last-solution'), None),
-                ('Abd-lnec', lambda b, m, md: abdtstatget(b, m, md, 'time-last-necessary'), None),
-                ('Sim', lambda b, m, md: md['simulation']['time'] if 'simulation' in md else 0, None),
-                ('Sim*', lambda b, m, md: md['vsimulation']['time'] if 'vsimulation' in md else 0, None),
-        ]
-        vtable = self.get_table(velements)
-        utable = self.get_table(uelements)
-        ttable = self.get_table(telements)
-        owner = lambda optl : lambda m : optl in m[0].ctx['source']
-        aggregators = { k : (lambda l: 100*statistics.mean(l)) for k in (e[0] for e in velements) }
-        #aggregators = { k : sum for k in (e[0] for e in velements) }
-        aggregators['#'] = sum
-        taggregators = { k : sum for k in (e[0] for e in telements) }
-        formatters = { k : (lambda v: round(v, 1)) for k in (e[0] for e in velements) }
-        tformatters = { k : (lambda v: datetime.timedelta(seconds=round(v))) for k in (e[0] for e in telements) }
+        c = self.columns
+        tools = (('SE', 'binsec'), ('RSE', 'robust'), ('Abd', 'abduction'), ('Sim', 'simu'), ('Sim*', 'vsimu'))
+        vtable = { k : (c.vuln(tool), None) for k, tool in tools }
+        vtable['#'] = (c.ones, None)
+        utable = { k : (c.unknown(tool), None) for k, tool in tools }
+        utable['#'] = (c.ones, None)
+        abdtstat = lambda stat : np.where(c.vuln('robust'), c.times['robust'], c.abdstat(stat))
+        ttable = {
+                '#': (c.ones, None),
+                'SE': (c.times['binsec'], None),
+                'RSE': (c.times['robust'], None),
+                'Abd': (c.corrected_abducer_time(), None),
+                'Abd-fsol': (abdtstat('time-first-solution'), None),
+                'Abd-fnec': (abdtstat('time-first-necessary'), None),
+                'Abd-lsol': (abdtstat('time-last-solution'), None),
+                'Abd-lnec': (abdtstat('time-last-necessary'), None),
+                'Sim': (c.times['simu'], None),
+                'Sim*': (c.times['vsimu'], None),
+        }
+        aggregators = { k : nppercent for k in vtable }
+        aggregators['#'] = npsum
+        taggregators = { k : npsum for k in ttable }
+        formatters = { k : (lambda v: round(v, 1)) for k in vtable }
+        tformatters = { k : (lambda v: datetime.timedelta(seconds=round(v))) for k in ttable }
         tformatters['#'] = None
-        categories = [ (owner(optl), aggregators, formatters) for optl in ('O0', 'O1', 'O2', 'O3', 'Os') ]
-        categories.append((lambda m: True, aggregators, formatters))
-        tcategories = [ (owner(optl), taggregators, tformatters) for optl in ('O0', 'O1', 'O2', 'O3', 'Os') ]
-        tcategories.append((lambda m: True, taggregators, tformatters))
+        categories = self.optl_categories(aggregators, formatters)
+        tcategories = self.optl_categories(taggregators, tformatters)
         avtable = self.aggregate_table(vtable, categories)
         autable = self.aggregate_table(utable, categories)
         attable = self.aggregate_table(ttable, tcategories)
-        firstcols = ['O0', 'O1', 'O2', 'O3', 'Os', 'total']
+        firstcols = self.optl_firstcols()
         self.log.info('table of aggregated vulnerability percentages')
         pp.print_pretty_table(avtable, sys.stdout, aslist=True, bdr=self.ctx['opt.rpp-bdr'], use_maxlen=False, split=True, firstcol=firstcols, withtotal=False)
         self.log.info('table of aggregated tool unknowns')
@@ -465,26 +384,22 @@ class ResultsComparatorMDT(MetaDataTask):
         self.log.info('table of total computation times')
         pp.print_pretty_table(attable, sys.stdout, aslist=True, bdr=self.ctx['opt.rpp-bdr'], use_maxlen=False, split=True, firstcol=firstcols, withtotal=False)
         # Mean and median computation times
-        vulnowner = lambda optl : lambda m : optl in m[0].ctx['source'] and m[0].ctx.is_vulnerable(m[1])
-        meanagg = { k : statistics.mean for k in (e[0] for e in telements) }
-        mednagg = { k : statistics.median for k in (e[0] for e in telements) }
-        meanagg['#'] = sum
-        mednagg['#'] = sum
-        meancats = [ (vulnowner(optl), meanagg, tformatters) for optl in ('O0', 'O1', 'O2', 'O3', 'Os') ]
-        meancats.append((lambda m: m[0].ctx.is_vulnerable(m[1]), meanagg, tformatters))
-        medncats = [ (vulnowner(optl), mednagg, tformatters) for optl in ('O0', 'O1', 'O2', 'O3', 'Os') ]
-        medncats.append((lambda m: m[0].ctx.is_vulnerable(m[1]), mednagg, tformatters))
-        meanttable = self.aggregate_table(ttable, meancats)
-        mednttable = self.aggregate_table(ttable, medncats)
+        meanagg = { k : npmean for k in ttable }
+        mednagg = { k : npmedian for k in ttable }
+        meanagg['#'] = npsum
+        mednagg['#'] = npsum
+        meanttable = self.aggregate_table(ttable, self.optl_categories(meanagg, tformatters, where=c.vulnerable))
+        mednttable = self.aggregate_table(ttable, self.optl_categories(mednagg, tformatters, where=c.vulnerable))
         self.log.info('table of mean vulnerable computation time')
         pp.print_pretty_table(meanttable, sys.stdout, aslist=True, bdr=self.ctx['opt.rpp-bdr'], use_maxlen=False, split=True, firstcol=firstcols, withtotal=False)
         self.log.info('table of median vulnerable computation time')
         pp.print_pretty_table(mednttable, sys.stdout, aslist=True, bdr=self.ctx['opt.rpp-bdr'], use_maxlen=False, split=True, firstcol=firstcols, withtotal=False)
         if self.ctx['opt.plots']:
+            vcolumns, ucolumns, tcolumns = self.table_columns(vtable), self.table_columns(utable), self.table_columns(ttable)
             self._generate_pulse_barplots(avtable, autable, attable)
-            self._generate_time_histograms(vtable, utable, ttable)
-            self._generate_survival_plots(vtable, utable, ttable)
-            self._generate_variating_plots(vtable, utable, ttable)
+            self._generate_time_histograms(vcolumns, ucolumns, tcolumns)
+            self._generate_survival_plots(vcolumns, ucolumns, tcolumns)
+            self._generate_variating_plots(vcolumns, ucolumns, tcolumns)
 
     def _get_status_color(self, vuln, unkn):
         return 'r' if vuln else 'y' if unkn else 'g'
@@ -497,41 +412,31 @@ class ResultsComparatorMDT(MetaDataTask):
                 self.log.info('writing {}, {} --> {}'.format(tool, stat, filename))
                 title = tool if self.ctx['opt.plot_titles'] else ''
                 if tool in ('RSE', 'Abd'):
-                    rttable = []
-                    for index in range(len(ttable[tool])):
-                        if vtable['SE'][index]:
-                            rttable.append(ttable[tool][index])
-                    plots.generate_cummulative_timeplots([rttable], title, filename, step, stat, labels=['total'], cummulative=stat == sum)
+                    self.plots.add('generate_cummulative_timeplots', [ttable[tool][vtable['SE']].tolist()], title, filename, step, stat, labels=['total'], cummulative=stat == sum)
                 else:
-                    plots.generate_cummulative_timeplots([ttable[tool]], title, filename, step, stat, labels=['total'], cummulative=stat == sum)
+                    self.plots.add('generate_cummulative_timeplots', [ttable[tool].tolist()], title, filename, step, stat, labels=['total'], cummulative=stat == sum)
 
     def _generate_time_histograms(self, vtable, utable, ttable):
         self.log.info('generating tool mutant times histograms')
         for tool in ('SE', 'RSE', 'Abd', 'Abd-fsol', 'Abd-fnec', 'Abd-lsol', 'Abd-lnec', 'Sim', 'Sim*'):
             title = 'Mutants Computation Time ({})'.format(tool) if self.ctx['opt.plot_titles'] else ''
             filename = os.path.join(self.ctx['target.result-svg'], 'mutant-ctime-histogram-{}-{}-bins.pdf'.format(tool.replace('*', '-star').lower(), '{}'))
-            colors = []
             color_labels = dict(r='vulnerable mutant', y='inconclusive', g='non vulnerable mutant')
-            for index in range(len(ttable[tool])):
-                toolcore = tool.split('-')[0]
-                colors.append(self._get_status_color(vtable[toolcore][index], utable[toolcore][index]))
+            toolcore = tool.split('-')[0]
+            colors = [ self._get_status_color(vuln, unkn) for vuln, unkn in zip(vtable[toolcore], utable[toolcore]) ]
             self.log.info('writing {} --> {}'.format(title.lower(), filename))
             if tool in ('RSE', 'Abd') or tool.startswith('Abd'):
                 # Draw for SE vulnerable elements only
-                rttable, rcolors = [], []
-                for index in range(len(ttable[tool])):
-                    if vtable['SE'][index]:
-                        rttable.append(ttable[tool][index])
-                        rcolors.append(colors[index])
-                plots.generate_histograms(rttable, title, filename, colors=rcolors, color_labels=color_labels)
+                rcolors = [ colors[index] for index in np.flatnonzero(vtable['SE']) ]
+                self.plots.add_histograms(ttable[tool][vtable['SE']].tolist(), title, filename, colors=rcolors, color_labels=color_labels)
             else:
-                plots.generate_histograms(ttable[tool], title, filename, colors=colors, color_labels=color_labels)
+                self.plots.add_histograms(ttable[tool].tolist(), title, filename, colors=colors, color_labels=color_labels)
 
     def _generate_pulse_barplots(self, vtable, utable, ttable):
         self.log.info('generating PULSE categorization barplots')
         values = [ vtable[tool][:-1] for tool in ('RSE', 'SE', 'Abd') ]
         filename =  os.path.join(self.ctx['target.result-svg'], 'pulse-barplot.png')
-        plots.generate_barplot(values, None, filename, labels=['robust', 'binsec', 'abduction'], xlabels=['O0', 'O1', 'O2', 'O3', 'Os'])
+        self.plots.add('generate_barplot', values, None, filename, labels=['robust', 'binsec', 'abduction'], xlabels=list(self.OptLevels))
 
     def _generate_survival_plots(self, vtable, utable, ttable):
         self.log.info('generating tool mutants survival and cdf plots')
@@ -542,42 +447,45 @@ class ResultsComparatorMDT(MetaDataTask):
         toolnames = ('Binsec', 'Binsec-RSE', 'PyAbd+pin', 'Qemu', 'Qemu+L1')
         for tool in tools:
             if tool in ('RSE', 'Abd'):
-                sanitizedtt[tool] = [ ttable[tool][i] + ttable['SE'][i] for i in range(len(ttable[tool])) if not utable['SE'][i] and not utable[tool][i] ]
-                sanvulntt[tool] = [ ttable[tool][i] + ttable['SE'][i] for i in range(len(ttable[tool])) if not utable['SE'][i] and vtable[tool][i] ]
-                sanrobutt[tool] = [ ttable[tool][i] + ttable['SE'][i] for i in range(len(ttable[tool])) if not utable['SE'][i] and not utable[tool][i] and not vtable[tool][i] ]
+                ttimes = ttable[tool] + ttable['SE']
+                known = ~utable['SE'] & ~utable[tool]
+                sanitizedtt[tool] = ttimes[known].tolist()
+                sanvulntt[tool] = ttimes[~utable['SE'] & vtable[tool]].tolist()
+                sanrobutt[tool] = ttimes[known & ~vtable[tool]].tolist()
             else:
-                sanitizedtt[tool] = [ ttable[tool][i] for i in range(len(ttable[tool])) if not utable[tool][i] ]
-                sanvulntt[tool] = [ ttable[tool][i] for i in range(len(ttable[tool])) if vtable[tool][i] ]
-                sanrobutt[tool] = [ ttable[tool][i] for i in range(len(ttable[tool])) if not utable[tool][i] and not vtable[tool][i] ]
+                known = ~utable[tool]
+                sanitizedtt[tool] = ttable[tool][known].tolist()
+                sanvulntt[tool] = ttable[tool][vtable[tool]].tolist()
+                sanrobutt[tool] = ttable[tool][known & ~vtable[tool]].tolist()
             title = 'Mutants Solved ({})'.format(tool) if self.ctx['opt.plot_titles'] else ''
 
             filename_c = os.path.join(self.ctx['target.result-svg'], 'mutant-cdf-{}.pdf'.format(tool.replace('*', '-star').lower()))
             self.log.info('writing cdf {} --> {}'.format(title.lower(), filename_c))
-            plots.generate_cdf_plot([ttable[tool]], title, filename_c)
+            self.plots.add('generate_cdf_plot', [ttable[tool].tolist()], title, filename_c)
 
             filename_c = os.path.join(self.ctx['target.result-svg'], 'mutant-cdf-sanitized-splitted-{}.pdf'.format(tool.replace('*', '-star').lower()))
             self.log.info('writing splitted sanitized cdf {} --> {}'.format(title.lower(), filename_c))
-            plots.generate_cdf_plot([sanitizedtt[tool], sanvulntt[tool], sanrobutt[tool]], title, filename_c, labels=('All', 'Vuln', '!Vuln'))
+            self.plots.add('generate_cdf_plot', [sanitizedtt[tool], sanvulntt[tool], sanrobutt[tool]], title, filename_c, labels=('All', 'Vuln', '!Vuln'))
 
             filename_c = os.path.join(self.ctx['target.result-svg'], 'mutant-cdf-sanitized-{}.pdf'.format(tool.replace('*', '-star').lower()))
             self.log.info('writing sanitized cdf {} --> {}'.format(title.lower(), filename_c))
-            plots.generate_cdf_plot([sanitizedtt[tool]], title, filename_c)
+            self.plots.add('generate_cdf_plot', [sanitizedtt[tool]], title, filename_c)
 
             filename_c = os.path.join(self.ctx['target.result-svg'], 'mutant-cdf-vulns-{}.pdf'.format(tool.replace('*', '-star').lower()))
             self.log.info('writing sanitized vulnerabilities cdf {} --> {}'.format(title.lower(), filename_c))
-            plots.generate_cdf_plot([sanvulntt[tool]], title, filename_c)
+            self.plots.add('generate_cdf_plot', [sanvulntt[tool]], title, filename_c)
 
             filename_s = os.path.join(self.ctx['target.result-svg'], 'mutant-survival-splitted-{}.pdf'.format(tool.replace('*', '-star').lower()))
             self.log.info('writing splitted survival {} --> {}'.format(title.lower(), filename_s))
-            plots.generate_survival_plot([sanitizedtt[tool], sanvulntt[tool], sanrobutt[tool]], title, filename_s, labels=('All', 'Vuln', '!Vuln'))
+            self.plots.add('generate_survival_plot', [sanitizedtt[tool], sanvulntt[tool], sanrobutt[tool]], title, filename_s, labels=('All', 'Vuln', '!Vuln'))
 
             filename_s = os.path.join(self.ctx['target.result-svg'], 'mutant-survival-{}.pdf'.format(tool.replace('*', '-star').lower()))
             self.log.info('writing survival {} --> {}'.format(title.lower(), filename_s))
-            plots.generate_survival_plot([sanitizedtt[tool]], title, filename_s)
+            self.plots.add('generate_survival_plot', [sanitizedtt[tool]], title, filename_s)
 
             filename_s = os.path.join(self.ctx['target.result-svg'], 'mutant-survival-vulns-{}.pdf'.format(tool.replace('*', '-star').lower()))
             self.log.info('writing vulnerabilities survival {} --> {}'.format(title.lower(), filename_s))
-            plots.generate_survival_plot([sanvulntt[tool]], title, filename_s)
+            self.plots.add('generate_survival_plot', [sanvulntt[tool]], title, filename_s)
 
         title = 'Mutants Solved' if self.ctx['opt.plot_titles'] else ''
         filename_c1 = os.path.join(self.ctx['target.result-svg'], 'mutant-cdf-all.pdf')
@@ -587,16 +495,16 @@ class ResultsComparatorMDT(MetaDataTask):
         filename_v2 = os.path.join(self.ctx['target.result-svg'], 'mutant-survival-vulns-all.pdf')
 
         self.log.info('writing cdf {} --> {}'.format(title.lower(), filename_c1))
-        plots.generate_cdf_plot([ttable[tool] for tool in tools], title, filename_c1, labels=toolnames)
+        self.plots.add('generate_cdf_plot', [ttable[tool].tolist() for tool in tools], title, filename_c1, labels=toolnames)
         self.log.info('writing sanitized cdf {} --> {}'.format(title.lower(), filename_c2))
-        plots.generate_cdf_plot([sanitizedtt[tool] for tool in tools], title, filename_c2, labels=toolnames)
+        self.plots.add('generate_cdf_plot', [sanitizedtt[tool] for tool in tools], title, filename_c2, labels=toolnames)
         self.log.info('writing survival {} --> {}'.format(title.lower(), filename_s))
-        plots.generate_survival_plot([sanitizedtt[tool] for tool in tools], title, filename_s, labels=toolnames)
+        self.plots.add('generate_survival_plot', [sanitizedtt[tool] for tool in tools], title, filename_s, labels=toolnames)
 
         self.log.info('writing sanitized vulnerabilities cdf {} --> {}'.format(title.lower(), filename_v1))
-        plots.generate_cdf_plot([sanvulntt[tool] for tool in tools], title, filename_v1, labels=toolnames)
+        self.plots.add('generate_cdf_plot', [sanvulntt[tool] for tool in tools], title, filename_v1, labels=toolnames)
         self.log.info('writing vulnerabilities survival {} --> {}'.format(title.lower(), filename_v2))
-        plots.generate_survival_plot([sanvulntt[tool] for tool in tools], title, filename_v2, labels=toolnames)
+        self.plots.add('generate_survival_plot', [sanvulntt[tool] for tool in tools], title, filename_v2, labels=toolnames)
 
         filename_ac1 = os.path.join(self.ctx['target.result-svg'], 'mutant-cdf-sanitized-abdsim-star.pdf')
         filename_ac2 = os.path.join(self.ctx['target.result-svg'], 'mutant-cdf-vulns-abdsim-star.pdf')
@@ -604,79 +512,68 @@ class ResultsComparatorMDT(MetaDataTask):
         filename_as2 = os.path.join(self.ctx['target.result-svg'], 'mutant-survival-vulns-cdf-abdsim-star.pdf')
 
         self.log.info('writing sanitized abd vs sim* cdf {} --> {}'.format(title.lower(), filename_ac1))
-        plots.generate_cdf_plot([sanitizedtt['Abd'], sanitizedtt['Sim*']], title, filename_ac1, labels=('Abd', 'Sim*'))
+        self.plots.add('generate_cdf_plot', [sanitizedtt['Abd'], sanitizedtt['Sim*']], title, filename_ac1, labels=('Abd', 'Sim*'))
         self.log.info('writing vulnerabilities abd vs sim* cdf {} --> {}'.format(title.lower(), filename_ac2))
-        plots.generate_cdf_plot([sanvulntt['Abd'], sanvulntt['Sim*']], title, filename_ac2, labels=('Abd', 'Sim*'))
+        self.plots.add('generate_cdf_plot', [sanvulntt['Abd'], sanvulntt['Sim*']], title, filename_ac2, labels=('Abd', 'Sim*'))
         self.log.info('writing abd vs sim* survival {} --> {}'.format(title.lower(), filename_as1))
-        plots.generate_survival_plot([sanitizedtt['Abd'], sanitizedtt['Sim*']], title, filename_as1, labels=('Abd', 'Sim*'))
+        self.plots.add('generate_survival_plot', [sanitizedtt['Abd'], sanitizedtt['Sim*']], title, filename_as1, labels=('Abd', 'Sim*'))
         self.log.info('writing vulnerabilities abd vs sim* survival {} --> {}'.format(title.lower(), filename_as2))
-        plots.generate_survival_plot([sanvulntt['Abd'], sanvulntt['Sim*']], title, filename_as2, labels=('Abd', 'Sim*'))
+        self.plots.add('generate_survival_plot', [sanvulntt['Abd'], sanvulntt['Sim*']], title, filename_as2, labels=('Abd', 'Sim*'))
 
     def _print_onvuln_abduction_tables(self):
-        self._print_onvuln_filtered_abduction_tables('abd vulnerable only', lambda b, m, md: b.get_merged_vstatus(m, 'abduction') == VStatus.Vuln and not md['abducer']['timeout'])
-        self._print_onvuln_filtered_abduction_tables('on binsec vulns', lambda b, m, md: b.get_merged_vstatus(m, 'binsec') == VStatus.Vuln and (b.get_merged_vstatus(m, 'abduction') != VStatus.Unknown or md['abducer']['timeout']))
-        self._print_onvuln_filtered_abduction_tables('any abd vuln', lambda b, m, md: b.get_merged_vstatus(m, 'abduction') == VStatus.Vuln)
-        self._print_onvuln_filtered_abduction_tables('weakest', lambda b, m, md: b.get_merged_vstatus(m, 'abduction') == VStatus.Vuln and md['abducer']['exact'])
-        self._print_onvuln_filtered_abduction_tables('weakest non rse', lambda b, m, md: b.get_merged_vstatus(m, 'abduction') == VStatus.Vuln and md['abducer']['exact'] and b.get_merged_vstatus(m, 'robust') != VStatus.Vuln)
+        c = self.columns
+        self._print_onvuln_filtered_abduction_tables('abd vulnerable only', c.vuln('abduction') & ~c.abducer_timeout)
+        self._print_onvuln_filtered_abduction_tables('on binsec vulns', c.vuln('binsec') & (~c.unknown('abduction') | c.abducer_timeout))
+        self._print_onvuln_filtered_abduction_tables('any abd vuln', c.vuln('abduction'))
+        self._print_onvuln_filtered_abduction_tables('weakest', c.vuln('abduction') & c.abducer_exact)
+        self._print_onvuln_filtered_abduction_tables('weakest non rse', c.vuln('abduction') & c.abducer_exact & ~c.vuln('robust'))
 
     def _print_onvuln_abduction_tables_static_nosplits(self):
+        c = self.columns
         #sys.stdout.write('\n\nAverage on Abduction Final Characterization Only\n\n')
-        #self._print_onvuln_filtered_abduction_tables('abd vulnerable only', lambda b, m, md: b.get_merged_vstatus(m, 'abduction') == VStatus.Vuln and not md['abducer']['timeout'], splits=False, print_median=False)
+        #self._print_onvuln_filtered_abduction_tables('abd vulnerable only', c.vuln('abduction') & ~c.abducer_timeout, splits=False, print_median=False)
         sys.stdout.write('\n\nAverage on Binsec Reachability\n\n')
-        self._print_onvuln_filtered_abduction_tables('on binsec vulns', lambda b, m, md: b.get_merged_vstatus(m, 'binsec') == VStatus.Vuln and (b.get_merged_vstatus(m, 'abduction') != VStatus.Unknown or md['abducer']['timeout']), splits=False, print_median=False)
+        self._print_onvuln_filtered_abduction_tables('on binsec vulns', c.vuln('binsec') & (~c.unknown('abduction') | c.abducer_timeout), splits=False, print_median=False)
         sys.stdout.write('\n\nAverage on Any Abduction Characterization\n\n')
-        self._print_onvuln_filtered_abduction_tables('any abd vuln', lambda b, m, md: b.get_merged_vstatus(m, 'abduction') == VStatus.Vuln, splits=False, print_median=False)
+        self._print_onvuln_filtered_abduction_tables('any abd vuln', c.vuln('abduction'), splits=False, print_median=False)
         sys.stdout.write('\n\nAverage on Weakest Abduction Characterization\n\n')
-        self._print_onvuln_filtered_abduction_tables('weakest', lambda b, m, md: b.get_merged_vstatus(m, 'abduction') == VStatus.Vuln and md['abducer']['exact'], splits=False, print_median=False)
+        self._print_onvuln_filtered_abduction_tables('weakest', c.vuln('abduction') & c.abducer_exact, splits=False, print_median=False)
         #sys.stdout.write('\n\nAverage on Weakest Abduction Characterization not Robustly Reachable\n\n')
-        #self._print_onvuln_filtered_abduction_tables('weakest non rse', lambda b, m, md: b.get_merged_vstatus(m, 'abduction') == VStatus.Vuln and md['abducer']['exact'] and b.get_merged_vstatus(m, 'robust') != VStatus.Vuln, splits=False, print_median=False)
+        #self._print_onvuln_filtered_abduction_tables('weakest non rse', c.vuln('abduction') & c.abducer_exact & ~c.vuln('robust'), splits=False, print_median=False)
 
-    def _print_onvuln_filtered_abduction_tables(self, filtername, filterf, splits=True, print_median=True):
+    def _print_onvuln_filtered_abduction_tables(self, filtername, filtermask, splits=True, print_median=True):
         self.log.info('print local time tables')
-        getstat = lambda md, stat : md['abducer']['statistics'][stat] if ('abducer' in md and 'statistics' in md['abducer'] and stat in md['abducer']['statistics']) else 0
-        getstatdiff = lambda md, statp, statm : max(md['abducer']['statistics'][statp] - md['abducer']['statistics'][statm], 0) if ('abducer' in md and 'statistics' in md['abducer'] and statp in md['abducer']['statistics'] and statm in md['abducer']['statistics']) else 0
+        c = self.columns
         telements_core = [
-                ('#', lambda b, m, md: filterf(b, m, md), None), # and not md['abducer']['timeout'], None),
-                ('candidates considered', lambda b, m, md: (filterf(b, m, md), getstat(md, 'candidates-considered')), None),
-                ('candidates checked', lambda b, m, md: (filterf(b, m, md), getstat(md, 'candidates-evaluated')), None),
-                ('candidates pruned', lambda b, m, md: (filterf(b, m, md), getstatdiff(md, 'candidates-considered', 'candidates-evaluated')), None),
-                #('binsec calls', lambda b, m, md: (filterf(b, m, md), getstat(md, 'count-binsec-call')), None),
-                #('check calls', lambda b, m, md: (filterf(b, m, md), getstat(md, 'count-minibinsec-call')), None),
-                #('variables', lambda b, m, md: (filterf(b, m, md), getstat(md, 'count-variable')), None),
-                ('literals', lambda b, m, md: (filterf(b, m, md), getstat(md, 'count-literal')), None),
-                ('solution count', lambda b, m, md: (filterf(b, m, md), len(md['abducer']['constraints']) if 'abducer' in md else 0), None),
-                ('solution length', lambda b, m, md: (filterf(b, m, md), (statistics.mean((len(c) for c in md['abducer']['constraints'])) if len(md['abducer']['constraints']) > 0 else 0) if 'abducer' in md else 0), None),
-                #('oracle time', lambda b, m, md: (filterf(b, m, md),
-                #        sum([] if getstat(md, 'times-binsec') == 0 else getstat(md, 'times-binsec'))), None),
-                #('total time', lambda b, m, md: (filterf(b, m, md),
-                #        md['abducer']['time'] if 'abducer' in md else 0), None),
-                #('binsec time', lambda b, m, md: (filterf(b, m, md),
-                #        md['binsec']['time'] if 'binsec' in md else 0), None),
-                #('robust time', lambda b, m, md: (filterf(b, m, md),
-                #        md['binsec-robust']['time'] if 'binsec-robust' in md else 0), None),
+                ('#', (filtermask, None)),
+                ('candidates considered', (c.abdstat('candidates-considered'), filtermask)),
+                ('candidates checked', (c.abdstat('candidates-evaluated'), filtermask)),
+                ('candidates pruned', (c.abdstat_diff('candidates-considered', 'candidates-evaluated'), filtermask)),
+                #('binsec calls', (c.abdstat('count-binsec-call'), filtermask)),
+                #('check calls', (c.abdstat('count-minibinsec-call'), filtermask)),
+                #('variables', (c.abdstat('count-variable'), filtermask)),
+                ('literals', (c.abdstat('count-literal'), filtermask)),
+                ('solution count', (c.solution_count, filtermask)),
+                ('solution length', (c.solution_length, filtermask)),
+                #('oracle time', (c.abdstat('times-binsec'), filtermask)),
+                #('total time', (c.times['abducer'], filtermask)),
+                #('binsec time', (c.times['binsec'], filtermask)),
+                #('robust time', (c.times['robust'], filtermask)),
         ]
         for telements in ( telements_core[:8], [telements_core[0]] + telements_core[8:] ):
-            ttable = self.get_table(telements)
-            owner = lambda optl : lambda m : optl in m[0].ctx['source']
-            taggregators = { k : lambda l : sum([v[1] for v in l if v[0]]) for k in (e[0] for e in telements) }
-            taggregators['#'] = sum
-            #tformatters = { k : (lambda v: datetime.timedelta(seconds=round(v))) for k in (e[0] for e in telements) }
-            tformatters = { k : lambda m : round(m, 1) if m != 'no value' else m for k in (e[0] for e in telements) }
+            ttable = dict(telements)
+            taggregators = { k : npsum for k in ttable }
+            #tformatters = { k : (lambda v: datetime.timedelta(seconds=round(v))) for k in ttable }
+            tformatters = { k : lambda m : round(m, 1) for k in ttable }
             tformatters['#'] = None
-            tcategories = [ (owner(optl), taggregators, tformatters) for optl in ('O0', 'O1', 'O2', 'O3', 'Os') ] if splits else []
-            tcategories.append((lambda m: True, taggregators, tformatters))
-            attable = self.aggregate_table(ttable, tcategories)
-            meanagg = { k : lambda l : (statistics.mean([v[1] for v in l if v[0]]) if len([v for v in l if v[0]]) else 'no value') for k in (e[0] for e in telements) }
-            mednagg = { k : lambda l : (statistics.median([v[1] for v in l if v[0]]) if len([v for v in l if v[0]]) else 'no value') for k in (e[0] for e in telements) }
-            meanagg['#'] = sum
-            mednagg['#'] = sum
-            meancats = [ (owner(optl), meanagg, tformatters) for optl in ('O0', 'O1', 'O2', 'O3', 'Os') ] if splits else []
-            meancats.append((lambda m: True, meanagg, tformatters))
-            medncats = [ (owner(optl), mednagg, tformatters) for optl in ('O0', 'O1', 'O2', 'O3', 'Os') ] if splits else []
-            medncats.append((lambda m: True, mednagg, tformatters))
-            meanttable = self.aggregate_table(ttable, meancats)
-            mednttable = self.aggregate_table(ttable, medncats)
-            firstcols = ['O0', 'O1', 'O2', 'O3', 'Os', 'total'] if splits else ['total']
+            attable = self.aggregate_table(ttable, self.optl_categories(taggregators, tformatters, split=splits))
+            meanagg = { k : npmean for k in ttable }
+            mednagg = { k : npmedian for k in ttable }
+            meanagg['#'] = npsum
+            mednagg['#'] = npsum
+            meanttable = self.aggregate_table(ttable, self.optl_categories(meanagg, tformatters, split=splits))
+            mednttable = self.aggregate_table(ttable, self.optl_categories(mednagg, tformatters, split=splits))
+            firstcols = self.optl_firstcols(splits)
             self.log.info('abduction statistics on abd-vulnerable mutants (mean) [filter={}]'.format(filtername))
             pp.print_pretty_table(meanttable, sys.stdout, aslist=True, bdr=self.ctx['opt.rpp-bdr'], use_maxlen=False, split=True, firstcol=firstcols, withtotal=False)
             if print_median:
@@ -686,45 +583,33 @@ class ResultsComparatorMDT(MetaDataTask):
     def _print_abduction_tables(self):
         self.log.info('printing abduction insight tables')
         self.log.warning('time elements of the following table are not RSE-fixed (simulation of an initial RSE check)')
-        def abdstatgetter(stat, fun=lambda b, m, md, d: d):
-            return (lambda b, m, md:
-                fun(b, m, md, md['abducer']['statistics'][stat]) if 'abducer' in md
-                                                                    and 'statistics' in md['abducer']
-                                                                    and stat in md['abducer']['statistics']
-                else 0)
-        celements = [
-                ('#', lambda b, m, md: 1, None),
-                ('precandidates', abdstatgetter('candidates-considered'), None),
-                ('literals', abdstatgetter('count-literal'), None),
-                ('candidates', abdstatgetter('candidates-evaluated'), None),
-                ('pruned candidates', abdstatgetter('candidates-pruned'), None),
-                ('binsec calls', abdstatgetter('count-binsec-call'), None),
-                ('restarts', abdstatgetter('count-restart'), None),
-        ]
-        telements = [
-                ('#', lambda b, m, md: 1, None),
-                ('total binsec time', abdstatgetter('times-binsec', fun=lambda b, m, md, d: sum(d)), None),
-                ('first solution', abdstatgetter('time-first-solution'), None),
-                ('last solution', abdstatgetter('time-last-solution'), None),
-                ('total-time', lambda b, m, md: md['abducer']['time'] if 'abducer' in md else 0, None),
-        ]
-        ctable = self.get_table(celements)
-        ttable = self.get_table(telements)
-        caggregators = { k : sum for k in (e[0] for e in celements) }
-        taggregators = { k : sum for k in (e[0] for e in telements if not e[0].endswith('%')) }
-        # TODO: Fix: taggregators.update({ k : (lambda l: 100*statistics.mean(l)) for k in (e[0] for e in telements if e[0].endswith('%')) })
-        cformatters = { k : None for k in (e[0] for e in celements) }
-        tformatters = { k : (lambda v: datetime.timedelta(seconds=round(v))) for k in (e[0] for e in telements if not e[0].endswith('%')) }
-        # TODO: Fix: tformatters.update({ k : (lambda v: round(v, 1)) for k in (e[0] for e in telements if e[0].endswith('%')) })
+        c = self.columns
+        ctable = {
+                '#': (c.ones, None),
+                'precandidates': (c.abdstat('candidates-considered'), None),
+                'literals': (c.abdstat('count-literal'), None),
+                'candidates': (c.abdstat('candidates-evaluated'), None),
+                'pruned candidates': (c.abdstat('candidates-pruned'), None),
+                'binsec calls': (c.abdstat('count-binsec-call'), None),
+                'restarts': (c.abdstat('count-restart'), None),
+        }
+        ttable = {
+                '#': (c.ones, None),
+                'total binsec time': (c.abdstat('times-binsec'), None),
+                'first solution': (c.abdstat('time-first-solution'), None),
+                'last solution': (c.abdstat('time-last-solution'), None),
+                'total-time': (c.times['abducer'], None),
+        }
+        caggregators = { k : npsum for k in ctable }
+        taggregators = { k : npsum for k in ttable if not k.endswith('%') }
+        # TODO: Fix: taggregators.update({ k : nppercent for k in ttable if k.endswith('%') })
+        cformatters = { k : None for k in ctable }
+        tformatters = { k : (lambda v: datetime.timedelta(seconds=round(v))) for k in ttable if not k.endswith('%') }
+        # TODO: Fix: tformatters.update({ k : (lambda v: round(v, 1)) for k in ttable if k.endswith('%') })
         tformatters['#'] = None
-        owner = lambda optl : lambda m : optl in m[0].ctx['source'] and 'abducer' in m[0].ctx.mutants[m[1]]
-        ownerships = [ owner(optl) for optl in ('O0', 'O1', 'O2', 'O3', 'Os') ]
-        ownerships.append(lambda m : 'abducer' in m[0].ctx.mutants[m[1]])
-        ccategories = [ (o, caggregators, cformatters) for o in ownerships ]
-        tcategories = [ (o, taggregators, tformatters) for o in ownerships ]
-        catable = self.aggregate_table(ctable, ccategories)
-        tatable = self.aggregate_table(ttable, tcategories)
-        firstcols = [ 'O0', 'O1', 'O2', 'O3', 'Os', 'total' ]
+        catable = self.aggregate_table(ctable, self.optl_categories(caggregators, cformatters, where=c.abducer))
+        tatable = self.aggregate_table(ttable, self.optl_categories(taggregators, tformatters, where=c.abducer))
+        firstcols = self.optl_firstcols()
         pp.print_pretty_table(catable, sys.stdout, aslist=True, bdr=self.ctx['opt.rpp-bdr'], use_maxlen=False, split=True, firstcol=firstcols, withtotal=False)
         pp.print_pretty_table(tatable, sys.stdout, aslist=True, bdr=self.ctx['opt.rpp-bdr'], use_maxlen=False, split=True, firstcol=firstcols, withtotal=False)
         self.log.info('printing meaned abduction insight tables')
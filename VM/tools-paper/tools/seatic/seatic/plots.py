@@ -2,13 +2,25 @@
 import os.path
 import time
 import math
-from mpl_toolkits.mplot3d import Axes3D
-import matplotlib.pyplot as plt
-import matplotlib.markers as markers
+import json
+import hashlib
+import concurrent.futures
 from .utils import pad_list, rotate_table
 from . import pprinters as pp
 # --------------------
-plt.rc('font', size=30)
+FONT_SIZE = 30
+# --------------------
+_pyplot = None
+def pyplot():
+    # matplotlib is only loaded when a plot is rendered, with a non-interactive backend
+    global _pyplot
+    if _pyplot is None:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot
+        _pyplot = matplotlib.pyplot
+        _pyplot.rc('font', size=FONT_SIZE)
+    return _pyplot
 # --------------------
 LINE_STYLES = [
     '--',
@@ -61,7 +73,11 @@ def get_hatch(color):
     return table[color] if color in table else None
 # --------------------
 def generate_barplot(elems, title, target, labels=None, xlabels=None):
-    plt.rc('font', size=10)
+    plt = pyplot()
+    with plt.rc_context({'font.size': 10}):
+        _generate_barplot(plt, elems, title, target, labels, xlabels)
+# --------------------
+def _generate_barplot(plt, elems, title, target, labels, xlabels):
     fig = plt.figure(figsize=(12,1.5))
     ax = fig.add_subplot(1, 1, 1)
     width = 0.25
@@ -84,13 +100,13 @@ def generate_barplot(elems, title, target, labels=None, xlabels=None):
     plt.tight_layout()
     plt.savefig(target)
     plt.close()
-    plt.rc('font', size=12)
 # --------------------
 def generate_histograms(elems, title, target_template, colors=None, color_labels=None):
     for nbins in get_bins_counts(len(elems)):
         generate_histogram(elems, title, target_template.format(nbins), nbins, colors, color_labels)
 # --------------------
 def generate_histogram(elems, title, target, nbins, colors=None, color_labels=None):
+    plt = pyplot()
     fig = plt.figure(figsize=(7, 7))
     index = 1
     ax = fig.add_subplot(1, 1, index)
@@ -130,6 +146,7 @@ def cumsum(l):
     return res
 # --------------------
 def generate_tsplot_generic(elems, title, target, labels=None, cummulative=True, inverted=True, figsize=(1,1), exlegend=None):
+    plt = pyplot()
     tseries = [cumsum(sorted(l)) for l in elems] if cummulative else [sorted(l) for l in elems]
     fig = plt.figure(figsize=figsize, constrained_layout=True)
     ax = fig.add_subplot(1, 1, 1)
@@ -206,6 +223,7 @@ def cumstat(l, stat, step):
     return [xs, res]
 # --------------------
 def generate_cummulative_timeplots(elems, title, target, step, stat, labels=None, cummulative=False):
+    plt = pyplot()
     tseries = [ cumstat(l, stat, step) for l in elems ]
     fig = plt.figure(figsize=(7,7))
     ax = fig.add_subplot(1, 1, 1)
@@ -225,3 +243,110 @@ def generate_cummulative_timeplots(elems, title, target, step, stat, labels=None
     plt.savefig(target)
     plt.close()
 # --------------------
+def _spec_default(obj):
+    return getattr(obj, '__qualname__', None) or str(obj)
+# --------------------
+_plots_version = None
+def plots_version():
+    # plot specs also depend on the rendering code itself
+    global _plots_version
+    if _plots_version is None:
+        with open(__file__, 'rb') as stream:
+            _plots_version = hashlib.sha256(stream.read()).hexdigest()
+    return _plots_version
+# --------------------
+class PlotJob:
+    # Pure description of a plot: the name of a generate_* function of this module
+    # and its (elems, title, target, ...) arguments.
+
+    def __init__(self, function, *args, **kwargs):
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+
+    @property
+    def targets(self):
+        targets = [ self.args[2] ]
+        if self.kwargs.get('exlegend') is not None:
+            targets.append(self.kwargs['exlegend'])
+        return targets
+
+    def digest(self):
+        spec = json.dumps([plots_version(), self.function, self.args, self.kwargs], sort_keys=True, default=_spec_default)
+        return hashlib.sha256(spec.encode()).hexdigest()
+
+    @staticmethod
+    def digest_file(target):
+        return os.path.join(os.path.dirname(target), '.{}.sha256'.format(os.path.basename(target)))
+
+    def is_rendered(self, digest):
+        for target in self.targets:
+            try:
+                with open(self.digest_file(target)) as stream:
+                    if stream.read().strip() != digest or not os.path.exists(target):
+                        return False
+            except OSError:
+                return False
+        return True
+
+    def mark_rendered(self, digest):
+        for target in self.targets:
+            with open(self.digest_file(target), 'w') as stream:
+                stream.write(digest)
+
+    def __call__(self):
+        globals()[self.function](*self.args, **self.kwargs)
+# --------------------
+def render_job(job):
+    job()
+# --------------------
+class PlotRenderer:
+    # Collects plot jobs and renders them in a process pool; jobs whose targets were
+    # already rendered from an identical spec are skipped.
+
+    def __init__(self, logger, workers=None, cached=True):
+        self.log = logger
+        self.workers = workers
+        self.cached = cached
+        self.jobs = []
+
+    def add(self, function, *args, **kwargs):
+        self.jobs.append(PlotJob(function, *args, **kwargs))
+
+    def add_histograms(self, elems, title, target_template, colors=None, color_labels=None):
+        for nbins in get_bins_counts(len(elems)):
+            self.add('generate_histogram', elems, title, target_template.format(nbins), nbins, colors, color_labels)
+
+    def render(self):
+        pending = []
+        for job in self.jobs:
+            digest = job.digest()
+            if self.cached and job.is_rendered(digest):
+                self.log.debug('skipping unchanged plot {}'.format(job.targets[0]))
+            else:
+                pending.append((job, digest))
+        self.log.info('rendering {} plots ({} unchanged)'.format(len(pending), len(self.jobs) - len(pending)))
+        self.jobs = []
+        if len(pending) > 1 and self.workers != 1:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=self.workers, initializer=pyplot) as executor:
+                futures = { executor.submit(render_job, job): (job, digest) for job, digest in pending }
+                for future in self.log.progress(concurrent.futures.as_completed(futures)):
+                    self._finalize(*futures[future], future.exception())
+        else:
+            for job, digest in self.log.progress(pending):
+                self._finalize(job, digest, self._run(job))
+
+    @staticmethod
+    def _run(job):
+        try:
+            job()
+        except Exception as e:
+            return e
+        return None
+
+    def _finalize(self, job, digest, error):
+        if error is not None:
+            self.log.error('could not render {}: {}'.format(job.targets[0], error))
+        else:
+            job.mark_rendered(digest)
+# --------------------
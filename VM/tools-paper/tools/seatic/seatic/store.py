@@ -0,0 +1,124 @@
+# --------------------
+import pickle
+import sqlite3
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
+# --------------------
+class MutantStore(MutableMapping):
+    # Lazy mapping of mutant data over an sqlite database.
+    # Mutants are loaded on access and kept in a bounded cache; cached entries
+    # modified in place are written back on eviction and on sync.
+    # A database can be shared by several contexts, each one in its own scope.
+
+    SCHEMA = 'CREATE TABLE IF NOT EXISTS mutants (scope TEXT, name TEXT, position INTEGER, data BLOB, PRIMARY KEY (scope, name))'
+
+    def __init__(self, filename, logger, scope='', cache_size=1024):
+        self.filename = filename
+        self.scope = scope
+        self.log = logger
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(filename, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        with self.conn:
+            self.conn.execute(self.SCHEMA)
+
+    def _write(self, mutant, blob):
+        with self.conn:
+            cur = self.conn.execute('UPDATE mutants SET data = ? WHERE scope = ? AND name = ?', (blob, self.scope, mutant))
+            if cur.rowcount == 0:
+                self.conn.execute('INSERT INTO mutants (scope, name, position, data) VALUES '
+                                  '(?, ?, (SELECT COALESCE(MAX(position), -1) + 1 FROM mutants WHERE scope = ?), ?)',
+                                  (self.scope, mutant, self.scope, blob))
+
+    def _writeback(self, mutant, mdata, blob):
+        nblob = pickle.dumps(mdata, protocol=pickle.HIGHEST_PROTOCOL)
+        if nblob != blob:
+            self._write(mutant, nblob)
+        return nblob
+
+    def _cache(self, mutant, mdata, blob):
+        self.cache[mutant] = (mdata, blob)
+        self.cache.move_to_end(mutant)
+        while len(self.cache) > self.cache_size:
+            emutant, (edata, eblob) = self.cache.popitem(last=False)
+            self._writeback(emutant, edata, eblob)
+
+    def __getitem__(self, mutant):
+        with self.lock:
+            if mutant in self.cache:
+                self.cache.move_to_end(mutant)
+                return self.cache[mutant][0]
+            row = self.conn.execute('SELECT data FROM mutants WHERE scope = ? AND name = ?', (self.scope, mutant)).fetchone()
+            if row is None:
+                raise KeyError(mutant)
+            mdata = pickle.loads(row[0])
+            self._cache(mutant, mdata, row[0])
+            return mdata
+
+    def __setitem__(self, mutant, mdata):
+        with self.lock:
+            blob = pickle.dumps(mdata, protocol=pickle.HIGHEST_PROTOCOL)
+            self._write(mutant, blob)
+            self._cache(mutant, mdata, blob)
+
+    def __delitem__(self, mutant):
+        with self.lock:
+            self.cache.pop(mutant, None)
+            with self.conn:
+                cur = self.conn.execute('DELETE FROM mutants WHERE scope = ? AND name = ?', (self.scope, mutant))
+            if cur.rowcount == 0:
+                raise KeyError(mutant)
+
+    def __contains__(self, mutant):
+        with self.lock:
+            if mutant in self.cache:
+                return True
+            return self.conn.execute('SELECT 1 FROM mutants WHERE scope = ? AND name = ?', (self.scope, mutant)).fetchone() is not None
+
+    def __iter__(self):
+        with self.lock:
+            names = [ row[0] for row in self.conn.execute('SELECT name FROM mutants WHERE scope = ? ORDER BY position', (self.scope,)) ]
+        return iter(names)
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute('SELECT COUNT(*) FROM mutants WHERE scope = ?', (self.scope,)).fetchone()[0]
+
+    def clear(self):
+        with self.lock:
+            self.cache.clear()
+            with self.conn:
+                self.conn.execute('DELETE FROM mutants WHERE scope = ?', (self.scope,))
+
+    def replace(self, mdata):
+        # replaces the complete scope content in a single transaction
+        with self.lock:
+            self.cache.clear()
+            with self.conn:
+                self.conn.execute('DELETE FROM mutants WHERE scope = ?', (self.scope,))
+                self.conn.executemany('INSERT INTO mutants (scope, name, position, data) VALUES (?, ?, ?, ?)',
+                                      ((self.scope, mutant, position, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+                                       for position, (mutant, data) in enumerate(mdata.items())))
+
+    def sync(self):
+        with self.lock:
+            for mutant, (mdata, blob) in list(self.cache.items()):
+                self.cache[mutant] = (mdata, self._writeback(mutant, mdata, blob))
+
+    def close(self):
+        self.sync()
+        self.conn.close()
+
+    def import_mutants(self, mdata):
+        self.log.info('importing {} mutants into {}'.format(len(mdata), self.filename))
+        for mutant, data in mdata.items():
+            self[mutant] = data
+
+    def export_mutants(self):
+        return { mutant: self[mutant] for mutant in self }
+# --------------------
+# --------------------
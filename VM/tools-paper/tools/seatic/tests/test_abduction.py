@@ -0,0 +1,108 @@
+import os
+import tempfile
+import unittest
+
+from seatic import abduction
+from seatic.core import SeaticContext
+from seatic.abduction import AbductionAnalysisTask, abducer_servers
+
+
+class DummyLogger:
+    def info(self, *_args, **_kwargs):
+        return None
+
+    def debug(self, *_args, **_kwargs):
+        return None
+
+    def error(self, *_args, **_kwargs):
+        return None
+
+
+class FakePool:
+    def __init__(self, result):
+        self.result = result
+        self.problems = []
+
+    def solve(self, problem, timeout=None):
+        self.problems.append((problem, timeout))
+        return dict(self.result, id=problem['id'])
+
+
+def make_context(tmpdir):
+    ctx = SeaticContext(DummyLogger())
+    ctx['environ.TMPDIR'] = os.path.join(tmpdir, 'tmp')
+    ctx['opt.abducer_server'] = True
+    ctx['opt.task_logging'] = False
+    for name in ('binsec-config', 'directives', 'binsec-memory', 'literals', 'robust-config'):
+        ctx['config.abducer-{}'.format(name)] = os.path.join(tmpdir, name)
+    ctx['abduction.address'] = 0x8049000
+    ctx['abduction.depth'] = 2
+    ctx['timeout.abducer'] = 30
+    return ctx
+
+
+class TestAbducerServerClient(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.ctx = make_context(self.tmpdir.name)
+        self.servers = dict(abduction.ABDUCER_SERVERS)
+        self.support = dict(abduction.ABDUCER_RESULT_SUPPORT)
+        # an abducer without --result-file: results are parsed from the returned log
+        abduction.ABDUCER_RESULT_SUPPORT[('pyabduce',)] = False
+
+    def tearDown(self):
+        for key, pool in abduction.ABDUCER_SERVERS.items():
+            if not key in self.servers and hasattr(pool, 'close'):
+                pool.close()
+        abduction.ABDUCER_SERVERS.clear()
+        abduction.ABDUCER_SERVERS.update(self.servers)
+        abduction.ABDUCER_RESULT_SUPPORT.clear()
+        abduction.ABDUCER_RESULT_SUPPORT.update(self.support)
+        self.tmpdir.cleanup()
+
+    def run_task(self, result):
+        pool = FakePool(result)
+        abduction.ABDUCER_SERVERS[(('pyabduce',), self.ctx['environ.TMPDIR'])] = pool
+        data = { 'binsec': { 'vulnerable': True } }
+        task = AbductionAnalysisTask(self.ctx, 'f0.bin', data, DummyLogger())
+        task.execute()
+        self.assertTrue(task.finished)
+        return pool, task, data['abducer']
+
+    def test_problem_is_submitted_without_the_abducer_command(self):
+        pool, task, _ = self.run_task({ 'status': 'ok', 'returncode': 0, 'output': '' })
+        problem, timeout = pool.problems[0]
+        self.assertEqual((problem['id'], problem['timeout'], timeout), ('f0.bin', 30, 30))
+        self.assertEqual(problem['args'], task.cmd[1:])
+        self.assertIn('--binsec-binary', problem['args'])
+
+    def test_solved_problem(self):
+        output = "[result] : satisfying solution: {'eax = 0'}\n"
+        _, _, result = self.run_task({ 'status': 'ok', 'returncode': 0, 'output': output })
+        self.assertEqual((result['returncode'], result['timeout']), (0, False))
+        self.assertEqual(result['constraints'], [{'eax = 0'}])
+
+    def test_timeout_reply(self):
+        _, _, result = self.run_task({ 'status': 'timeout', 'returncode': 1, 'output': '' })
+        self.assertEqual((result['returncode'], result['timeout'], result['constraints']), (1, True, []))
+
+    def test_killed_server(self):
+        # client side timeouts and crashes have no return code nor output
+        _, _, result = self.run_task({ 'status': 'timeout', 'returncode': None })
+        self.assertEqual((result['returncode'], result['timeout']), (-9, True))
+        _, _, result = self.run_task({ 'status': 'crash', 'returncode': None })
+        self.assertEqual((result['returncode'], result['timeout'], result['constraints']), (-9, False, []))
+
+    def test_servers_are_not_shared_across_temporary_directories(self):
+        other = make_context(self.tmpdir.name)
+        other['environ.TMPDIR'] = os.path.join(self.tmpdir.name, 'other')
+        first, second = abducer_servers(self.ctx), abducer_servers(other)
+        self.assertIsNot(first, second)
+        self.assertIs(abducer_servers(make_context(self.tmpdir.name)), first)
+        self.assertEqual(first.env['TMPDIR'], self.ctx['environ.TMPDIR'])
+        self.assertEqual(second.env['TMPDIR'], other['environ.TMPDIR'])
+        self.assertEqual(first.cmd, ['pyabduce', '--serve'])
+
+
+if __name__ == '__main__':
+    unittest.main()
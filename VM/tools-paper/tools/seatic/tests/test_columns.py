@@ -0,0 +1,136 @@
+import itertools
+import unittest
+
+from seatic.columns import MetaColumns, npsum
+from seatic.results import VStatus
+
+
+class DummyLogger:
+    def info(self, *_args, **_kwargs):
+        return None
+
+
+class FakeContext(dict):
+    def __init__(self, source, mutants):
+        super().__init__(source=source)
+        self.mutants = mutants
+
+    def is_vulnerable(self, mutant):
+        return self.mutants[mutant]['binsec']['vulnerable']
+
+
+class FakeBuilder:
+    def __init__(self, source, mutants):
+        self.ctx = FakeContext(source, mutants)
+
+    def get_merged_vstatus(self, mutant, tool):
+        return VStatus(self.ctx.mutants[mutant]['status'][tool])
+
+    def get_vseverity(self, mutant, tool):
+        return self.ctx.mutants[mutant]['severity']
+
+    def get_pseverity(self, mutant, tool):
+        return 2 * self.ctx.mutants[mutant]['severity']
+
+
+def make_mutant(idx):
+    statuses = 'VNUTE'
+    md = {
+        'status': { tool: statuses[(idx + i) % len(statuses)] for i, tool in enumerate(MetaColumns.Tools) },
+        'severity': idx % 3,
+        'binsec': { 'time': 0.5 * idx, 'vulnerable': idx % 2 == 0 },
+    }
+    if idx % 3 == 0:
+        md['abducer'] = { 'time': float(idx), 'timeout': False, 'constraints': [['a'], ['a', 'b']][:idx % 2 + 1],
+                          'statistics': { 'count-binsec-call': idx, 'time-binsec': 0.1 * idx } }
+    return md
+
+
+def make_metadata():
+    sources = ('aes-O0.c', 'aes-O2.c', 'pin-O2.c')
+    return { source: FakeBuilder(source, { 'f{}.bin'.format(i): make_mutant(i + 7 * s) for i in range(6) })
+             for s, source in enumerate(sources) }
+
+
+# dict-based tables of the meta scripts before the columnar engine
+def get_table(metadata, elements):
+    table = { key : [] for key, _ in elements }
+    table[''] = []
+    for builder in metadata.values():
+        for mutant in sorted(builder.ctx.mutants.keys()):
+            table[''].append((builder, mutant))
+            for key, kgetter in elements:
+                table[key].append(kgetter(builder, mutant, builder.ctx.mutants[mutant]))
+    return table
+
+
+def aggregate_table(table, ownerships):
+    atable = { key : [] for key in table if key != '' }
+    for ownership in ownerships:
+        for key, vlist in table.items():
+            if key != '':
+                mlist = [ m for m in table[''] if ownership(m) ]
+                atable[key].append(sum(vlist[table[''].index(m)] for m in mlist) if mlist else 'no value')
+    return atable
+
+
+class TestMetaColumns(unittest.TestCase):
+    def setUp(self):
+        self.metadata = make_metadata()
+        self.columns = MetaColumns(self.metadata, DummyLogger())
+
+    def test_columns_match_mutant_data(self):
+        c = self.columns
+        self.assertEqual(len(c), 18)
+        self.assertEqual(c.sources, list(self.metadata))
+        for row, (builder, mutant) in enumerate(c.rows):
+            md = builder.ctx.mutants[mutant]
+            self.assertEqual(c.sources[c.context[row]], builder.ctx['source'])
+            for tool in MetaColumns.Tools:
+                self.assertEqual(c.vuln(tool)[row], md['status'][tool] == 'V')
+                self.assertEqual(c.unknown(tool)[row], md['status'][tool] == 'U')
+            self.assertEqual(c.vseverity['binsec'][row], md['severity'])
+            self.assertEqual(c.pseverity['abduction'][row], 2 * md['severity'])
+            self.assertEqual(c.times['binsec'][row], md['binsec']['time'])
+            self.assertEqual(c.abducer[row], 'abducer' in md)
+            self.assertEqual(c.solution_count[row], len(md['abducer']['constraints']) if 'abducer' in md else 0)
+            self.assertEqual(c.abdstat('count-binsec-call')[row], md['abducer']['statistics']['count-binsec-call'] if 'abducer' in md else 0)
+            self.assertEqual(c.abdstat('time-first-solution', default=-1)[row], -1)
+            self.assertEqual(c.corrected_abducer_time()[row], md['abducer']['time'] if 'abducer' in md and md['status']['robust'] != 'V' else 0)
+            self.assertEqual(c.vulnerable[row], md['binsec']['vulnerable'])
+        self.assertEqual(c.source('pin-O2.c').sum(), 6)
+        self.assertTrue((c.owner('O2') == (c.context > 0)).all())
+
+    def test_aggregate_counts_match_dict_tables(self):
+        c = self.columns
+        for t1, t2 in itertools.combinations(('binsec', 'vsimu', 'abduction', 'simu', 'robust'), 2):
+            vuln = lambda b, m, t: b.get_merged_vstatus(m, t) == VStatus.Vuln
+            unkn = lambda b, m, t: b.get_merged_vstatus(m, t) == VStatus.Unknown
+            elements = [
+                ('#', lambda b, m, md: 1),
+                ('?', lambda b, m, md: unkn(b, m, t1) or unkn(b, m, t2)),
+                ('match', lambda b, m, md: b.get_merged_vstatus(m, t1) == b.get_merged_vstatus(m, t2) and not unkn(b, m, t1)),
+                ('!in', lambda b, m, md: vuln(b, m, t1) and not vuln(b, m, t2)),
+            ]
+            ownerships = [ (lambda optl: lambda m: optl in m[0].ctx['source'])(optl) for optl in ('O0', 'O1', 'O2') ]
+            ownerships.append(lambda m: True)
+            expected = aggregate_table(get_table(self.metadata, elements), ownerships)
+            table = {
+                '#': (c.ones, None),
+                '?': (c.unknown(t1) | c.unknown(t2), None),
+                'match': ((c.status[t1] == c.status[t2]) & ~c.unknown(t1), None),
+                '!in': (c.vuln(t1) & ~c.vuln(t2), None),
+            }
+            aggregators = { k : npsum for k in table }
+            formatters = { k : None for k in table }
+            masks = [ c.owner(optl) for optl in ('O0', 'O1', 'O2') ] + [ c.all ]
+            self.assertEqual(c.aggregate_table(table, [ (mask, aggregators, formatters) for mask in masks ]), expected)
+
+    def test_vulnerable_selection(self):
+        selected = { (b.ctx['source'], m) for b, m in self.columns.select(self.columns.vulnerable) }
+        expected = { (s, m) for s, b in self.metadata.items() for m, md in b.ctx.mutants.items() if md['binsec']['vulnerable'] }
+        self.assertEqual(selected, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
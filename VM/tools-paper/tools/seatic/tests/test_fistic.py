@@ -0,0 +1,90 @@
+import os
+import json
+import tempfile
+import unittest
+import importlib.util
+
+from seatic.analysis import FullAnalysisTask
+from seatic.fistic import FisticLogParser, group_mutant_aliases
+
+
+class DummyLogger:
+    def info(self, *_args, **_kwargs):
+        return None
+
+    def debug(self, *_args, **_kwargs):
+        return None
+
+
+class FakeContext:
+    def __init__(self):
+        self.mutants = {}
+
+    def set_mutants(self, mutants):
+        self.mutants = mutants
+
+
+class FakeAnalysis:
+    def __init__(self, results, to_discard=False):
+        self.results = results
+        self.to_discard = to_discard
+
+    def get_results(self):
+        return self.results
+
+
+class TestMutantAliases(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.mutants = []
+        for idx, content in enumerate([b'a', b'b', b'a', b'a']):
+            mutant = os.path.join(self.tmpdir.name, 'f{}.bin'.format(idx))
+            with open(mutant, 'wb') as stream:
+                stream.write(content)
+            self.mutants.append(mutant)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_identical_mutants_alias_the_first_of_their_class(self):
+        ctx = { 'mutants': { mutant: dict() for mutant in self.mutants } }
+        group_mutant_aliases(ctx, self.mutants, DummyLogger())
+        aliases = [ ctx['mutants'][mutant].get('alias') for mutant in self.mutants ]
+        self.assertEqual(aliases, [None, None, self.mutants[0], self.mutants[0]])
+        self.assertEqual(ctx['mutants'][self.mutants[0]]['digest'], ctx['mutants'][self.mutants[2]]['digest'])
+        self.assertNotEqual(ctx['mutants'][self.mutants[0]]['digest'], ctx['mutants'][self.mutants[1]]['digest'])
+
+    def test_aliases_get_the_representative_results(self):
+        ctx = FakeContext()
+        task = FullAnalysisTask(ctx, DummyLogger())
+        task.subtasks[ctx, self.mutants[0]] = FakeAnalysis({ 'status': 'crash' })
+        task.subtasks[ctx, self.mutants[1]] = FakeAnalysis({ 'status': 'ok' })
+        task.aliases[ctx, self.mutants[2]] = self.mutants[0]
+        task.aliases[ctx, self.mutants[3]] = self.mutants[1]
+        task._postprocess()
+        self.assertEqual(ctx.mutants[self.mutants[2]], { 'status': 'crash', 'alias': self.mutants[0] })
+        self.assertEqual(ctx.mutants[self.mutants[3]], { 'status': 'ok', 'alias': self.mutants[1] })
+        self.assertNotIn('alias', ctx.mutants[self.mutants[0]])
+
+
+class TestFisticLogParser(unittest.TestCase):
+    def test_golden_result_from_log(self):
+        parser = FisticLogParser('[info]   : golden run evaluation result: failure\n', DummyLogger())
+        self.assertEqual(parser.results, { 'golden': { 'result': None, 'crash': True, 'timeout': False } })
+
+    @unittest.skipUnless(importlib.util.find_spec('fistic'), 'fistic is not installed')
+    def test_golden_result_from_sink(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            sink = os.path.join(tmpdir, 'f0.bin.fistic-results.jsonl')
+            with open(sink, 'w') as stream:
+                entry = { 'binary': 'f0.bin', 'targets': [16], 'digest': None, 'alias': None }
+                stream.write(json.dumps(dict(entry, status='valid', golden=False)) + '\n')
+                stream.write(json.dumps(dict(entry, status='invalid', golden=True)) + '\n')
+                # truncated by a killed run
+                stream.write(json.dumps(dict(entry, status='valid', golden=True))[:20])
+            parser = FisticLogParser('[info]   : golden run evaluation result: valid\n', DummyLogger(), sink=sink)
+        self.assertEqual(parser.results, { 'golden': { 'result': True, 'crash': False, 'timeout': False } })
+
+
+if __name__ == '__main__':
+    unittest.main()
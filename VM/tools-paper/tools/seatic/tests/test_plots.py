@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+
+from seatic import plots
+from seatic.plots import PlotRenderer
+
+
+class DummyLogger:
+    def __init__(self):
+        self.messages = []
+
+    def info(self, message, *_args, **_kwargs):
+        self.messages.append(message)
+
+    def debug(self, message, *_args, **_kwargs):
+        self.messages.append(message)
+
+    def error(self, message, *_args, **_kwargs):
+        self.messages.append(message)
+
+    def progress(self, iterable, *_args, **_kwargs):
+        return iterable
+
+
+# per-tool mutant computation times, as the meta tasks tabulate them
+TIMES = {
+    'binsec': [ 0.5, 1.2, 3.4, 0.8, 12.0, 2.2, 0.3, 7.5 ],
+    'robust': [ 1.5, 2.2, 6.1, 1.0, 30.5, 4.0, 0.9, 9.1 ],
+    'abducer': [ 4.0, 8.5, 60.0, 2.5, 120.0, 16.0, 1.5, 33.0 ],
+}
+COLORS = [ 'r', 'g', 'y', 'g', 'r', 'g', 'y', 'g' ]
+
+
+class TestPlotRendering(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.log = DummyLogger()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def target(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    def add_plots(self, renderer, times):
+        tools = list(times)
+        series = [ times[tool] for tool in tools ]
+        renderer.add('generate_cdf_plot', series, 'times', self.target('cdf.png'), labels=tools)
+        renderer.add('generate_survival_plot', series, 'times', self.target('survival.png'), labels=tools,
+                     exlegend=self.target('survival.legend.png'))
+        renderer.add('generate_cummulative_timeplots', [ times['abducer'] ], 'abducer', self.target('cumulative.png'), 10, sum,
+                     labels=['total'], cummulative=True)
+        renderer.add('generate_barplot', [ [10, 20, 30], [5, 15, 25], [1, 2, 3] ], None, self.target('bars.png'),
+                     labels=['robust', 'binsec', 'abduction'], xlabels=['O0', 'O1', 'O2'])
+        renderer.add_histograms(times['binsec'], 'binsec', self.target('histogram-{}.png'),
+                                colors=COLORS, color_labels={ 'r': 'vuln', 'g': 'safe', 'y': 'unknown' })
+
+    def rendered(self):
+        return sorted(name for name in os.listdir(self.tmpdir.name) if name.endswith('.png'))
+
+    def test_fixture_table_is_rendered(self):
+        renderer = PlotRenderer(self.log, workers=1)
+        self.add_plots(renderer, TIMES)
+        renderer.render()
+        self.assertEqual(plots.pyplot().get_backend().lower(), 'agg')
+        self.assertFalse([ m for m in self.log.messages if m.startswith('could not render') ])
+        self.assertEqual(self.rendered(), [ 'bars.png', 'cdf.png', 'cumulative.png', 'histogram-3.png', 'histogram-4.png',
+                                            'survival.legend.png', 'survival.png' ])
+        for name in self.rendered():
+            with open(self.target(name), 'rb') as stream:
+                self.assertEqual(stream.read(8), b'\x89PNG\r\n\x1a\n')
+
+    def test_unchanged_plots_are_not_rendered_again(self):
+        renderer = PlotRenderer(self.log, workers=2)
+        self.add_plots(renderer, TIMES)
+        renderer.render()
+        self.assertIn('rendering 6 plots (0 unchanged)', self.log.messages)
+        mtime = os.stat(self.target('bars.png')).st_mtime_ns
+        self.add_plots(renderer, TIMES)
+        renderer.render()
+        self.assertIn('rendering 0 plots (6 unchanged)', self.log.messages)
+        times = dict(TIMES, abducer=TIMES['abducer'] + [ 42.0 ])
+        self.add_plots(renderer, times)
+        renderer.render()
+        self.assertIn('rendering 3 plots (3 unchanged)', self.log.messages)
+        self.assertEqual(os.stat(self.target('bars.png')).st_mtime_ns, mtime)
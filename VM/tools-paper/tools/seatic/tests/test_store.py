@@ -0,0 +1,147 @@
+import argparse
+import io
+import os
+import tempfile
+import unittest
+
+import yaml
+
+from seatic.core import SeaticContext
+from seatic.engine import SeaticBaseMergedRunner, SeaticMergedEngine
+from seatic.store import MutantStore
+
+
+class DummyLogger:
+    def info(self, *_args, **_kwargs):
+        return None
+
+    def debug(self, *_args, **_kwargs):
+        return None
+
+
+def make_mutants():
+    return {
+        'f{}.bin'.format(idx): { 'binsec': { 'vulnerable': idx % 2 == 0, 'time': 0.5 * idx }, 'targets': [idx] }
+        for idx in range(5)
+    }
+
+
+class TestMutantStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmpdir.name, 'mutants.db')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_yaml_import_export_roundtrip(self):
+        mutants = make_mutants()
+        stream = io.StringIO()
+        yaml.dump(mutants, stream)
+        stream.seek(0)
+        store = MutantStore(self.filename, DummyLogger())
+        store.import_mutants(yaml.safe_load(stream))
+        exported = io.StringIO()
+        yaml.dump(store.export_mutants(), exported)
+        store.close()
+        exported.seek(0)
+        self.assertEqual(yaml.safe_load(exported), mutants)
+        self.assertEqual(list(MutantStore(self.filename, DummyLogger())), list(mutants))
+
+    def test_context_dump_exports_store_mutants(self):
+        ctx = SeaticContext(DummyLogger())
+        ctx.update_from({ 'mutants': make_mutants() })
+        ctx.attach_store(self.filename)
+        stream = io.StringIO()
+        ctx.dump(stream, full=True)
+        stream.seek(0)
+        self.assertEqual(yaml.safe_load(stream)['mutants'], make_mutants())
+
+    def test_update_one_mutant_status(self):
+        store = MutantStore(self.filename, DummyLogger(), cache_size=2)
+        store.import_mutants(make_mutants())
+        store['f1.bin']['binsec']['vulnerable'] = True
+        for mutant in store:
+            store[mutant]
+        store['f3.bin']['binsec']['vulnerable'] = True
+        store.close()
+        store = MutantStore(self.filename, DummyLogger())
+        expected = make_mutants()
+        expected['f1.bin']['binsec']['vulnerable'] = True
+        expected['f3.bin']['binsec']['vulnerable'] = True
+        self.assertEqual(store.export_mutants(), expected)
+
+    def test_context_update_merges_into_store(self):
+        ctx = SeaticContext(DummyLogger())
+        ctx.attach_store(self.filename)
+        ctx.set_mutants(make_mutants())
+        ctx.update_from({ 'mutants': { 'f0.bin': { 'binsec': { 'vulnerable': False } }, 'f9.bin': { 'targets': [9] } } })
+        self.assertTrue(ctx.has_store)
+        ctx.mutants.sync()
+        store = MutantStore(self.filename, DummyLogger())
+        self.assertEqual(store['f0.bin'], { 'binsec': { 'vulnerable': False, 'time': 0.0 }, 'targets': [0] })
+        self.assertEqual(store['f9.bin'], { 'targets': [9] })
+        self.assertEqual(len(store), 6)
+
+    def test_scopes_of_a_shared_store_are_independent(self):
+        first = MutantStore(self.filename, DummyLogger(), scope='a')
+        second = MutantStore(self.filename, DummyLogger(), scope='b')
+        first.import_mutants(make_mutants())
+        second.replace({ 'f0.bin': { 'targets': [42] } })
+        self.assertEqual(first.export_mutants(), make_mutants())
+        self.assertEqual(second.export_mutants(), { 'f0.bin': { 'targets': [42] } })
+        first.clear()
+        self.assertEqual(len(first), 0)
+        self.assertEqual(list(second), ['f0.bin'])
+
+
+class FakeTask:
+    def __init__(self, ctxs):
+        self.ctxs = ctxs
+
+    def execute(self):
+        # results are edited in place on the loaded mutants, as analysis tasks do
+        for idx, ctx in enumerate(self.ctxs):
+            ctx.mutants['f{}.bin'.format(idx)]['binsec']['vulnerable'] = 'done'
+
+
+class TestMergedContextStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmpdir.name, 'mutants.db')
+        self.ctxfiles = []
+        for name in ('a', 'b'):
+            ctxdir = os.path.join(self.tmpdir.name, name)
+            os.makedirs(ctxdir)
+            ctxfile = os.path.join(ctxdir, 'context.yml')
+            with open(ctxfile, 'w') as stream:
+                yaml.dump({ 'source': '{}.c'.format(name) }, stream)
+            self.ctxfiles.append(ctxfile)
+        self.args = argparse.Namespace(debug=False, color=False, progress=False, meta_context=self.ctxfiles,
+                                       binsec_from_robust=False, override_context=[], context_prefix=None,
+                                       mutant_store=self.filename, full_context_dump=False, tempdir_cleanup=False)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_merged_contexts_keep_their_own_mutants(self):
+        runner = SeaticBaseMergedRunner(self.args)
+        ctxs = list(runner.ctxs.values())
+        # as FullAnalysisTask._postprocess does, one context after the other
+        for idx, ctx in enumerate(ctxs):
+            mutants = make_mutants()
+            mutants['only-{}.bin'.format(idx)] = { 'targets': [] }
+            ctx.set_mutants(mutants)
+        engine = SeaticMergedEngine(ctxs, DummyLogger())
+        engine.tasks.append(FakeTask(ctxs))
+        engine.run()
+        for idx, ctxfile in enumerate(self.ctxfiles):
+            store = MutantStore(self.filename, DummyLogger(), scope=os.path.abspath(ctxfile))
+            self.assertEqual(len(store), 6)
+            self.assertIn('only-{}.bin'.format(idx), store)
+            self.assertEqual(store['f{}.bin'.format(idx)]['binsec']['vulnerable'], 'done')
+        del runner
+
+
+if __name__ == '__main__':
+    unittest.main()